@@ -169,6 +169,7 @@ MODERNRPC_METHODS_MODULES = [
     'mathesar.rpc.schemas.privileges',
     'mathesar.rpc.servers.configured',
     'mathesar.rpc.tables',
+    'mathesar.rpc.tables.import_jobs',
     'mathesar.rpc.tables.metadata',
     'mathesar.rpc.tables.privileges',
     'mathesar.rpc.users'
@@ -312,6 +313,37 @@ MATHESAR_ANALYTICS_URL = os.environ.get('MATHESAR_ANALYTICS_URL', default='https
 MATHESAR_INIT_REPORT_URL = os.environ.get('MATHESAR_INIT_REPORT_URL', default='https://example.com/hello')
 MATHESAR_FEEDBACK_URL = os.environ.get('MATHESAR_FEEDBACK_URL', default='https://example.com/feedback')
 
+# Pooling of connections to user databases. Setting the max size to 0
+# disables pooling, so that each request opens its own connection.
+MATHESAR_CONNECTION_POOL = {
+    'min_size': int(os.environ.get('MATHESAR_CONNECTION_POOL_MIN_SIZE', default=0)),
+    'max_size': int(os.environ.get('MATHESAR_CONNECTION_POOL_MAX_SIZE', default=10)),
+    'max_idle': float(os.environ.get('MATHESAR_CONNECTION_POOL_MAX_IDLE', default=300)),
+    'check_interval': float(os.environ.get('MATHESAR_CONNECTION_POOL_CHECK_INTERVAL', default=30)),
+    'timeout': float(os.environ.get('MATHESAR_CONNECTION_POOL_TIMEOUT', default=30)),
+}
+
+# The number of threads running background imports (see mathesar.imports.jobs).
+MATHESAR_IMPORT_WORKERS = int(os.environ.get('MATHESAR_IMPORT_WORKERS', default=2))
+
+# Data files of at least MATHESAR_IMPORT_PARALLEL_MIN_SIZE bytes which
+# PostgreSQL can parse directly are copied by `tables.import` and bulk
+# inserts through this many connections at once (see
+# mathesar.imports.datafile). Set to 1 to disable.
+MATHESAR_IMPORT_PARALLEL_WORKERS = int(
+    os.environ.get('MATHESAR_IMPORT_PARALLEL_WORKERS', default=4)
+)
+MATHESAR_IMPORT_PARALLEL_MIN_SIZE = int(
+    os.environ.get('MATHESAR_IMPORT_PARALLEL_MIN_SIZE', default=64 * 1024 * 1024)
+)
+
+# Seconds for which results of saved explorations are cached. Cached
+# results are discarded earlier when any table of the exploration is
+# modified. Setting this to 0 disables the cache.
+MATHESAR_EXPLORATION_CACHE_TIMEOUT = int(
+    os.environ.get('MATHESAR_EXPLORATION_CACHE_TIMEOUT', default=300)
+)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 # UI source files have to be served by Django in order for static assets to be included during dev mode
@@ -0,0 +1,310 @@
+"""
+A small, thread-safe pool of psycopg connections.
+
+Connections are created via `db.connection.mathesar_connection`, so they
+carry the usual Mathesar `application_name`. Pools are kept in a
+process-wide registry keyed by an arbitrary hashable key chosen by the
+caller (Mathesar uses a (server, database, role) tuple).
+
+Idle connections are reaped whenever a connection is taken from their
+pool. So that pools which are no longer used don't hold on to their
+connections, every registered pool is also reaped whenever any pool is
+got from the registry, at most once every `REAP_INTERVAL` seconds.
+"""
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
+
+import psycopg
+from psycopg.pq import TransactionStatus
+
+from db.connection import mathesar_connection
+
+RESET_QUERY = "RESET ALL; DISCARD TEMP"
+CHECK_QUERY = "SELECT 1"
+REAP_INTERVAL = 60  # seconds between reaps of all registered pools
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PoolClosed(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Hand out psycopg connections, reusing idle ones where possible.
+
+    Args:
+        conninfo: A dict of keyword arguments for `mathesar_connection`.
+        min_size: Idle connections are not reaped below this number.
+        max_size: The maximum number of connections the pool will open.
+        max_idle: Seconds after which an idle connection is closed.
+        check_interval: Seconds of idleness after which a connection is
+            checked with a trivial query before being handed out.
+        timeout: Seconds to wait for a connection when the pool is full.
+    """
+
+    def __init__(
+            self,
+            conninfo,
+            min_size=0,
+            max_size=10,
+            max_idle=300,
+            check_interval=30,
+            timeout=30,
+    ):
+        self.conninfo = conninfo
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.check_interval = check_interval
+        self.timeout = timeout
+        self.closed = False
+        # (connection, monotonic time it was returned) pairs. New entries
+        # are appended, so the right end holds the most recently used.
+        self._idle = deque()
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "requests_num": 0,
+            "requests_waiting": 0,
+            "requests_errors": 0,
+            "connections_num": 0,
+            "connections_errors": 0,
+            "connections_lost": 0,
+            "connections_reaped": 0,
+            "returns_bad": 0,
+        }
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a `with` block.
+
+        This mirrors the behavior of `with psycopg.connect(...) as conn:`;
+        the transaction is committed if the block exits normally, and
+        rolled back otherwise. The connection is then returned to the
+        pool rather than closed.
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        except BaseException:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg.Error:
+                    pass
+            raise
+        else:
+            conn.commit()
+        finally:
+            self.putconn(conn)
+
+    def getconn(self):
+        """Get a connection from the pool, opening one if needed."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            self._check_open()
+            self._stats["requests_num"] += 1
+            waited = False
+            to_close = []
+            while True:
+                to_close.extend(self._pop_expired())
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._in_use < self.max_size:
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["requests_errors"] += 1
+                    raise PoolTimeout(
+                        f"Couldn't get a connection after {self.timeout} seconds."
+                    )
+                if not waited:
+                    self._stats["requests_waiting"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+                self._check_open()
+            self._in_use += 1
+        _close_all(to_close)
+
+        try:
+            if conn is not None and time.monotonic() - last_used > self.check_interval:
+                conn = self._checked(conn)
+            if conn is None:
+                conn = self._connect()
+        except BaseException:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return conn
+
+    def putconn(self, conn):
+        """Return a connection to the pool, discarding it if unusable."""
+        reusable = not self.closed and self._reset(conn)
+        with self._cond:
+            self._in_use -= 1
+            if not reusable:
+                self._stats["returns_bad"] += 1
+            elif len(self._idle) + self._in_use < self.max_size:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+        if conn is not None:
+            _close_all([conn])
+
+    def close(self):
+        """
+        Close all idle connections and stop handing out new ones.
+
+        Connections currently in use are closed when they're returned.
+        """
+        with self._cond:
+            self.closed = True
+            to_close = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        _close_all(to_close)
+
+    def reap(self):
+        """Close connections idle for longer than `max_idle`."""
+        with self._cond:
+            expired = self._pop_expired()
+        _close_all(expired)
+
+    def get_stats(self):
+        """Return a dict of counters and sizes describing the pool."""
+        with self._cond:
+            return {
+                **self._stats,
+                "pool_min": self.min_size,
+                "pool_max": self.max_size,
+                "pool_size": len(self._idle) + self._in_use,
+                "pool_available": len(self._idle),
+                "pool_in_use": self._in_use,
+            }
+
+    def _check_open(self):
+        if self.closed:
+            raise PoolClosed("The connection pool is closed.")
+
+    def _connect(self):
+        try:
+            conn = mathesar_connection(**self.conninfo)
+        except BaseException:
+            with self._cond:
+                self._stats["connections_errors"] += 1
+            raise
+        with self._cond:
+            self._stats["connections_num"] += 1
+        return conn
+
+    def _checked(self, conn):
+        """Return the connection if it's still alive, None otherwise."""
+        try:
+            conn.autocommit = True
+            conn.execute(CHECK_QUERY)
+            conn.autocommit = False
+            return conn
+        except psycopg.Error:
+            with self._cond:
+                self._stats["connections_lost"] += 1
+            _close_all([conn])
+            return None
+
+    def _reset(self, conn):
+        """Clear session state left by the borrower; report success."""
+        if conn.closed or conn.broken:
+            return False
+        if conn.info.transaction_status != TransactionStatus.IDLE:
+            return False
+        try:
+            conn.autocommit = True
+            conn.execute(RESET_QUERY)
+            conn.autocommit = False
+        except psycopg.Error:
+            return False
+        return True
+
+    def _pop_expired(self):
+        """Remove (and return) connections idle for longer than `max_idle`."""
+        expired = []
+        cutoff = time.monotonic() - self.max_idle
+        while (
+                len(self._idle) + self._in_use > self.min_size
+                and self._idle
+                and self._idle[0][1] < cutoff
+        ):
+            expired.append(self._idle.popleft()[0])
+        self._stats["connections_reaped"] += len(expired)
+        return expired
+
+
+def _close_all(conns):
+    for conn in conns:
+        try:
+            conn.close()
+        except psycopg.Error:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_last_reaped = time.monotonic()
+
+
+def get_pool(key, conninfo, **pool_kwargs):
+    """
+    Get the pool registered under `key`, creating it if necessary.
+
+    If the registered pool was created with different connection info
+    (e.g., because a password or host changed), it is closed and
+    replaced.
+
+    Args:
+        key: A hashable identifying the pool.
+        conninfo: A dict of keyword arguments for `mathesar_connection`.
+        **pool_kwargs: Passed on to `ConnectionPool` when creating it.
+    """
+    global _last_reaped
+    stale = None
+    to_reap = []
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None and (pool.closed or pool.conninfo != conninfo):
+            stale, pool = pool, None
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(conninfo, **pool_kwargs)
+        now = time.monotonic()
+        if now - _last_reaped >= REAP_INTERVAL:
+            _last_reaped = now
+            to_reap = list(_pools.values())
+    if stale is not None:
+        stale.close()
+    for other_pool in to_reap:
+        other_pool.reap()
+    return pool
+
+
+def close_pools(predicate=lambda key: True):
+    """Close and unregister every pool whose key satisfies `predicate`."""
+    with _pools_lock:
+        keys = [key for key in _pools if predicate(key)]
+        pools = [_pools.pop(key) for key in keys]
+    for pool in pools:
+        pool.close()
+
+
+def get_pool_stats():
+    """Return a dict mapping each registered pool key to its stats."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {key: pool.get_stats() for key, pool in pools}
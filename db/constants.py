@@ -4,9 +4,13 @@ MATHESAR_PREFIX = "mathesar_"
 MSAR_PUBLIC_SCHEMA = 'msar'
 MSAR_PRIVATE_SCHEMA = f"__{MSAR_PUBLIC_SCHEMA}"
 TYPES_SCHEMA = f"{MATHESAR_PREFIX}types"
+RECORD_SUMMARIES_SCHEMA = f"{MSAR_PUBLIC_SCHEMA}_record_summaries"
+IMPORT_STAGING_SCHEMA = f"{MSAR_PUBLIC_SCHEMA}_import_staging"
 
 INTERNAL_SCHEMAS = {
     TYPES_SCHEMA,
     MSAR_PUBLIC_SCHEMA,
     MSAR_PRIVATE_SCHEMA,
+    RECORD_SUMMARIES_SCHEMA,
+    IMPORT_STAGING_SCHEMA,
 }
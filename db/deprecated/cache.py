@@ -0,0 +1,57 @@
+from collections import OrderedDict
+import threading
+
+
+class LRUCache:
+    """
+    A thread-safe mapping holding at most `max_size` entries.
+
+    When full, adding an entry evicts the least recently used one, which
+    is passed to `on_evict` (if given) outside of the lock.
+    """
+
+    def __init__(self, max_size, on_evict=None):
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                old_value = self._entries.pop(key)
+                if old_value is not value:
+                    evicted.append(old_value)
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                evicted.append(self._entries.popitem(last=False)[1])
+        self._evict(evicted)
+
+    def pop(self, key):
+        with self._lock:
+            value = self._entries.pop(key, None)
+        if value is not None:
+            self._evict([value])
+
+    def clear(self):
+        with self._lock:
+            evicted = list(self._entries.values())
+            self._entries.clear()
+        self._evict(evicted)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self, values):
+        if self.on_evict is not None:
+            for value in values:
+                self.on_evict(value)
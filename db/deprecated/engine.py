@@ -3,8 +3,11 @@ import copy
 from sqlalchemy import create_engine as sa_create_engine
 from sqlalchemy.engine import URL
 
+from db.deprecated.cache import LRUCache
 from db.deprecated.types.custom import CUSTOM_DB_TYPE_TO_SA_CLASS
 
+ENGINE_CACHE_SIZE = 32
+
 
 def create_future_engine_with_custom_types(
         username, password, hostname, database, port, *args, **kwargs
@@ -18,6 +21,30 @@ def create_future_engine_with_custom_types(
     return engine
 
 
+_engines = LRUCache(ENGINE_CACHE_SIZE, on_evict=lambda entry: entry[1].dispose())
+
+
+def get_cached_engine_with_custom_types(username, password, hostname, database, port):
+    """
+    Get an engine for the given role and database, reusing a cached one.
+
+    Engines are cached per (host, port, database, role); a cached engine
+    created with a different password is disposed of and replaced. The
+    least recently used engine is disposed of when the cache is full.
+    """
+    key = (hostname, port, database, username)
+    entry = _engines.get(key)
+    if entry is None or entry[0] != password:
+        entry = (
+            password,
+            create_future_engine_with_custom_types(
+                username, password, hostname, database, port
+            ),
+        )
+        _engines.put(key, entry)
+    return entry[1]
+
+
 def create_future_engine(
         username, password, hostname, database, port, *args, **kwargs
 ):
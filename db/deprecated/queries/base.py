@@ -1,15 +1,20 @@
 from frozendict import frozendict
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.sql.functions import count
 
 from db.deprecated.columns import MathesarColumn
 from db.deprecated.columns import get_column_name_from_attnum
-from db.deprecated.tables import reflect_table_from_oid
+from db.deprecated.tables import get_reflected_tables
 from db.deprecated.transforms.operations import apply
 from db.deprecated.transforms import base
-from db.deprecated.utils import execute_pg_query
+from db.deprecated.utils import execute_pg_query, stream_pg_query
 from db.deprecated.metadata import get_empty_metadata
 
+# Ordinary tables, partitioned tables and materialized views.
+SAMPLEABLE_RELKINDS = ('r', 'p', 'm')
+
+COUNT_ALIAS = '__mathesar_count'
+
 
 class DBQuery:
     def __init__(
@@ -35,6 +40,10 @@ class DBQuery:
         self.transformations = transformations
         self.name = name
         self.metadata = metadata if metadata else get_empty_metadata()
+        # Reflected tables by oid, validated against the catalogs once per
+        # DBQuery. Like the metadata, these may go stale if the database
+        # objects are altered while the DBQuery is in use.
+        self._reflected_tables = None
 
     def get_input_aliases(self, ix_of_transform):
         """
@@ -121,6 +130,49 @@ class DBQuery:
         )
         return execute_pg_query(self.engine, final_relation)
 
+    def get_records_and_count(self, limit=None, offset=None):
+        """
+        Get a page of records along with the count of all records, in a
+        single query.
+
+        The count is a window over the whole (ordered) relation, so it's
+        computed before the limit and offset are applied. Only when the
+        page is empty is the relation counted separately.
+
+        Returns a (records, count) tuple, where each record is a dict.
+        """
+        fallback_to_default_ordering = not self._is_sorting_transform_used
+        ordered_relation = apply.apply_transformations_deprecated(
+            table=self.transformed_relation,
+            fallback_to_default_ordering=fallback_to_default_ordering,
+        )
+        counted_relation = select(
+            ordered_relation, count(1).over().label(COUNT_ALIAS)
+        ).cte()
+        final_relation = apply.apply_transformations_deprecated(
+            table=counted_relation, limit=limit, offset=offset,
+        )
+        records = [r._asdict() for r in execute_pg_query(self.engine, final_relation)]
+        if not records:
+            return records, self.count if offset else 0
+        records_count = records[0][COUNT_ALIAS]
+        for record in records:
+            del record[COUNT_ALIAS]
+        return records, records_count
+
+    def stream_records(self, batch_size, **kwargs):
+        """
+        Like `get_records`, but yield the records in batches of at most
+        `batch_size`, fetched through a server-side cursor.
+        """
+        fallback_to_default_ordering = not self._is_sorting_transform_used
+        final_relation = apply.apply_transformations_deprecated(
+            table=self.transformed_relation,
+            fallback_to_default_ordering=fallback_to_default_ordering,
+            **kwargs
+        )
+        return stream_pg_query(self.engine, final_relation, batch_size)
+
     @property
     def _is_sorting_transform_used(self):
         """
@@ -142,32 +194,24 @@ class DBQuery:
         )
         return execute_pg_query(self.engine, relation)[0][col_name]
 
-    # NOTE if too expensive, can be rewritten to parse DBQuery spec, instead of leveraging sqlalchemy
     @property
     def all_sa_columns_map(self):
         """
-        Expensive! use with care.
+        Map each alias appearing at any step of the query to its SA column.
+
+        The transformations are applied once, in sequence, collecting the
+        columns of each intermediate relation. Where an alias appears at
+        several steps, the column of the latest step is used.
         """
-        initial_columns_map = {
-            col.name: MathesarColumn.from_column(col, engine=self.engine)
-            for col in self.initial_relation.columns
-        }
-        output_columns_map = {
-            col.name: col for col in self.sa_output_columns
+        relation = self.initial_relation
+        sa_columns = list(relation.columns)
+        for transform in self.transformations:
+            relation = apply.apply_transformations(relation, [transform])
+            sa_columns.extend(relation.columns)
+        return {
+            sa_col.name: MathesarColumn.from_column(sa_col, engine=self.engine)
+            for sa_col in sa_columns
         }
-        transforms_columns_map = {} if self.transformations is None else {
-            col.name: MathesarColumn.from_column(col, engine=self.engine)
-            for i in range(len(self.transformations))
-            for col in DBQuery(
-                base_table_oid=self.base_table_oid,
-                initial_columns=self.initial_columns,
-                engine=self.engine,
-                transformations=self.transformations[:i],
-                name=f'{self.name}_{i}'
-            ).transformed_relation.columns
-        }
-        map_of_alias_to_sa_col = initial_columns_map | transforms_columns_map | output_columns_map
-        return map_of_alias_to_sa_col
 
     @property
     def sa_output_columns(self):
@@ -197,12 +241,65 @@ class DBQuery:
         else:
             return self.initial_relation
 
+    def _get_reflected_table(self, oid):
+        if self._reflected_tables is None:
+            oids = {self.base_table_oid}
+            for initial_col in self.initial_columns:
+                oids.add(initial_col.reloid)
+                for jp in initial_col.jp_path:
+                    oids.update((jp.left_oid, jp.right_oid))
+            self._reflected_tables = get_reflected_tables(oids, self.engine)
+        return self._reflected_tables[oid]
+
+    def get_column_name(self, table_oid, attnum):
+        """Get the name of a column of one of the tables used by the query."""
+        return self._get_reflected_table(table_oid).column_names.get(attnum)
+
+    def get_table_name(self, table_oid):
+        """Get the name of one of the tables used by the query."""
+        return self._get_reflected_table(table_oid).table.name
+
+    def get_sa_column(self, table_oid, attnum):
+        """Get the SA column of one of the tables used by the query."""
+        reflected_table = self._get_reflected_table(table_oid)
+        return reflected_table.table.columns[reflected_table.column_names[attnum]]
+
+    @property
+    def sample_percent(self):
+        """
+        The percentage of the base table to sample for an approximate
+        summarization, or None if no summarization is approximate.
+
+        The sample is taken with TABLESAMPLE SYSTEM, which reads only that
+        percentage of the table's pages. Since it applies to the base table,
+        only the first summarization of a query can be approximate.
+        """
+        summarizations = [
+            transform
+            for transform
+            in self.transformations
+            if type(transform) is base.Summarize
+        ]
+        if not summarizations:
+            return None
+        if any(s.sample_percent is not None for s in summarizations[1:]):
+            raise ValueError(
+                "Only the first summarization of an exploration can be approximate."
+            )
+        return summarizations[0].sample_percent
+
     @property
     def initial_relation(self):
-        metadata = self.metadata
-        base_table = reflect_table_from_oid(
-            self.base_table_oid, self.engine, metadata=metadata
-        )
+        reflected_base_table = self._get_reflected_table(self.base_table_oid)
+        base_table = reflected_base_table.table
+        sample_percent = self.sample_percent
+        if sample_percent is not None:
+            # TABLESAMPLE can't be applied to views.
+            if reflected_base_table.relkind not in SAMPLEABLE_RELKINDS:
+                raise ValueError(
+                    "Only explorations of tables can be summarized approximately."
+                )
+            base_table = base_table.tablesample(func.system(sample_percent))
         from_clause = base_table
 
         # We cache aliases, because we want a given join-param subpath to have only one alias.
@@ -236,18 +333,17 @@ class DBQuery:
                 if previous_and_this_jps in map_of_jp_subpath_to_alias:
                     right = map_of_jp_subpath_to_alias[previous_and_this_jps]
                 else:
-                    right = reflect_table_from_oid(
-                        jp.right_oid, self.engine, metadata=metadata
-                    ).alias()
+                    right = self._get_reflected_table(jp.right_oid).table.alias()
                     map_of_jp_subpath_to_alias[previous_and_this_jps] = right
-                left_col, right_col = jp._get_sa_cols(left, right, self.engine, metadata)
+                left_col = left.columns[self.get_column_name(jp.left_oid, jp.left_attnum)]
+                right_col = right.columns[self.get_column_name(jp.right_oid, jp.right_attnum)]
                 join_id = _get_join_id(previous_and_this_jps)
                 if join_id not in created_joins:
                     created_joins.add(join_id)
                     from_clause = from_clause.join(
                         right, onclause=left_col == right_col, isouter=True,
                     )
-            initial_col_name = initial_col.get_name(self.engine, metadata)
+            initial_col_name = self.get_column_name(initial_col.reloid, initial_col.attnum)
             return right.columns[initial_col_name].label(initial_col.alias)
 
         processed_initial_columns = [
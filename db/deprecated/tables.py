@@ -1,8 +1,65 @@
-from sqlalchemy import Table
+from sqlalchemy import Table, bindparam, text
+from db.deprecated.cache import LRUCache
+from db.deprecated.metadata import get_empty_metadata
 from db.deprecated.utils import engine_to_psycopg_conn
 from db.schemas import get_schema
 from db.tables import get_table
 
+REFLECTION_CACHE_SIZE = 512
+
+# The token changes whenever the table, or any of its columns or
+# constraints, is altered, since each such change writes a new version
+# of the respective catalog row. A dropped table whose oid is reused gets
+# new catalog rows as well.
+_CATALOG_TOKEN_QUERY = text("""
+SELECT
+  c.oid,
+  n.nspname,
+  c.relname,
+  c.relkind,
+  concat_ws(
+    ':',
+    c.xmin::text,
+    (
+      SELECT string_agg(a.xmin::text, ',' ORDER BY a.attnum)
+      FROM pg_catalog.pg_attribute AS a
+      WHERE a.attrelid = c.oid
+    ),
+    (
+      SELECT string_agg(co.xmin::text, ',' ORDER BY co.oid)
+      FROM pg_catalog.pg_constraint AS co
+      WHERE co.conrelid = c.oid
+    )
+  ) AS token,
+  (
+    SELECT json_object_agg(a.attnum, a.attname)
+    FROM pg_catalog.pg_attribute AS a
+    WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+  ) AS column_names
+FROM pg_catalog.pg_class AS c
+JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+WHERE c.oid IN :oids
+""").bindparams(bindparam('oids', expanding=True))
+
+
+class ReflectedTable:
+    """
+    A reflected table, along with the names of its columns by attnum, and
+its relkind.
+
+    Each reflected table has its own MetaData, so that it's never mutated
+    once cached, and can be shared between threads.
+    """
+
+    def __init__(self, table, column_names, token, relkind='r'):
+        self.table = table
+        self.column_names = column_names
+        self.token = token
+        self.relkind = relkind
+
+
+_reflected_tables = LRUCache(REFLECTION_CACHE_SIZE)
+
 
 def reflect_table_from_oid(oid, engine, metadata, connection_to_use=None, keep_existing=False):
     with engine_to_psycopg_conn(engine) as conn:
@@ -18,3 +75,47 @@ def reflect_table_from_oid(oid, engine, metadata, connection_to_use=None, keep_e
         extend_existing=extend_existing,
         keep_existing=keep_existing
     )
+
+
+def get_reflected_tables(oids, engine):
+    """
+    Get a `ReflectedTable` for each of the given table oids.
+
+    Tables are cached process-wide per (database, role, table oid). All
+    cached entries for `oids` are validated against the catalogs with a
+    single query, and only tables which are missing or have changed since
+    they were cached are reflected again.
+
+    Returns:
+        A dict mapping each oid to its `ReflectedTable`. Oids of tables
+        which don't exist are omitted.
+    """
+    oids = list(set(oids))
+    if not oids:
+        return {}
+    url = engine.url
+    db_key = (url.host or url.query.get("host"), url.port, url.database, url.username)
+    with engine.connect() as conn:
+        rows = conn.execute(_CATALOG_TOKEN_QUERY, {"oids": oids}).all()
+    reflected_tables = {}
+    for oid, schema_name, table_name, relkind, token, column_names in rows:
+        key = db_key + (oid,)
+        reflected = _reflected_tables.get(key)
+        if reflected is None or reflected.token != token:
+            table = Table(
+                table_name,
+                get_empty_metadata(),
+                schema=schema_name,
+                autoload_with=engine,
+            )
+            column_names = {
+                int(attnum): name for attnum, name in (column_names or {}).items()
+            }
+            reflected = ReflectedTable(table, column_names, token, relkind)
+            _reflected_tables.put(key, reflected)
+        reflected_tables[oid] = reflected
+    return reflected_tables
+
+
+def clear_reflection_cache():
+    _reflected_tables.clear()
@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
 from copy import deepcopy
+from decimal import Decimal
 import itertools
 
 import sqlalchemy
 from sqlalchemy import select
 
 from db.deprecated.functions.operations.apply import apply_db_function_by_id, apply_db_function_spec_as_filter
+from db.deprecated.functions.base import Count, Sum
 from db.deprecated.functions.packed import DistinctArrayAgg
 from db.deprecated import sort as rec_sort
 
@@ -174,8 +176,14 @@ class Summarize(Transform):
                 "output_alias": "col3_alias",  # required for aggregation cols
                 "function": "distinct_aggregate_to_array"  # required DBFunction id
             }
-        ]
+        ],
+        "sample_percent": 1.5  # optional; makes the summarization approximate
     }
+
+    An approximate summarization is computed over a sample of the base table
+    (see `DBQuery.sample_percent`), with its counts and sums scaled up by the
+    inverse of the sampled fraction. Only the first summarization of a query
+    can be approximate.
     """
     type = "summarize"
 
@@ -219,6 +227,13 @@ class Summarize(Transform):
                 agg_db_function_subclass_id,
                 [column_to_aggregate],
             )
+            if self.sample_percent is not None:
+                sa_expression = _scale_sampled_aggregation(
+                    sa_expression,
+                    agg_db_function_subclass_id,
+                    column_to_aggregate,
+                    self.sample_percent,
+                )
             return sa_expression.label(output_alias)
 
         grouping_expressions = [
@@ -327,6 +342,16 @@ class Summarize(Transform):
             in self.aggregation_col_specs
         ]
 
+    @property
+    def sample_percent(self):
+        sample_percent = self.spec.get("sample_percent")
+        if sample_percent is not None and not 0 < sample_percent <= 100:
+            raise ValueError(
+                f"Invalid sample percentage: {sample_percent}. It must be greater"
+                " than 0, and at most 100."
+            )
+        return sample_percent
+
     @property
     def _grouping_col_specs(self):
         return self.spec.get("grouping_expressions", [])
@@ -336,6 +361,27 @@ class Summarize(Transform):
         return self.spec.get("aggregation_expressions", [])
 
 
+def _scale_sampled_aggregation(sa_expression, function_id, column_to_aggregate, sample_percent):
+    """
+    Scale a count or sum computed over a sample up to the whole relation.
+
+    Scaled counts, and sums of integers, are rounded. Other aggregations are
+    returned as they are.
+    """
+    if function_id not in (Count.id, Sum.id):
+        return sa_expression
+    scaled = sa_expression * sqlalchemy.literal(
+        Decimal(100) / Decimal(str(sample_percent)), sqlalchemy.Numeric
+    )
+    if function_id == Count.id:
+        return sqlalchemy.cast(
+            sqlalchemy.func.round(scaled, type_=sqlalchemy.Numeric), sqlalchemy.BigInteger
+        )
+    if isinstance(column_to_aggregate.type, sqlalchemy.Integer):
+        return sqlalchemy.func.round(scaled, type_=sqlalchemy.Numeric)
+    return scaled
+
+
 def _add_aliases_to_summarization_expr_field(
     summarization, spec_field, aliases, get_col_spec_from_alias
 ):
@@ -2,7 +2,6 @@ from sqlalchemy import inspect
 
 from db.tables import list_joinable_tables
 from db.deprecated.transforms.base import Summarize
-from db.deprecated.columns import get_column_from_oid_and_attnum
 from db.deprecated.utils import engine_to_psycopg_conn
 
 
@@ -70,7 +69,7 @@ def _split_missing_input_aliases_into_group_and_agg_lists(
     can_add_other_aliases_to_group_by = (
         base_grouping_initial_column is not None
         and _is_initial_column_unique_constrained(
-            base_grouping_initial_column, engine, metadata
+            base_grouping_initial_column, db_query, engine
         )
     )
     if can_add_other_aliases_to_group_by:
@@ -169,15 +168,10 @@ def _get_oids_of_joinable_tables_with_single_results(
     )
 
 
-def _is_initial_column_unique_constrained(initial_column, engine, metadata):
+def _is_initial_column_unique_constrained(initial_column, db_query, engine):
     oid = _get_oid_of_initial_column(initial_column)
     attnum = initial_column.attnum
-    sa_column = get_column_from_oid_and_attnum(
-        table_oid=oid,
-        attnum=attnum,
-        engine=engine,
-        metadata=metadata,
-    )
+    sa_column = db_query.get_sa_column(oid, attnum)
     return _is_sa_column_unique_constrained(sa_column, engine)
 
 
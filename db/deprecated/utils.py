@@ -48,6 +48,25 @@ def execute_pg_query(engine, query, connection_to_use=None):
     return execute_statement(engine, executable, connection_to_use=connection_to_use).fetchall()
 
 
+def stream_pg_query(engine, query, batch_size):
+    """
+    Yield the rows of the query in lists of at most `batch_size` rows.
+
+    The rows are fetched through a server-side cursor, so only one batch
+    is held in memory at a time.
+    """
+    col_list = stringify_json_cols(query)
+    executable = sqlalchemy.select(col_list)
+    with engine.connect() as conn:
+        result = execute_statement(
+            engine,
+            executable,
+            connection_to_use=conn.execution_options(yield_per=batch_size),
+        )
+        for partition in result.partitions(batch_size):
+            yield partition
+
+
 def get_module_members_that_satisfy(module, predicate):
     """
     Looks at the members of the provided module and filters them using the provided predicate.
@@ -0,0 +1,216 @@
+from decimal import Decimal
+from functools import partial
+import json
+from uuid import uuid4
+
+from psycopg import sql
+from psycopg.types.json import set_json_loads
+
+from db import connection as db_conn
+
+
+def run_exploration(
+        conn,
+        exploration,
+        limit=None,
+        offset=None,
+        count_mode='exact',
+        after=None,
+        before=None,
+):
+    """
+    Run an exploration, compiling it to SQL on the database.
+
+    Raises psycopg.errors.FeatureNotSupported if the exploration uses a
+    transformation or function which can't be compiled there.
+
+    Args:
+        exploration: A dict with the keys "base_table_oid",
+            "initial_columns", and "transformations".
+        limit: The maximum number of records to return.
+        offset: The number of records to skip.
+        count_mode: How to compute the count of records. One of 'exact'
+            or 'none'.
+        after: A cursor; only records after the one it identifies are returned.
+        before: A cursor; only records before the one it identifies are returned.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'run_exploration',
+        json.dumps(exploration),
+        limit,
+        offset,
+        count_mode,
+        after,
+        before,
+    ).fetchone()[0]
+
+
+def get_exploration_records_query(conn, exploration):
+    """
+    Compile an exploration into a query selecting all of its records, in
+    order, for `stream_exploration_records`.
+
+    Raises psycopg.errors.FeatureNotSupported if the exploration uses a
+    transformation or function which can't be compiled there.
+
+    Args:
+        exploration: A dict with the keys "base_table_oid",
+            "initial_columns", and "transformations".
+
+    Returns:
+        A dict with the "output_columns" of the exploration, and the
+        "query".
+    """
+    output_columns, query = conn.execute(
+        """
+        SELECT
+          msar.build_exploration_query(%(exploration)s) -> 'output_columns',
+          msar.build_exploration_records_query(%(exploration)s)
+        """,
+        {"exploration": json.dumps(exploration)},
+    ).fetchone()
+    return {"output_columns": output_columns, "query": query}
+
+
+def stream_exploration_records(conn, query, batch_size, limit=None, offset=None):
+    """
+    Yield the records of an exploration in batches of at most
+    `batch_size`, as dicts formatted as by `run_exploration`.
+
+    The records are fetched through a server-side cursor, so the whole
+    result set is never held in memory. Numeric values are loaded as
+    Decimals, so that they keep their precision.
+
+    Args:
+        query: A query from `get_exploration_records_query`.
+        limit: The maximum number of records to yield.
+        offset: The number of records to skip.
+    """
+    with conn.cursor(name=str(uuid4())) as cursor:
+        set_json_loads(partial(json.loads, parse_float=Decimal), cursor)
+        cursor.execute(
+            sql.SQL("{} LIMIT {} OFFSET {}").format(
+                sql.SQL(query), sql.Literal(limit), sql.Literal(offset)
+            )
+        )
+        while records := cursor.fetchmany(batch_size):
+            yield [record for record, in records]
+
+
+def materialize_exploration(conn, exploration, schema_oid, view_name):
+    """
+    Create a materialized view holding the records of an exploration.
+
+    Args:
+        exploration: A dict with the keys "base_table_oid",
+            "initial_columns", and "transformations".
+        schema_oid: The OID of the schema where the view will be created.
+        view_name: The name of the view.
+
+    Returns:
+        The OID of the view.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'materialize_exploration',
+        json.dumps(exploration),
+        schema_oid,
+        view_name,
+    ).fetchone()[0]
+
+
+def replace_materialized_exploration(conn, exploration, view_oid, schema_oid, view_name):
+    """
+    Replace the materialized view of an exploration with one built from
+    a new definition. The new view keeps the owner of the old one.
+
+    Args:
+        exploration: A dict with the keys "base_table_oid",
+            "initial_columns", and "transformations".
+        view_oid: The OID of the view to replace.
+        schema_oid: The OID of the schema where the view will be created.
+        view_name: The name of the view.
+
+    Returns:
+        The OID of the new view.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'replace_materialized_exploration',
+        json.dumps(exploration),
+        view_oid,
+        schema_oid,
+        view_name,
+    ).fetchone()[0]
+
+
+def can_read_materialized_exploration(conn, exploration, view_oid):
+    """
+    Return whether the records of an exploration may be read from its
+    materialized view, i.e., whether the role of the connection may
+    select from the view, and from all the columns used by the
+    exploration.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'can_read_materialized_exploration',
+        json.dumps(exploration),
+        view_oid,
+    ).fetchone()[0]
+
+
+def refresh_materialized_exploration(conn, view_oid):
+    db_conn.exec_msar_func(conn, 'refresh_materialized_exploration', view_oid)
+
+
+def drop_materialized_exploration(conn, view_oid):
+    db_conn.exec_msar_func(conn, 'drop_materialized_exploration', view_oid)
+
+
+def run_materialized_exploration(
+        conn, exploration, view_oid, limit=None, offset=None, count_mode='exact'
+):
+    """
+    Run an exploration, reading its records from its materialized view.
+
+    The result has the same form as that of `run_exploration`.
+
+    Args:
+        exploration: A dict with the keys "base_table_oid",
+            "initial_columns", and "transformations".
+        view_oid: The OID of the materialized view of the exploration.
+        limit: The maximum number of records to return.
+        offset: The number of records to skip.
+        count_mode: How to compute the count of records. One of 'exact'
+            or 'none'.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'run_materialized_exploration',
+        json.dumps(exploration),
+        view_oid,
+        limit,
+        offset,
+        count_mode,
+    ).fetchone()[0]
+
+
+def copy_materialized_exploration_as_csv(conn, view_oid, limit=None, offset=None):
+    """
+    Yield the records of a materialized exploration as chunks of CSV
+    bytes, with a header.
+    """
+    export_query = db_conn.exec_msar_func(
+        conn,
+        'build_materialized_exploration_query',
+        view_oid,
+        limit,
+        offset,
+    ).fetchone()[0]
+    cursor = conn.cursor()
+    with cursor.copy(
+        f"COPY ({export_query}) TO STDOUT WITH (FORMAT csv, HEADER)"
+    ) as copy:
+        for data in copy:
+            yield bytes(data)
@@ -18,6 +18,10 @@ def list_records_from_table(
     joined_columns=None,
     return_record_summaries=False,
     table_record_summary_templates=None,
+    count_mode='exact',
+    after=None,
+    before=None,
+    return_cursors=False,
 ):
     """
     Get records from a table.
@@ -39,6 +43,12 @@ def list_records_from_table(
             "join_path" represents linkages via a simple many-to-many mapping to a column in another table.
         return_record_summaries: Whether to return self record summaries.
         table_record_summary_templates: A dict of record summary templates, per table.
+        count_mode: How to compute the count of matching records. One of
+            'exact', 'estimated' (the query planner's estimate), or 'none'.
+        after: A cursor; only records after the one it identifies are returned.
+        before: A cursor; only records before the one it identifies are returned.
+        return_cursors: Whether to return the cursors of the first and last
+            records listed.
     """
     result = db_conn.exec_msar_func(
         conn,
@@ -52,10 +62,30 @@ def list_records_from_table(
         _json_or_none(joined_columns),
         return_record_summaries,
         _json_or_none(table_record_summary_templates),
+        count_mode,
+        after,
+        before,
+        return_cursors,
     ).fetchone()[0]
     return result
 
 
+def count_records_from_table(conn, table_oid, filter=None):
+    """
+    Get the exact number of records in a table, optionally filtered.
+
+    Args:
+        table_oid: The OID of the table whose records we'll count.
+        filter: A filter definition object.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'count_records_from_table',
+        table_oid,
+        _json_or_none(filter),
+    ).fetchone()[0]
+
+
 def get_record_from_table(
     conn,
     record_id,
@@ -97,6 +127,9 @@ def search_records_from_table(
     offset=0,
     return_record_summaries=False,
     table_record_summary_templates=None,
+    after=None,
+    before=None,
+    return_cursors=False,
 ):
     """
     Get records from a table, according to a search specification
@@ -109,6 +142,10 @@ def search_records_from_table(
         limit: The maximum number of rows we'll return.
         return_record_summaries: Whether to return self record summaries.
         table_record_summary_templates: A dict of record summary templates, per table.
+        after: A cursor; only records after the one it identifies are returned.
+        before: A cursor; only records before the one it identifies are returned.
+        return_cursors: Whether to return the cursors of the first and last
+            records listed.
 
     The search definition objects should have the form
     {"attnum": <int>, "literal": <text>}
@@ -123,6 +160,9 @@ def search_records_from_table(
         offset,
         return_record_summaries,
         _json_or_none(table_record_summary_templates),
+        after,
+        before,
+        return_cursors,
     ).fetchone()[0]
     return result
 
@@ -186,6 +226,27 @@ def add_record_to_table(
     return result
 
 
+def add_records_to_table(
+    conn,
+    record_defs,
+    table_oid,
+    return_records=False,
+    return_record_summaries=False,
+    table_record_summary_templates=None,
+):
+    """Add many records to a table, all at once."""
+    result = db_conn.exec_msar_func(
+        conn,
+        'add_records_to_table',
+        table_oid,
+        json.dumps(record_defs),
+        return_records,
+        return_record_summaries,
+        _json_or_none(table_record_summary_templates),
+    ).fetchone()[0]
+    return result
+
+
 def patch_record_in_table(
     conn,
     record_def,
@@ -207,6 +268,33 @@ def patch_record_in_table(
     return result
 
 
+def patch_records_in_table(
+    conn,
+    record_patches,
+    table_oid,
+    return_records=False,
+    return_record_summaries=False,
+    table_record_summary_templates=None,
+):
+    """
+    Update many records in a table, all at once.
+
+    Args:
+        record_patches: A list of dicts of the form
+            {"record_id": <pk value>, "record_def": <dict>}.
+    """
+    result = db_conn.exec_msar_func(
+        conn,
+        'patch_records_in_table',
+        table_oid,
+        json.dumps(record_patches),
+        return_records,
+        return_record_summaries,
+        _json_or_none(table_record_summary_templates),
+    ).fetchone()[0]
+    return result
+
+
 def insert_from_select(
     conn,
     src_table_id,
@@ -237,3 +325,31 @@ def insert_from_select(
         json.dumps(mappings)
     ).fetchone()[0]
     return result
+
+
+def insert_from_staging_tables(
+    conn,
+    src_table_ids,
+    dst_table_id,
+    mappings=None
+):
+    """
+    Move the records of staging tables to a destination/target table in
+    order, dropping the staging tables, and return the number of records
+    moved.
+
+    Args:
+      src_table_ids: The OIDs of the staging tables, in order.
+      dst_table_id: The OID of the destination/target table.
+      mappings: The column mappings b/w the staging tables and the
+        destination table, as for `insert_from_select`. If omitted, the
+        columns are mapped in order onto the text columns of a table made
+        by `db.tables.prepare_table_for_import`.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'insert_from_staging_tables',
+        src_table_ids,
+        dst_table_id,
+        _json_or_none(mappings)
+    ).fetchone()[0]
@@ -575,21 +575,34 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.add_pkey_column(regclass,msar.pkey_kind,text)', 'FUNCTION', NULL),
   ('msar', 'msar.add_record_to_table(oid,jsonb,boolean)', 'FUNCTION', NULL),
   ('msar', 'msar.add_record_to_table(oid,jsonb,boolean,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.add_records_to_table(oid,jsonb,boolean,boolean,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.add_temp_table(text,__msar.col_def[])', 'FUNCTION', NULL),
   ('msar', 'msar.add_time_to_vector(point,time without time zone)', 'FUNCTION', NULL),
+  ('msar', 'msar.add_vectors(point,point)', 'FUNCTION', NULL),
   ('msar', 'msar.all_mathesar_objects', 'TABLE', NULL),
   ('msar', 'msar.all_mathesar_objects', 'TYPE', NULL),
   ('msar', 'msar.alter_columns(oid,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.alter_table(oid,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.auto_generate_record_summary_template(oid)', 'FUNCTION', NULL),
   ('msar', 'msar.build_all_columns_expr(regclass)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_bulk_insert_expr(oid,smallint[])', 'FUNCTION', NULL),
+  ('msar', 'msar.build_bulk_update_expr(oid,smallint[])', 'FUNCTION', NULL),
   ('msar', 'msar.build_cast_expr(regclass,smallint,regtype)', 'FUNCTION', NULL),
   ('msar', 'msar.build_column_expr(jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_column_expr(text,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_columns_expr(regclass,smallint[])', 'FUNCTION', NULL),
+  ('msar', 'msar.build_count_cte_query(oid,text,text,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_cursor_expr(jsonb,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_cursors_expr(jsonb,text,text)', 'FUNCTION', NULL),
   ('msar', 'msar.build_database_privilege_replace_expr(regrole,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_empty_record_summary_query()', 'FUNCTION', NULL),
+  ('msar', 'msar.build_exploration_expr(jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_exploration_literal(jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_exploration_order_by_expr(text,jsonb,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_exploration_query(jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_exploration_records_query(jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_expr(oid,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_expr_template(oid,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_grant_membership_expr(regrole,oid[])', 'FUNCTION', NULL),
   ('msar', 'msar.build_group_count_expr(oid,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_group_id_expr(oid,jsonb)', 'FUNCTION', NULL),
@@ -598,6 +611,43 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.build_grouping_results_jsonb_expr(oid,text,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_groups_cte_expr(oid,text,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_groups_cte_expr(oid,text,text,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_keyset_condition_expr(jsonb,text,boolean)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_keyset_order_by_expr(jsonb,boolean)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_keyset_where_clause(jsonb,text,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_materialized_exploration_query(regclass,integer,integer)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_record_list_query_components_with_ctes(oid,integer,integer,jsonb,jsonb,jsonb,jsonb,text,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_record_summary_index(oid,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.build_table_export_query(oid,integer,integer,jsonb,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.bump_catalog_version()', 'FUNCTION', NULL),
+  ('msar', 'msar.can_read_materialized_exploration(jsonb,oid)', 'FUNCTION', NULL),
+  ('msar', 'msar.catalog_version', 'TABLE', NULL),
+  ('msar', 'msar.catalog_version', 'TYPE', NULL),
+  ('msar', 'msar.count_records_from_table(oid,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.create_record_summary_index(oid,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.decode_record_cursor(text)', 'FUNCTION', NULL),
+  ('msar', 'msar.drop_materialized_exploration(oid)', 'FUNCTION', NULL),
+  ('msar', 'msar.drop_record_summary_index(oid)', 'FUNCTION', NULL),
+  ('msar', 'msar.encode_record_cursor(jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.estimate_record_count(oid,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_cached_sql_fragments(oid,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_cached_sql_fragments(oid,jsonb,bigint)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_cached_sql_fragments(oid,jsonb,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_catalog_fingerprint(oid)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_catalog_version()', 'FUNCTION', NULL),
+  ('msar', 'msar.get_exploration_function_template(text)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_exploration_keyset(jsonb,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_exploration_query_types(text,text[])', 'FUNCTION', NULL),
+  ('msar', 'msar.get_joined_columns_expr_json(jsonb,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_record_keyset(oid,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_record_list_fragments(oid,jsonb,jsonb,jsonb,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_record_summaries_by_keys(oid,jsonb,boolean,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_record_summary_fragments(oid,jsonb,jsonb,boolean,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_record_summary_index(oid,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_sql_fragment_cache_key(jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_tables_modification_token(oid[])', 'FUNCTION', NULL),
+  ('msar', 'msar.get_total_order_spec(oid,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.get_typmodless_type_name(regtype)', 'FUNCTION', NULL),
+  ('msar', 'msar.increment_catalog_version()', 'FUNCTION', NULL),
   ('msar', 'msar.insert_from_select(regclass,regclass,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_insert_lookup_table(jsonb,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.build_join_expr(jsonb)', 'FUNCTION', NULL),
@@ -1141,7 +1191,6 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.get_selectable_pkey_attnum(regclass)', 'FUNCTION', NULL),
   ('msar', 'msar.get_table(regclass)', 'FUNCTION', NULL),
   ('msar', 'msar.get_tab_col_info_map(jsonb)', 'FUNCTION', NULL),
-  ('msar', 'msar.get_table_columns_and_records(oid,integer,integer,jsonb,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.get_table_info(regnamespace)', 'FUNCTION', NULL),
   ('msar', 'msar.get_total_order(oid)', 'FUNCTION', NULL),
   ('msar', 'msar.get_type_options(regtype,integer,integer)', 'FUNCTION', NULL),
@@ -1152,6 +1201,7 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.infer_column_data_type(regclass,smallint)', 'FUNCTION', NULL),
   ('msar', 'msar.infer_column_data_type(regclass,smallint,numeric)', 'FUNCTION', NULL),
   ('msar', 'msar.infer_table_column_data_types(regclass)', 'FUNCTION', NULL),
+  ('msar', 'msar.insert_from_staging_tables(bigint[],regclass,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.is_default_possibly_dynamic(oid,integer)', 'FUNCTION', NULL),
   ('msar', 'msar.is_mathesar_id_column(oid,integer)', 'FUNCTION', NULL),
   ('msar', 'msar.is_pkey_col(oid,integer)', 'FUNCTION', NULL),
@@ -1165,18 +1215,22 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.list_records_from_table(oid,integer,integer,jsonb,jsonb,jsonb,boolean)', 'FUNCTION', NULL),
   ('msar', 'msar.list_records_from_table(oid,integer,integer,jsonb,jsonb,jsonb,boolean,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.list_records_from_table(oid,integer,integer,jsonb,jsonb,jsonb,jsonb,boolean,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.list_records_from_table(oid,integer,integer,jsonb,jsonb,jsonb,jsonb,boolean,jsonb,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.list_records_from_table(oid,integer,integer,jsonb,jsonb,jsonb,jsonb,boolean,jsonb,text,text,text,boolean)', 'FUNCTION', NULL),
   ('msar', 'msar.list_roles()', 'FUNCTION', NULL),
   ('msar', 'msar.list_schema_privileges(regnamespace)', 'FUNCTION', NULL),
   ('msar', 'msar.list_schema_privileges_for_current_role(regnamespace)', 'FUNCTION', NULL),
   ('msar', 'msar.list_schemas()', 'FUNCTION', NULL),
   ('msar', 'msar.list_table_privileges(regclass)', 'FUNCTION', NULL),
   ('msar', 'msar.list_table_privileges_for_current_role(regclass)', 'FUNCTION', NULL),
+  ('msar', 'msar.materialize_exploration(jsonb,oid,text)', 'FUNCTION', NULL),
   ('msar', 'msar.mathesar_system_schemas()', 'FUNCTION', NULL),
   ('msar', 'msar.month_to_degrees(date)', 'FUNCTION', NULL),
   ('msar', 'msar.move_columns_to_referenced_table(regclass,regclass,smallint[])', 'FUNCTION', NULL),
   ('msar', 'msar.obj_description(oid,text)', 'FUNCTION', NULL),
   ('msar', 'msar.patch_record_in_table(oid,anycompatible,jsonb,boolean)', 'FUNCTION', NULL),
   ('msar', 'msar.patch_record_in_table(oid,anycompatible,jsonb,boolean,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.patch_records_in_table(oid,jsonb,boolean,boolean,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.patch_schema(oid,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.patch_schema(text,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.peak_month(date)', 'AGGREGATE', NULL),
@@ -1184,6 +1238,9 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.pkey_kind', 'TYPE', NULL),
   ('msar', 'msar.point_to_month(point)', 'FUNCTION', NULL),
   ('msar', 'msar.point_to_time(point)', 'FUNCTION', NULL),
+  ('msar', 'msar.prepare_columns_for_import(regclass,smallint[])', 'FUNCTION', NULL),
+  ('msar', 'msar.prepare_staging_tables_for_import(integer,integer)', 'FUNCTION', NULL),
+  ('msar', 'msar.prepare_staging_tables_for_import(oid,integer,integer)', 'FUNCTION', NULL),
   ('msar', 'msar.prepare_table_for_import(oid,text,jsonb,boolean,text,text,text,text,text)', 'FUNCTION', NULL),
   ('msar', 'msar.prepare_table_for_import(oid,text,text[],text)', 'FUNCTION', NULL),
   ('msar', 'msar.prepare_temp_table_for_import(text,text[])', 'FUNCTION', NULL),
@@ -1191,24 +1248,33 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.process_col_def_jsonb(oid,jsonb,boolean,boolean)', 'FUNCTION', NULL),
   ('msar', 'msar.process_con_def_jsonb(oid,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.raise_exception(text)', 'FUNCTION', NULL),
+  ('msar', 'msar.record_summary_index_is_manageable(oid)', 'FUNCTION', NULL),
+  ('msar', 'msar.refresh_materialized_exploration(regclass)', 'FUNCTION', NULL),
   ('msar', 'msar.rename_column(oid,integer,text)', 'FUNCTION', NULL),
   ('msar', 'msar.rename_schema(oid,text)', 'FUNCTION', NULL),
   ('msar', 'msar.rename_schema(text,text)', 'FUNCTION', NULL),
   ('msar', 'msar.rename_table(oid,text)', 'FUNCTION', NULL),
   ('msar', 'msar.rename_table(text,text,text)', 'FUNCTION', NULL),
   ('msar', 'msar.replace_database_privileges_for_roles(jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.replace_materialized_exploration(jsonb,oid,oid,text)', 'FUNCTION', NULL),
   ('msar', 'msar.replace_schema_privileges_for_roles(regnamespace,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.replace_table_privileges_for_roles(regclass,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.retype_column(regclass,smallint,text)', 'FUNCTION', NULL),
   ('msar', 'msar.retype_column(regclass,smallint,text,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.reset_mash(regclass,smallint,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.role_info_table()', 'FUNCTION', NULL),
+  ('msar', 'msar.run_exploration(jsonb,integer,integer,text,text,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.run_materialized_exploration(jsonb,regclass,integer,integer,text)', 'FUNCTION', NULL),
   ('msar', 'msar.sanitize_direction(text)', 'FUNCTION', NULL),
   ('msar', 'msar.schema_exists(text)', 'FUNCTION', NULL),
   ('msar', 'msar.schema_info_table()', 'FUNCTION', NULL),
   ('msar', 'msar.search_records_from_table(oid,jsonb,integer,boolean)', 'FUNCTION', NULL),
   ('msar', 'msar.search_records_from_table(oid,jsonb,integer,boolean,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.search_records_from_table(oid,jsonb,integer,integer,boolean,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.search_records_from_table(oid,jsonb,integer,integer,boolean,jsonb,text,text,boolean)', 'FUNCTION', NULL),
+  ('msar', 'msar.set_cached_sql_fragments(oid,jsonb,bigint,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.set_cached_sql_fragments(oid,jsonb,jsonb)', 'FUNCTION', NULL),
+  ('msar', 'msar.set_cached_sql_fragments(oid,jsonb,text,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.set_col_default(regclass,smallint,text)', 'FUNCTION', NULL),
   ('msar', 'msar.set_members_to_role(regrole,oid[])', 'FUNCTION', NULL),
   ('msar', 'msar.set_not_null(regclass,smallint,boolean)', 'FUNCTION', NULL),
@@ -1216,6 +1282,10 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.set_old_col_default(regclass,smallint,text,text,boolean,jsonb)', 'FUNCTION', NULL),
   ('msar', 'msar.set_pkey_column(regclass,integer,msar.pkey_kind,boolean)', 'FUNCTION', NULL),
   ('msar', 'msar.set_schema_description(oid,text)', 'FUNCTION', NULL),
+  ('msar', 'msar.split_expr_literals(jsonb,text[])', 'FUNCTION', NULL),
+  ('msar', 'msar.sql_fragment_cache', 'TABLE', NULL),
+  ('msar', 'msar.sql_fragment_cache', 'TYPE', NULL),
+  ('msar', 'msar.sync_record_summary_index_privileges(oid)', 'FUNCTION', NULL),
   ('msar', 'msar.table_info_table()', 'FUNCTION', NULL),
   ('msar', 'msar.time_to_degrees(time without time zone)', 'FUNCTION', NULL),
   ('msar', 'msar.top_level_domains', 'TABLE', NULL),
@@ -1231,7 +1301,8 @@ INSERT INTO msar.all_mathesar_objects VALUES
   ('msar', 'msar.uri_parts(text)', 'FUNCTION', NULL),
   ('msar', 'msar.uri_path(text)', 'FUNCTION', NULL),
   ('msar', 'msar.uri_query(text)', 'FUNCTION', NULL),
-  ('msar', 'msar.uri_scheme(text)', 'FUNCTION', NULL);
+  ('msar', 'msar.uri_scheme(text)', 'FUNCTION', NULL),
+  ('msar', 'msar_bump_catalog_version', 'EVENT TRIGGER', NULL);
 
 
 --
@@ -6,6 +6,11 @@ SELECT msar.drop_all_msar_objects(
 
 CREATE SCHEMA IF NOT EXISTS __msar;
 CREATE SCHEMA IF NOT EXISTS msar;
+-- Holds record summary indexes. It isn't dropped above, so the indexes survive upgrades.
+CREATE SCHEMA IF NOT EXISTS msar_record_summaries;
+-- Holds the staging tables of imports in progress. It isn't dropped above, so those imports survive
+-- upgrades.
+CREATE SCHEMA IF NOT EXISTS msar_import_staging;
 
 ----------------------------------------------------------------------------------------------------
 ----------------------------------------------------------------------------------------------------
@@ -21,7 +26,7 @@ Return a text array of the Mathesar System schemas.
 
 Update this function whenever the list changes.
 */
-SELECT ARRAY['msar', '__msar', 'mathesar_types']
+SELECT ARRAY['msar', '__msar', 'mathesar_types', 'msar_record_summaries', 'msar_import_staging']
 $$ LANGUAGE SQL STABLE;
 
 
@@ -1412,6 +1417,8 @@ BEGIN
     msar.build_grant_membership_expr(parent_rol_id, members)
   );
   EXECUTE set_members_expr;
+  -- Memberships aren't subject to event triggers, so invalidate the SQL fragment cache here.
+  PERFORM msar.increment_catalog_version();
   -- Return the updated parent_role info including membership details.
   RETURN msar.get_role(parent_role_name);
 END;
@@ -1723,6 +1730,7 @@ EXECUTE string_agg(
   E';\n'
 ) || ';'
 FROM jsonb_to_recordset(priv_spec) AS x(role_oid regrole, direct jsonb);
+PERFORM msar.sync_record_summary_index_privileges(tab_id);
 RETURN msar.list_table_privileges(tab_id);
 END;
 $$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
@@ -3102,6 +3110,7 @@ Args:
 DECLARE relation_name text;
 BEGIN
   relation_name := __msar.get_qualified_relation_name_or_null(tab_id);
+  PERFORM msar.drop_record_summary_index(tab_id);
   -- if_exists doesn't work while working with oids because
   -- the SQL query gets parameterized with tab_id instead of relation_name
   -- since we're unable to find the relation_name for a non existing table.
@@ -3321,11 +3330,14 @@ statement to carry out `COPY FROM`, table_oid & table_name of the created table.
 Each returned JSON object will have the form:
   {
     "copy_sql": <str>,
+    "copy_columns": [<str>, <str>, ...],
     "table_oid": <int>,
     "table_name": <str>,
     "renamed_columns": <arr>
   }
 
+The "copy_columns" are the (unquoted) names of the columns listed in "copy_sql", in order.
+
 Args:
   sch_id: The OID of the schema where the table will be created.
   tab_name (optional): The unquoted name for the new table.
@@ -3339,6 +3351,7 @@ DECLARE
   mathesar_table json;
   rel_id oid;
   col_names_sql text;
+  copy_columns jsonb;
   copy_sql text;
 BEGIN
   -- Build column definition jsonb
@@ -3353,13 +3366,15 @@ BEGIN
   ON pgc.relnamespace = pgn.oid
   WHERE pgc.oid = rel_id;
   -- Aggregate TEXT type column names of the created table
-  SELECT string_agg(quote_ident(attname), ', ') INTO col_names_sql
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum), jsonb_agg(attname ORDER BY attnum)
+  INTO col_names_sql, copy_columns
   FROM pg_catalog.pg_attribute
   WHERE attrelid = rel_id AND atttypid = 'TEXT'::regtype::oid;
   -- Create a properly formatted COPY SQL string
   copy_sql := format('COPY %I.%I (%s) FROM STDIN', sch_name, rel_name, col_names_sql);
   RETURN jsonb_build_object(
     'copy_sql', copy_sql,
+    'copy_columns', COALESCE(copy_columns, '[]'::jsonb),
     'table_oid', rel_id::bigint,
     'table_name', relname,
     'renamed_columns', mathesar_table -> 'renamed_columns',
@@ -3380,9 +3395,12 @@ statement to carry out `COPY FROM`, table_oid of the created temp table.
 Each returned JSON object will have the form:
   {
     "copy_sql": <str>,
+    "copy_columns": [<str>, <str>, ...],
     "table_oid": <int>
   }
 
+The "copy_columns" are the (unquoted) names of the columns listed in "copy_sql", in order.
+
 Args:
   tab_name (optional): The unquoted name for the new temp table.
   col_defs: The columns for the new table, in order.
@@ -3396,6 +3414,7 @@ DECLARE
   sch_name text;
   rel_id bigint;
   col_names_sql text;
+  copy_columns jsonb;
   copy_sql text;
 BEGIN
   -- Passing 'id' as column name gets filtered out by __msar.process_col_def_jsonb,
@@ -3428,7 +3447,8 @@ BEGIN
   WHERE pgc.relname = uq_tab_name AND pgc.relpersistence = 't';
 
   -- Aggregate TEXT type column names of the created table
-  SELECT string_agg(quote_ident(attname), ', ') INTO col_names_sql
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum), jsonb_agg(attname ORDER BY attnum)
+  INTO col_names_sql, copy_columns
   FROM pg_catalog.pg_attribute
   WHERE attrelid = rel_id AND atttypid = 'TEXT'::regtype::oid;
 
@@ -3437,6 +3457,7 @@ BEGIN
 
   RETURN jsonb_build_object(
     'copy_sql', copy_sql,
+    'copy_columns', COALESCE(copy_columns, '[]'::jsonb),
     'table_oid', rel_id::bigint
   ) FROM pg_catalog.pg_class WHERE oid = rel_id;
 END;
@@ -3529,6 +3550,163 @@ END;
 $$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.prepare_columns_for_import(tab_id regclass, col_ids smallint[]) RETURNS jsonb AS $$/*
+Return a JSON object containing a properly formatted SQL statement to carry out `COPY FROM` directly
+into the given columns of an existing table, or NULL if that wouldn't import text as
+msar.insert_from_select does.
+
+The returned JSON object will have the form:
+  {
+    "copy_sql": <str>,
+    "copy_columns": [<str>, <str>, ...]
+  }
+
+COPY parses values with the input functions of the columns' types, whereas msar.insert_from_select
+uses Mathesar's (more lenient) casts from text. These only agree for textual types, so NULL is
+returned if any of the columns has another type. In that case, import into a temp table (see
+msar.prepare_temp_table_for_import) and use msar.insert_from_select instead.
+
+Args:
+  tab_id: The OID of the table.
+  col_ids: The attnums of the columns, in the order of the values to be copied.
+*/
+SELECT jsonb_build_object(
+  'copy_sql', format(
+    'COPY %I.%I (%s) FROM STDIN',
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    string_agg(quote_ident(attname), ', ' ORDER BY ord)
+  ),
+  'copy_columns', jsonb_agg(attname ORDER BY ord)
+)
+FROM unnest(col_ids) WITH ORDINALITY AS x(col_id, ord)
+LEFT JOIN pg_catalog.pg_attribute ON attrelid = tab_id AND attnum = col_id AND NOT attisdropped
+HAVING count(*) > 0 AND bool_and(
+  atttypid IS NOT NULL
+  AND atttypid IN (
+    'text'::regtype::oid, 'character varying'::regtype::oid, 'character'::regtype::oid
+  )
+);
+$$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.prepare_staging_tables_for_import(
+  col_count integer,
+  tab_count integer
+) RETURNS jsonb AS $$/*
+Add UNLOGGED tables of TEXT columns, to be filled concurrently by separate connections during an
+import, returning a JSON array with an object per table containing a properly formatted SQL
+statement to carry out `COPY FROM`.
+
+The tables are added to the msar_import_staging schema, so that they aren't listed with the user's
+tables. Tables left there for more than a day by the current role (e.g., because the process running
+an import died) are dropped first.
+
+Each object in the returned array will have the form:
+  {
+    "copy_sql": <str>,
+    "copy_columns": [<str>, <str>, ...],
+    "table_oid": <int>
+  }
+
+The tables are meant to be emptied into their destination by msar.insert_from_staging_tables. Since
+the connections filling them need to see them, they must be committed before being filled.
+
+Args:
+  col_count: The number of columns of each table.
+  tab_count: The number of tables.
+*/
+DECLARE
+  -- The creation time is part of the name, so that stale tables can be found.
+  prefix text := format(
+    'import_%s_%s_', extract(epoch FROM now())::bigint, substr(md5(random()::text), 1, 12)
+  );
+  col_names text[];
+  tables jsonb := '[]'::jsonb;
+  fq_table_name text;
+  stale_tab_id oid;
+BEGIN
+  FOR stale_tab_id IN
+    SELECT pgc.oid FROM pg_catalog.pg_class AS pgc
+    WHERE
+      pgc.relnamespace = 'msar_import_staging'::regnamespace
+      AND pgc.relkind = 'r'
+      AND pg_catalog.pg_has_role(pgc.relowner, 'MEMBER')
+      AND to_timestamp(substring(pgc.relname FROM '^import_(\d+)_')::bigint)
+        < now() - interval '1 day'
+  LOOP
+    EXECUTE format('DROP TABLE IF EXISTS %s', stale_tab_id::regclass);
+  END LOOP;
+  col_names := array_agg(format('column_%s', i) ORDER BY i) FROM generate_series(1, col_count) AS i;
+  FOR i IN 1..tab_count LOOP
+    fq_table_name := format('msar_import_staging.%I', prefix || i);
+    EXECUTE format(
+      'CREATE UNLOGGED TABLE %s (%s)',
+      fq_table_name,
+      (SELECT string_agg(format('%I text', n), ', ') FROM unnest(col_names) AS x(n))
+    );
+    tables := tables || jsonb_build_object(
+      'copy_sql', format(
+        'COPY %s (%s) FROM STDIN',
+        fq_table_name,
+        (SELECT string_agg(quote_ident(n), ', ') FROM unnest(col_names) AS x(n))
+      ),
+      'copy_columns', to_jsonb(col_names),
+      'table_oid', fq_table_name::regclass::oid::bigint
+    );
+  END LOOP;
+  RETURN tables;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.insert_from_staging_tables(
+  src_tab_ids bigint[],
+  dst_tab_id regclass,
+  mappings jsonb
+) RETURNS bigint AS $$/*
+Move the records of staging tables into a destination table, in order, then drop the staging tables,
+returning the number of records moved.
+
+Within each staging table, records are moved in the order they were written, so an import split
+across staging tables keeps the order of the imported file (and of any ids generated for it).
+
+Args:
+  src_tab_ids: The OIDs of the staging tables (see msar.prepare_staging_tables_for_import).
+  dst_tab_id: The OID of the destination/target table.
+  mappings: The column mappings b/w the staging tables and the destination table, as for
+    msar.insert_from_select. If NULL, the columns of the staging tables are mapped in order onto
+    the TEXT columns of the destination table, as for a table from msar.prepare_table_for_import.
+*/
+DECLARE
+  src_tab_id oid;
+  insert_count bigint := 0;
+BEGIN
+  -- Read each staging table from its start, so the records come in insertion order.
+  PERFORM set_config('synchronize_seqscans', 'off', true);
+  IF mappings IS NULL THEN
+    SELECT jsonb_agg(
+      jsonb_build_object('src_table_attnum', src_attnum, 'dst_table_attnum', attnum)
+      ORDER BY attnum
+    ) INTO mappings
+    FROM (
+      SELECT attnum, row_number() OVER (ORDER BY attnum) AS src_attnum
+      FROM pg_catalog.pg_attribute
+      WHERE attrelid = dst_tab_id AND atttypid = 'TEXT'::regtype::oid AND NOT attisdropped
+    ) AS dst_cols;
+  END IF;
+  FOREACH src_tab_id IN ARRAY src_tab_ids LOOP
+    insert_count := insert_count + msar.insert_from_select(src_tab_id, dst_tab_id, mappings);
+    EXECUTE format('DROP TABLE %s', src_tab_id::regclass);
+  END LOOP;
+  RETURN insert_count;
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION
 msar.get_preview(
   tab_id oid,
@@ -4581,21 +4759,51 @@ $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
 CREATE OR REPLACE FUNCTION
-msar.build_total_order_expr(tab_id oid, order_ jsonb) RETURNS text AS $$/*
-Build a deterministic order expression for the given table and order JSON.
+msar.get_total_order_spec(tab_id oid, order_ jsonb) RETURNS jsonb AS $$/*
+Return the deterministic ordering for the given table and order JSON as a JSONB array.
+
+The given ordering is extended by the primary key columns (or all orderable columns if there is no
+primary key), and restricted to columns the user can select. Each element has the form
+  {"attnum": <int>, "direction": "ASC" | "DESC", "not_null": <bool>}
+
 Args:
   tab_id: The OID of the table whose columns we'll order by.
   order_: A JSONB array defining any desired ordering of columns.
 */
-SELECT string_agg(format('%I %s', attnum, msar.sanitize_direction(direction)), ', ')
-FROM jsonb_to_recordset(
+SELECT COALESCE(
+  jsonb_agg(
+    jsonb_build_object(
+      'attnum', x.attnum,
+      'direction', COALESCE(msar.sanitize_direction(x.direction), 'ASC'),
+      'not_null', pga.attnotnull
+    ) ORDER BY x.ordinality
+  ),
+  '[]'::jsonb
+)
+FROM ROWS FROM (
+  jsonb_to_recordset(
     COALESCE(
       COALESCE(order_, '[]'::jsonb) || msar.get_pkey_order(tab_id),
       COALESCE(order_, '[]'::jsonb) || msar.get_total_order(tab_id)
     )
-)
-  AS x(attnum smallint, direction text)
-WHERE has_column_privilege(tab_id, attnum, 'SELECT');
+  ) AS (attnum smallint, direction text)
+) WITH ORDINALITY AS x(attnum, direction, ordinality)
+  INNER JOIN pg_catalog.pg_attribute AS pga ON pga.attrelid = tab_id AND pga.attnum = x.attnum
+WHERE has_column_privilege(tab_id, x.attnum, 'SELECT');
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_total_order_expr(tab_id oid, order_ jsonb) RETURNS text AS $$/*
+Build a deterministic order expression for the given table and order JSON.
+Args:
+  tab_id: The OID of the table whose columns we'll order by.
+  order_: A JSONB array defining any desired ordering of columns.
+*/
+SELECT string_agg(format('%I %s', attnum, direction), ', ' ORDER BY ordinality)
+FROM ROWS FROM (
+  jsonb_to_recordset(msar.get_total_order_spec(tab_id, order_)) AS (attnum smallint, direction text)
+) WITH ORDINALITY AS x(attnum, direction, ordinality);
 $$ LANGUAGE SQL STABLE;
 
 
@@ -4616,6 +4824,224 @@ SELECT 'ORDER BY ' || msar.build_total_order_expr(tab_id, order_)
 $$ LANGUAGE SQL STABLE;
 
 
+----------------------------------------------------------------------------------------------------
+-- Keyset pagination
+--
+-- A "keyset" is a JSONB array describing a deterministic ordering of a set of query results, with
+-- elements of the form
+--   {"name": <output column name>, "direction": "ASC" | "DESC", "not_null": <bool>}
+--
+-- A cursor is an opaque (base64 encoded) JSONB array of the text values of the keyset columns for
+-- some row. Given a cursor, we can select the rows strictly after (or before) that row with a
+-- condition on the keyset columns, rather than counting through all preceding rows via OFFSET.
+----------------------------------------------------------------------------------------------------
+
+
+CREATE OR REPLACE FUNCTION msar.get_record_keyset(tab_id oid, order_ jsonb) RETURNS jsonb AS $$/*
+Return the keyset for listing the records of a table according to the given order JSON.
+
+The output column names are the attnums, matching `msar.build_selectable_column_expr`.
+
+Args:
+  tab_id: The OID of the table whose records we'll list.
+  order_: A JSONB array defining any desired ordering of columns.
+*/
+SELECT COALESCE(
+  jsonb_agg(
+    jsonb_build_object('name', x.attnum::text, 'direction', x.direction, 'not_null', x.not_null)
+    ORDER BY x.ordinality
+  ),
+  '[]'::jsonb
+)
+FROM ROWS FROM (
+  jsonb_to_recordset(
+    msar.get_total_order_spec(tab_id, order_)
+  ) AS (attnum smallint, direction text, not_null boolean)
+) WITH ORDINALITY AS x(attnum, direction, not_null, ordinality);
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION msar.encode_record_cursor(vals jsonb) RETURNS text AS $$/*
+Encode a JSONB array of keyset values as an opaque cursor string.
+*/
+SELECT translate(encode(convert_to(vals::text, 'UTF8'), 'base64'), E'\n', '');
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.decode_record_cursor(cursor_ text) RETURNS jsonb AS $$/*
+Decode a cursor string produced by `msar.encode_record_cursor`.
+*/
+SELECT convert_from(decode(cursor_, 'base64'), 'UTF8')::jsonb;
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_cursor_expr(keyset jsonb, cte_name text) RETURNS text AS $$/*
+Build an expression producing the cursor of a row of the given CTE (or table).
+
+Args:
+  keyset: The keyset of the ordering; see above.
+  cte_name: The name of the CTE whose rows we're producing cursors for.
+*/
+SELECT format(
+  'msar.encode_record_cursor(jsonb_build_array(%s))',
+  string_agg(format('%I.%I::text', cte_name, x.name), ', ' ORDER BY x.ordinality)
+)
+FROM ROWS FROM (
+  jsonb_to_recordset(keyset) AS (name text)
+) WITH ORDINALITY AS x(name, ordinality);
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_keyset_order_by_expr(keyset jsonb, reverse_ boolean) RETURNS text AS $$/*
+Build an ORDER BY expression for the keyset, optionally reversing all directions.
+
+Note that reversing ASC (which puts NULLs last by default) gives DESC (which puts NULLs first by
+default), so the reversed ordering is exactly the original ordering, backwards.
+*/
+SELECT 'ORDER BY ' || string_agg(
+  format(
+    '%I %s',
+    x.name,
+    CASE WHEN reverse_ THEN
+      CASE x.direction WHEN 'DESC' THEN 'ASC' ELSE 'DESC' END
+    ELSE x.direction END
+  ),
+  ', ' ORDER BY x.ordinality
+)
+FROM ROWS FROM (
+  jsonb_to_recordset(keyset) AS (name text, direction text)
+) WITH ORDINALITY AS x(name, direction, ordinality);
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_keyset_condition_expr(keyset jsonb, cursor_ text, before_ boolean) RETURNS text AS $$/*
+Build a condition selecting the rows strictly after (or before) the row identified by a cursor.
+
+NULLs are treated as larger than all other values, matching PostgreSQL's default ordering (NULLS
+LAST for ASC, NULLS FIRST for DESC). When every keyset column is NOT NULL, all directions are the
+same, and no cursor value is NULL, we produce a single row-value comparison, e.g.,
+  ("2", "1") > ('abc', '42')
+which can be served by an index on the underlying columns. Otherwise, we produce the equivalent
+expanded form, e.g.,
+  ("2" > 'abc' OR "2" IS NULL) OR ("2" = 'abc' AND "1" > '42')
+
+Cursor values are untyped literals, so they're resolved to the type of the column they're compared
+against.
+
+Args:
+  keyset: The keyset of the ordering; see above.
+  cursor_: A cursor produced for the same keyset by `msar.build_cursor_expr`.
+  before_: Whether to select rows before, rather than after, the cursor row.
+*/
+DECLARE
+  cursor_vals jsonb := msar.decode_record_cursor(cursor_);
+  condition text;
+BEGIN
+  IF cursor_ IS NULL THEN
+    RETURN NULL;
+  END IF;
+  IF jsonb_typeof(cursor_vals) <> 'array'
+    OR jsonb_array_length(cursor_vals) <> jsonb_array_length(keyset)
+  THEN
+    RAISE EXCEPTION 'The cursor does not match the ordering of the records.'
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+  WITH keys_cte AS (
+    SELECT
+      x.ordinality,
+      quote_ident(x.name) AS col,
+      v.val,
+      x.not_null,
+      -- Whether we want rows with lesser values than the cursor for this column.
+      (x.direction = 'DESC') <> before_ AS want_lesser
+    FROM ROWS FROM (
+      jsonb_to_recordset(keyset) AS (name text, direction text, not_null boolean)
+    ) WITH ORDINALITY AS x(name, direction, not_null, ordinality)
+    INNER JOIN ROWS FROM (
+      jsonb_array_elements_text(cursor_vals)
+    ) WITH ORDINALITY AS v(val, ordinality) USING (ordinality)
+  ), terms_cte AS (
+    SELECT
+      ordinality,
+      CASE
+        WHEN want_lesser AND val IS NULL THEN format('%s IS NOT NULL', col)
+        WHEN want_lesser THEN format('%s < %L', col, val)
+        WHEN val IS NULL THEN 'false'
+        WHEN not_null THEN format('%s > %L', col, val)
+        ELSE format('(%s > %L OR %s IS NULL)', col, val, col)
+      END AS strict_term,
+      CASE WHEN val IS NULL THEN format('%s IS NULL', col) ELSE format('%s = %L', col, val) END
+        AS eq_term
+    FROM keys_cte
+  ), prefixed_terms_cte AS (
+    SELECT
+      ordinality,
+      strict_term,
+      string_agg(eq_term, ' AND ') OVER (
+        ORDER BY ordinality ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+      ) AS eq_prefix
+    FROM terms_cte
+  )
+  SELECT
+    CASE WHEN bool_and(k.not_null AND k.val IS NOT NULL) AND count(DISTINCT k.want_lesser) = 1
+    THEN format(
+      '(%s) %s (%s)',
+      string_agg(k.col, ', ' ORDER BY k.ordinality),
+      CASE WHEN bool_and(k.want_lesser) THEN '<' ELSE '>' END,
+      string_agg(quote_literal(k.val), ', ' ORDER BY k.ordinality)
+    )
+    ELSE (
+      SELECT string_agg(
+        '(' || concat_ws(' AND ', p.eq_prefix, p.strict_term) || ')', ' OR ' ORDER BY p.ordinality
+      )
+      FROM prefixed_terms_cte AS p
+    )
+    END
+  INTO condition
+  FROM keys_cte AS k;
+  RETURN COALESCE(condition, 'false');
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_keyset_where_clause(keyset jsonb, after_ text, before_ text) RETURNS text AS $$/*
+Build a WHERE clause selecting the rows between the `after_` and `before_` cursors (exclusive).
+
+Either cursor may be NULL. If both are NULL, the result is NULL.
+*/
+SELECT 'WHERE ' || NULLIF(
+  concat_ws(
+    ' AND ',
+    '(' || msar.build_keyset_condition_expr(keyset, after_, false) || ')',
+    '(' || msar.build_keyset_condition_expr(keyset, before_, true) || ')'
+  ),
+  ''
+);
+$$ LANGUAGE SQL IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_cursors_expr(keyset jsonb, cte_name text, order_by_expr text) RETURNS text AS $$/*
+Build an aggregate expression returning the cursors of the first and last rows of a CTE.
+
+The result has the form {"first": <cursor>, "last": <cursor>}. Pass "last" as the `after_` cursor
+to get the next page, and "first" as the `before_` cursor to get the previous page.
+*/
+SELECT format(
+  $c$jsonb_build_object(
+    'first', (jsonb_agg(%1$s %2$s) ->> 0),
+    'last', (jsonb_agg(%1$s %2$s) ->> -1)
+  )$c$,
+  msar.build_cursor_expr(keyset, cte_name),
+  order_by_expr
+);
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT;
+
+
 CREATE OR REPLACE FUNCTION
 msar.build_grouping_columns_expr(tab_id oid, group_ jsonb) RETURNS TEXT AS $$/*
 Build a column expression for use in grouping window functions.
@@ -5294,107 +5720,543 @@ END;
 $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
-CREATE OR REPLACE FUNCTION msar.build_record_list_query_components_with_ctes(
-  tab_id oid,
-  limit_ integer,
-  offset_ integer,
-  order_ jsonb,
-  filter_ jsonb,
-  group_ jsonb,
-  joined_columns jsonb
-) RETURNS jsonb AS $$/*
-  Constructs the components necessary for generating enriched query results,
-  including expressions, clauses, selectable_column list, and CTEs, for a table.
+----------------------------------------------------------------------------------------------------
+-- SQL fragment cache
+--
+-- Generating the SQL for listing records involves many catalog lookups (column names, types,
+-- privileges, constraints, casts, etc.), which are repeated for every page of a table. The SQL
+-- fragments that depend only on the catalog and on the "shape" of a request (i.e., the order,
+-- grouping, etc., and the structure of the filter, but not its literal values, the limit, offset,
+-- or cursors) are cached in msar.sql_fragment_cache, keyed by table, role, and shape.
+--
+-- Cache entries are tagged with the catalog version (see msar.get_catalog_version) at the time they
+-- were built. An event trigger increments that version at the end of every DDL command in the
+-- database (including GRANT and REVOKE, and changes to types and casts), so that any change to the
+-- catalog invalidates the whole cache. The version is taken before the fragments are built, and is
+-- updated transactionally, so an entry can't be tagged with a new version while being built from
+-- the old catalog.
+--
+-- The version is the sum of one counter per backend, and each DDL command only updates the counter
+-- of its own backend. DDL in concurrent transactions therefore never waits on the same row.
+--
+-- Role memberships aren't subject to event triggers. msar.set_members_to_role increments the
+-- version itself; memberships changed otherwise are only picked up by the cache after the next DDL
+-- command.
+--
+-- Creating an event trigger requires superuser privileges. When Mathesar is installed by another
+-- role, there is no event trigger, no catalog version, and hence no caching.
+----------------------------------------------------------------------------------------------------
 
-  Args:
-    tab_id: The OID of the table whose records we'll get
-    limit_: The maximum number of rows we'll return
-    offset_: The number of rows to skip before returning records from following rows
-    order_: An array of ordering definition objects
-    filter_: An array of filter definition objects
-    group_: An array of group definition objects
-    joined_columns: (optional) A jsonb list defining columns joined via a simple many-to-many linkage.
-      See msar.get_joined_columns_expr_json for more details.
 
-  Behavior:
-    Fetches metadata about the table (selectable_column list, schema name, table name etc.,)
-    Constructs expressions and SQL snippets (SELECT, WHERE, GROUP BY, etc.,)
-    Generates two SQL queries:
-      1. A query for paginated results (`results_cte_query`).
-      2. A query to count the total matching rows (`count_cte_query`).
-    Returns a jsonb object combining metadata, the expressions, and the generated SQL queries.
+CREATE TABLE msar.catalog_version (
+  backend_pid integer PRIMARY KEY,
+  version bigint NOT NULL
+);
+
+
+CREATE UNLOGGED TABLE msar.sql_fragment_cache (
+  role_name name NOT NULL DEFAULT current_user,
+  tab_id oid NOT NULL,
+  cache_key text NOT NULL,
+  catalog_version bigint NOT NULL,
+  fragments jsonb NOT NULL,
+  cached_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (role_name, tab_id, cache_key)
+);
+-- Each role may only see and write its own entries, so that no role can plant SQL to be run by
+-- another.
+ALTER TABLE msar.sql_fragment_cache ENABLE ROW LEVEL SECURITY;
+CREATE POLICY own_entries ON msar.sql_fragment_cache
+  USING (role_name = current_user) WITH CHECK (role_name = current_user);
+
+
+CREATE OR REPLACE FUNCTION msar.get_catalog_version() RETURNS bigint AS $$/*
+Return the current catalog version, or NULL if the SQL fragment cache is disabled.
 */
-DECLARE
-  expr_object jsonb;
-  joinable_expr_object jsonb;
-  results_cte_query text;
-  count_cte_query text;
-BEGIN
-  SELECT jsonb_build_object(
-    'relation_name', msar.get_relation_name(tab_id),
-    'relation_schema_name', msar.get_relation_schema_name(tab_id),
-    'selectable_columns_expr', msar.build_selectable_column_expr(tab_id),
-    'grouping_expr', msar.build_grouping_expr(tab_id, group_),
-    'order_by_expr', msar.build_order_by_expr(tab_id, order_),
-    'where_clause', msar.build_where_clause(tab_id, filter_)
-  ) INTO expr_object;
-
-  joinable_expr_object :=
-    CASE
-      WHEN joined_columns IS NOT NULL THEN
-        msar.get_joined_columns_expr_json(joined_columns)
-      ELSE NULL
-    END;
+SELECT sum(cv.version)::bigint FROM msar.catalog_version AS cv;
+$$ LANGUAGE SQL STABLE;
 
-  SELECT format(
-    $q$SELECT %1$s, %2$s FROM %3$I.%4$I %5$s %6$s %7$s %8$s LIMIT %9$L OFFSET %10$L$q$,
-    /* %1 */ CONCAT_WS(
-               ', ',
-               COALESCE(expr_object ->> 'selectable_columns_expr', 'NULL'),
-               joinable_expr_object ->> 'selectable_joined_columns_expr'
-             ),
-    /* %2 */ COALESCE(expr_object ->> 'grouping_expr', 'NULL'),
-    /* %3 */ expr_object ->> 'relation_schema_name',
-    /* %4 */ expr_object ->> 'relation_name',
-    /* %5 */ joinable_expr_object ->> 'join_sql_expr',
-    /* %6 */ expr_object ->> 'where_clause',
-    /* %7 */ joinable_expr_object ->> 'join_group_by_expr',
-    /* %8 */ expr_object ->> 'order_by_expr',
-    /* %9 */ limit_,
-    /* %10 */ offset_
-  ) INTO results_cte_query;
 
-  SELECT format(
-    $q$SELECT count(1) AS count FROM %1$I.%2$I %3$s$q$,
-    expr_object ->> 'relation_schema_name',
-    expr_object ->> 'relation_name',
-    expr_object ->> 'where_clause'
-  ) INTO count_cte_query;
+CREATE OR REPLACE FUNCTION msar.increment_catalog_version() RETURNS void AS $$/*
+Increment the catalog version, invalidating the SQL fragment cache.
 
-  RETURN expr_object || jsonb_build_object(
-    'results_cte_query', results_cte_query,
-    'count_cte_query', count_cte_query
-  );
-END
-$$ LANGUAGE plpgsql STABLE;
+Only the counter of the current backend is updated, so that concurrent transactions don't wait on
+each other. Does nothing if the SQL fragment cache is disabled.
+*/
+INSERT INTO msar.catalog_version AS cv (backend_pid, version)
+SELECT pg_catalog.pg_backend_pid(), 1 WHERE EXISTS (SELECT 1 FROM msar.catalog_version)
+ON CONFLICT (backend_pid) DO UPDATE SET version = cv.version + 1;
+$$ LANGUAGE SQL SECURITY DEFINER SET search_path = pg_catalog, pg_temp;
 
 
-CREATE OR REPLACE FUNCTION
-msar.list_records_from_table(
-  tab_id oid,
-  limit_ integer,
-  offset_ integer,
-  order_ jsonb,
-  filter_ jsonb,
-  group_ jsonb,
-  joined_columns jsonb DEFAULT NULL,
-  return_record_summaries boolean DEFAULT false,
-  table_record_summary_templates jsonb DEFAULT NULL
-) RETURNS jsonb AS $$/*
-Get records from a table. Only columns to which the user has access are returned.
+CREATE OR REPLACE FUNCTION msar.bump_catalog_version() RETURNS event_trigger AS $$/*
+Increment the catalog version at the end of every DDL command.
+*/
+BEGIN
+  -- The counters are dropped along with the other msar objects while (re)installing.
+  IF pg_catalog.to_regclass('msar.catalog_version') IS NOT NULL THEN
+    PERFORM msar.increment_catalog_version();
+  END IF;
+END;
+$$ LANGUAGE plpgsql SET search_path = pg_catalog, pg_temp;
 
-Args:
-  tab_id: The OID of the table whose records we'll get
+
+DO $$
+BEGIN
+  CREATE EVENT TRIGGER msar_bump_catalog_version ON ddl_command_end
+    EXECUTE FUNCTION msar.bump_catalog_version();
+  -- The counter of a backend that never exists, so the version is defined before any DDL.
+  INSERT INTO msar.catalog_version VALUES (0, 0);
+EXCEPTION WHEN insufficient_privilege THEN
+  RAISE NOTICE 'Only superusers can create event triggers; SQL fragment caching is disabled.';
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION
+msar.split_expr_literals(tree jsonb, INOUT literals text[] DEFAULT '{}', OUT shape jsonb) AS $$/*
+Separate the literal values of an expression tree from its shape.
+
+Each literal in the tree is replaced by its (1-based) position in `literals`, so that trees which
+only differ in their literal values have the same shape. See msar.build_expr_template.
+
+Args:
+  tree: An expression tree, as passed to msar.build_expr.
+  literals: The literal values already taken from the preceding parts of a larger tree.
+*/
+DECLARE
+  arg jsonb;
+  args jsonb := '[]'::jsonb;
+BEGIN
+  IF tree ->> 'type' = 'literal' THEN
+    literals := array_append(literals, tree ->> 'value');
+    shape := jsonb_build_object('type', 'literal', 'param', cardinality(literals));
+  ELSIF jsonb_typeof(tree -> 'args') = 'array' THEN
+    FOR arg IN
+      SELECT arg_elems.elem
+      FROM jsonb_array_elements(tree -> 'args') WITH ORDINALITY AS arg_elems(elem, idx)
+      ORDER BY arg_elems.idx
+    LOOP
+      SELECT split.literals, args || jsonb_build_array(split.shape) INTO literals, args
+      FROM msar.split_expr_literals(arg, literals) AS split;
+    END LOOP;
+    shape := jsonb_set(tree, '{args}', args);
+  ELSE
+    shape := tree;
+  END IF;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION msar.build_expr_template(rel_id oid, tree jsonb) RETURNS text AS $$/*
+Build an expression from a tree whose literals were taken out by msar.split_expr_literals.
+
+The result is a format string. Formatting it with the literals gives the expression msar.build_expr
+builds from the original tree.
+*/
+SELECT CASE tree ->> 'type'
+  WHEN 'literal' THEN format('%%%s$L', tree ->> 'param')
+  WHEN 'attnum' THEN replace(msar.build_expr(rel_id, tree), '%', '%%')
+  ELSE
+    format(max(expr_template), VARIADIC array_agg(msar.build_expr_template(rel_id, inner_tree)))
+END
+FROM jsonb_array_elements(tree -> 'args') inner_tree, msar.expr_templates
+WHERE tree ->> 'type' = expr_key
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_cached_sql_fragments(tab_id oid, shape jsonb, catalog_version bigint)
+RETURNS jsonb AS $$/*
+Return the SQL fragments cached for a table and request shape, or NULL if there's no valid entry.
+
+Args:
+  tab_id: The OID of the table the fragments query.
+  shape: A JSON value describing everything (other than the catalog) the fragments depend on.
+  catalog_version: The current catalog version; see msar.get_catalog_version.
+*/
+SELECT sfc.fragments
+FROM msar.sql_fragment_cache AS sfc
+WHERE
+  sfc.role_name = current_user
+  AND sfc.tab_id = get_cached_sql_fragments.tab_id
+  AND sfc.cache_key = md5(shape::text)
+  AND sfc.catalog_version = get_cached_sql_fragments.catalog_version;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.set_cached_sql_fragments(
+  tab_id oid,
+  shape jsonb,
+  catalog_version bigint,
+  fragments jsonb
+) RETURNS jsonb AS $$/*
+Cache SQL fragments for a table and request shape, and return them.
+
+Only the most recently cached 32 shapes are kept for each table and role. Nothing is cached when
+caching is disabled, or in a read-only transaction.
+
+Args:
+  tab_id: The OID of the table the fragments query.
+  shape: A JSON value describing everything (other than the catalog) the fragments depend on.
+  catalog_version: The catalog version, taken before building the fragments.
+  fragments: A JSON object of SQL fragments built for the table and shape.
+*/
+BEGIN
+  IF catalog_version IS NULL OR current_setting('transaction_read_only')::boolean THEN
+    RETURN fragments;
+  END IF;
+  INSERT INTO msar.sql_fragment_cache AS sfc (tab_id, cache_key, catalog_version, fragments)
+  VALUES (tab_id, md5(shape::text), catalog_version, fragments)
+  ON CONFLICT ON CONSTRAINT sql_fragment_cache_pkey DO UPDATE
+    SET catalog_version = excluded.catalog_version,
+      fragments = excluded.fragments,
+      cached_at = excluded.cached_at;
+  DELETE FROM msar.sql_fragment_cache AS sfc
+  WHERE
+    sfc.role_name = current_user
+    AND sfc.tab_id = set_cached_sql_fragments.tab_id
+    AND sfc.cache_key NOT IN (
+      SELECT recent.cache_key FROM msar.sql_fragment_cache AS recent
+      WHERE recent.role_name = current_user AND recent.tab_id = set_cached_sql_fragments.tab_id
+      ORDER BY recent.cached_at DESC
+      LIMIT 32
+    );
+  RETURN fragments;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION msar.get_record_list_fragments(
+  tab_id oid,
+  order_ jsonb,
+  filter_ jsonb,
+  group_ jsonb,
+  joined_columns jsonb
+) RETURNS jsonb AS $$/*
+Return the catalog-dependent SQL fragments for listing the records of a table, using the cache.
+
+Since this writes to the cache, neither it nor its callers are STABLE.
+
+The result contains the relation name and schema name, the selectable columns, grouping, ORDER BY
+and WHERE expressions, the keyset (see msar.get_record_keyset), and the joined columns expressions
+(see msar.get_joined_columns_expr_json). The WHERE clause is cached without the literal values of
+the filter, which are filled in afterwards.
+
+Args:
+  tab_id: The OID of the table whose records we'll get
+  order_: An array of ordering definition objects
+  filter_: An array of filter definition objects
+  group_: An array of group definition objects
+  joined_columns: (optional) A jsonb list defining columns joined via a simple many-to-many linkage.
+*/
+DECLARE
+  catalog_version bigint := msar.get_catalog_version();
+  filter_shape jsonb;
+  filter_literals text[];
+  shape jsonb;
+  fragments jsonb;
+BEGIN
+  SELECT split.shape, split.literals INTO filter_shape, filter_literals
+  FROM msar.split_expr_literals(filter_) AS split;
+  shape := jsonb_build_array('record_list', order_, filter_shape, group_, joined_columns);
+  fragments := msar.get_cached_sql_fragments(tab_id, shape, catalog_version);
+  IF fragments IS NULL THEN
+    fragments := msar.set_cached_sql_fragments(
+      tab_id,
+      shape,
+      catalog_version,
+      jsonb_build_object(
+        'relation_name', msar.get_relation_name(tab_id),
+        'relation_schema_name', msar.get_relation_schema_name(tab_id),
+        'selectable_columns_expr', msar.build_selectable_column_expr(tab_id),
+        'grouping_expr', msar.build_grouping_expr(tab_id, group_),
+        'order_by_expr', msar.build_order_by_expr(tab_id, order_),
+        'where_clause_template', 'WHERE ' || msar.build_expr_template(tab_id, filter_shape),
+        'keyset', msar.get_record_keyset(tab_id, order_),
+        'joined_columns', CASE WHEN joined_columns IS NOT NULL THEN
+          msar.get_joined_columns_expr_json(joined_columns, '__mathesar_page')
+        END
+      )
+    );
+  END IF;
+  RETURN fragments || jsonb_build_object(
+    'where_clause', format(fragments ->> 'where_clause_template', VARIADIC filter_literals)
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION msar.get_record_summary_fragments(
+  tab_id oid,
+  group_ jsonb,
+  joined_columns jsonb,
+  return_record_summaries boolean,
+  table_record_summary_templates jsonb
+) RETURNS jsonb AS $$/*
+Return the catalog-dependent SQL fragments for grouping and summarizing listed records, using the
+cache.
+
+See msar.list_records_from_table for the meaning of the arguments.
+*/
+DECLARE
+  shape jsonb := jsonb_build_array(
+    'record_summaries', group_, joined_columns, return_record_summaries,
+    table_record_summary_templates
+  );
+  catalog_version bigint := msar.get_catalog_version();
+  fragments jsonb := msar.get_cached_sql_fragments(tab_id, shape, catalog_version);
+BEGIN
+  IF fragments IS NULL THEN
+    fragments := msar.set_cached_sql_fragments(
+      tab_id,
+      shape,
+      catalog_version,
+      jsonb_build_object(
+        'grouping_results_expr',
+          msar.build_grouping_results_jsonb_expr(tab_id, 'groups_cte', group_),
+        'groups_cte_expr',
+          msar.build_groups_cte_expr(tab_id, 'results_eq_cte', 'results_ranked_cte', group_),
+        'summary_query',
+          msar.build_record_summary_query_for_table(tab_id, null, table_record_summary_templates),
+        'linked_record_summaries_ctes',
+          msar.build_linked_record_summaries_ctes(tab_id, table_record_summary_templates),
+        'summary_join_expr', msar.build_summary_join_expr_for_table(tab_id, 'enriched_results_cte'),
+        'summary_json_expr', NULLIF(
+          concat_ws(', ',
+            msar.build_summary_json_expr_for_table(tab_id),
+            CASE WHEN return_record_summaries THEN msar.build_self_summary_json_expr(tab_id) END
+          ), ''
+        ),
+        'results_eq_cte_expr',
+          msar.build_results_eq_cte_expr(tab_id, 'results_ranked_cte', group_),
+        'joined_columns_summaries_ctes', msar.build_joined_columns_summaries_ctes(
+          'enriched_results_cte', joined_columns, table_record_summary_templates
+        ),
+        'joined_columns_summaries_expr',
+          NULLIF(msar.build_joined_columns_summaries_expr(joined_columns), '')
+      )
+    );
+  END IF;
+  RETURN fragments;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION msar.build_record_list_query_components_with_ctes(
+  tab_id oid,
+  limit_ integer,
+  offset_ integer,
+  order_ jsonb,
+  filter_ jsonb,
+  group_ jsonb,
+  joined_columns jsonb,
+  after_ text DEFAULT NULL,
+  before_ text DEFAULT NULL
+) RETURNS jsonb AS $$/*
+  Constructs the components necessary for generating enriched query results,
+  including expressions, clauses, selectable_column list, and CTEs, for a table.
+
+  Args:
+    tab_id: The OID of the table whose records we'll get
+    limit_: The maximum number of rows we'll return
+    offset_: The number of rows to skip before returning records from following rows
+    order_: An array of ordering definition objects
+    filter_: An array of filter definition objects
+    group_: An array of group definition objects
+    joined_columns: (optional) A jsonb list defining columns joined via a simple many-to-many linkage.
+      See msar.get_joined_columns_expr_json for more details.
+    after_: (optional) A cursor; only rows after the row it identifies are returned.
+    before_: (optional) A cursor; only rows before the row it identifies are returned.
+
+  Behavior:
+    Fetches metadata about the table (selectable_column list, schema name, table name etc.,)
+    Constructs expressions and SQL snippets (SELECT, WHERE, GROUP BY, etc.,)
+    Generates two SQL queries:
+      1. A query for paginated results (`results_cte_query`).
+      2. A query to count the total matching rows (`count_cte_query`).
+    Returns a jsonb object combining metadata, the expressions, and the generated SQL queries.
+
+    When a cursor is given, the page query is wrapped so the keyset condition applies to the output
+    columns. For plain listings, the planner flattens the wrapper, so the condition is pushed down
+    to the table (and can use an index). With grouping, window functions keep the wrapper intact,
+    so group ids and counts are still computed over all matching rows. When only `before_` is
+    given, the page is selected in reverse order; callers re-sort it using `order_by_expr`.
+
+    Joined columns are added to the page of records after it's selected, so they're only
+    computed for the records returned.
+
+    The catalog-dependent fragments are cached; see msar.get_record_list_fragments.
+*/
+DECLARE
+  expr_object jsonb;
+  joinable_expr_object jsonb;
+  results_cte_query text;
+  count_cte_query text;
+  keyset jsonb;
+BEGIN
+  expr_object := msar.get_record_list_fragments(tab_id, order_, filter_, group_, joined_columns);
+  keyset := expr_object -> 'keyset';
+  joinable_expr_object := NULLIF(expr_object -> 'joined_columns', 'null'::jsonb);
+  expr_object := expr_object - 'joined_columns';
+
+  SELECT format(
+    $q$SELECT %1$s, %2$s FROM %3$I.%4$I %5$s %6$s LIMIT %7$L OFFSET %8$L$q$,
+    /* %1 */ COALESCE(expr_object ->> 'selectable_columns_expr', 'NULL'),
+    /* %2 */ COALESCE(expr_object ->> 'grouping_expr', 'NULL'),
+    /* %3 */ expr_object ->> 'relation_schema_name',
+    /* %4 */ expr_object ->> 'relation_name',
+    /* %5 */ expr_object ->> 'where_clause',
+    /* %6 */ expr_object ->> 'order_by_expr',
+    /* %7 */ limit_,
+    /* %8 */ offset_
+  ) INTO results_cte_query;
+
+  IF after_ IS NOT NULL OR before_ IS NOT NULL THEN
+    SELECT format(
+      $q$SELECT * FROM (SELECT %1$s, %2$s FROM %3$I.%4$I %5$s) AS __mathesar_keyset_cte
+      %6$s %7$s LIMIT %8$L OFFSET %9$L$q$,
+      /* %1 */ COALESCE(expr_object ->> 'selectable_columns_expr', 'NULL'),
+      /* %2 */ COALESCE(expr_object ->> 'grouping_expr', 'NULL'),
+      /* %3 */ expr_object ->> 'relation_schema_name',
+      /* %4 */ expr_object ->> 'relation_name',
+      /* %5 */ expr_object ->> 'where_clause',
+      /* %6 */ msar.build_keyset_where_clause(keyset, after_, before_),
+      /* %7 */ msar.build_keyset_order_by_expr(keyset, after_ IS NULL),
+      /* %8 */ limit_,
+      /* %9 */ offset_
+    ) INTO results_cte_query;
+  END IF;
+
+  IF joinable_expr_object IS NOT NULL THEN
+    -- The joined columns are only computed for the records of the page.
+    SELECT format(
+      $q$SELECT __mathesar_page.*, %1$s FROM (%2$s) AS __mathesar_page %3$s$q$,
+      /* %1 */ joinable_expr_object ->> 'selectable_joined_columns_expr',
+      /* %2 */ results_cte_query,
+      /* %3 */ joinable_expr_object ->> 'lateral_join_expr'
+    ) INTO results_cte_query;
+  END IF;
+
+  SELECT format(
+    $q$SELECT count(1) AS count FROM %1$I.%2$I %3$s$q$,
+    expr_object ->> 'relation_schema_name',
+    expr_object ->> 'relation_name',
+    expr_object ->> 'where_clause'
+  ) INTO count_cte_query;
+
+  RETURN expr_object || jsonb_build_object(
+    'results_cte_query', results_cte_query,
+    'count_cte_query', count_cte_query
+  );
+END
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.estimate_record_count(tab_id oid, where_clause text) RETURNS bigint AS $$/*
+Return the query planner's estimate of the number of records of a table matching a WHERE clause.
+
+Without a WHERE clause, this is derived from `pg_class.reltuples` (scaled to the current size of
+the table), so it's accurate to within the precision of the table's last ANALYZE. With a WHERE
+clause, the estimate is only as good as the column statistics used by the planner. Either way, no
+rows of the table are read.
+
+Args:
+  tab_id: The OID of the table whose records we'll count.
+  where_clause: (optional) A WHERE clause, e.g., as produced by `msar.build_where_clause`.
+*/
+DECLARE
+  plan jsonb;
+BEGIN
+  EXECUTE format(
+    'EXPLAIN (FORMAT JSON) SELECT 1 FROM %I.%I %s',
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    where_clause
+  ) INTO plan;
+  RETURN (plan -> 0 -> 'Plan' ->> 'Plan Rows')::numeric::bigint;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_count_cte_query(tab_id oid, count_query text, where_clause text, count_mode text)
+RETURNS text AS $$/*
+Return a query producing a single `count` column according to the given count mode.
+
+Args:
+  tab_id: The OID of the table whose records we'll count.
+  count_query: A query returning the exact count of the records.
+  where_clause: The WHERE clause of the count query (used for estimation).
+  count_mode: One of 'exact', 'estimated', or 'none'. 'none' produces a NULL count.
+*/
+BEGIN
+  CASE COALESCE(count_mode, 'exact')
+    WHEN 'exact' THEN
+      RETURN count_query;
+    WHEN 'estimated' THEN
+      RETURN format(
+        'SELECT %L::bigint AS count', msar.estimate_record_count(tab_id, where_clause)
+      );
+    WHEN 'none' THEN
+      RETURN 'SELECT NULL::bigint AS count';
+    ELSE
+      RAISE EXCEPTION 'Invalid count mode: %', count_mode
+        USING HINT = 'The count mode must be one of exact, estimated, or none.',
+              ERRCODE = 'invalid_parameter_value';
+  END CASE;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.count_records_from_table(tab_id oid, filter_ jsonb) RETURNS bigint AS $$/*
+Return the exact number of records in a table, optionally restricted by a filter.
+
+This is the standalone equivalent of the `count` returned by `msar.list_records_from_table` when
+using the 'exact' count mode. It lets clients list records cheaply (with the 'none' or
+'estimated' count modes) and fetch the exact count lazily.
+
+Args:
+  tab_id: The OID of the table whose records we'll count.
+  filter_: (optional) A filter definition object, as for `msar.list_records_from_table`.
+*/
+DECLARE
+  record_count bigint;
+BEGIN
+  EXECUTE format(
+    'SELECT count(1) FROM %I.%I %s',
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    msar.build_where_clause(tab_id, filter_)
+  ) INTO record_count;
+  RETURN record_count;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.list_records_from_table(
+  tab_id oid,
+  limit_ integer,
+  offset_ integer,
+  order_ jsonb,
+  filter_ jsonb,
+  group_ jsonb,
+  joined_columns jsonb DEFAULT NULL,
+  return_record_summaries boolean DEFAULT false,
+  table_record_summary_templates jsonb DEFAULT NULL,
+  count_mode text DEFAULT 'exact',
+  after_ text DEFAULT NULL,
+  before_ text DEFAULT NULL,
+  return_cursors boolean DEFAULT false
+) RETURNS jsonb AS $$/*
+Get records from a table. Only columns to which the user has access are returned.
+
+Args:
+  tab_id: The OID of the table whose records we'll get
   limit_: The maximum number of rows we'll return
   offset_: The number of rows to skip before returning records from following rows.
   order_: An array of ordering definition objects.
@@ -5405,12 +6267,24 @@ Args:
   return_record_summaries : Whether to return a summary for each record listed.
   table_record_summary_templates: (optional) A JSON object that maps table OIDs to record summary
     templates.
+  count_mode: (optional) How to compute the returned `count`. 'exact' (the default) counts all
+    matching rows, 'estimated' uses the query planner's estimate (see
+    msar.estimate_record_count), and 'none' skips counting, returning a null count.
+  after_: (optional) A cursor; only records after the record it identifies are returned.
+  before_: (optional) A cursor; only records before the record it identifies are returned.
+  return_cursors: Whether to return the cursors of the first and last records listed, under the
+    "cursors" key. See msar.build_cursors_expr.
 
 The order definition objects should have the form
   {"attnum": <int>, "direction": <text>}
+
+Cursors allow keyset pagination: rather than skipping `offset_` rows (which gets slower the deeper
+the page), pass the "last" cursor of the current page as `after_` to get the next page, or the
+"first" cursor as `before_` to get the previous one. A cursor is only valid for the same order_.
 */
 DECLARE
   expr_and_ctes jsonb;
+  summary_fragments jsonb;
   records jsonb;
 BEGIN
   SELECT msar.build_record_list_query_components_with_ctes(
@@ -5420,8 +6294,13 @@ BEGIN
     order_,
     filter_,
     group_,
-    joined_columns
+    joined_columns,
+    after_,
+    before_
   ) INTO expr_and_ctes;
+  summary_fragments := msar.get_record_summary_fragments(
+    tab_id, group_, joined_columns, return_record_summaries, table_record_summary_templates
+  );
 
   EXECUTE format(
     $q$
@@ -5463,9 +6342,9 @@ BEGIN
     ),
     records_json_cte AS ( SELECT jsonb_build_object(
       'results', %4$s,
-      'count', coalesce(max(count_cte.count), 0),
+      'count', %14$s,
       'grouping', %5$s
-    ) AS rj
+    ) %15$s AS rj
     FROM enriched_results_cte
       LEFT JOIN groups_cte ON enriched_results_cte.__mathesar_gid = groups_cte.id
       CROSS JOIN count_cte
@@ -5473,7 +6352,12 @@ BEGIN
     SELECT records_json_cte.rj || summaries_json_cte.sj
     FROM records_json_cte, summaries_json_cte;
     $q$,
-    /* %1 */ expr_and_ctes ->> 'count_cte_query',
+    /* %1 */ msar.build_count_cte_query(
+      tab_id,
+      expr_and_ctes ->> 'count_cte_query',
+      expr_and_ctes ->> 'where_clause',
+      count_mode
+    ),
     /* %2 */ expr_and_ctes ->> 'results_cte_query',
     /* %3 */ expr_and_ctes ->> 'order_by_expr',
     /* %4 */ COALESCE(
@@ -5483,87 +6367,81 @@ BEGIN
       ),
       'NULL'
     ),
-    /* %5 */ COALESCE(
-      msar.build_grouping_results_jsonb_expr(tab_id, 'groups_cte', group_),
-      'NULL'
-    ),
-    /* %6 */ COALESCE(
-      msar.build_groups_cte_expr(tab_id, 'results_eq_cte', 'results_ranked_cte', group_),
-      'NULL AS id'
-    ),
-    /* %7 */ msar.build_record_summary_query_for_table(
-      tab_id,
-      null,
-      table_record_summary_templates
-    ),
-    /* %8 */ msar.build_linked_record_summaries_ctes(
-      tab_id,
-      table_record_summary_templates
-    ),
-    /* %9 */ msar.build_summary_join_expr_for_table(tab_id, 'enriched_results_cte'),
-    /* %10 */ COALESCE(
-      NULLIF(
-        concat_ws(', ',
-          msar.build_summary_json_expr_for_table(tab_id),
-          CASE WHEN return_record_summaries
-          THEN msar.build_self_summary_json_expr(tab_id)
-          END
-        ), ''
-      ), 'COUNT(1) AS count_hack'
-      -- count_hack ensures that summary_cte is not empty,
-      -- which in turn helps to generate summaries_json_cte
-    ),
-    /* %11 */ msar.build_results_eq_cte_expr(tab_id, 'results_ranked_cte', group_),
-    /* %12 */ msar.build_joined_columns_summaries_ctes(
-      'enriched_results_cte',
-      joined_columns,
-      table_record_summary_templates
-    ),
+    /* %5 */ COALESCE(summary_fragments ->> 'grouping_results_expr', 'NULL'),
+    /* %6 */ COALESCE(summary_fragments ->> 'groups_cte_expr', 'NULL AS id'),
+    /* %7 */ summary_fragments ->> 'summary_query',
+    /* %8 */ summary_fragments ->> 'linked_record_summaries_ctes',
+    /* %9 */ summary_fragments ->> 'summary_join_expr',
+    -- count_hack ensures that summary_cte is not empty,
+    -- which in turn helps to generate summaries_json_cte
+    /* %10 */ COALESCE(summary_fragments ->> 'summary_json_expr', 'COUNT(1) AS count_hack'),
+    /* %11 */ summary_fragments ->> 'results_eq_cte_expr',
+    /* %12 */ summary_fragments ->> 'joined_columns_summaries_ctes',
     /* %13 */ COALESCE(
-      NULLIF(msar.build_joined_columns_summaries_expr(joined_columns), ''),
+      summary_fragments ->> 'joined_columns_summaries_expr',
       'SELECT COUNT(1) AS count_hack'
-    )
+    ),
+    /* %14 */ CASE WHEN count_mode = 'none' THEN 'NULL' ELSE 'coalesce(max(count_cte.count), 0)' END,
+    /* %15 */ CASE WHEN return_cursors THEN
+      '|| jsonb_build_object(''cursors'', ' || msar.build_cursors_expr(
+        expr_and_ctes -> 'keyset',
+        'enriched_results_cte',
+        expr_and_ctes ->> 'order_by_expr'
+      ) || ')'
+    END
   ) INTO records;
   RETURN records;
 END;
-$$ LANGUAGE plpgsql STABLE;
+$$ LANGUAGE plpgsql;
 
 
 CREATE OR REPLACE FUNCTION
-msar.get_table_columns_and_records(
+msar.build_table_export_query(
   tab_id oid,
   limit_ integer,
   offset_ integer,
   order_ jsonb,
   filter_ jsonb
-) RETURNS SETOF jsonb AS $$
-DECLARE
-  expr_and_ctes jsonb;
-BEGIN
-  SELECT msar.build_record_list_query_components_with_ctes(
-    tab_id,
-    limit_,
-    offset_,
-    order_,
-    filter_,
-    null,
-    null
-  ) INTO expr_and_ctes;
+) RETURNS text AS $$/*
+Build a query selecting the records of a table for export, suitable for wrapping in a COPY.
 
-  RETURN QUERY SELECT msar.get_selectable_columns(tab_id);
-  RETURN QUERY EXECUTE format(
-    $q$
-    WITH results_cte AS ( %1$s )
-    SELECT %2$s AS records FROM results_cte;
-    $q$,
-    expr_and_ctes ->> 'results_cte_query',
-    COALESCE(
-      msar.build_results_setof_jsonb_expr('results_cte'),
-      'NULL'
-    )
-  );
-END;
-$$ LANGUAGE plpgsql STABLE;
+The records are selected (and ordered) as in msar.list_records_from_table, and the output columns
+are then renamed after the table columns, so a `COPY ... WITH (HEADER)` produces a header naming
+them. Values are cast to text. Only columns to which the user has access are selected.
+
+Args:
+  tab_id: The OID of the table whose records we'll export.
+  limit_: The maximum number of rows we'll export.
+  offset_: The number of rows to skip before exporting records from following rows.
+  order_: An array of ordering definition objects.
+  filter_: An array of filter definition objects.
+*/
+WITH fragments_cte AS (
+  SELECT msar.get_record_list_fragments(tab_id, order_, filter_, null, null) AS fragments
+), columns_cte AS (
+  SELECT string_agg(format('%1$I::text AS %2$I', attnum, attname), ', ' ORDER BY attnum) AS expr
+  FROM pg_catalog.pg_attribute
+  WHERE
+    attrelid = tab_id
+    AND attnum > 0
+    AND NOT attisdropped
+    AND has_column_privilege(attrelid, attnum, 'SELECT')
+)
+SELECT format(
+  $q$SELECT %1$s FROM (
+    SELECT %2$s FROM %3$I.%4$I %5$s %6$s LIMIT %7$L OFFSET %8$L
+  ) AS __mathesar_export$q$,
+  /* %1 */ COALESCE(columns_cte.expr, 'NULL'),
+  /* %2 */ COALESCE(fragments ->> 'selectable_columns_expr', 'NULL'),
+  /* %3 */ fragments ->> 'relation_schema_name',
+  /* %4 */ fragments ->> 'relation_name',
+  /* %5 */ fragments ->> 'where_clause',
+  /* %6 */ fragments ->> 'order_by_expr',
+  /* %7 */ limit_,
+  /* %8 */ offset_
+)
+FROM fragments_cte, columns_cte;
+$$ LANGUAGE SQL;
 
 
 CREATE OR REPLACE FUNCTION
@@ -5602,7 +6480,10 @@ msar.search_records_from_table(
   limit_ integer,
   offset_ integer DEFAULT 0,
   return_record_summaries boolean DEFAULT false,
-  table_record_summary_templates jsonb DEFAULT NULL
+  table_record_summary_templates jsonb DEFAULT NULL,
+  after_ text DEFAULT NULL,
+  before_ text DEFAULT NULL,
+  return_cursors boolean DEFAULT false
 ) RETURNS jsonb AS $$/*
 Get records from a table, filtering and sorting according to a search specification.
 
@@ -5613,13 +6494,26 @@ Args:
   search_: An array of search definition objects.
   limit_: The maximum number of rows we'll return.
   offset_: The number of rows to skip before returning records from following rows
+  after_: (optional) A cursor; only records after the record it identifies are returned.
+  before_: (optional) A cursor; only records before the record it identifies are returned.
+  return_cursors: Whether to return the cursors of the first and last records listed, under the
+    "cursors" key.
 
 The search definition objects should have the form
   {"attnum": <int>, "literal": <any>}
+
+Cursors work as for msar.list_records_from_table. Since results are ordered by their score first,
+the score is part of each cursor.
 */
 DECLARE
   records jsonb;
+  keyset jsonb;
+  order_by_expr text;
 BEGIN
+  keyset := jsonb_build_array(
+    jsonb_build_object('name', '__mathesar_score', 'direction', 'DESC', 'not_null', true)
+  ) || msar.get_record_keyset(tab_id, null);
+  order_by_expr := msar.build_keyset_order_by_expr(keyset, false);
   EXECUTE format(
     $q$
     WITH
@@ -5627,7 +6521,9 @@ BEGIN
       SELECT count(1) AS count FROM %2$I.%3$I %4$s
     ),
     results_cte AS (
-      SELECT %1$s FROM %2$I.%3$I %4$s %7$s LIMIT %5$L OFFSET %6$L
+      SELECT * FROM (
+        SELECT %1$s, %12$s AS __mathesar_score FROM %2$I.%3$I %4$s
+      ) AS __mathesar_keyset_cte %13$s %7$s LIMIT %5$L OFFSET %6$L
     ),
     summary_cte_self AS (%8$s)
     %9$s,
@@ -5651,9 +6547,12 @@ BEGIN
     ),
     results_json_cte AS (
       SELECT jsonb_build_object(
-        'results', coalesce(jsonb_agg(row_to_json(results_cte.*)), jsonb_build_array()),
+        'results', coalesce(
+          jsonb_agg(to_jsonb(results_cte.*) - '__mathesar_score' %15$s),
+          jsonb_build_array()
+        ),
         'count', coalesce(max(count_cte.count), 0)
-      ) AS rj
+      ) %14$s AS rj
       FROM results_cte CROSS JOIN count_cte
     )
     SELECT results_json_cte.rj || summaries_json_cte.sj
@@ -5665,13 +6564,10 @@ BEGIN
     /* %4 */ 'WHERE ' || msar.get_score_expr(tab_id, search_) || ' > 0',
     /* %5 */ limit_,
     /* %6 */ offset_,
-    /* %7 */ 'ORDER BY ' || NULLIF(
-      concat(
-        msar.get_score_expr(tab_id, search_) || ' DESC, ',
-        msar.build_total_order_expr(tab_id, null)
-      ),
-      ''
-    ),
+    /* %7 */ CASE WHEN after_ IS NULL AND before_ IS NOT NULL
+      THEN msar.build_keyset_order_by_expr(keyset, true)
+      ELSE order_by_expr
+    END,
     /* %8 */ msar.build_record_summary_query_for_table(
       tab_id,
       msar.get_selectable_pkey_attnum(tab_id),
@@ -5690,7 +6586,15 @@ BEGIN
       ), 'COUNT(1) AS count_hack'
       -- count_hack ensures that summary_cte is not empty,
       -- which in turn helps to generate summaries_json_cte
-    )
+    ),
+    /* %12 */ COALESCE(msar.get_score_expr(tab_id, search_), '0'),
+    /* %13 */ msar.build_keyset_where_clause(keyset, after_, before_),
+    /* %14 */ CASE WHEN return_cursors THEN
+      '|| jsonb_build_object(''cursors'', '
+      || msar.build_cursors_expr(keyset, 'results_cte', order_by_expr)
+      || ')'
+    END,
+    /* %15 */ order_by_expr
   ) INTO records;
   RETURN records;
 END;
@@ -5734,7 +6638,7 @@ SELECT msar.list_records_from_table(
   return_record_summaries,
   table_record_summary_templates
 )
-$$ LANGUAGE SQL STABLE;
+$$ LANGUAGE SQL;
 
 
 CREATE OR REPLACE FUNCTION
@@ -5849,6 +6753,263 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION
+msar.get_typmodless_type_name(typ_id regtype) RETURNS text AS $$/*
+Return the name of a type, without any type modifier, for casting values before assigning them.
+
+Casting to a type with a modifier (e.g., varchar(3)) silently truncates overlong values, whereas
+assigning a value to a column checks it against the modifier of the column. Since `bit` without a
+modifier means bit(1), `bit varying` is used in its place.
+
+Args:
+  typ_id: The OID of the type.
+*/
+SELECT CASE typ_id
+  WHEN 'bit'::regtype THEN 'bit varying'
+  WHEN 'bit[]'::regtype THEN 'bit varying[]'
+  ELSE format_type(typ_id, NULL)
+END;
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_bulk_insert_expr(tab_id oid, col_ids smallint[]) RETURNS TEXT AS $$/*
+Build an INSERT statement adding the records in a JSON array (passed as the $1 parameter) to a table.
+
+Each record should have exactly the given attnums as keys. Values are cast from their text form to
+the type of the column, as for msar.build_single_insert_expr, and the column's type modifier is
+enforced on assignment. The statement returns, in order, the primary key value of each inserted
+record (or NULL if the table has no single column primary key) as __msar_key, and the inserted
+record, with the columns the user can select keyed by attnum (as in msar.list_records_from_table),
+as __msar_record.
+
+Args:
+  tab_id: The OID of the table to which we'll add records.
+  col_ids: The attnums of the columns we'll set.
+*/
+SELECT format(
+  $q$
+  INSERT INTO %1$I.%2$I %3$s
+  SELECT %4$s FROM jsonb_array_elements($1) WITH ORDINALITY AS __msar_input(rec, idx)
+  ORDER BY __msar_input.idx
+  RETURNING %5$s AS __msar_key, %6$s AS __msar_record
+  $q$,
+  /* %1 */ msar.get_relation_schema_name(tab_id),
+  /* %2 */ msar.get_relation_name(tab_id),
+  /* %3 */ '(' || string_agg(format('%I', pga.attname), ', ' ORDER BY x.ordinality) || ')',
+  /* %4 */ string_agg(
+    format(
+      'CAST(__msar_input.rec ->> %L AS %s)',
+      pga.attnum,
+      msar.get_typmodless_type_name(pga.atttypid)
+    ),
+    ', ' ORDER BY x.ordinality
+  ),
+  /* %5 */ COALESCE(
+    quote_ident(msar.get_column_name(tab_id, msar.get_pk_column(tab_id))),
+    'NULL'
+  ),
+  /* %6 */ COALESCE(
+    format(
+      '(SELECT to_jsonb(__msar_rec) FROM (SELECT %s) AS __msar_rec)',
+      msar.build_selectable_column_expr(tab_id)
+    ),
+    '''{}''::jsonb'
+  )
+)
+FROM unnest(col_ids) WITH ORDINALITY AS x(attnum, ordinality)
+  LEFT JOIN pg_catalog.pg_attribute AS pga ON pga.attrelid = tab_id AND pga.attnum = x.attnum;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_record_summaries_by_keys(
+  tab_id oid,
+  rec_keys jsonb,
+  return_record_summaries boolean DEFAULT false,
+  table_record_summary_templates jsonb DEFAULT NULL
+) RETURNS jsonb AS $$/*
+Return summaries of the given records of a table, and of the records they link to.
+
+The records are looked up by their primary key values (so that the primary key index can be used),
+and the result has the "record_summaries" and "linked_record_summaries" keys of
+msar.list_records_from_table.
+
+Args:
+  tab_id: The OID of the table whose records we'll summarize.
+  rec_keys: A JSON array of the primary key values of the records.
+  return_record_summaries: Whether to return summaries of the records themselves, rather than only
+    of the records they link to.
+  table_record_summary_templates: (optional) A JSON object that maps table OIDs to record summary
+    templates.
+
+Only tables with a single primary key column are supported.
+*/
+DECLARE
+  summaries jsonb;
+BEGIN
+  EXECUTE format(
+    $q$
+    WITH
+    results_cte AS (
+      SELECT %1$s FROM %2$I.%3$I
+      WHERE %3$I.%4$I IN (SELECT CAST(value AS %5$s) FROM jsonb_array_elements_text($1))
+    ),
+    summary_cte_self AS (%6$s)
+    %7$s,
+    summary_cte AS ( SELECT %8$s FROM results_cte %9$s )
+    SELECT jsonb_build_object(
+      'linked_record_summaries',
+      NULLIF(to_jsonb(summary_cte) - 'summary_self' - 'count_hack', '{}'::jsonb),
+      'record_summaries',
+      NULLIF(to_jsonb(summary_cte) - 'count_hack' -> 'summary_self', '{}'::jsonb)
+    )
+    FROM summary_cte
+    $q$,
+    /* %1 */ msar.build_selectable_column_expr(tab_id),
+    /* %2 */ msar.get_relation_schema_name(tab_id),
+    /* %3 */ msar.get_relation_name(tab_id),
+    /* %4 */ msar.get_column_name(tab_id, msar.get_pk_column(tab_id)),
+    /* %5 */ msar.get_column_type(tab_id, msar.get_pk_column(tab_id)),
+    /* %6 */ msar.build_record_summary_query_for_table(tab_id, null, table_record_summary_templates),
+    /* %7 */ msar.build_linked_record_summaries_ctes(tab_id, table_record_summary_templates),
+    -- count_hack ensures that summary_cte is not empty.
+    /* %8 */ COALESCE(
+      NULLIF(
+        concat_ws(', ',
+          msar.build_summary_json_expr_for_table(tab_id),
+          CASE WHEN return_record_summaries THEN msar.build_self_summary_json_expr(tab_id) END
+        ), ''
+      ), 'COUNT(1) AS count_hack'
+    ),
+    /* %9 */ msar.build_summary_join_expr_for_table(tab_id, 'results_cte')
+  ) USING rec_keys INTO summaries;
+  RETURN summaries;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.add_records_to_table(
+  tab_id oid,
+  rec_defs jsonb,
+  return_records boolean DEFAULT false,
+  return_record_summaries boolean DEFAULT false,
+  table_record_summary_templates jsonb DEFAULT NULL
+) RETURNS jsonb AS $$/*
+Add many records to a table.
+
+Records are grouped by the set of columns they define, and each group is added by a single INSERT
+statement. If any record can't be added, no records are added. Instead, each record is tried on its
+own to find the ones causing errors, which are returned under the "errors" key as objects of the
+form {"index": <position in rec_defs>, "message": <text>, "code": <SQLSTATE>}.
+
+Otherwise, the result has the primary key values of the added records (in the same order as
+`rec_defs`) under the "keys" key, and, if requested, the added records and their summaries.
+
+Args:
+  tab_id: The OID of the table to which we'll add records.
+  rec_defs: A JSON array of objects defining the records, as for msar.add_record_to_table.
+  return_records: Whether to return the added records.
+  return_record_summaries: Whether to return summaries of the added records.
+  table_record_summary_templates: (optional) A JSON object that maps table OIDs to record summary
+    templates.
+*/
+DECLARE
+  rec_group record;
+  group_keys jsonb;
+  group_records jsonb;
+  rec_keys jsonb := '{}'::jsonb;
+  rec_results jsonb := '{}'::jsonb;
+  rec_errors jsonb := '[]'::jsonb;
+  rec_item record;
+  err_state text;
+  err_message text;
+  summaries jsonb;
+BEGIN
+  IF jsonb_typeof(rec_defs) <> 'array' THEN
+    RAISE EXCEPTION 'Records must be given as a JSON array.'
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+  BEGIN
+    FOR rec_group IN
+      SELECT col_ids, array_agg(idx ORDER BY idx) AS idxs, jsonb_agg(rec ORDER BY idx) AS recs
+      FROM (
+        SELECT
+          x.rec,
+          x.idx,
+          ARRAY(SELECT k::smallint FROM jsonb_object_keys(x.rec) AS k ORDER BY 1) AS col_ids
+        FROM jsonb_array_elements(rec_defs) WITH ORDINALITY AS x(rec, idx)
+      ) AS rec_col_ids
+      GROUP BY col_ids
+      ORDER BY min(idx)
+    LOOP
+      EXECUTE format(
+        $q$
+        WITH insert_cte AS (%s)
+        SELECT jsonb_agg(__msar_key), jsonb_agg(__msar_record) FROM insert_cte
+        $q$,
+        msar.build_bulk_insert_expr(tab_id, rec_group.col_ids)
+      ) USING rec_group.recs INTO group_keys, group_records;
+      SELECT
+        rec_keys || jsonb_object_agg(x.idx, group_keys -> (x.ordinality::integer - 1)),
+        rec_results || jsonb_object_agg(x.idx, group_records -> (x.ordinality::integer - 1))
+      FROM unnest(rec_group.idxs) WITH ORDINALITY AS x(idx, ordinality)
+      INTO rec_keys, rec_results;
+    END LOOP;
+  EXCEPTION WHEN OTHERS THEN
+    GET STACKED DIAGNOSTICS err_state = RETURNED_SQLSTATE, err_message = MESSAGE_TEXT;
+    -- Try each record on its own (in the order given, so that e.g. a duplicate value is reported
+    -- for its second occurrence), and then roll back all of the attempts.
+    BEGIN
+      FOR rec_item IN
+        SELECT * FROM jsonb_array_elements(rec_defs) WITH ORDINALITY AS x(rec, idx)
+      LOOP
+        BEGIN
+          EXECUTE msar.build_bulk_insert_expr(
+            tab_id, ARRAY(SELECT k::smallint FROM jsonb_object_keys(rec_item.rec) AS k ORDER BY 1)
+          ) USING jsonb_build_array(rec_item.rec);
+        EXCEPTION WHEN OTHERS THEN
+          rec_errors := rec_errors || jsonb_build_object(
+            'index', rec_item.idx - 1, 'message', SQLERRM, 'code', SQLSTATE
+          );
+        END;
+      END LOOP;
+      RAISE EXCEPTION USING ERRCODE = 'transaction_rollback';
+    EXCEPTION WHEN transaction_rollback THEN
+      NULL;
+    END;
+    IF jsonb_array_length(rec_errors) = 0 THEN
+      -- No single record is to blame, e.g., because of a deferred constraint.
+      RAISE EXCEPTION '%', err_message USING ERRCODE = err_state;
+    END IF;
+    RETURN jsonb_build_object('keys', NULL, 'errors', rec_errors);
+  END;
+
+  rec_keys := (
+    SELECT COALESCE(jsonb_agg(value ORDER BY key::integer), '[]'::jsonb) FROM jsonb_each(rec_keys)
+  );
+  -- The added records come straight from the INSERT statements, so only their summaries need to be
+  -- looked up.
+  IF (return_records OR return_record_summaries) AND msar.get_pk_column(tab_id) IS NOT NULL THEN
+    summaries := msar.get_record_summaries_by_keys(
+      tab_id, rec_keys, return_record_summaries, table_record_summary_templates
+    );
+  END IF;
+  RETURN jsonb_build_object(
+    'keys', rec_keys,
+    'results', CASE WHEN return_records THEN (
+      SELECT COALESCE(jsonb_agg(value ORDER BY key::integer), '[]'::jsonb)
+      FROM jsonb_each(rec_results)
+    ) END,
+    'record_summaries', summaries -> 'record_summaries',
+    'linked_record_summaries', CASE WHEN return_records THEN summaries -> 'linked_record_summaries' END,
+    'errors', NULL
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION
 msar.build_update_expr(tab_id oid, rec_def jsonb) RETURNS TEXT AS $$
 SELECT
@@ -5919,6 +7080,182 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION
+msar.build_bulk_update_expr(tab_id oid, col_ids smallint[]) RETURNS TEXT AS $$/*
+Build an UPDATE statement applying the patches in a JSON array (passed as the $1 parameter) to a
+table.
+
+Each patch should have the form {"record_id": <pk value>, "record_def": <object>}, where the
+record_def has exactly the given attnums as keys. Values are cast from their text form to the type
+of the column, as for msar.build_update_expr, and the column's type modifier is enforced on
+assignment. The statement returns the primary key value of each updated record (as __msar_key),
+along with the position of its patch in the array (as __msar_idx).
+
+Args:
+  tab_id: The OID of the table whose records we'll update.
+  col_ids: The attnums of the columns we'll set.
+*/
+WITH pkey AS (
+  -- Record ids aren't truncated to fit the primary key column either, so that they can't match the
+  -- wrong record.
+  SELECT pga.attname, msar.get_typmodless_type_name(pga.atttypid) AS type_name
+  FROM pg_catalog.pg_attribute AS pga
+  WHERE pga.attrelid = tab_id AND pga.attnum = msar.get_pk_column(tab_id)
+)
+SELECT format(
+  $q$
+  UPDATE %1$I.%2$I SET (%3$s) = ROW(%4$s)
+  FROM jsonb_array_elements($1) WITH ORDINALITY AS __msar_input(patch, idx)
+  WHERE %1$I.%2$I.%5$I = CAST(__msar_input.patch ->> 'record_id' AS %6$s)
+  RETURNING %1$I.%2$I.%5$I AS __msar_key, __msar_input.idx AS __msar_idx
+  $q$,
+  /* %1 */ msar.get_relation_schema_name(tab_id),
+  /* %2 */ msar.get_relation_name(tab_id),
+  /* %3 */ string_agg(format('%I', pga.attname), ', ' ORDER BY x.ordinality),
+  /* %4 */ string_agg(
+    format(
+      'CAST(__msar_input.patch -> %L ->> %L AS %s)',
+      'record_def',
+      pga.attnum,
+      msar.get_typmodless_type_name(pga.atttypid)
+    ),
+    ', ' ORDER BY x.ordinality
+  ),
+  /* %5 */ (SELECT attname FROM pkey),
+  /* %6 */ (SELECT type_name FROM pkey)
+)
+FROM unnest(col_ids) WITH ORDINALITY AS x(attnum, ordinality)
+  LEFT JOIN pg_catalog.pg_attribute AS pga ON pga.attrelid = tab_id AND pga.attnum = x.attnum;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.patch_records_in_table(
+  tab_id oid,
+  rec_patches jsonb,
+  return_records boolean DEFAULT false,
+  return_record_summaries boolean DEFAULT false,
+  table_record_summary_templates jsonb DEFAULT NULL
+) RETURNS jsonb AS $$/*
+Modify (update/patch) many records in a table.
+
+Patches are grouped by the set of columns they set, and each group is applied by a single UPDATE
+statement joining the table to the patches. Patching a record more than once is an error.
+
+The result has the primary key values of the updated records (in the order of their patches) under
+the "keys" key, and, if requested, the updated records (in the same order) and their summaries.
+Records which don't exist are skipped. The updated records are looked up by their primary key
+values, so that the primary key index can be used.
+
+Args:
+  tab_id: The OID of the table whose records we'll update.
+  rec_patches: A JSON array of objects of the form {"record_id": <pk value>, "record_def": <object>},
+    where the record_def is as for msar.patch_record_in_table.
+  return_records: Whether to return the updated records.
+  return_record_summaries: Whether to return summaries of the updated records.
+  table_record_summary_templates: (optional) A JSON object that maps table OIDs to record summary
+    templates.
+
+Only tables with a single primary key column are supported.
+*/
+DECLARE
+  pk_type text;
+  has_duplicates boolean;
+  patch_group record;
+  group_keys jsonb;
+  rec_keys jsonb := '{}'::jsonb;
+  records jsonb;
+  summaries jsonb;
+BEGIN
+  IF jsonb_typeof(rec_patches) <> 'array' THEN
+    RAISE EXCEPTION 'Patches must be given as a JSON array.'
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+  IF msar.get_pk_column(tab_id) IS NULL THEN
+    RAISE EXCEPTION 'Only tables with a single primary key column can be patched.'
+      USING ERRCODE = 'feature_not_supported';
+  END IF;
+  pk_type := msar.get_typmodless_type_name(
+    (SELECT atttypid FROM pg_catalog.pg_attribute
+    WHERE attrelid = tab_id AND attnum = msar.get_pk_column(tab_id))
+  );
+  EXECUTE format(
+    $q$
+    SELECT count(DISTINCT CAST(x.patch ->> 'record_id' AS %1$s)) < count(x.patch ->> 'record_id')
+    FROM jsonb_array_elements($1) AS x(patch)
+    $q$,
+    pk_type
+  ) USING rec_patches INTO has_duplicates;
+  IF has_duplicates THEN
+    RAISE EXCEPTION 'Each record can only be patched once.'
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+  FOR patch_group IN
+    SELECT col_ids, array_agg(idx ORDER BY idx) AS idxs, jsonb_agg(patch ORDER BY idx) AS patches
+    FROM (
+      SELECT
+        x.patch,
+        x.idx,
+        ARRAY(
+          SELECT k::smallint FROM jsonb_object_keys(x.patch -> 'record_def') AS k ORDER BY 1
+        ) AS col_ids
+      FROM jsonb_array_elements(rec_patches) WITH ORDINALITY AS x(patch, idx)
+    ) AS patch_col_ids
+    WHERE cardinality(col_ids) > 0
+    GROUP BY col_ids
+    ORDER BY min(idx)
+  LOOP
+    EXECUTE format(
+      $q$
+      WITH update_cte AS (%s)
+      SELECT COALESCE(jsonb_object_agg(($2)[__msar_idx], __msar_key), '{}') FROM update_cte
+      $q$,
+      msar.build_bulk_update_expr(tab_id, patch_group.col_ids)
+    ) USING patch_group.patches, patch_group.idxs INTO group_keys;
+    rec_keys := rec_keys || group_keys;
+  END LOOP;
+  rec_keys := (
+    SELECT COALESCE(jsonb_agg(value ORDER BY key::integer), '[]'::jsonb) FROM jsonb_each(rec_keys)
+  );
+
+  IF return_records THEN
+    EXECUTE format(
+      $q$
+      SELECT COALESCE(jsonb_agg(__msar_records.__msar_record ORDER BY __msar_keys.idx), '[]')
+      FROM jsonb_array_elements_text($1) WITH ORDINALITY AS __msar_keys(key, idx)
+        INNER JOIN (
+          SELECT %3$I AS __msar_key, %5$s AS __msar_record FROM %1$I.%2$I
+          WHERE %3$I = ANY(ARRAY(SELECT CAST(value AS %4$s) FROM jsonb_array_elements_text($1)))
+        ) AS __msar_records ON __msar_records.__msar_key = CAST(__msar_keys.key AS %4$s)
+      $q$,
+      /* %1 */ msar.get_relation_schema_name(tab_id),
+      /* %2 */ msar.get_relation_name(tab_id),
+      /* %3 */ msar.get_column_name(tab_id, msar.get_pk_column(tab_id)),
+      /* %4 */ pk_type,
+      /* %5 */ COALESCE(
+        format(
+          '(SELECT to_jsonb(__msar_rec) FROM (SELECT %s) AS __msar_rec)',
+          msar.build_selectable_column_expr(tab_id)
+        ),
+        '''{}''::jsonb'
+      )
+    ) USING rec_keys INTO records;
+  END IF;
+  IF return_records OR return_record_summaries THEN
+    summaries := msar.get_record_summaries_by_keys(
+      tab_id, rec_keys, return_record_summaries, table_record_summary_templates
+    );
+  END IF;
+  RETURN jsonb_build_object(
+    'keys', rec_keys,
+    'results', records,
+    'record_summaries', summaries -> 'record_summaries',
+    'linked_record_summaries', CASE WHEN return_records THEN summaries -> 'linked_record_summaries' END
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION msar.get_simple_mapping_regclass(join_path jsonb) RETURNS regclass AS $$
   SELECT (join_path -> 0 -> 1 ->> 0)::bigint;
 $$ LANGUAGE SQL;
@@ -5960,43 +7297,343 @@ END;
 $$ LANGUAGE plpgsql;
 
 
-CREATE OR REPLACE FUNCTION msar.list_by_record_summaries(
-  tab_id oid,
-  limit_ integer,
-  offset_ integer,
-  search_ text DEFAULT NULL,
-  table_record_summary_templates jsonb DEFAULT NULL,
-  linked_record_path jsonb DEFAULT NULL
-) RETURNS jsonb
-LANGUAGE plpgsql STABLE
-AS $$/*
-Get record summaries from a table, optionally filtering by a search term. Results are sorted by
-the summary text.
+----------------------------------------------------------------------------------------------------
+-- Record summary index
+--
+-- An optional, maintained copy of the record summaries of a table, used by
+-- msar.list_by_record_summaries (and hence the row seeker) to avoid rendering and sorting the
+-- summary of every record of the table for every request.
+--
+-- The index of a table is a side table in the msar_record_summaries schema, named by the table's
+-- OID, holding a (key, summary) row for each record. It has a btree index on the summary for sorted
+-- listing, and (if the pg_trgm extension is installed) a trigram index for substring searches. The
+-- side table is kept current by statement-level triggers on the table, and its comment holds the
+-- summary query it was built from. The index is only used when that query matches the query that
+-- would be used for the current request, so a change to the template, the table's columns, or the
+-- user's privileges makes us fall back to rendering the summaries directly.
+--
+-- Roles can't create objects in the msar_record_summaries schema themselves, so that they can't
+-- take the name of another table's index. Instead, the side table and trigger function are created
+-- (and owned) by the role owning the msar schemas, through SECURITY DEFINER functions which check
+-- that the session user owns the indexed table. The triggers themselves are created by the table
+-- owner.
+--
+-- Only templates referencing columns of the table itself can be indexed, since changes to linked
+-- tables would not be picked up by the triggers.
+----------------------------------------------------------------------------------------------------
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_record_summary_index(tab_id oid, summary_query text) RETURNS regclass AS $$/*
+Return the side table of the record summary index for a table, if it can be used for a query.
+
+Returns NULL if there is no index, if it was built from a different summary query, or if the user
+can't read it.
 
 Args:
-  tab_id: The OID of the table whose record summaries we'll get.
-  limit_: The maximum number of record summaries to return.
-  offset_: The number of record summaries to skip before returning results.
-  search_: A search term to filter the summaries by. If provided, only summaries containing this
-    term (case insensitive) in their text will be returned.
-  table_record_summary_templates: (optional) A JSON object that maps table OIDs to record summary
-    templates.
-  linked_record_path: (optional) A JSON object that represents linkages via a simple many-to-many
-    mapping to a record in another table. This can be used to determine whether the listed
-    summaries are derived from records which are linked from the other table.
+  tab_id: The OID of the table whose summaries we want.
+  summary_query: The query that renders the summaries, from msar.build_record_summary_query_for_table.
+*/
+SELECT pgc.oid::regclass
+FROM pg_catalog.pg_class AS pgc
+  INNER JOIN pg_catalog.pg_namespace AS pgn
+    ON pgn.oid = pgc.relnamespace AND pgn.nspowner = pgc.relowner
+WHERE
+  pgn.nspname = 'msar_record_summaries'
+  AND pgc.relname = tab_id::text
+  AND pg_catalog.obj_description(pgc.oid, 'pg_class') = summary_query
+  AND pg_catalog.has_table_privilege(pgc.oid, 'SELECT')
+  AND pg_catalog.has_table_privilege(tab_id, 'SELECT');
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.record_summary_index_is_manageable(tab_id oid) RETURNS boolean AS $$/*
+Return true if the session user may build or drop the record summary index of a table.
+
+The session user (rather than the current user) is checked, since this is called from SECURITY
+DEFINER functions. Indexes of tables which no longer exist may be dropped by anyone.
+
+Args:
+  tab_id: The OID of the table whose record summary index we'll manage.
+*/
+SELECT COALESCE(
+  (SELECT pg_catalog.pg_has_role(session_user, relowner, 'USAGE') FROM pg_catalog.pg_class WHERE oid = tab_id),
+  true
+);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.sync_record_summary_index_privileges(tab_id oid) RETURNS void AS $$/*
+Allow exactly those roles which can select from a table to select from its record summary index.
 
+Does nothing if the table has no record summary index, or if the session user doesn't own the
+table.
+
+Args:
+  tab_id: The OID of the table whose record summary index we'll update.
 */
 DECLARE
-  search_where_clause text := '';
-  mapping_join_path jsonb;
-  mapped_record_pkey text;
-  final_sql text;
-  result_json jsonb;
+  idx_id regclass;
 BEGIN
-  IF search_ IS NOT NULL AND search_ <> '' THEN
-    search_where_clause := format(' WHERE summary ILIKE %L', '%'||search_||'%');
+  SELECT pgc.oid INTO idx_id
+  FROM pg_catalog.pg_class AS pgc
+  WHERE
+    pgc.relnamespace = 'msar_record_summaries'::regnamespace
+    AND pgc.relname = tab_id::text;
+  IF idx_id IS NULL OR NOT msar.record_summary_index_is_manageable(tab_id) THEN
+    RETURN;
+  END IF;
+  EXECUTE concat_ws(
+    E';\n',
+    format('REVOKE ALL ON %s FROM PUBLIC', idx_id),
+    (
+      SELECT string_agg(format('REVOKE ALL ON %s FROM %I', idx_id, pgr.rolname), E';\n')
+      FROM pg_catalog.aclexplode((SELECT relacl FROM pg_catalog.pg_class WHERE oid = idx_id)) AS acl
+        INNER JOIN pg_catalog.pg_roles AS pgr ON pgr.oid = acl.grantee
+      WHERE acl.grantee <> acl.grantor
+    ),
+    (
+      SELECT string_agg(format('GRANT SELECT ON %s TO %I', idx_id, pgr.rolname), E';\n')
+      FROM pg_catalog.pg_roles AS pgr
+      WHERE
+        pgr.rolname NOT LIKE 'pg\_%'
+        AND pg_catalog.has_table_privilege(pgr.oid, tab_id, 'SELECT')
+    )
+  );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp
+RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.drop_record_summary_index(tab_id oid) RETURNS void AS $$/*
+Drop the record summary index of a table (along with its triggers), if it has one.
+
+The session user must own the table, unless the table no longer exists.
+
+Args:
+  tab_id: The OID of the table whose record summary index we'll drop.
+*/
+BEGIN
+  IF NOT msar.record_summary_index_is_manageable(tab_id) THEN
+    RAISE EXCEPTION 'Only the owner of a table can drop its record summary index.'
+      USING ERRCODE = 'insufficient_privilege';
+  END IF;
+  -- Dropping the trigger function drops the triggers using it.
+  EXECUTE format('DROP FUNCTION IF EXISTS msar_record_summaries.%I() CASCADE', tab_id::text);
+  EXECUTE format('DROP TABLE IF EXISTS msar_record_summaries.%I', tab_id::text);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp
+RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_record_summary_index(tab_id oid, template jsonb) RETURNS void AS $$/*
+Build (or rebuild) the side table of the record summary index of a table, and its trigger function.
+
+This runs with the privileges of the role owning the msar schemas, which owns the side table and
+the trigger function, and must be able to read the table. The session user must own the table, and
+is allowed to execute the trigger function, so that it can create the triggers using it. See
+msar.create_record_summary_index.
+
+Args:
+  tab_id: The OID of the table whose record summaries we'll index.
+  template: The record summary template to index.
+*/
+DECLARE
+  idx_name text := tab_id::text;
+  pkey_col_id smallint := msar.get_selectable_pkey_attnum(tab_id);
+  summary_query text;
+  trgm_sch_name text;
+  trigger_body text;
+BEGIN
+  IF NOT msar.record_summary_index_is_manageable(tab_id) THEN
+    RAISE EXCEPTION 'Only the owner of a table can index its record summaries.'
+      USING ERRCODE = 'insufficient_privilege';
+  END IF;
+  IF NOT pg_catalog.has_table_privilege(tab_id, 'SELECT') THEN
+    RAISE EXCEPTION 'Record summaries can only be indexed for tables readable by %.', current_user
+      USING ERRCODE = 'insufficient_privilege';
+  END IF;
+  IF pkey_col_id IS NULL THEN
+    RAISE EXCEPTION 'Record summaries can only be indexed for tables with a single column primary key.'
+      USING ERRCODE = 'feature_not_supported';
+  END IF;
+  IF EXISTS (
+    SELECT 1 FROM jsonb_array_elements(template) AS part
+    WHERE jsonb_typeof(part) = 'array' AND jsonb_array_length(part) > 1
+  ) THEN
+    RAISE EXCEPTION 'Record summaries which refer to linked tables can''t be indexed.'
+      USING ERRCODE = 'feature_not_supported';
+  END IF;
+  summary_query := msar.build_record_summary_query_for_table(
+    tab_id, pkey_col_id, jsonb_build_object(tab_id::text, template)
+  );
+  PERFORM msar.drop_record_summary_index(tab_id);
+
+  EXECUTE format('CREATE TABLE msar_record_summaries.%I AS %s', idx_name, summary_query);
+  EXECUTE format('ALTER TABLE msar_record_summaries.%I ADD PRIMARY KEY (key)', idx_name);
+  EXECUTE format('CREATE INDEX ON msar_record_summaries.%I (summary)', idx_name);
+  SELECT pgn.nspname INTO trgm_sch_name
+  FROM pg_catalog.pg_extension AS pge
+    INNER JOIN pg_catalog.pg_namespace AS pgn ON pgn.oid = pge.extnamespace
+  WHERE pge.extname = 'pg_trgm';
+  IF trgm_sch_name IS NOT NULL THEN
+    EXECUTE format(
+      'CREATE INDEX ON msar_record_summaries.%I USING gin (summary %I.gin_trgm_ops)',
+      idx_name,
+      trgm_sch_name
+    );
+  END IF;
+  EXECUTE format('COMMENT ON TABLE msar_record_summaries.%I IS %L', idx_name, summary_query);
+
+  trigger_body := format(
+    $t$
+    BEGIN
+      IF TG_OP = 'TRUNCATE' THEN
+        TRUNCATE msar_record_summaries.%1$I;
+        RETURN NULL;
+      END IF;
+      IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM msar_record_summaries.%1$I WHERE key IN (SELECT %2$I FROM old_rows);
+      END IF;
+      IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO msar_record_summaries.%1$I
+        SELECT * FROM (%3$s) AS summaries WHERE key IN (SELECT %2$I FROM new_rows);
+      END IF;
+      RETURN NULL;
+    EXCEPTION
+      WHEN undefined_column OR undefined_table OR undefined_function OR datatype_mismatch
+        OR insufficient_privilege THEN
+      -- The summary query no longer fits the table, e.g., a column used by the summary was dropped
+      -- or its type changed. Rather than blocking changes to the table, mark the index as stale so
+      -- that it isn't used until it's rebuilt.
+      COMMENT ON TABLE msar_record_summaries.%1$I IS NULL;
+      RETURN NULL;
+    END;
+    $t$,
+    /* %1 */ idx_name,
+    /* %2 */ msar.get_column_name(tab_id, pkey_col_id),
+    /* %3 */ summary_query
+  );
+  EXECUTE format(
+    $f$
+    CREATE FUNCTION msar_record_summaries.%1$I() RETURNS trigger AS %2$L
+    LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp
+    $f$,
+    idx_name,
+    trigger_body
+  );
+  EXECUTE format(
+    'REVOKE ALL ON FUNCTION msar_record_summaries.%I() FROM PUBLIC', idx_name
+  );
+  EXECUTE format(
+    'GRANT EXECUTE ON FUNCTION msar_record_summaries.%I() TO %I',
+    idx_name,
+    (SELECT pg_catalog.pg_get_userbyid(relowner) FROM pg_catalog.pg_class WHERE oid = tab_id)
+  );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp
+RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.create_record_summary_index(
+  tab_id oid,
+  table_record_summary_templates jsonb DEFAULT NULL
+) RETURNS void AS $$/*
+Build (or rebuild) the record summary index of a table, and the triggers maintaining it.
+
+The current role must own the table. The triggers run with the privileges of the index owner, so
+any role that can modify the table can keep its index current.
+
+Args:
+  tab_id: The OID of the table whose record summaries we'll index.
+  table_record_summary_templates: (optional) A JSON object that maps table OIDs to record summary
+    templates. The template for the given table is used, defaulting to an automatic one.
+*/
+DECLARE
+  idx_name text := tab_id::text;
+BEGIN
+  PERFORM msar.build_record_summary_index(
+    tab_id,
+    COALESCE(
+      NULLIF(table_record_summary_templates -> tab_id::text, 'null'::jsonb),
+      msar.auto_generate_record_summary_template(tab_id)
+    )
+  );
+  EXECUTE format(
+    $c$
+    CREATE TRIGGER msar_record_summary_index_insert AFTER INSERT ON %1$I.%2$I
+      REFERENCING NEW TABLE AS new_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION msar_record_summaries.%3$I();
+    CREATE TRIGGER msar_record_summary_index_update AFTER UPDATE ON %1$I.%2$I
+      REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION msar_record_summaries.%3$I();
+    CREATE TRIGGER msar_record_summary_index_delete AFTER DELETE ON %1$I.%2$I
+      REFERENCING OLD TABLE AS old_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION msar_record_summaries.%3$I();
+    CREATE TRIGGER msar_record_summary_index_truncate AFTER TRUNCATE ON %1$I.%2$I
+      FOR EACH STATEMENT EXECUTE FUNCTION msar_record_summaries.%3$I();
+    $c$,
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    idx_name
+  );
+  PERFORM msar.sync_record_summary_index_privileges(tab_id);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION msar.list_by_record_summaries(
+  tab_id oid,
+  limit_ integer,
+  offset_ integer,
+  search_ text DEFAULT NULL,
+  table_record_summary_templates jsonb DEFAULT NULL,
+  linked_record_path jsonb DEFAULT NULL
+) RETURNS jsonb
+LANGUAGE plpgsql STABLE
+AS $$/*
+Get record summaries from a table, optionally filtering by a search term. Results are sorted by
+the summary text.
+
+If the table has a usable record summary index (see msar.create_record_summary_index), the
+summaries are read from it, rather than rendered for every record of the table.
+
+Args:
+  tab_id: The OID of the table whose record summaries we'll get.
+  limit_: The maximum number of record summaries to return.
+  offset_: The number of record summaries to skip before returning results.
+  search_: A search term to filter the summaries by. If provided, only summaries containing this
+    term (case insensitive) in their text will be returned.
+  table_record_summary_templates: (optional) A JSON object that maps table OIDs to record summary
+    templates.
+  linked_record_path: (optional) A JSON object that represents linkages via a simple many-to-many
+    mapping to a record in another table. This can be used to determine whether the listed
+    summaries are derived from records which are linked from the other table.
+
+*/
+DECLARE
+  search_where_clause text := '';
+  mapping_join_path jsonb;
+  mapped_record_pkey text;
+  summary_query text;
+  summary_idx_id regclass;
+  final_sql text;
+  result_json jsonb;
+BEGIN
+  IF search_ IS NOT NULL AND search_ <> '' THEN
+    search_where_clause := format(' WHERE summary ILIKE %L', '%'||search_||'%');
   END IF;
 
+  summary_query := msar.build_record_summary_query_for_table(
+    tab_id, NULL, table_record_summary_templates
+  );
+  summary_idx_id := msar.get_record_summary_index(tab_id, summary_query);
+
   mapping_join_path := linked_record_path -> 'join_path';
   mapped_record_pkey := linked_record_path ->> 'record_pkey';
 
@@ -6004,7 +7641,7 @@ BEGIN
     $q$
     WITH
       all_record_summaries AS ( %1$s ),
-      filtered AS ( SELECT * FROM all_record_summaries %2$s ),
+      filtered AS %7$s ( SELECT * FROM all_record_summaries %2$s ),
       sorted AS ( SELECT * FROM filtered ORDER BY summary LIMIT %3$s OFFSET %4$s ),
       results AS ( SELECT coalesce(jsonb_agg(sorted), '[]') AS results FROM sorted ),
       count_all_results AS ( SELECT count(*) AS num FROM filtered ),
@@ -6024,12 +7661,15 @@ BEGIN
       )
     FROM count_all_results, results, agg_mapping_cte
     $q$,
-    /* 1 */ msar.build_record_summary_query_for_table(tab_id, NULL, table_record_summary_templates),
+    /* 1 */ COALESCE('SELECT key, summary FROM ' || summary_idx_id::text, summary_query),
     /* 2 */ search_where_clause,
     /* 3 */ limit_,
     /* 4 */ offset_,
     /* 5 */ msar.get_simple_mapping_join_cte(mapping_join_path, mapped_record_pkey::text),
-    /* 6 */ msar.get_simple_mapping_regclass(mapping_join_path)::oid
+    /* 6 */ msar.get_simple_mapping_regclass(mapping_join_path)::oid,
+    -- With an index, `sorted` and `count_all_results` should each query it directly (using its
+    -- indexes), rather than sharing a materialized scan.
+    /* 7 */ CASE WHEN summary_idx_id IS NOT NULL THEN 'NOT MATERIALIZED' END
   );
 
   EXECUTE final_sql INTO result_json;
@@ -6315,7 +7955,8 @@ Note: This doesn't handle aliasing.
 $$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
 
 
-CREATE OR REPLACE FUNCTION msar.get_joined_columns_expr_json(joined_columns jsonb)
+CREATE OR REPLACE FUNCTION
+msar.get_joined_columns_expr_json(joined_columns jsonb, page_name text DEFAULT '__mathesar_page')
 RETURNS jsonb AS $$/*
 Returns a json object containing SQL exprs essential for listing aggregates of pk-ids for a table
 which is connect via a simple many-to-many relation.
@@ -6326,59 +7967,1261 @@ joined_columns should have the folowing form:
   {"alias": "column_alias_2", "join_path": [[[17837, 1], [17847, 2]], [[17847, 3], [17874, 1]]]},
 ]
 
+The exprs are meant to be applied to an already-paginated set of records of the base table (named
+`page_name`), whose columns are named by attnum. For each joined column, a LATERAL subquery gets the
+count of linked records, and the ids of (at most) the first 25 of them, for each record of the page
+via the mapping table. So, the cost is proportional to the size of the page, rather than that of
+the base table.
+
 Args:
   joined_columns: A list of JSON object that include an "alias" and "join_path" where,
     "join_path" represents linkages via a simple many-to-many mapping to a column in another table.
+  page_name: The name of the relation holding the page of base table records.
 */
   WITH cte AS (
     SELECT
       t.alias AS alias,
-      msar.get_relation_name((t.join_path->0->0->>0)::oid) AS base_tab_name,
-      msar.get_column_name((t.join_path->0->0->>0)::oid, (t.join_path->0->0->>1)::int) AS base_tab_col_name,
-      msar.get_relation_name((t.join_path->-1->-1->>0)::oid) AS target_tab_name,
-      msar.get_column_name((t.join_path->-1->-1->>0)::oid, (t.join_path->-1->-1->>1)::int) AS target_tab_col_name,
-      msar.build_join_expr(t.join_path) AS join_expr
+      t.ordinality AS ordinality,
+      t.join_path->0->0->>1 AS base_tab_attnum,
+      __msar.get_qualified_relation_name((t.join_path->0->1->>0)::oid) AS map_tab_name,
+      msar.get_column_name((t.join_path->0->1->>0)::oid, (t.join_path->0->1->>1)::int) AS map_tab_base_col_name,
+      msar.get_column_name((t.join_path->1->0->>0)::oid, (t.join_path->1->0->>1)::int) AS map_tab_target_col_name,
+      __msar.get_qualified_relation_name((t.join_path->-1->-1->>0)::oid) AS target_tab_name,
+      msar.get_column_name((t.join_path->-1->-1->>0)::oid, (t.join_path->-1->-1->>1)::int) AS target_tab_col_name
     FROM ROWS FROM (
       jsonb_to_recordset(joined_columns) AS (
         alias text,
         join_path jsonb
       )
     ) WITH ORDINALITY AS t(alias, join_path)
-    ORDER BY ordinality
+  ), linked_cte AS (
+    SELECT
+      cte.alias,
+      cte.ordinality,
+      format(
+        '%1$s AS __m INNER JOIN %2$s AS __t ON __m.%3$I = __t.%4$I WHERE __m.%5$I = %6$I.%7$I',
+        cte.map_tab_name,
+        cte.target_tab_name,
+        cte.map_tab_target_col_name,
+        cte.target_tab_col_name,
+        cte.map_tab_base_col_name,
+        page_name,
+        cte.base_tab_attnum
+      ) AS linked_from_expr,
+      cte.target_tab_col_name
+    FROM cte
   ) SELECT jsonb_build_object(
       'selectable_joined_columns_expr', string_agg(
+        format('%1$I.%1$I', alias), ', ' ORDER BY ordinality
+      ),
+      'lateral_join_expr', string_agg(
         format(
           $q$
-          jsonb_build_object(
-            'count', COUNT(DISTINCT %1$I.%2$I),
-            'result', jsonb_path_query_array(
-              COALESCE(
-                NULLIF(
-                  jsonb_agg(DISTINCT %1$I.%2$I),
-                  '[null]'::jsonb
-                ),
-                '[]'::jsonb
-              ), '$[0 to 24]'
-            ) -- limit results to 25
-          ) AS %3$I
+          CROSS JOIN LATERAL (
+            SELECT jsonb_build_object(
+              'count', (SELECT COUNT(DISTINCT __t.%2$I) FROM %3$s),
+              'result', (
+                SELECT COALESCE(jsonb_agg(__ids.id ORDER BY __ids.id), '[]'::jsonb)
+                FROM (
+                  SELECT DISTINCT __t.%2$I AS id FROM %3$s ORDER BY 1 LIMIT 25
+                ) AS __ids
+              ) -- limit results to 25
+            )
+          ) AS %1$I(%1$I)
           $q$,
-          cte.target_tab_name,
-          cte.target_tab_col_name,
-          cte.alias
+          alias,
+          target_tab_col_name,
+          linked_from_expr
         ),
-        ', '
+        E'\n' ORDER BY ordinality
+      )
+  ) FROM linked_cte
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+----------------------------------------------------------------------------------------------------
+-- Explorations
+--
+-- An exploration is defined by a base table, a list of initial columns (each from the base table or
+-- from a table reached by a path of joins from it), and a list of transformations applied to those
+-- columns in sequence. The functions below compile such a definition into SQL directly from the
+-- catalog, using OIDs and attnums, and run it.
+--
+-- Each transformation is compiled into a CTE selecting from the previous one, so the output columns
+-- of each step are named by their aliases. Filters use the function specs of the (deprecated)
+-- Python DB functions, e.g., {"equal": [{"column_name": ["alias"]}, {"literal": [3]}]}.
+--
+-- Definitions using a function or transformation these functions don't know, or a summarization
+-- which doesn't mention every input column, raise a `feature_not_supported` error. Callers are
+-- expected to fall back to the Python implementation in that case.
+----------------------------------------------------------------------------------------------------
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_exploration_function_template(fn_id text) RETURNS text AS $$/*
+Return a format() template implementing an exploration (DB) function, or NULL if it's unknown.
+
+The template takes the SQL expressions of the function's parameters as positional arguments. The
+logical functions `and`, `or`, and `not`, which take any number of parameters, are handled by
+msar.build_exploration_expr instead.
+
+Args:
+  fn_id: The id of the DB function, e.g., 'equal' or 'truncate_to_month'.
+*/
+SELECT CASE fn_id
+  -- comparison
+  WHEN 'equal' THEN '(%s) = (%s)'
+  WHEN 'greater' THEN '(%s) > (%s)'
+  WHEN 'lesser' THEN '(%s) < (%s)'
+  WHEN 'greater_or_equal' THEN '(%s) >= (%s)'
+  WHEN 'lesser_or_equal' THEN '(%s) <= (%s)'
+  WHEN 'null' THEN '(%s) IS NULL'
+  WHEN 'not_null' THEN '(%s) IS NOT NULL'
+  -- strings
+  WHEN 'starts_with' THEN '(%s) LIKE ((%s) || ''%%'')'
+  WHEN 'contains' THEN '(%s) LIKE (''%%'' || (%s) || ''%%'')'
+  WHEN 'starts_with_case_insensitive' THEN '(%s) ILIKE ((%s) || ''%%'')'
+  WHEN 'contains_case_insensitive' THEN '(%s) ILIKE (''%%'' || (%s) || ''%%'')'
+  WHEN 'to_lowercase' THEN 'lower(%s)'
+  -- arrays
+  WHEN 'array_length' THEN 'coalesce(array_length(%s, %s), 0)'
+  WHEN 'array_length_equals' THEN '(coalesce(array_length(%s, %s), 0)) = (%s)'
+  WHEN 'array_length_greater_than' THEN '(coalesce(array_length(%s, %s), 0)) > (%s)'
+  WHEN 'array_length_lesser_than' THEN '(coalesce(array_length(%s, %s), 0)) < (%s)'
+  WHEN 'array_length_greater_than_or_equal' THEN '(coalesce(array_length(%s, %s), 0)) >= (%s)'
+  WHEN 'array_length_lesser_than_or_equal' THEN '(coalesce(array_length(%s, %s), 0)) <= (%s)'
+  WHEN 'array_not_empty' THEN 'coalesce(array_length(%s, %s), 0) > 0'
+  -- JSON arrays
+  WHEN 'json_array_length' THEN 'jsonb_array_length((%s)::jsonb)'
+  WHEN 'json_array_contains' THEN '(%s)::jsonb @> (%s)::jsonb'
+  WHEN 'json_array_length_equals' THEN 'jsonb_array_length((%s)::jsonb) = (%s)'
+  WHEN 'json_array_length_greater_than' THEN 'jsonb_array_length((%s)::jsonb) > (%s)'
+  WHEN 'json_array_length_greater_or_equal' THEN 'jsonb_array_length((%s)::jsonb) >= (%s)'
+  WHEN 'json_array_length_less_than' THEN 'jsonb_array_length((%s)::jsonb) < (%s)'
+  WHEN 'json_array_length_less_or_equal' THEN 'jsonb_array_length((%s)::jsonb) <= (%s)'
+  WHEN 'json_array_not_empty' THEN 'jsonb_array_length((%s)::jsonb) > 0'
+  -- URIs and emails
+  WHEN 'extract_uri_authority' THEN 'msar.uri_authority(%s)'
+  WHEN 'extract_uri_scheme' THEN 'msar.uri_scheme(%s)'
+  WHEN 'uri_authority_contains' THEN 'msar.uri_authority(%s) LIKE (''%%'' || (%s) || ''%%'')'
+  WHEN 'uri_scheme_equals' THEN 'msar.uri_scheme(%s) = (%s)'
+  WHEN 'extract_email_domain' THEN 'msar.email_domain_name(%s)'
+  WHEN 'email_domain_contains' THEN 'msar.email_domain_name(%s) LIKE (''%%'' || (%s) || ''%%'')'
+  WHEN 'email_domain_equals' THEN 'msar.email_domain_name(%s) = (%s)'
+  -- dates and times
+  WHEN 'truncate_to_year' THEN 'to_char(%s, ''YYYY'')'
+  WHEN 'truncate_to_month' THEN 'to_char(%s, ''YYYY-MM'')'
+  WHEN 'truncate_to_day' THEN 'to_char(%s, ''YYYY-MM-DD'')'
+  WHEN 'current_date' THEN 'current_date'
+  WHEN 'current_time' THEN 'current_time'
+  WHEN 'current_datetime' THEN 'current_timestamp'
+  -- aggregates
+  WHEN 'count' THEN 'count(%s)'
+  WHEN 'max' THEN 'max(%s)'
+  WHEN 'min' THEN 'min(%s)'
+  WHEN 'mode' THEN 'mode() WITHIN GROUP (ORDER BY %s)'
+  WHEN 'mean' THEN 'avg(%s)'
+  WHEN 'sum' THEN 'sum(%s)'
+  WHEN 'median' THEN 'percentile_disc(0.5) WITHIN GROUP (ORDER BY %s)'
+  WHEN 'percentage_true' THEN 'avg(100 * (%s)::integer)'
+  WHEN 'peak_time' THEN 'msar.peak_time((%s)::time)'
+  WHEN 'peak_month' THEN 'msar.peak_month((%s)::date)'
+  WHEN 'aggregate_to_array' THEN 'array_agg(%s)'
+  WHEN 'distinct_aggregate_to_array' THEN 'array_agg(DISTINCT %s)'
+END;
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.build_exploration_literal(val jsonb) RETURNS text AS $$/*
+Return an SQL literal for the given JSON value. The literal is untyped unless it's NULL.
+
+Args:
+  val: A JSON string, number, boolean, array, object, or null.
+*/
+SELECT CASE jsonb_typeof(val)
+  WHEN 'null' THEN 'NULL'
+  WHEN 'string' THEN quote_literal(val #>> '{}')
+  ELSE quote_literal(val::text)
+END;
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.build_exploration_expr(tree jsonb) RETURNS text AS $$/*
+Build an SQL expression from an exploration function spec.
+
+A spec is an object with a single key, the id of the function, whose value is the array of
+parameters. Columns are referenced by their alias with `column_name`, and values are given with
+`literal`. For example:
+
+  {"and": [
+    {"null": [{"column_name": ["Title"]}]},
+    {"greater": [{"column_name": ["Year"]}, {"literal": [1990]}]}
+  ]}
+
+Raises `feature_not_supported` for unknown function ids.
+
+Args:
+  tree: The function spec.
+*/
+DECLARE
+  fn_id text;
+  args jsonb;
+  arg_exprs text[];
+  template text;
+BEGIN
+  IF jsonb_typeof(tree) <> 'object' THEN
+    RAISE EXCEPTION 'Function specs must be objects, got %', tree
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+  SELECT key, value INTO fn_id, args FROM jsonb_each(tree) LIMIT 1;
+  IF jsonb_typeof(args) IS DISTINCT FROM 'array' THEN
+    RAISE EXCEPTION 'The parameters of function % must be an array', fn_id
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+  CASE fn_id
+    WHEN 'column_name' THEN RETURN quote_ident(args ->> 0);
+    WHEN 'literal' THEN RETURN msar.build_exploration_literal(args -> 0);
+    ELSE
+      SELECT array_agg(msar.build_exploration_expr(arg) ORDER BY ordinality) INTO arg_exprs
+      FROM jsonb_array_elements(args) WITH ORDINALITY AS x(arg, ordinality);
+  END CASE;
+  CASE fn_id
+    WHEN 'and' THEN RETURN '(' || array_to_string(arg_exprs, ') AND (') || ')';
+    WHEN 'or' THEN RETURN '(' || array_to_string(arg_exprs, ') OR (') || ')';
+    WHEN 'not' THEN RETURN 'NOT ((' || array_to_string(arg_exprs, ') AND (') || '))';
+    ELSE template := msar.get_exploration_function_template(fn_id);
+  END CASE;
+  IF template IS NULL THEN
+    RAISE EXCEPTION 'The function % is not supported in explorations', fn_id
+      USING ERRCODE = 'feature_not_supported';
+  END IF;
+  RETURN format(template, VARIADIC arg_exprs);
+END;
+$$ LANGUAGE plpgsql IMMUTABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_exploration_order_by_expr(rel_name text, order_ jsonb, cols jsonb) RETURNS text AS $$/*
+Build a deterministic ORDER BY expression for a step of an exploration.
+
+The row key columns of the step (see msar.build_exploration_query) are appended to the given
+ordering. If that gives nothing to order by, all orderable columns (i.e., not arrays, JSON, or
+binary data) are used instead.
+
+Args:
+  rel_name: The name of the CTE or subquery whose columns are ordered by; it's used to qualify
+    the column names, so they can't be confused with output columns of the same name.
+  order_: An array of objects of the form
+    {"field": <alias>, "direction": "asc" | "desc", "nullsfirst": <bool>, "nullslast": <bool>}
+  cols: An array of the columns of the step, as built by msar.build_exploration_query.
+*/
+WITH order_cte AS (
+  SELECT
+    x.field AS alias,
+    msar.sanitize_direction(x.direction) AS direction,
+    CASE
+      WHEN x.nullsfirst THEN ' NULLS FIRST'
+      WHEN x.nullslast THEN ' NULLS LAST'
+      ELSE ''
+    END AS nulls,
+    x.ordinality AS ordinality
+  FROM ROWS FROM (
+    jsonb_to_recordset(COALESCE(order_, '[]'::jsonb))
+      AS (field text, direction text, nullsfirst boolean, nullslast boolean)
+  ) WITH ORDINALITY AS x(field, direction, nullsfirst, nullslast, ordinality)
+  UNION ALL
+  SELECT col ->> 'alias', 'ASC', '', 1000000 + c.ordinality
+  FROM jsonb_array_elements(cols) WITH ORDINALITY AS c(col, ordinality)
+  WHERE (col ->> 'row_key')::boolean
+), total_order_cte AS (
+  SELECT alias, direction, nulls, ordinality FROM order_cte
+  UNION ALL
+  SELECT col ->> 'alias', 'ASC', '', c.ordinality
+  FROM jsonb_array_elements(cols) WITH ORDINALITY AS c(col, ordinality)
+    INNER JOIN pg_catalog.pg_type AS pgt ON pgt.oid = (col ->> 'type_id')::oid
+  WHERE
+    NOT EXISTS (SELECT 1 FROM order_cte)
+    AND pgt.typcategory <> 'A'
+    AND pgt.oid::regtype <> ALL('{json, jsonb, bytea}'::regtype[])
+)
+SELECT 'ORDER BY ' || string_agg(
+  format('%I.%I %s%s', rel_name, alias, COALESCE(direction, 'ASC'), nulls),
+  ', ' ORDER BY ordinality
+)
+FROM total_order_cte;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_exploration_keyset(order_ jsonb, cols jsonb) RETURNS jsonb AS $$/*
+Return the keyset of the deterministic order of the records of an exploration; see "Keyset
+pagination" above.
+
+The given ordering is followed by the row key columns (see msar.build_exploration_query) or, if
+there are none, by all orderable columns (i.e., not arrays, JSON, or binary data), so that distinct
+records are distinguished. Only row key columns are taken to be NOT NULL.
+
+Returns NULL if the records can't be paged with cursors, i.e., if the ordering refers to a column
+which isn't in `cols`, or places NULLs other than where PostgreSQL does by default (last for
+ascending, first for descending order), or if there's nothing to order by.
+
+Args:
+  order_: An array of objects of the form
+    {"field": <alias>, "direction": "asc" | "desc", "nullsfirst": <bool>, "nullslast": <bool>}
+  cols: An array of the output columns of the exploration, as built by msar.build_exploration_query.
+*/
+WITH order_cte AS (
+  SELECT
+    x.field AS alias,
+    COALESCE(msar.sanitize_direction(x.direction), 'ASC') AS direction,
+    CASE COALESCE(msar.sanitize_direction(x.direction), 'ASC')
+      WHEN 'ASC' THEN COALESCE(x.nullsfirst, false)
+      ELSE COALESCE(x.nullslast, false)
+    END AS nulls_moved,
+    x.ordinality AS ordinality
+  FROM ROWS FROM (
+    jsonb_to_recordset(COALESCE(order_, '[]'::jsonb))
+      AS (field text, direction text, nullsfirst boolean, nullslast boolean)
+  ) WITH ORDINALITY AS x(field, direction, nullsfirst, nullslast, ordinality)
+), cols_cte AS (
+  SELECT
+    col ->> 'alias' AS alias,
+    COALESCE((col ->> 'row_key')::boolean, false) AS row_key,
+    pgt.typcategory <> 'A' AND pgt.oid::regtype <> ALL('{json, jsonb, bytea}'::regtype[])
+      AS orderable,
+    c.ordinality AS ordinality
+  FROM jsonb_array_elements(cols) WITH ORDINALITY AS c(col, ordinality)
+    LEFT JOIN pg_catalog.pg_type AS pgt ON pgt.oid = (col ->> 'type_id')::oid
+), keys_cte AS (
+  SELECT o.alias, o.direction, COALESCE(c.row_key, false) AS not_null, o.ordinality
+  FROM order_cte AS o LEFT JOIN cols_cte AS c USING (alias)
+  UNION ALL
+  SELECT alias, 'ASC', true, 1000000 + ordinality FROM cols_cte WHERE row_key
+  UNION ALL
+  SELECT alias, 'ASC', false, 2000000 + ordinality FROM cols_cte
+  WHERE orderable AND NOT EXISTS (SELECT 1 FROM cols_cte WHERE row_key)
+), distinct_keys_cte AS (
+  SELECT DISTINCT ON (alias) alias, direction, not_null, ordinality
+  FROM keys_cte
+  ORDER BY alias, ordinality
+)
+SELECT CASE WHEN NOT EXISTS (
+  SELECT 1 FROM order_cte AS o LEFT JOIN cols_cte AS c USING (alias)
+  WHERE c.alias IS NULL OR o.nulls_moved
+) THEN
+  jsonb_agg(
+    jsonb_build_object('name', alias, 'direction', direction, 'not_null', not_null)
+    ORDER BY ordinality
+  )
+END
+FROM distinct_keys_cte;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_exploration_query_types(query text, aliases text[]) RETURNS jsonb AS $$/*
+Return an object mapping each of the given output columns of a query to the OID of its type.
+
+The query is planned, but not run; no rows are read.
+
+Args:
+  query: The query whose output columns we'll describe.
+  aliases: The names of the output columns.
+*/
+DECLARE
+  types jsonb;
+BEGIN
+  EXECUTE format(
+    $q$
+    SELECT jsonb_object(%1$L::text[], ARRAY[%2$s]::text[])
+    FROM (SELECT 1) AS __mathesar_dummy LEFT JOIN (%3$s LIMIT 0) AS __mathesar_q ON true
+    $q$,
+    aliases,
+    (
+      SELECT string_agg(format('pg_typeof(__mathesar_q.%I)::oid', alias), ', ' ORDER BY ordinality)
+      FROM unnest(aliases) WITH ORDINALITY AS x(alias, ordinality)
+    ),
+    query
+  ) INTO types;
+  RETURN types;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION msar.build_exploration_query(exploration jsonb) RETURNS jsonb AS $$/*
+Compile an exploration definition into SQL.
+
+The definition is an object with the keys:
+  base_table_oid: The OID of the base table.
+  initial_columns: An array of objects of the form
+    {"alias": <text>, "attnum": <int>, "join_path": [[[<oid>, <attnum>], [<oid>, <attnum>]], ...]}
+    where the (optional) join path gives the columns joined at each step, starting from the base
+    table, and the attnum is that of a column in the last table of the path.
+  transformations: An array of {"type": <text>, "spec": <any>} objects. The supported types are
+    'filter', 'order', 'limit', 'offset', 'hide', and 'summarize'.
+
+The first summarization may be approximate, if its spec has a "sample_percent" between 0
+(exclusive) and 100. The base table is then sampled with TABLESAMPLE SYSTEM, which reads only that
+percentage of its pages, and the summarization's counts and sums are scaled up accordingly. The
+columns it (and any later summarization) produces are flagged as approximate.
+
+Returns an object with the keys:
+  query: A SELECT statement giving the result of the exploration.
+  order_by_expr: An ORDER BY expression (qualified by `__mathesar_q`) which should be applied to
+    the result when none of the transformations is an 'order', or NULL otherwise.
+  keyset: The keyset of the order of the result (see msar.get_exploration_keyset), or NULL if its
+    records can't be paged with cursors. Ordering by the keyset refines the order given by the
+    transformations.
+  output_columns: The aliases of the output columns.
+  columns: An array describing every column of every step of the exploration, in order of first
+    appearance. Each has the keys alias, type_id, type, type_options, primary_key, approximate,
+    and (for the initial columns) input_table_oid, input_table_name, input_column_attnum, and
+    input_column_name.
+
+The records of a step are identified by its row key columns, if it has any. Those are the primary
+key columns of the base table, provided that all of them are initial columns, and no join can
+repeat a row of the base table (i.e., each joins to a single-column primary key or unique
+constraint). Primary keys of joined tables are never row keys: their values may repeat, or be NULL
+where nothing was joined. The row key columns of a step remain so through filters, orderings,
+limits, and offsets, and through summarizations grouping by all of them as they are; hiding any of
+them, or summarizing otherwise, leaves a step with none.
+
+Raises `feature_not_supported` when the definition can't be compiled here.
+
+Args:
+  exploration: The exploration definition.
+*/
+DECLARE
+  base_tab_id oid := (exploration ->> 'base_table_oid')::oid;
+  -- The CTEs of the query; each step of the exploration adds one.
+  ctes text[] := ARRAY[]::text[];
+  rel_name text;
+  step_query text;
+  -- The columns of the current step, each of the form
+  --   {"alias": <text>, "type_id": <oid>, "typmod": <int>, "primary_key": <bool>,
+  --    "row_key": <bool>}
+  -- plus the input_* keys for the initial columns.
+  step_columns jsonb := '[]'::jsonb;
+  -- The columns of all steps, keyed by alias.
+  all_columns jsonb := '{}'::jsonb;
+  all_aliases text[] := ARRAY[]::text[];
+  join_aliases jsonb := '{}'::jsonb;
+  from_expr text;
+  select_exprs text[] := ARRAY[]::text[];
+  init_col jsonb;
+  jp jsonb;
+  jp_prefix jsonb;
+  left_alias text;
+  right_alias text;
+  col_tab_id oid;
+  col_info record;
+  transformation jsonb;
+  spec jsonb;
+  is_ordered boolean := false;
+  -- The ordering of the last 'order' transformation, unless a later summarization discarded it.
+  order_spec jsonb := '[]'::jsonb;
+  missing_aliases text[];
+  group_exprs text[];
+  agg_exprs text[];
+  new_columns jsonb;
+  types jsonb;
+  -- The percentage of the base table sampled for an approximate summarization.
+  sample_percent numeric;
+  is_summarized boolean := false;
+  -- Whether every join matches at most one row, so that no row of the base table is repeated.
+  joins_to_one boolean := true;
+  -- The factor by which the current summarization scales counts and sums, if it's approximate.
+  sample_scale numeric;
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_catalog.pg_class WHERE oid = base_tab_id) THEN
+    RAISE EXCEPTION 'Relation with OID % does not exist', base_tab_id
+      USING ERRCODE = 'undefined_table';
+  END IF;
+  SELECT (x.t #>> '{spec,sample_percent}')::numeric INTO sample_percent
+  FROM jsonb_array_elements(
+    COALESCE(NULLIF(exploration -> 'transformations', 'null'::jsonb), '[]'::jsonb)
+  ) WITH ORDINALITY AS x(t, ordinality)
+  WHERE x.t ->> 'type' = 'summarize'
+  ORDER BY ordinality
+  LIMIT 1;
+  IF sample_percent <= 0 OR sample_percent > 100 THEN
+    RAISE EXCEPTION 'Invalid sample percentage: %', sample_percent
+      USING HINT = 'The sample percentage must be greater than 0, and at most 100.',
+            ERRCODE = 'invalid_parameter_value';
+  END IF;
+  IF sample_percent IS NOT NULL AND NOT EXISTS (
+    SELECT 1 FROM pg_catalog.pg_class WHERE oid = base_tab_id AND relkind IN ('r', 'm', 'p')
+  ) THEN
+    RAISE EXCEPTION 'Only explorations of tables can be summarized approximately'
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+  from_expr := format(
+    '%I.%I AS %I',
+    msar.get_relation_schema_name(base_tab_id),
+    msar.get_relation_name(base_tab_id),
+    '__mathesar_base'
+  ) || COALESCE(format(' TABLESAMPLE SYSTEM (%L)', sample_percent), '');
+
+  -- The initial columns, and the joins needed to reach them.
+  FOR init_col IN SELECT * FROM jsonb_array_elements(exploration -> 'initial_columns') LOOP
+    left_alias := '__mathesar_base';
+    right_alias := '__mathesar_base';
+    col_tab_id := base_tab_id;
+    jp_prefix := '[]'::jsonb;
+    FOR jp IN
+      SELECT x.jp FROM jsonb_array_elements(
+        COALESCE(NULLIF(init_col -> 'join_path', 'null'::jsonb), '[]'::jsonb)
+      ) WITH ORDINALITY AS x(jp, ordinality)
+      ORDER BY ordinality
+    LOOP
+      jp_prefix := jp_prefix || jsonb_build_array(jp);
+      col_tab_id := (jp #>> '{1,0}')::oid;
+      right_alias := join_aliases ->> jp_prefix::text;
+      IF right_alias IS NULL THEN
+        -- Each distinct (prefix of a) join path is joined only once.
+        right_alias := '__mathesar_j' || (SELECT count(*) FROM jsonb_object_keys(join_aliases));
+        join_aliases := join_aliases || jsonb_build_object(jp_prefix::text, right_alias);
+        from_expr := from_expr || format(
+          ' LEFT OUTER JOIN %I.%I AS %I ON %I.%I = %I.%I',
+          msar.get_relation_schema_name(col_tab_id),
+          msar.get_relation_name(col_tab_id),
+          right_alias,
+          left_alias,
+          msar.get_column_name((jp #>> '{0,0}')::oid, (jp #>> '{0,1}')::smallint),
+          right_alias,
+          msar.get_column_name(col_tab_id, (jp #>> '{1,1}')::smallint)
+        );
+        joins_to_one := joins_to_one AND EXISTS (
+          SELECT 1 FROM pg_catalog.pg_constraint AS pgc
+          WHERE
+            pgc.conrelid = col_tab_id
+            AND pgc.contype IN ('p', 'u')
+            AND pgc.conkey = ARRAY[(jp #>> '{1,1}')::smallint]
+        );
+      END IF;
+      left_alias := right_alias;
+    END LOOP;
+
+    SELECT
+      pga.attname,
+      pga.atttypid,
+      pga.atttypmod,
+      EXISTS (
+        SELECT 1 FROM pg_catalog.pg_constraint AS pgc
+        WHERE pgc.conrelid = pga.attrelid AND pgc.contype = 'p' AND pga.attnum = ANY(pgc.conkey)
+      ) AS primary_key
+    INTO col_info
+    FROM pg_catalog.pg_attribute AS pga
+    WHERE
+      pga.attrelid = col_tab_id
+      AND pga.attnum = (init_col ->> 'attnum')::smallint
+      AND NOT pga.attisdropped;
+    IF col_info.attname IS NULL THEN
+      RAISE EXCEPTION 'Column % of relation % does not exist', init_col ->> 'attnum', col_tab_id
+        USING ERRCODE = 'undefined_column';
+    END IF;
+    select_exprs := select_exprs || format(
+      '%I.%I AS %I', right_alias, col_info.attname, init_col ->> 'alias'
+    );
+    step_columns := step_columns || jsonb_build_array(jsonb_build_object(
+      'alias', init_col ->> 'alias',
+      'type_id', col_info.atttypid::bigint,
+      'typmod', col_info.atttypmod,
+      'primary_key', col_info.primary_key,
+      'row_key', col_info.primary_key AND jp_prefix = '[]'::jsonb,
+      'input_table_oid', col_tab_id::bigint,
+      'input_table_name', msar.get_relation_name(col_tab_id),
+      'input_column_attnum', (init_col ->> 'attnum')::smallint,
+      'input_column_name', col_info.attname
+    ));
+  END LOOP;
+  IF NOT joins_to_one OR EXISTS (
+    SELECT 1
+    FROM pg_catalog.pg_constraint AS pgc CROSS JOIN LATERAL unnest(pgc.conkey) AS k(attnum)
+    WHERE
+      pgc.conrelid = base_tab_id
+      AND pgc.contype = 'p'
+      AND NOT EXISTS (
+        SELECT 1 FROM jsonb_array_elements(step_columns) AS col
+        WHERE (col ->> 'row_key')::boolean AND (col ->> 'input_column_attnum')::smallint = k.attnum
+      )
+  ) THEN
+    SELECT COALESCE(jsonb_agg(col || '{"row_key": false}'::jsonb ORDER BY o), '[]'::jsonb) INTO step_columns
+    FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o);
+  END IF;
+  ctes := ctes || format(
+    '%I AS (SELECT %s FROM %s)', '__mathesar_step_0', array_to_string(select_exprs, ', '), from_expr
+  );
+
+  -- The transformations, each selecting from the previous step.
+  FOR transformation IN
+    SELECT x.t FROM jsonb_array_elements(
+      COALESCE(NULLIF(exploration -> 'transformations', 'null'::jsonb), '[]'::jsonb)
+    ) WITH ORDINALITY AS x(t, ordinality)
+    ORDER BY ordinality
+  LOOP
+    all_columns := all_columns || COALESCE((
+      SELECT jsonb_object_agg(col ->> 'alias', col) FROM jsonb_array_elements(step_columns) AS col
+    ), '{}'::jsonb);
+    all_aliases := all_aliases || ARRAY(
+      SELECT col ->> 'alias' FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o)
+      WHERE NOT col ->> 'alias' = ANY(all_aliases) ORDER BY o
+    );
+    rel_name := '__mathesar_step_' || (cardinality(ctes) - 1);
+    spec := transformation -> 'spec';
+    CASE transformation ->> 'type'
+      WHEN 'filter' THEN
+        step_query := format(
+          'SELECT * FROM %I WHERE %s', rel_name, COALESCE(msar.build_exploration_expr(spec), 'true')
+        );
+      WHEN 'order' THEN
+        is_ordered := true;
+        order_spec := spec;
+        step_query := format(
+          'SELECT * FROM %I %s',
+          rel_name,
+          msar.build_exploration_order_by_expr(rel_name, spec, step_columns)
+        );
+      WHEN 'limit' THEN
+        step_query := format('SELECT * FROM %I LIMIT %L', rel_name, (spec #>> '{}')::integer);
+      WHEN 'offset' THEN
+        step_query := format('SELECT * FROM %I OFFSET %L', rel_name, (spec #>> '{}')::integer);
+      WHEN 'hide' THEN
+        -- Hiding every column is ignored, as it is in the Python implementation.
+        IF EXISTS (
+          SELECT 1 FROM jsonb_array_elements(step_columns) AS col
+          WHERE NOT spec ? (col ->> 'alias')
+        ) THEN
+          IF EXISTS (
+            SELECT 1 FROM jsonb_array_elements(step_columns) AS col
+            WHERE (col ->> 'row_key')::boolean AND spec ? (col ->> 'alias')
+          ) THEN
+            SELECT COALESCE(jsonb_agg(col || '{"row_key": false}'::jsonb ORDER BY o), '[]'::jsonb) INTO step_columns
+            FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o);
+          END IF;
+          SELECT jsonb_agg(col ORDER BY o) INTO step_columns
+          FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o)
+          WHERE NOT spec ? (col ->> 'alias');
+        END IF;
+        step_query := format(
+          'SELECT %s FROM %I',
+          (
+            SELECT string_agg(format('%I', col ->> 'alias'), ', ' ORDER BY o)
+            FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o)
+          ),
+          rel_name
+        );
+      WHEN 'summarize' THEN
+        IF is_summarized AND spec ->> 'sample_percent' IS NOT NULL THEN
+          RAISE EXCEPTION 'Only the first summarization of an exploration can be approximate'
+            USING ERRCODE = 'invalid_parameter_value';
+        END IF;
+        sample_scale := CASE WHEN NOT is_summarized THEN 100 / sample_percent END;
+        is_summarized := true;
+        SELECT array_agg(col ->> 'alias') INTO missing_aliases
+        FROM jsonb_array_elements(step_columns) AS col
+        WHERE NOT EXISTS (
+          SELECT 1 FROM jsonb_array_elements(
+            COALESCE(spec -> 'grouping_expressions', '[]'::jsonb)
+            || COALESCE(spec -> 'aggregation_expressions', '[]'::jsonb)
+          ) AS expr
+          WHERE expr ->> 'input_alias' = col ->> 'alias'
+        );
+        IF missing_aliases IS NOT NULL OR EXISTS (
+          SELECT 1 FROM jsonb_array_elements(
+            COALESCE(spec -> 'grouping_expressions', '[]'::jsonb)
+            || COALESCE(spec -> 'aggregation_expressions', '[]'::jsonb)
+          ) AS expr
+          WHERE expr ->> 'output_alias' IS NULL
+        ) THEN
+          RAISE EXCEPTION 'The summarization needs to be fully specified'
+            USING ERRCODE = 'feature_not_supported';
+        END IF;
+        SELECT
+          array_agg(
+            CASE WHEN expr ->> 'preproc' IS NULL THEN
+              format('%I', expr ->> 'input_alias')
+            ELSE
+              format(
+                msar.get_exploration_function_template(expr ->> 'preproc'),
+                quote_ident(expr ->> 'input_alias')
+              )
+            END || format(' AS %I', expr ->> 'output_alias')
+            ORDER BY o
+          ),
+          jsonb_agg(
+            jsonb_build_object(
+              'alias', expr ->> 'output_alias',
+              -- Only grouping by a column as-is keeps its type and primary key status.
+              'type_id', CASE WHEN expr ->> 'preproc' IS NULL THEN col -> 'type_id' END,
+              'typmod', CASE WHEN expr ->> 'preproc' IS NULL THEN col -> 'typmod' ELSE '-1' END,
+              'primary_key', expr ->> 'preproc' IS NULL AND (col ->> 'primary_key')::boolean,
+              'row_key', expr ->> 'preproc' IS NULL AND (col ->> 'row_key')::boolean,
+              -- Groups found in a sample are exact values; only aggregations are approximate.
+              'approximate', false
+            )
+            ORDER BY o
+          )
+        INTO group_exprs, new_columns
+        FROM jsonb_array_elements(spec -> 'grouping_expressions') WITH ORDINALITY AS x(expr, o)
+          LEFT JOIN jsonb_array_elements(step_columns) AS col
+            ON col ->> 'alias' = expr ->> 'input_alias';
+        SELECT
+          array_agg(
+            CASE
+              WHEN sample_scale IS NOT NULL AND expr ->> 'function' = 'count' THEN
+                'round(' || agg.fn_expr || format(' * %L::numeric)::bigint', sample_scale)
+              -- Scaled sums of integers are rounded, as are counts.
+              WHEN sample_scale IS NOT NULL AND expr ->> 'function' = 'sum'
+                AND (col ->> 'type_id')::regtype = ANY('{smallint, integer, bigint}'::regtype[])
+              THEN
+                'round(' || agg.fn_expr || format(' * %L::numeric)', sample_scale)
+              WHEN sample_scale IS NOT NULL AND expr ->> 'function' = 'sum' THEN
+                '(' || agg.fn_expr || format(' * %L::numeric)', sample_scale)
+              ELSE agg.fn_expr
+            END || format(' AS %I', expr ->> 'output_alias')
+            ORDER BY o
+          ),
+          COALESCE(new_columns, '[]'::jsonb) || COALESCE(jsonb_agg(
+            jsonb_build_object(
+              'alias', expr ->> 'output_alias',
+              -- These aggregates give a value of the aggregated column.
+              'type_id', CASE
+                WHEN expr ->> 'function' IN ('max', 'min', 'mode', 'median') THEN col -> 'type_id'
+              END,
+              'typmod', CASE
+                WHEN expr ->> 'function' IN ('max', 'min', 'mode', 'median') THEN col -> 'typmod'
+                ELSE '-1'
+              END,
+              'primary_key', false,
+              'row_key', false,
+              'approximate', sample_percent IS NOT NULL
+            )
+            ORDER BY o
+          ), '[]'::jsonb)
+        INTO agg_exprs, new_columns
+        FROM jsonb_array_elements(spec -> 'aggregation_expressions') WITH ORDINALITY AS x(expr, o)
+          LEFT JOIN jsonb_array_elements(step_columns) AS col
+            ON col ->> 'alias' = expr ->> 'input_alias'
+          CROSS JOIN LATERAL (
+            SELECT format(
+              msar.get_exploration_function_template(expr ->> 'function'),
+              quote_ident(expr ->> 'input_alias')
+            ) AS fn_expr
+          ) AS agg;
+        IF EXISTS (
+          SELECT 1 FROM unnest(group_exprs || agg_exprs) AS x(expr) WHERE expr IS NULL
+        ) THEN
+          RAISE EXCEPTION 'The summarization uses a function not supported in explorations'
+            USING ERRCODE = 'feature_not_supported';
+        END IF;
+        step_query := format(
+          'SELECT %s FROM %I %s',
+          array_to_string(group_exprs || agg_exprs, ', '),
+          rel_name,
+          CASE WHEN cardinality(group_exprs) > 0 THEN
+            'GROUP BY ' || (
+              SELECT string_agg(i::text, ', ') FROM generate_series(1, cardinality(group_exprs)) AS i
+            )
+          END
+        );
+        IF EXISTS (
+          SELECT 1 FROM jsonb_array_elements(step_columns) AS col
+          WHERE (col ->> 'row_key')::boolean AND NOT EXISTS (
+            SELECT 1 FROM jsonb_array_elements(spec -> 'grouping_expressions') AS expr
+            WHERE expr ->> 'input_alias' = col ->> 'alias' AND expr ->> 'preproc' IS NULL
+          )
+        ) THEN
+          SELECT COALESCE(jsonb_agg(col || '{"row_key": false}'::jsonb ORDER BY o), '[]'::jsonb) INTO new_columns
+          FROM jsonb_array_elements(new_columns) WITH ORDINALITY AS x(col, o);
+        END IF;
+        step_columns := new_columns;
+        order_spec := '[]'::jsonb;
+      ELSE
+        RAISE EXCEPTION 'The transformation type % is not supported', transformation ->> 'type'
+          USING ERRCODE = 'feature_not_supported';
+    END CASE;
+    ctes := ctes || format('%I AS (%s)', '__mathesar_step_' || cardinality(ctes), step_query);
+
+    -- Fill in the types of computed columns.
+    IF EXISTS (
+      SELECT 1 FROM jsonb_array_elements(step_columns) AS col WHERE col ->> 'type_id' IS NULL
+    ) THEN
+      types := msar.get_exploration_query_types(
+        format(
+          'WITH %s SELECT * FROM %I',
+          array_to_string(ctes, ', '),
+          '__mathesar_step_' || (cardinality(ctes) - 1)
+        ),
+        ARRAY(SELECT col ->> 'alias' FROM jsonb_array_elements(step_columns) AS col)
+      );
+      SELECT jsonb_agg(
+        col || jsonb_build_object(
+          'type_id', COALESCE(col ->> 'type_id', types ->> (col ->> 'alias'))::bigint
+        )
+        ORDER BY o
+      ) INTO step_columns
+      FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o);
+    END IF;
+  END LOOP;
+
+  all_columns := all_columns || COALESCE((
+    SELECT jsonb_object_agg(col ->> 'alias', col) FROM jsonb_array_elements(step_columns) AS col
+  ), '{}'::jsonb);
+  all_aliases := all_aliases || ARRAY(
+    SELECT col ->> 'alias' FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o)
+    WHERE NOT col ->> 'alias' = ANY(all_aliases) ORDER BY o
+  );
+
+  RETURN jsonb_build_object(
+    'query', format(
+      'WITH %s SELECT * FROM %I',
+      array_to_string(ctes, ', '),
+      '__mathesar_step_' || (cardinality(ctes) - 1)
+    ),
+    'order_by_expr', CASE WHEN NOT is_ordered THEN
+      msar.build_exploration_order_by_expr('__mathesar_q', null, step_columns)
+    END,
+    'keyset', msar.get_exploration_keyset(order_spec, step_columns),
+    'output_columns', COALESCE(
+      (SELECT jsonb_agg(col -> 'alias' ORDER BY o)
+      FROM jsonb_array_elements(step_columns) WITH ORDINALITY AS x(col, o)),
+      '[]'::jsonb
+    ),
+    'columns', (
+      SELECT COALESCE(jsonb_agg(
+        jsonb_build_object(
+          'alias', alias,
+          'type_id', col -> 'type_id',
+          'type', CASE WHEN pgt.typcategory = 'A' THEN '_array' ELSE pgt.oid::regtype::text END,
+          'type_options', msar.get_type_options(
+            pgt.oid, (col ->> 'typmod')::integer, (pgt.typcategory = 'A')::integer
+          ),
+          'primary_key', col -> 'primary_key',
+          'approximate', COALESCE((col ->> 'approximate')::boolean, false),
+          'input_table_oid', col -> 'input_table_oid',
+          'input_table_name', col -> 'input_table_name',
+          'input_column_attnum', col -> 'input_column_attnum',
+          'input_column_name', col -> 'input_column_name'
+        )
+        ORDER BY o
+      ), '[]'::jsonb)
+      FROM unnest(all_aliases) WITH ORDINALITY AS x(alias, o)
+        CROSS JOIN LATERAL (SELECT all_columns -> alias AS col) AS c
+        LEFT JOIN pg_catalog.pg_type AS pgt ON pgt.oid = (col ->> 'type_id')::oid
+    )
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.run_exploration(
+  exploration jsonb,
+  limit_ integer,
+  offset_ integer,
+  count_mode text DEFAULT 'exact',
+  after_ text DEFAULT NULL,
+  before_ text DEFAULT NULL
+) RETURNS jsonb AS $$/*
+Run an exploration, returning a page of its records, the count of all of them, and its columns.
+
+Values are formatted with msar.format_data, as they are for records of tables. The page and the
+count are produced by a single query; the count is a window over all records, computed before the
+limit and offset are applied. Only when the page is empty, or when a cursor is given, is the count
+computed separately.
+
+Returns an object with the keys:
+  count: The number of records of the exploration, or null if count_mode is 'none'.
+  results: An array of the requested records, each an object keyed by the output column aliases.
+  cursors: The cursors of the first and last records returned (see msar.build_cursors_expr), or
+    null if the records of the exploration can't be paged with cursors.
+  output_columns: See msar.build_exploration_query.
+  columns: See msar.build_exploration_query.
+
+Args:
+  exploration: The exploration definition; see msar.build_exploration_query.
+  limit_: The maximum number of records to return.
+  offset_: The number of records to skip.
+  count_mode: (optional) One of 'exact' (the default), to count all records, or 'none'.
+  after_: (optional) A cursor; only records after the record it identifies are returned.
+  before_: (optional) A cursor; only records before the record it identifies are returned.
+
+Cursors allow keyset pagination: rather than skipping `offset_` records (all of which must be
+computed and then discarded), pass the "last" cursor of the current page as `after_` to get the
+next page, or the "first" cursor as `before_` to get the previous one. A cursor is only valid for
+the same exploration definition. See msar.get_exploration_keyset for which explorations can be
+paged this way.
+*/
+DECLARE
+  compiled jsonb := msar.build_exploration_query(exploration);
+  keyset jsonb := NULLIF(compiled -> 'keyset', 'null'::jsonb);
+  has_cursor boolean := after_ IS NOT NULL OR before_ IS NOT NULL;
+  -- When only `before_` is given, we read backwards from it, so the page ends right before it.
+  backwards boolean := after_ IS NULL AND before_ IS NOT NULL;
+  records_count bigint;
+  results jsonb;
+  cursors jsonb;
+BEGIN
+  IF COALESCE(count_mode, 'exact') NOT IN ('exact', 'none') THEN
+    RAISE EXCEPTION 'Invalid count mode: %', count_mode
+      USING HINT = 'The count mode must be one of exact or none.',
+            ERRCODE = 'invalid_parameter_value';
+  END IF;
+  IF has_cursor AND keyset IS NULL THEN
+    RAISE EXCEPTION 'The records of this exploration can''t be paged with cursors'
+      USING HINT = 'Order the exploration by visible columns, with NULLs placed by default.',
+            ERRCODE = 'invalid_parameter_value';
+  END IF;
+  EXECUTE format(
+    $q$
+    SELECT
+      max(__mathesar_page.__mathesar_count),
+      COALESCE(
+        jsonb_agg(__mathesar_page.__mathesar_record ORDER BY __mathesar_page.__mathesar_ord %7$s),
+        '[]'::jsonb
       ),
-      'join_sql_expr', string_agg(
-        cte.join_expr,
-        E'\n'
+      %8$s
+    FROM (
+      SELECT __mathesar_k.*, to_jsonb(__mathesar_r) AS __mathesar_record
+      FROM (
+        SELECT
+          __mathesar_q.*,
+          %1$s AS __mathesar_count,
+          row_number() OVER (%3$s) AS __mathesar_ord
+        FROM (%2$s) AS __mathesar_q
+        %9$s
+        %3$s LIMIT %5$L OFFSET %6$L
+      ) AS __mathesar_k
+        CROSS JOIN LATERAL (SELECT %4$s) AS __mathesar_r
+    ) AS __mathesar_page
+    $q$,
+    /* %1 */ CASE WHEN count_mode = 'none' OR has_cursor
+      THEN 'NULL::bigint'
+      ELSE 'count(1) OVER ()'
+    END,
+    /* %2 */ compiled ->> 'query',
+    /* %3 */ COALESCE(
+      msar.build_keyset_order_by_expr(keyset, backwards),
+      compiled ->> 'order_by_expr'
+    ),
+    /* %4 */ COALESCE((
+      SELECT string_agg(format('msar.format_data(__mathesar_k.%1$I) AS %1$I', alias), ', ')
+      FROM jsonb_array_elements_text(compiled -> 'output_columns') AS alias
+    ), 'NULL'),
+    /* %5 */ limit_,
+    /* %6 */ offset_,
+    /* %7 */ CASE WHEN backwards THEN 'DESC' END,
+    /* %8 */ COALESCE(
+      msar.build_cursors_expr(
+        keyset,
+        '__mathesar_page',
+        'ORDER BY __mathesar_page.__mathesar_ord' || CASE WHEN backwards THEN ' DESC' ELSE '' END
       ),
-      'join_group_by_expr', 'GROUP BY ' || string_agg(
-        DISTINCT format(
-          '%I.%I',
-          base_tab_name,
-          base_tab_col_name
-        ),
-        ', '
-      )
-  ) FROM cte
+      'NULL::jsonb'
+    ),
+    /* %9 */ msar.build_keyset_where_clause(keyset, after_, before_)
+  ) INTO records_count, results, cursors;
+  IF count_mode IS DISTINCT FROM 'none' AND records_count IS NULL THEN
+    EXECUTE format('SELECT count(1) FROM (%s) AS __mathesar_q', compiled ->> 'query')
+      INTO records_count;
+  END IF;
+  RETURN jsonb_build_object(
+    'count', records_count,
+    'results', results,
+    'cursors', cursors,
+    'output_columns', compiled -> 'output_columns',
+    'columns', compiled -> 'columns'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_exploration_records_query(exploration jsonb) RETURNS text AS $$/*
+Build a query selecting all records of an exploration, in order.
+
+The query has a single __mathesar_record column, giving each record as msar.run_exploration does.
+It's meant for declaring a cursor through which the records can be fetched page by page.
+
+Args:
+  exploration: The exploration definition; see msar.build_exploration_query.
+*/
+DECLARE
+  compiled jsonb := msar.build_exploration_query(exploration);
+BEGIN
+  RETURN format(
+    $q$
+    SELECT to_jsonb(__mathesar_r) AS __mathesar_record
+    FROM (
+      SELECT __mathesar_q.*, row_number() OVER (%2$s) AS __mathesar_ord
+      FROM (%1$s) AS __mathesar_q
+    ) AS __mathesar_k
+      CROSS JOIN LATERAL (SELECT %3$s) AS __mathesar_r
+    ORDER BY __mathesar_k.__mathesar_ord
+    $q$,
+    /* %1 */ compiled ->> 'query',
+    /* %2 */ COALESCE(
+      msar.build_keyset_order_by_expr(NULLIF(compiled -> 'keyset', 'null'::jsonb), false),
+      compiled ->> 'order_by_expr'
+    ),
+    /* %3 */ COALESCE((
+      SELECT string_agg(format('msar.format_data(__mathesar_k.%1$I) AS %1$I', alias), ', ')
+      FROM jsonb_array_elements_text(compiled -> 'output_columns') AS alias
+    ), 'NULL')
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_tables_modification_token(tab_ids oid[]) RETURNS text AS $$/*
+Return a token which changes whenever any of the given tables is modified.
+
+The token combines, for each table, the version (xmin and ctid) of its pg_class row (which changes
+with DDL, privilege changes, and TRUNCATE), and its cumulative tuple counters from pg_stat_all_tables (which
+change with INSERT, UPDATE, and DELETE). The statistics are reported asynchronously, so a
+modification may only be reflected in the token after a short delay (about a second). Callers
+should bound the lifetime of anything validated with the token accordingly.
+
+Args:
+  tab_ids: The OIDs of the tables.
+*/
+SELECT string_agg(
+  concat_ws(
+    ':', c.oid, c.xmin, c.ctid, s.n_tup_ins, s.n_tup_upd, s.n_tup_del, s.n_live_tup
+  ),
+  ',' ORDER BY c.oid
+)
+FROM pg_catalog.pg_class AS c
+  LEFT JOIN pg_catalog.pg_stat_all_tables AS s ON s.relid = c.oid
+WHERE c.oid = ANY(tab_ids);
 $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.materialize_exploration(exploration jsonb, sch_id oid, mv_name text) RETURNS oid AS $$/*
+Create a materialized view holding the records of an exploration, returning the view's OID.
+
+Besides the output columns of the exploration, the view has a __mathesar_row_number column giving
+the position of each record in the (deterministic) order of the exploration. A unique index on that
+column lets pages of the view be read cheaply, and lets the view be refreshed concurrently.
+
+Args:
+  exploration: The exploration definition; see msar.build_exploration_query.
+  sch_id: The OID of the schema where the view will be created.
+  mv_name: The unquoted name of the view.
+*/
+DECLARE
+  compiled jsonb := msar.build_exploration_query(exploration);
+  qualified_name text := __msar.build_qualified_name_sql(msar.get_schema_name(sch_id), mv_name);
+BEGIN
+  EXECUTE format(
+    $q$
+    CREATE MATERIALIZED VIEW %1$s AS
+    SELECT row_number() OVER (%2$s) AS __mathesar_row_number, %3$s FROM (%4$s) AS __mathesar_q
+    $q$,
+    /* %1 */ qualified_name,
+    /* %2 */ compiled ->> 'order_by_expr',
+    /* %3 */ COALESCE((
+      SELECT string_agg(format('__mathesar_q.%I', alias), ', ')
+      FROM jsonb_array_elements_text(compiled -> 'output_columns') AS alias
+    ), 'NULL'),
+    /* %4 */ compiled ->> 'query'
+  );
+  EXECUTE format('CREATE UNIQUE INDEX ON %s (__mathesar_row_number)', qualified_name);
+  RETURN qualified_name::regclass::oid;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.replace_materialized_exploration(
+  exploration jsonb,
+  mv_id oid,
+  sch_id oid,
+  mv_name text
+) RETURNS oid AS $$/*
+Replace the materialized view of an exploration with one built from a new definition, returning the
+OID of the new view.
+
+The new view is built under a temporary name before the old one is dropped, so that readers of the
+old view are only blocked for the rest of the transaction. The new view is given the owner of the
+old one.
+
+Args:
+  exploration: The new exploration definition; see msar.build_exploration_query.
+  mv_id: The OID of the view to replace, as created by msar.materialize_exploration.
+  sch_id: The OID of the schema where the new view will be created.
+  mv_name: The unquoted name of the new view.
+*/
+DECLARE
+  old_owner regrole := (SELECT relowner FROM pg_catalog.pg_class WHERE oid = mv_id);
+  new_mv_id oid := msar.materialize_exploration(exploration, sch_id, mv_name || '_new');
+BEGIN
+  PERFORM msar.drop_materialized_exploration(mv_id);
+  EXECUTE format('ALTER MATERIALIZED VIEW %s RENAME TO %I', new_mv_id::regclass, mv_name);
+  IF old_owner IS NOT NULL THEN
+    EXECUTE format('ALTER MATERIALIZED VIEW %s OWNER TO %s', new_mv_id::regclass, old_owner);
+  END IF;
+  RETURN new_mv_id;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.can_read_materialized_exploration(exploration jsonb, mv_id oid) RETURNS boolean AS $$/*
+Return whether the current role may read the records of an exploration from its materialized view.
+
+The view is owned by the role which materialized the exploration, so besides being allowed to select
+from the view, the current role must be allowed to select every column the exploration uses from its
+table. Otherwise, the exploration should be run against its tables.
+
+Args:
+  exploration: The exploration definition; see msar.build_exploration_query.
+  mv_id: The OID of the view, as created by msar.materialize_exploration.
+*/
+WITH used_columns_cte AS (
+  SELECT
+    COALESCE(
+      (col -> 'join_path' -> -1 -> 1 ->> 0)::oid,
+      (exploration ->> 'base_table_oid')::oid
+    ) AS tab_id,
+    (col ->> 'attnum')::smallint AS attnum
+  FROM jsonb_array_elements(exploration -> 'initial_columns') AS col
+  UNION
+  SELECT (jp_step -> side ->> 0)::oid, (jp_step -> side ->> 1)::smallint
+  FROM jsonb_array_elements(exploration -> 'initial_columns') AS col
+    CROSS JOIN LATERAL jsonb_array_elements(
+      COALESCE(col -> 'join_path', '[]'::jsonb)
+    ) AS jp_step
+    CROSS JOIN generate_series(0, 1) AS side
+)
+SELECT
+  EXISTS (SELECT 1 FROM pg_catalog.pg_class WHERE oid = mv_id)
+  AND COALESCE(has_table_privilege(mv_id, 'SELECT'), false)
+  AND NOT EXISTS (
+    SELECT 1 FROM used_columns_cte
+    WHERE NOT COALESCE(has_column_privilege(tab_id, attnum, 'SELECT'), false)
+  );
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.refresh_materialized_exploration(mv_id regclass) RETURNS void AS $$/*
+Refresh the materialized view of an exploration, without locking out readers.
+
+Args:
+  mv_id: The OID of the view, as created by msar.materialize_exploration.
+*/
+BEGIN
+  EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %s', mv_id);
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.drop_materialized_exploration(mv_id oid) RETURNS void AS $$/*
+Drop the materialized view of an exploration, if it exists.
+
+Args:
+  mv_id: The OID of the view, as created by msar.materialize_exploration.
+*/
+DECLARE
+  qualified_name text := __msar.get_qualified_relation_name_or_null(mv_id);
+BEGIN
+  IF qualified_name IS NOT NULL THEN
+    EXECUTE format('DROP MATERIALIZED VIEW %s', qualified_name);
+  END IF;
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_materialized_exploration_query(
+  mv_id regclass,
+  limit_ integer,
+  offset_ integer
+) RETURNS text AS $$/*
+Build a query selecting a page of the records of a materialized exploration, in order.
+
+Args:
+  mv_id: The OID of the view, as created by msar.materialize_exploration.
+  limit_: The maximum number of records to select.
+  offset_: The number of records to skip.
+*/
+SELECT format(
+  'SELECT %1$s FROM %2$s ORDER BY __mathesar_row_number LIMIT %3$L OFFSET %4$L',
+  /* %1 */ COALESCE(
+    string_agg(quote_ident(attname), ', ' ORDER BY attnum),
+    'NULL'
+  ),
+  /* %2 */ mv_id,
+  /* %3 */ limit_,
+  /* %4 */ offset_
+)
+FROM pg_catalog.pg_attribute
+WHERE attrelid = mv_id
+  AND attnum > 0
+  AND NOT attisdropped
+  AND attname <> '__mathesar_row_number';
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.run_materialized_exploration(
+  exploration jsonb,
+  mv_id regclass,
+  limit_ integer,
+  offset_ integer,
+  count_mode text DEFAULT 'exact'
+) RETURNS jsonb AS $$/*
+Run an exploration, reading its records from its materialized view.
+
+The result has the same form as that of msar.run_exploration. The columns are described according to
+the current definition of the exploration, which should be the one the view was created from.
+
+Args:
+  exploration: The exploration definition; see msar.build_exploration_query.
+  mv_id: The OID of the view, as created by msar.materialize_exploration.
+  limit_: The maximum number of records to return.
+  offset_: The number of records to skip.
+  count_mode: (optional) One of 'exact' (the default), to count all records, or 'none'.
+*/
+DECLARE
+  compiled jsonb := msar.build_exploration_query(exploration);
+  records_count bigint;
+  results jsonb;
+BEGIN
+  IF COALESCE(count_mode, 'exact') NOT IN ('exact', 'none') THEN
+    RAISE EXCEPTION 'Invalid count mode: %', count_mode
+      USING HINT = 'The count mode must be one of exact or none.',
+            ERRCODE = 'invalid_parameter_value';
+  END IF;
+  IF count_mode IS DISTINCT FROM 'none' THEN
+    EXECUTE format('SELECT count(1) FROM %s', mv_id) INTO records_count;
+  END IF;
+  EXECUTE format(
+    $q$
+    SELECT COALESCE(jsonb_agg(to_jsonb(__mathesar_r) ORDER BY __mathesar_mv.__mathesar_row_number), '[]'::jsonb)
+    FROM (
+      SELECT * FROM %1$s ORDER BY __mathesar_row_number LIMIT %3$L OFFSET %4$L
+    ) AS __mathesar_mv
+      CROSS JOIN LATERAL (SELECT %2$s) AS __mathesar_r
+    $q$,
+    /* %1 */ mv_id,
+    /* %2 */ COALESCE((
+      SELECT string_agg(format('msar.format_data(__mathesar_mv.%1$I) AS %1$I', alias), ', ')
+      FROM jsonb_array_elements_text(compiled -> 'output_columns') AS alias
+    ), 'NULL'),
+    /* %3 */ limit_,
+    /* %4 */ offset_
+  ) INTO results;
+  RETURN jsonb_build_object(
+    'count', records_count,
+    'results', results,
+    'output_columns', compiled -> 'output_columns',
+    'columns', compiled -> 'columns'
+  );
+END;
+$$ LANGUAGE plpgsql;
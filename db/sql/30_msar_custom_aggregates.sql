@@ -10,6 +10,16 @@ link: https://www.postgresql.org/docs/current/xaggr.html
 
 We'll use snake_case for legibility and to avoid collisions with internal PostgreSQL naming
 conventions.
+
+The aggregates are PARALLEL SAFE, with msar.add_vectors as their combine function, so that
+PostgreSQL can use parallel workers to aggregate large tables: each worker accumulates a partial
+vector sum over its share of the rows, and the partial sums are added before the final function is
+applied. Vector addition is associative and commutative, so the result doesn't depend on how the
+rows are split between workers (up to floating point rounding). The helper functions are IMMUTABLE
+and PARALLEL SAFE as well, which also lets the planner inline them.
+
+To check that a summarization is aggregated in parallel, EXPLAIN it: the plan should show a
+Finalize Aggregate above a Gather of Partial Aggregates.
 */
 
 
@@ -30,7 +40,7 @@ Examples:
   18:00:00 => 270
 */
 SELECT EXTRACT(EPOCH FROM time_) / 240;
-$$ LANGUAGE SQL;
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE FUNCTION
@@ -56,7 +66,7 @@ Examples:
 Inverse of msar.time_to_degrees.
 */
 SELECT MAKE_INTERVAL(secs => ((degrees::numeric % 360 + 360) % 360)::double precision * 240)::time;
-$$ LANGUAGE SQL;
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE FUNCTION 
@@ -76,7 +86,25 @@ Returns:
 */
 WITH t(degrees) AS (SELECT msar.time_to_degrees(time_))
 SELECT point_ + point(sind(degrees), cosd(degrees)) FROM t;
-$$ LANGUAGE SQL STRICT;
+$$ LANGUAGE SQL STRICT IMMUTABLE PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.add_vectors(point_a point, point_b point) RETURNS point AS $$/*
+Add two vectors, each represented by a point.
+
+This is the combine function of the aggregates in this file, used to add up the partial vector sums
+accumulated by parallel workers.
+
+Args:
+  point_a: A point representing a vector.
+  point_b: A point representing a vector.
+
+Returns:
+  point that stores the resultant vector after the addition.
+*/
+SELECT point_a + point_b;
+$$ LANGUAGE SQL STRICT IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE FUNCTION 
@@ -106,7 +134,7 @@ SELECT CASE
   WHEN point_ <-> point(0,0) < 1e-10 THEN NULL
   ELSE msar.degrees_to_time(atan2d(point_[0],point_[1]))
 END;
-$$ LANGUAGE SQL;
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE AGGREGATE
@@ -121,6 +149,7 @@ Steps:
   - Convert time to degrees.
   - Calculate sine and cosine of the degrees.
   - Add this to the state point to update the running sum.
+  - (When aggregating in parallel) add up the state points of the workers.
   - Calculate the inverse tangent of the state point.
   - Convert the result to time, which is the peak time.
 
@@ -130,8 +159,10 @@ Link: https://github.com/centerofci/mathesar/pull/2981
 (
   sfunc = msar.add_time_to_vector,
   stype = point,
+  combinefunc = msar.add_vectors,
   finalfunc = msar.point_to_time,
-  initcond = '(0,0)'
+  initcond = '(0,0)',
+  parallel = safe
 );
 
 
@@ -150,7 +181,7 @@ Examples:
   2023-12-12 => 330
 */
 SELECT ((EXTRACT(MONTH FROM date_) - 1)::double precision) * 30;    
-$$ LANGUAGE SQL;
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE FUNCTION 
@@ -168,7 +199,7 @@ Examples:
   -120 =>  9
 */
 SELECT (((degrees::numeric % 360 + 360) % 360)::double precision / 30)::int + 1;
-$$ LANGUAGE SQL;
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE FUNCTION 
@@ -189,7 +220,7 @@ Returns:
 */
 WITH t(degrees) AS (SELECT msar.month_to_degrees(date_))
 SELECT point_ + point(sind(degrees), cosd(degrees)) FROM t;
-$$ LANGUAGE SQL STRICT;
+$$ LANGUAGE SQL STRICT IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE FUNCTION 
@@ -219,7 +250,7 @@ SELECT CASE
   WHEN point_ <-> point(0,0) < 1e-10 THEN NULL
   ELSE msar.degrees_to_month(atan2d(point_[0],point_[1]))
 END;
-$$ LANGUAGE SQL;
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
 
 
 CREATE OR REPLACE AGGREGATE 
@@ -235,6 +266,7 @@ Steps:
   - convert the result to degrees.
   - Calculate sine and cosine of the degrees.
   - Add this to the state point to update the running sum.
+  - (When aggregating in parallel) add up the state points of the workers.
   - Calculate the inverse tangent of the state point.
   - Convert the result to a month which is the peak month.
 
@@ -244,6 +276,8 @@ Link: https://github.com/centerofci/mathesar/pull/3006
 (
   sfunc = msar.add_month_to_vector,
   stype = point,
+  combinefunc = msar.add_vectors,
   finalfunc = msar.point_to_month,
-  initcond = '(0,0)'
+  initcond = '(0,0)',
+  parallel = safe
 );
@@ -33,3 +33,13 @@ GRANT USAGE ON SCHEMA __msar, msar, mathesar_types TO PUBLIC;
 GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA msar, __msar, mathesar_types TO PUBLIC;
 GRANT SELECT ON ALL TABLES IN SCHEMA msar, __msar, mathesar_types TO PUBLIC;
 SELECT msar.grant_usage_on_custom_mathesar_types_to_public();
+-- Record summary indexes are created for table owners by SECURITY DEFINER functions, and are
+-- readable by roles which can read the table. See msar.create_record_summary_index.
+REVOKE CREATE ON SCHEMA msar_record_summaries FROM PUBLIC;
+GRANT USAGE ON SCHEMA msar_record_summaries TO PUBLIC;
+-- Each import creates its own staging tables, which only the role importing can read or write. See
+-- msar.prepare_staging_tables_for_import.
+GRANT USAGE, CREATE ON SCHEMA msar_import_staging TO PUBLIC;
+-- Rows of the SQL fragment cache are restricted to the role that cached them by row level security.
+-- See msar.set_cached_sql_fragments.
+GRANT INSERT, UPDATE, DELETE ON msar.sql_fragment_cache TO PUBLIC;
@@ -1977,12 +1977,92 @@ BEGIN
     response ->> 'copy_sql',
     'COPY tab_create_schema.anewtable ("My Col", col2) FROM STDIN'
   );
+  RETURN NEXT is(response -> 'copy_columns', '["My Col", "col2"]'::jsonb);
   RETURN NEXT is(response -> 'renamed_columns', '{}'::jsonb);
   RETURN NEXT is((response ->> 'pkey_column_attnum')::integer, 1);
 END;
 $f$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_prepare_columns_for_import() RETURNS SETOF TEXT AS $f$
+BEGIN
+  PERFORM __setup_create_table();
+  CREATE TABLE tab_create_schema.target (
+    id integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    "Name" text,
+    code varchar(8),
+    amount numeric
+  );
+  RETURN NEXT is(
+    msar.prepare_columns_for_import('tab_create_schema.target', ARRAY[3, 2]::smallint[]),
+    jsonb_build_object(
+      'copy_sql', 'COPY tab_create_schema.target (code, "Name") FROM STDIN',
+      'copy_columns', jsonb_build_array('code', 'Name')
+    )
+  );
+  RETURN NEXT is(
+    msar.prepare_columns_for_import('tab_create_schema.target', ARRAY[2, 4]::smallint[]),
+    NULL,
+    'Columns needing a Mathesar cast are rejected'
+  );
+  RETURN NEXT is(
+    msar.prepare_columns_for_import('tab_create_schema.target', ARRAY[2, 9]::smallint[]),
+    NULL,
+    'Missing columns are rejected'
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_insert_from_staging_tables() RETURNS SETOF TEXT AS $f$
+DECLARE
+  staging jsonb;
+  response jsonb;
+BEGIN
+  PERFORM __setup_create_table();
+  -- A staging table left behind by an import which didn't finish.
+  CREATE TABLE msar_import_staging.import_1000000000_abc_1 (column_1 text);
+  staging := msar.prepare_staging_tables_for_import(2, 2);
+  RETURN NEXT hasnt_table('msar_import_staging', 'import_1000000000_abc_1', NULL);
+  RETURN NEXT is(jsonb_array_length(staging), 2);
+  RETURN NEXT is(
+    (SELECT relnamespace FROM pg_class WHERE oid = (staging -> 0 ->> 'table_oid')::oid),
+    'msar_import_staging'::regnamespace::oid
+  );
+  RETURN NEXT is(staging -> 0 -> 'copy_columns', '["column_1", "column_2"]'::jsonb);
+  RETURN NEXT is(
+    (SELECT relpersistence FROM pg_class WHERE oid = (staging -> 1 ->> 'table_oid')::oid),
+    'u'::"char"
+  );
+  EXECUTE format(
+    $q$INSERT INTO %s VALUES ('c', '3'), ('d', NULL)$q$, (staging -> 1 ->> 'table_oid')::regclass
+  );
+  EXECUTE format(
+    $q$INSERT INTO %s VALUES ('a', '1'), ('b', '2')$q$, (staging -> 0 ->> 'table_oid')::regclass
+  );
+  response := msar.prepare_table_for_import(
+    'tab_create_schema'::regnamespace::oid, 'anewtable', ARRAY['id', 'col2'], null
+  );
+  RETURN NEXT is(
+    msar.insert_from_staging_tables(
+      ARRAY[(staging -> 0 ->> 'table_oid')::bigint, (staging -> 1 ->> 'table_oid')::bigint],
+      (response ->> 'table_oid')::regclass,
+      null
+    ),
+    4::bigint
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, "id 1", col2 FROM tab_create_schema.anewtable ORDER BY id',
+    $v$VALUES (1, 'a', '1'), (2, 'b', '2'), (3, 'c', '3'), (4, 'd', NULL)$v$
+  );
+  RETURN NEXT is(
+    (SELECT count(*) FROM pg_class WHERE relnamespace = 'msar_import_staging'::regnamespace),
+    0::bigint
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION __setup_column_alter() RETURNS SETOF TEXT AS $$
 BEGIN
   CREATE SCHEMA test_schema;
@@ -3798,6 +3878,280 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_list_records_from_table_count_modes() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  ANALYZE atable;
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 1,
+      offset_ => null,
+      order_ => null,
+      filter_ => null,
+      group_ => null,
+      count_mode => 'none'
+    ) -> 'count',
+    'null'::jsonb
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 1,
+      offset_ => null,
+      order_ => null,
+      filter_ => null,
+      group_ => null,
+      count_mode => 'estimated'
+    ) -> 'count',
+    '3'::jsonb
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 1,
+      offset_ => null,
+      order_ => null,
+      filter_ => null,
+      group_ => null,
+      count_mode => 'none'
+    ) -> 'results',
+    $j$[{"1": 1, "2": 5, "3": "sdflkj", "4": "\"s\"", "5": "{\"a\": \"val\"}"}]$j$
+  );
+  RETURN NEXT throws_ok(
+    format(
+      $q$SELECT msar.list_records_from_table(%s, null, null, null, null, null, count_mode => 'bogus')$q$,
+      rel_id
+    ),
+    '22023',
+    'Invalid count mode: bogus'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_count_records_from_table() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(msar.count_records_from_table(rel_id, null), 3::bigint);
+  RETURN NEXT is(
+    msar.count_records_from_table(
+      rel_id,
+      '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}]}'
+    ),
+    2::bigint
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_from_table_with_cursors() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  order_ jsonb := '[{"attnum": 2, "direction": "asc"}]';
+  list_result jsonb;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  INSERT INTO atable (col1) VALUES (null);
+  -- Ordered by col1 ASC, the ids are 3, 1, 2, 4 (NULLs come last).
+  list_result := msar.list_records_from_table(
+    tab_id => rel_id,
+    limit_ => 2,
+    offset_ => null,
+    order_ => order_,
+    filter_ => null,
+    group_ => null,
+    return_cursors => true
+  );
+  RETURN NEXT is(jsonb_path_query_array(list_result, '$.results[*]."1"'), '[3, 1]'::jsonb);
+  RETURN NEXT is(
+    list_result -> 'cursors',
+    jsonb_build_object(
+      'first', msar.encode_record_cursor('["2", "3"]'),
+      'last', msar.encode_record_cursor('["5", "1"]')
+    )
+  );
+  RETURN NEXT is((list_result -> 'count')::integer, 4);
+  list_result := msar.list_records_from_table(
+    tab_id => rel_id,
+    limit_ => 10,
+    offset_ => null,
+    order_ => order_,
+    filter_ => null,
+    group_ => null,
+    after_ => list_result -> 'cursors' ->> 'last',
+    return_cursors => true
+  );
+  RETURN NEXT is(jsonb_path_query_array(list_result, '$.results[*]."1"'), '[2, 4]'::jsonb);
+  RETURN NEXT is(
+    list_result -> 'cursors' ->> 'last',
+    msar.encode_record_cursor('[null, "4"]')
+  );
+  -- The previous page is selected backwards, but returned in order.
+  RETURN NEXT is(
+    jsonb_path_query_array(
+      msar.list_records_from_table(
+        tab_id => rel_id,
+        limit_ => 2,
+        offset_ => null,
+        order_ => order_,
+        filter_ => null,
+        group_ => null,
+        before_ => msar.encode_record_cursor('[null, "4"]')
+      ),
+      '$.results[*]."1"'
+    ),
+    '[1, 2]'::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(
+      msar.list_records_from_table(
+        tab_id => rel_id,
+        limit_ => 10,
+        offset_ => null,
+        order_ => order_,
+        filter_ => null,
+        group_ => null,
+        after_ => msar.encode_record_cursor('["2", "3"]'),
+        before_ => msar.encode_record_cursor('[null, "4"]')
+      ),
+      '$.results[*]."1"'
+    ),
+    '[1, 2]'::jsonb
+  );
+  -- Ordered by col1 DESC, the ids are 4, 2, 1, 3 (NULLs come first).
+  RETURN NEXT is(
+    jsonb_path_query_array(
+      msar.list_records_from_table(
+        tab_id => rel_id,
+        limit_ => 10,
+        offset_ => null,
+        order_ => '[{"attnum": 2, "direction": "desc"}]',
+        filter_ => null,
+        group_ => null,
+        after_ => msar.encode_record_cursor('[null, "4"]')
+      ),
+      '$.results[*]."1"'
+    ),
+    '[2, 1, 3]'::jsonb
+  );
+  -- Without an order, records are listed by primary key, which allows a row comparison.
+  RETURN NEXT is(
+    msar.build_keyset_condition_expr(
+      msar.get_record_keyset(rel_id, null), msar.encode_record_cursor('["2"]'), false
+    ),
+    $c$("1") > ('2')$c$
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(
+      msar.list_records_from_table(
+        tab_id => rel_id,
+        limit_ => 10,
+        offset_ => null,
+        order_ => null,
+        filter_ => null,
+        group_ => null,
+        after_ => msar.encode_record_cursor('["2"]')
+      ),
+      '$.results[*]."1"'
+    ),
+    '[3, 4]'::jsonb
+  );
+  RETURN NEXT throws_ok(
+    format(
+      $q$SELECT msar.list_records_from_table(%s, null, null, null, null, null, after_ => %L)$q$,
+      rel_id,
+      msar.encode_record_cursor('["2", "3"]')
+    ),
+    '22023',
+    'The cursor does not match the ordering of the records.'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_from_table_fragment_cache() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  shape jsonb := jsonb_build_array('record_list', null, null, null, null);
+  cached_version bigint;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  cached_version := msar.get_catalog_version();
+  PERFORM msar.list_records_from_table(rel_id, 1, null, null, null, null);
+  RETURN NEXT isnt(msar.get_cached_sql_fragments(rel_id, shape, cached_version), NULL);
+  -- The cached fragments are reused for further pages, and writing records doesn't invalidate them.
+  INSERT INTO atable (col1) VALUES (99);
+  RETURN NEXT is(msar.get_catalog_version(), cached_version);
+  RETURN NEXT is(
+    msar.list_records_from_table(rel_id, 1, 1, null, null, null) -> 'results',
+    $j$[{"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": "[1, 2, 3, 4]"}]$j$
+  );
+  -- DDL invalidates the cache.
+  ALTER TABLE atable DROP COLUMN col3;
+  RETURN NEXT cmp_ok(msar.get_catalog_version(), '>', cached_version);
+  RETURN NEXT is(msar.get_cached_sql_fragments(rel_id, shape, msar.get_catalog_version()), NULL);
+  RETURN NEXT is(
+    msar.list_records_from_table(rel_id, 1, 1, null, null, null) -> 'results',
+    $j$[{"1": 2, "2": 34, "3": "sdflfflsk", "5": "[1, 2, 3, 4]"}]$j$
+  );
+  -- So do privilege changes, and changes to types.
+  cached_version := msar.get_catalog_version();
+  REVOKE SELECT ON atable FROM PUBLIC;
+  RETURN NEXT cmp_ok(msar.get_catalog_version(), '>', cached_version);
+  cached_version := msar.get_catalog_version();
+  CREATE TYPE amood AS ENUM ('sad', 'ok', 'happy');
+  RETURN NEXT cmp_ok(msar.get_catalog_version(), '>', cached_version);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_from_table_fragment_cache_filter_literals()
+RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  cache_size integer;
+  filter_template text := $f${
+    "type": "or", "args": [
+      {"type": "equal", "args": [{"type": "attnum", "value": 3}, {"type": "literal", "value": %s}]},
+      {"type": "equal", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": %s}]}
+    ]
+  }$f$;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      rel_id, null, null, null, format(filter_template, to_jsonb('sdflkj'::text), 2)::jsonb, null
+    ) -> 'results',
+    $j$[
+      {"1": 1, "2": 5, "3": "sdflkj", "4": "\"s\"", "5": "{\"a\": \"val\"}"},
+      {"1": 3, "2": 2, "3": "abcde", "4": "{\"k\": 3242348}", "5": "true"}
+    ]$j$
+  );
+  cache_size := (SELECT count(*) FROM msar.sql_fragment_cache WHERE tab_id = rel_id);
+  -- Filters differing only in their literal values share a cache entry.
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      rel_id, null, null, null, format(filter_template, to_jsonb('it''s 100%'::text), 34)::jsonb, null
+    ) -> 'results',
+    $j$[{"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": "[1, 2, 3, 4]"}]$j$
+  );
+  RETURN NEXT is(
+    (SELECT count(*) FROM msar.sql_fragment_cache WHERE tab_id = rel_id)::integer, cache_size
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_list_records_from_table_with_filter()
 RETURNS SETOF TEXT AS $$
 DECLARE
@@ -4470,6 +4824,8 @@ $$ LANGUAGE plpgsql;
 
 CREATE OR REPLACE FUNCTION test_get_joined_columns_expr_json()
 RETURNS SETOF TEXT AS $$
+DECLARE
+  lateral_join_expr text;
 BEGIN
   PERFORM __setup_list_records_table_joined_columns();
   RETURN NEXT is(
@@ -4502,50 +4858,38 @@ BEGIN
           ) 
         )
       )
+    ) ->> 'selectable_joined_columns_expr',
+    'colors_alias.colors_alias, windows_alias.windows_alias'
+  );
+  lateral_join_expr := msar.get_joined_columns_expr_json(
+    joined_columns => jsonb_build_array(
+      jsonb_build_object(
+        'alias', 'colors_alias',
+        'join_path', jsonb_build_array(
+          jsonb_build_array(
+            jsonb_build_array('vehicles'::regclass::oid::bigint, 1),
+            jsonb_build_array('vehicles_colors'::regclass::oid::bigint, 2)
+          ),
+          jsonb_build_array(
+            jsonb_build_array('vehicles_colors'::regclass::oid::bigint, 3),
+            jsonb_build_array('colors'::regclass::oid::bigint, 1)
+          )
+        )
+      )
     ),
-    jsonb_build_object(
-      'join_sql_expr', CONCAT_WS(
-        E'\n','LEFT JOIN public.vehicles_colors ON vehicles.id = vehicles_colors.vehicle',
-              'LEFT JOIN public.colors ON vehicles_colors.color = colors.id',
-              'LEFT JOIN public.vehicles_windows ON vehicles.id = vehicles_windows.vehicle',
-              'LEFT JOIN public.windows_ ON vehicles_windows.windows_ = windows_.id'
-      ),
-      'join_group_by_expr', 'GROUP BY vehicles.id',
-      'selectable_joined_columns_expr', $q$
-          jsonb_build_object(
-            'count', COUNT(DISTINCT colors.id),
-            'result', jsonb_path_query_array(
-              COALESCE(
-                NULLIF(
-                  jsonb_agg(DISTINCT colors.id),
-                  '[null]'::jsonb
-                ),
-                '[]'::jsonb
-              ), '$[0 to 24]'
-            ) -- limit results to 25
-          ) AS colors_alias
-          $q$ || ', ' || $q$
-          jsonb_build_object(
-            'count', COUNT(DISTINCT windows_.id),
-            'result', jsonb_path_query_array(
-              COALESCE(
-                NULLIF(
-                  jsonb_agg(DISTINCT windows_.id),
-                  '[null]'::jsonb
-                ),
-                '[]'::jsonb
-              ), '$[0 to 24]'
-            ) -- limit results to 25
-          ) AS windows_alias
-          $q$
-    )
+    page_name => 'page'
+  ) ->> 'lateral_join_expr';
+  RETURN NEXT ok(
+    strpos(lateral_join_expr, 'ON __m.color = __t.id WHERE __m.vehicle = page."1"') > 0
   );
+  RETURN NEXT ok(strpos(lateral_join_expr, 'ORDER BY 1 LIMIT 25') > 0);
+  RETURN NEXT ok(strpos(lateral_join_expr, ') AS colors_alias(colors_alias)') > 0);
 END;
 $$ LANGUAGE plpgsql;
 
--- msar.get_table_columns_and_records ---------------------------------------------------------------------------
+-- msar.build_table_export_query --------------------------------------------------------------------------------
 
-CREATE OR REPLACE FUNCTION __setup_get_table_columns_records() RETURNS SETOF TEXT AS $$
+CREATE OR REPLACE FUNCTION __setup_table_for_export() RETURNS SETOF TEXT AS $$
 BEGIN
   CREATE TABLE table_for_export (
     id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
@@ -4562,112 +4906,43 @@ END;
 $$ LANGUAGE plpgsql;
 
 
-CREATE OR REPLACE FUNCTION test_get_table_columns_and_records() RETURNS SETOF TEXT AS $$
+CREATE OR REPLACE FUNCTION test_build_table_export_query() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
 BEGIN
-  PERFORM __setup_get_table_columns_records();
+  PERFORM __setup_table_for_export();
   rel_id := 'table_for_export'::regclass::oid;
   RETURN NEXT results_eq(
-    format(
-      $q$
-      SELECT msar.get_table_columns_and_records(
-        tab_id => %1$L,
-        limit_ => %2$L,
-        offset_ => %3$L,
-        order_ => %4$L,
-        filter_ => %5$L
-      )
-      $q$,
-      rel_id,
-      null,
-      null,
-      null,
-      null
-    ),
-    ARRAY[
-      '{"1": "id", "2": "col1", "3": "col2", "4": "col3", "5": "col4"}'::JSONB,
-      '{"1": 1, "2": 5, "3": "sdflkj", "4": "\"s\"", "5": "{\"a\": \"val\"}"}'::JSONB,
-      '{"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": "[1, 2, 3, 4]"}'::JSONB,
-      '{"1": 3, "2": 2, "3": "abcde", "4": "{\"k\": 3242348}", "5": "true"}'::JSONB
-    ]
-  );
-  RETURN NEXT results_eq(
-    format(
-      $q$
-      SELECT msar.get_table_columns_and_records(
-        tab_id => %1$L,
-        limit_ => %2$L,
-        offset_ => %3$L,
-        order_ => %4$L,
-        filter_ => %5$L
-      )
-      $q$,
-      rel_id,
-      2,
-      null,
-      '[{"attnum": 2, "direction": "desc"}]',
-      null
-    ),
-    ARRAY[
-      '{"1": "id", "2": "col1", "3": "col2", "4": "col3", "5": "col4"}'::JSONB,
-      '{"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": "[1, 2, 3, 4]"}'::JSONB,
-      '{"1": 1, "2": 5, "3": "sdflkj", "4": "\"s\"", "5": "{\"a\": \"val\"}"}'::JSONB
-    ]
+    msar.build_table_export_query(rel_id, null, null, null, null),
+    $v$VALUES
+      ('1', '5', 'sdflkj', '"s"', '{"a": "val"}'),
+      ('2', '34', 'sdflfflsk', null, '[1, 2, 3, 4]'),
+      ('3', '2', 'abcde', '{"k": 3242348}', 'true')
+    $v$
   );
   RETURN NEXT results_eq(
-    format(
-      $q$
-      SELECT msar.get_table_columns_and_records(
-        tab_id => %1$L,
-        limit_ => %2$L,
-        offset_ => %3$L,
-        order_ => %4$L,
-        filter_ => %5$L
-      )
-      $q$,
+    msar.build_table_export_query(
       rel_id,
-      null,
       1,
-      '[{"attnum": 1, "direction": "desc"}]',
-      null
-    ),
-    ARRAY[
-      '{"1": "id", "2": "col1", "3": "col2", "4": "col3", "5": "col4"}'::JSONB,
-      '{"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": "[1, 2, 3, 4]"}'::JSONB,
-      '{"1": 1, "2": 5, "3": "sdflkj", "4": "\"s\"", "5": "{\"a\": \"val\"}"}'::JSONB
-    ]
-  );
-  RETURN NEXT results_eq(
-    format(
-      $q$
-      SELECT msar.get_table_columns_and_records(
-        tab_id => %1$L,
-        limit_ => %2$L,
-        offset_ => %3$L,
-        order_ => %4$L,
-        filter_ => %5$L
-      )
-      $q$,
-      rel_id,
-      null,
-      null,
       null,
+      '[{"attnum": 2, "direction": "desc"}]',
       concat(
         '{"type":"contains_case_insensitive","args":[',
         '{"type":"attnum","value":3},'
         '{"type":"literal","value":"sdfl"}',
       ']}')::JSONB
     ),
-    ARRAY[
-      '{"1": "id", "2": "col1", "3": "col2", "4": "col3", "5": "col4"}'::JSONB,
-      '{"1": 1, "2": 5, "3": "sdflkj", "4": "\"s\"", "5": "{\"a\": \"val\"}"}'::JSONB,
-      '{"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": "[1, 2, 3, 4]"}'::JSONB
-    ]
+    $v$VALUES ('2', '34', 'sdflfflsk', null::text, '[1, 2, 3, 4]')$v$
+  );
+  ALTER TABLE table_for_export RENAME COLUMN col2 TO "Col 2";
+  RETURN NEXT ok(
+    msar.build_table_export_query(rel_id, null, null, null, null)
+    LIKE 'SELECT "1"::text AS id, "2"::text AS col1, "3"::text AS "Col 2", %'
   );
 END;
 $$ LANGUAGE plpgsql;
 
+
 -- msar.get_current_role ---------------------------------------------------------------------------
 
 CREATE OR REPLACE FUNCTION __setup_get_current_role() RETURNS SETOF TEXT AS $$
@@ -5280,13 +5555,53 @@ END;
 $$ LANGUAGE plpgsql;
 
 
-CREATE OR REPLACE FUNCTION __setup_uuid_search_records_table() RETURNS SETOF TEXT AS $$
+CREATE OR REPLACE FUNCTION test_search_records_from_table_with_cursors() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  search_ jsonb := jsonb_build_array(jsonb_build_object('attnum', 3, 'literal', 'bc'));
+  search_result jsonb;
 BEGIN
-  CREATE TABLE uuid_table (
-  id UUID PRIMARY KEY,
-  column1 TEXT,
-  column2 INTEGER,
-  column3 BOOLEAN
+  PERFORM __setup_search_records_table();
+  rel_id := 'search_table'::regclass::oid;
+  search_result := msar.search_records_from_table(rel_id, search_, 1, return_cursors => true);
+  RETURN NEXT is(
+    search_result -> 'results',
+    jsonb_build_array(jsonb_build_object('1', 1, '2', 1, '3', 'bcdea'))
+  );
+  RETURN NEXT is(
+    search_result -> 'cursors',
+    jsonb_build_object(
+      'first', msar.encode_record_cursor('["3", "1"]'),
+      'last', msar.encode_record_cursor('["3", "1"]')
+    )
+  );
+  search_result := msar.search_records_from_table(
+    rel_id, search_, 1, after_ => search_result -> 'cursors' ->> 'last'
+  );
+  RETURN NEXT is(
+    search_result -> 'results',
+    jsonb_build_array(jsonb_build_object('1', 4, '2', 2, '3', 'abcde'))
+  );
+  RETURN NEXT is((search_result -> 'count')::integer, 2);
+  RETURN NEXT ok(NOT search_result ? 'cursors');
+  search_result := msar.search_records_from_table(
+    rel_id, search_, 10, before_ => msar.encode_record_cursor('["2", "4"]')
+  );
+  RETURN NEXT is(
+    search_result -> 'results',
+    jsonb_build_array(jsonb_build_object('1', 1, '2', 1, '3', 'bcdea'))
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION __setup_uuid_search_records_table() RETURNS SETOF TEXT AS $$
+BEGIN
+  CREATE TABLE uuid_table (
+  id UUID PRIMARY KEY,
+  column1 TEXT,
+  column2 INTEGER,
+  column3 BOOLEAN
   );
   INSERT INTO uuid_table (id, column1, column2, column3) VALUES
     ('042bb99f-5467-4645-9b9f-843d8b26b087', 'foo', 1, TRUE),
@@ -5611,6 +5926,88 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_add_records_to_table() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.add_records_to_table(
+      rel_id,
+      '[{"2": 7, "3": "abc"}, {"3": "def", "5": [1, 2]}, {"2": 8, "3": "ghi"}, {}]'
+    ),
+    '{"keys": [4, 6, 5, 7], "results": null, "record_summaries": null,
+      "linked_record_summaries": null, "errors": null}'
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, col1, col2, col4 FROM atable WHERE id > 3 ORDER BY id',
+    $v$VALUES
+      (4, 7, 'abc'::varchar, null::jsonb),
+      (5, 8, 'ghi', null),
+      (6, 200, 'def', '[1, 2]'),
+      (7, 200, null, null)
+    $v$
+  );
+  RETURN NEXT is(
+    msar.add_records_to_table(rel_id, '[{"2": 9, "3": "jkl"}]', return_records => true),
+    $a${
+      "keys": [8],
+      "results": [{"1": 8, "2": 9, "3": "jkl", "4": null, "5": null}],
+      "record_summaries": null,
+      "linked_record_summaries": null,
+      "errors": null
+    }$a$
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_add_records_to_table_errors() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  result jsonb;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  result := msar.add_records_to_table(
+    rel_id,
+    '[{"3": "abc"}, {"2": "notanumber"}, {"3": "def"}, {"3": "abc"}]'
+  );
+  RETURN NEXT is(result -> 'keys', 'null'::jsonb);
+  RETURN NEXT is(
+    jsonb_path_query_array(result, '$.errors[*].index'),
+    '[1, 3]'::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result, '$.errors[*].code'),
+    '["22P02", "23505"]'::jsonb
+  );
+  -- Nothing is inserted.
+  RETURN NEXT is((SELECT count(*) FROM atable), 3::bigint);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_add_records_to_table_typmod() RETURNS SETOF TEXT AS $$
+DECLARE
+  result jsonb;
+BEGIN
+  CREATE TABLE sized (id int PRIMARY KEY GENERATED ALWAYS AS IDENTITY, code varchar(3), flags bit(3));
+  RETURN NEXT is(
+    msar.add_records_to_table(
+      'sized'::regclass, '[{"2": "abc", "3": "101"}]', return_records => true
+    ) -> 'results',
+    '[{"1": 1, "2": "abc", "3": "101"}]'
+  );
+  -- Overlong values are rejected, rather than truncated.
+  result := msar.add_records_to_table('sized'::regclass, '[{"2": "abcd"}, {"3": "1010"}]');
+  RETURN NEXT is(jsonb_path_query_array(result, '$.errors[*].code'), '["22001", "22026"]'::jsonb);
+  RETURN NEXT is((SELECT count(*) FROM sized), 1::bigint);
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_add_record_to_table_nonobj_json() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
@@ -5742,6 +6139,111 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_patch_records_in_table() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.patch_records_in_table(
+      rel_id,
+      '[
+        {"record_id": 1, "record_def": {"2": 10}},
+        {"record_id": "3", "record_def": {"2": 11, "3": "xyz"}},
+        {"record_id": 2, "record_def": {"2": 12}},
+        {"record_id": 42, "record_def": {"2": 13}}
+      ]'
+    ),
+    '{"keys": [1, 3, 2], "results": null, "record_summaries": null, "linked_record_summaries": null}'
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, col1, col2 FROM atable ORDER BY id',
+    $v$VALUES (1, 10, 'sdflkj'::varchar), (2, 12, 'sdflfflsk'), (3, 11, 'xyz')$v$
+  );
+  RETURN NEXT is(
+    msar.patch_records_in_table(
+      rel_id, '[{"record_id": 2, "record_def": {"2": null}}]', return_records => true
+    ),
+    '{
+      "keys": [2],
+      "results": [{"1": 2, "2": null, "3": "sdflfflsk", "4": null, "5": "[1, 2, 3, 4]"}],
+      "record_summaries": null,
+      "linked_record_summaries": null
+    }'
+  );
+  -- The records are returned in the order of their patches.
+  RETURN NEXT is(
+    msar.patch_records_in_table(
+      rel_id,
+      '[{"record_id": 3, "record_def": {"2": 21}}, {"record_id": 1, "record_def": {"2": 20}}]',
+      return_records => true
+    ) -> 'results',
+    '[
+      {"1": 3, "2": 21, "3": "xyz", "4": "{\"k\": 3242348}", "5": "true"},
+      {"1": 1, "2": 20, "3": "sdflkj", "4": "\"s\"", "5": "{\"a\": \"val\"}"}
+    ]'
+  );
+  -- A record can't be patched twice, however its id is written.
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.patch_records_in_table(%s, %L)',
+      rel_id,
+      '[{"record_id": 1, "record_def": {"2": 30}}, {"record_id": "1", "record_def": {"3": "a"}}]'
+    ),
+    '22023',
+    'Each record can only be patched once.'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_patch_records_in_table_with_string_pk() RETURNS SETOF TEXT AS $$
+BEGIN
+  CREATE TABLE spaceships(name TEXT PRIMARY KEY, max_speed real);
+  INSERT INTO spaceships VALUES ('Millennium Falcon', 9.0), ('Serenity', 4.0);
+  RETURN NEXT is(
+    msar.patch_records_in_table(
+      'spaceships'::regclass,
+      '[
+        {"record_id": "Millennium Falcon", "record_def": {"2": 10.3}},
+        {"record_id": "Serenity", "record_def": {"2": 10.3}}
+      ]'
+    ) -> 'keys',
+    '["Millennium Falcon", "Serenity"]'::jsonb
+  );
+  RETURN NEXT results_eq(
+    'SELECT max_speed FROM spaceships ORDER BY name',
+    'VALUES (10.3::real), (10.3::real)'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_patch_records_in_table_typmod() RETURNS SETOF TEXT AS $$
+BEGIN
+  CREATE TABLE codes(code varchar(3) PRIMARY KEY, label varchar(3));
+  INSERT INTO codes VALUES ('abc', 'x');
+  -- Overlong values are rejected, rather than truncated.
+  RETURN NEXT throws_ok(
+    $p$SELECT msar.patch_records_in_table(
+      'codes'::regclass, '[{"record_id": "abc", "record_def": {"2": "wxyz"}}]'
+    )$p$,
+    '22001',
+    NULL
+  );
+  -- Overlong record ids don't match a truncated primary key value.
+  RETURN NEXT is(
+    msar.patch_records_in_table(
+      'codes'::regclass, '[{"record_id": "abcd", "record_def": {"2": "y"}}]'
+    ) -> 'keys',
+    '[]'::jsonb
+  );
+  RETURN NEXT results_eq('SELECT label FROM codes', $v$VALUES ('x'::varchar)$v$);
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION __setup_add_records_table_only_pk() RETURNS SETOF TEXT AS $$
 BEGIN
   CREATE TABLE atable (
@@ -7733,6 +8235,100 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+
+CREATE OR REPLACE FUNCTION test_list_by_record_summaries_with_index()
+RETURNS SETOF TEXT AS $$
+DECLARE
+  tmpl jsonb := format('{ "%s": [ [2], " with ", [3], " wheels" ] }', 'vehicles'::regclass::oid);
+BEGIN
+  CREATE TABLE vehicles (
+    id int primary key,
+    name text,
+    wheel_count int
+  );
+  INSERT INTO vehicles VALUES (1, 'Car', 4), (2, 'Unicycle', 1), (3, 'Bicycle', 2);
+  PERFORM msar.create_record_summary_index('vehicles'::regclass);
+  RETURN NEXT isnt(msar.get_record_summary_index('vehicles'::regclass, msar.build_record_summary_query_for_table(
+    'vehicles'::regclass, 1::smallint, NULL
+  )), NULL);
+  RETURN NEXT is(
+    msar.list_by_record_summaries('vehicles'::regclass, 10, 0, 'cycle'),
+    '{
+      "count": 2,
+      "mapping": null,
+      "results": [{"key": 2, "summary": "Unicycle"}, {"key": 3, "summary": "Bicycle"}]
+    }'
+  );
+  -- The index follows writes to the table.
+  INSERT INTO vehicles VALUES (4, 'Tricycle', 3);
+  UPDATE vehicles SET name = 'Monocycle' WHERE id = 2;
+  DELETE FROM vehicles WHERE id = 3;
+  RETURN NEXT results_eq(
+    format('SELECT key::int, summary FROM msar_record_summaries.%I ORDER BY key', 'vehicles'::regclass::oid),
+    $v$VALUES (1, 'Car'), (2, 'Monocycle'), (4, 'Tricycle')$v$
+  );
+  RETURN NEXT is(
+    msar.list_by_record_summaries('vehicles'::regclass, 10, 0, 'cycle'),
+    '{
+      "count": 2,
+      "mapping": null,
+      "results": [{"key": 2, "summary": "Monocycle"}, {"key": 4, "summary": "Tricycle"}]
+    }'
+  );
+  -- A different template doesn't match the index, and is computed directly.
+  RETURN NEXT is(
+    msar.list_by_record_summaries('vehicles'::regclass, 10, 0, '3 wheels', tmpl),
+    '{"count": 1, "mapping": null, "results": [{"key": 4, "summary": "Tricycle with 3 wheels"}]}'
+  );
+  PERFORM msar.create_record_summary_index('vehicles'::regclass, tmpl);
+  TRUNCATE vehicles;
+  RETURN NEXT is_empty(
+    format('SELECT * FROM msar_record_summaries.%I', 'vehicles'::regclass::oid)
+  );
+  PERFORM msar.drop_record_summary_index('vehicles'::regclass);
+  RETURN NEXT hasnt_table('msar_record_summaries', 'vehicles'::regclass::oid::text, NULL);
+  INSERT INTO vehicles VALUES (1, 'Car', 4);
+  RETURN NEXT is(
+    msar.list_by_record_summaries('vehicles'::regclass, 10, 0),
+    '{"count": 1, "mapping": null, "results": [{"key": 1, "summary": "Car"}]}'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_create_record_summary_index_linked_template()
+RETURNS SETOF TEXT AS $$
+BEGIN
+  CREATE TABLE makers (id int primary key, name text);
+  CREATE TABLE vehicles (id int primary key, name text, maker int REFERENCES makers(id));
+  RETURN NEXT throws_ok(
+    format(
+      $q$SELECT msar.create_record_summary_index('vehicles'::regclass, '{"%s": [[2], " by ", [3, 2]]}')$q$,
+      'vehicles'::regclass::oid
+    ),
+    '0A000',
+    NULL
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_record_summary_index_goes_stale()
+RETURNS SETOF TEXT AS $$
+BEGIN
+  CREATE TABLE vehicles (id int primary key, name text, wheel_count int);
+  INSERT INTO vehicles VALUES (1, 'Car', 4);
+  PERFORM msar.create_record_summary_index('vehicles'::regclass);
+  ALTER TABLE vehicles DROP COLUMN name;
+  -- Writes to the table still succeed, but the index is no longer used.
+  RETURN NEXT lives_ok($w$INSERT INTO vehicles VALUES (2, 2)$w$);
+  RETURN NEXT is(
+    obj_description(format('msar_record_summaries.%I', 'vehicles'::regclass::oid)::regclass, 'pg_class'),
+    NULL
+  );
+END;
+$$ LANGUAGE plpgsql;
+
 -- msar.form_insert -------------------------------------------------------------------------------
 
 CREATE OR REPLACE FUNCTION __setup_items_books_authors_insert() RETURNS SETOF TEXT AS $$
@@ -8159,3 +8755,656 @@ BEGIN
   );
 END;
 $$ LANGUAGE plpgsql;
+
+
+-- msar.run_exploration ----------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION __setup_run_exploration() RETURNS SETOF TEXT AS $$
+BEGIN
+  CREATE TABLE "Authors" (
+    id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    "Name" text
+  );
+  CREATE TABLE "Books" (
+    id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    "Title" text,
+    "Year" integer,
+    "Author" integer REFERENCES "Authors" (id)
+  );
+  INSERT INTO "Authors" ("Name") VALUES ('Le Guin'), ('Pratchett');
+  INSERT INTO "Books" ("Title", "Year", "Author") VALUES
+    ('The Dispossessed', 1974, 1),
+    ('Mort', 1987, 2),
+    ('Guards! Guards!', 1989, 2),
+    ('Unattributed', 2001, null);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_run_exploration() RETURNS SETOF TEXT AS $$
+DECLARE
+  exploration jsonb;
+  result jsonb;
+BEGIN
+  PERFORM __setup_run_exploration();
+  exploration := jsonb_build_object(
+    'base_table_oid', '"Books"'::regclass::oid::bigint,
+    'initial_columns', jsonb_build_array(
+      jsonb_build_object('alias', 'Title', 'attnum', 2),
+      jsonb_build_object('alias', 'Year', 'attnum', 3),
+      jsonb_build_object(
+        'alias', 'Author Name',
+        'attnum', 2,
+        'join_path', jsonb_build_array(jsonb_build_array(
+          jsonb_build_array('"Books"'::regclass::oid, 4),
+          jsonb_build_array('"Authors"'::regclass::oid, 1)
+        ))
+      )
+    )
+  );
+
+  -- Without transformations, the records are ordered by all orderable columns.
+  result := msar.run_exploration(exploration, 2, 1);
+  RETURN NEXT is(result -> 'count', '4'::jsonb);
+  RETURN NEXT is(
+    result -> 'results',
+    $j$[
+      {"Title": "Mort", "Year": 1987, "Author Name": "Pratchett"},
+      {"Title": "The Dispossessed", "Year": 1974, "Author Name": "Le Guin"}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(result -> 'output_columns', '["Title", "Year", "Author Name"]'::jsonb);
+  RETURN NEXT is(
+    result -> 'columns' -> 2,
+    jsonb_build_object(
+      'alias', 'Author Name',
+      'type_id', 'text'::regtype::oid::bigint,
+      'type', 'text',
+      'type_options', null,
+      'primary_key', false,
+      'input_table_oid', '"Authors"'::regclass::oid::bigint,
+      'input_table_name', 'Authors',
+      'input_column_attnum', 2,
+      'input_column_name', 'Name'
+    )
+  );
+
+  -- The count is still given when the page is past the last record.
+  result := msar.run_exploration(exploration, 2, 10);
+  RETURN NEXT is(result -> 'count', '4'::jsonb);
+  RETURN NEXT is(result -> 'results', '[]'::jsonb);
+
+  -- Counting can be skipped.
+  result := msar.run_exploration(exploration, 1, 0, 'none');
+  RETURN NEXT is(result -> 'count', 'null'::jsonb);
+  RETURN NEXT is(jsonb_array_length(result -> 'results'), 1);
+
+  -- Pages can be fetched with cursors.
+  result := msar.run_exploration(exploration, 2, 0);
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'results', '$[*].Title'),
+    '["Guards! Guards!", "Mort"]'::jsonb
+  );
+  result := msar.run_exploration(exploration, 2, 0, 'exact', result -> 'cursors' ->> 'last');
+  RETURN NEXT is(result -> 'count', '4'::jsonb);
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'results', '$[*].Title'),
+    '["The Dispossessed", "Unattributed"]'::jsonb
+  );
+  -- Unattributed has a NULL Author Name, which is part of its cursor.
+  RETURN NEXT is(
+    msar.run_exploration(exploration, 2, 0, 'none', result -> 'cursors' ->> 'last') -> 'results',
+    '[]'::jsonb
+  );
+  result := msar.run_exploration(
+    exploration, 1, 0, 'none', null, result -> 'cursors' ->> 'first'
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'results', '$[*].Title'),
+    '["Mort"]'::jsonb
+  );
+  RETURN NEXT is(
+    msar.decode_record_cursor(result -> 'cursors' ->> 'first'),
+    '["Mort", "1987", "Pratchett"]'::jsonb
+  );
+
+  -- Cursors follow an order transformation.
+  result := msar.run_exploration(
+    exploration || jsonb_build_object('transformations', $j$[
+      {"type": "order", "spec": [{"field": "Year", "direction": "desc"}]}
+    ]$j$::jsonb),
+    2,
+    0,
+    'none',
+    msar.encode_record_cursor('["1989", "Guards! Guards!", "Pratchett"]'::jsonb)
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'results', '$[*].Title'),
+    '["Mort", "The Dispossessed"]'::jsonb
+  );
+
+  -- The query for declaring a cursor gives all the records, in order.
+  EXECUTE format(
+    'SELECT jsonb_agg(__mathesar_record ->> %L) FROM (%s) AS q',
+    'Title',
+    msar.build_exploration_records_query(exploration)
+  ) INTO result;
+  RETURN NEXT is(
+    result, '["Guards! Guards!", "Mort", "The Dispossessed", "Unattributed"]'::jsonb
+  );
+
+  -- Explorations ordered with NULLs moved can't be paged with cursors.
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.run_exploration(%L, 2, 0, %L, %L)',
+      exploration || jsonb_build_object('transformations', $j$[
+        {"type": "order", "spec": [{"field": "Year", "direction": "asc", "nullsfirst": true}]}
+      ]$j$::jsonb),
+      'exact',
+      msar.encode_record_cursor('["1989"]'::jsonb)
+    ),
+    '22023'
+  );
+
+  -- Filter, order, and hide.
+  result := msar.run_exploration(
+    exploration || jsonb_build_object('transformations', $j$[
+      {"type": "filter", "spec": {"greater": [{"column_name": ["Year"]}, {"literal": [1980]}]}},
+      {"type": "order", "spec": [{"field": "Year", "direction": "desc"}]},
+      {"type": "hide", "spec": ["Author Name"]}
+    ]$j$::jsonb),
+    null,
+    null
+  );
+  RETURN NEXT is(result -> 'count', '3'::jsonb);
+  RETURN NEXT is(
+    result -> 'results',
+    $j$[
+      {"Title": "Unattributed", "Year": 2001},
+      {"Title": "Guards! Guards!", "Year": 1989},
+      {"Title": "Mort", "Year": 1987}
+    ]$j$::jsonb
+  );
+
+  -- Summarize.
+  result := msar.run_exploration(
+    exploration || jsonb_build_object('transformations', $j$[
+      {"type": "filter", "spec": {"not_null": [{"column_name": ["Author Name"]}]}},
+      {"type": "summarize", "spec": {
+        "base_grouping_column": "Author Name",
+        "grouping_expressions": [{"input_alias": "Author Name", "output_alias": "Author"}],
+        "aggregation_expressions": [
+          {"input_alias": "Title", "output_alias": "Titles", "function": "distinct_aggregate_to_array"},
+          {"input_alias": "Year", "output_alias": "Latest", "function": "max"}
+        ]
+      }}
+    ]$j$::jsonb),
+    null,
+    null
+  );
+  RETURN NEXT is(
+    result -> 'results',
+    $j$[
+      {"Author": "Le Guin", "Titles": ["The Dispossessed"], "Latest": 1974},
+      {"Author": "Pratchett", "Titles": ["Guards! Guards!", "Mort"], "Latest": 1989}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'columns', '$[*] ? (@.alias == "Titles").type'),
+    '["_array"]'::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'columns', '$[*] ? (@.alias == "Latest").type'),
+    '["integer"]'::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'columns', '$[*] ? (@.approximate == true).alias'),
+    '[]'::jsonb
+  );
+
+  -- Approximate summarize; sampling all of the table gives the exact result, with the
+  -- aggregations flagged approximate.
+  exploration := exploration || jsonb_build_object('transformations', $j$[
+    {"type": "summarize", "spec": {
+      "base_grouping_column": "Author Name",
+      "sample_percent": 100,
+      "grouping_expressions": [{"input_alias": "Author Name", "output_alias": "Author"}],
+      "aggregation_expressions": [
+        {"input_alias": "Title", "output_alias": "Books", "function": "count"},
+        {"input_alias": "Year", "output_alias": "Years", "function": "sum"}
+      ]
+    }}
+  ]$j$::jsonb);
+  result := msar.run_exploration(exploration, null, null);
+  RETURN NEXT is(
+    result -> 'results',
+    $j$[
+      {"Author": "Le Guin", "Books": 1, "Years": 1974},
+      {"Author": "Pratchett", "Books": 2, "Years": 3976},
+      {"Author": null, "Books": 1, "Years": 2001}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'columns', '$[*] ? (@.approximate == true).alias'),
+    '["Books", "Years"]'::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result -> 'columns', '$[*] ? (@.alias == "Books").type'),
+    '["bigint"]'::jsonb
+  );
+  -- Counts and sums are scaled by the sampled fraction of the table.
+  RETURN NEXT matches(
+    msar.build_exploration_query(
+      jsonb_set(exploration, '{transformations,0,spec,sample_percent}', '50')
+    ) ->> 'query',
+    'TABLESAMPLE SYSTEM \(''50''\).*round\(count\("Title"\) \* ''2\.0*''::numeric\)::bigint'
+  );
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.run_exploration(%L, null, null)',
+      jsonb_set(exploration, '{transformations,0,spec,sample_percent}', '0')
+    ),
+    '22023'
+  );
+  exploration := exploration || jsonb_build_object('transformations', $j$[
+    {"type": "summarize", "spec": {
+      "base_grouping_column": "Author Name",
+      "grouping_expressions": [{"input_alias": "Author Name", "output_alias": "Author"}],
+      "aggregation_expressions": [
+        {"input_alias": "Title", "output_alias": "Books", "function": "count"},
+        {"input_alias": "Year", "output_alias": "Years", "function": "sum"}
+      ]
+    }},
+    {"type": "summarize", "spec": {
+      "base_grouping_column": "Books",
+      "sample_percent": 10,
+      "grouping_expressions": [{"input_alias": "Books", "output_alias": "Books"}],
+      "aggregation_expressions": [
+        {"input_alias": "Author", "output_alias": "Authors", "function": "count"},
+        {"input_alias": "Years", "output_alias": "Years", "function": "max"}
+      ]
+    }}
+  ]$j$::jsonb);
+  RETURN NEXT throws_ok(
+    format('SELECT msar.run_exploration(%L, null, null)', exploration),
+    '22023'
+  );
+
+  -- A summarization which doesn't mention every column isn't handled here.
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.run_exploration(%L, null, null)',
+      exploration || jsonb_build_object('transformations', $j$[
+        {"type": "summarize", "spec": {
+          "base_grouping_column": "Author Name",
+          "grouping_expressions": [{"input_alias": "Author Name", "output_alias": "Author"}],
+          "aggregation_expressions": []
+        }}
+      ]$j$::jsonb)
+    ),
+    '0A000'
+  );
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.run_exploration(%L, null, null)',
+      exploration || jsonb_build_object('transformations', $j$[
+        {"type": "filter", "spec": {"in": [{"column_name": ["Year"]}, {"list": []}]}}
+      ]$j$::jsonb)
+    ),
+    '0A000'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION __page_exploration_titles(exploration jsonb) RETURNS jsonb AS $$
+-- Page through the records of an exploration one at a time with cursors, collecting their titles.
+DECLARE
+  result jsonb;
+  cursor_ text;
+  titles jsonb := '[]'::jsonb;
+BEGIN
+  FOR i IN 1..10 LOOP
+    result := msar.run_exploration(exploration, 1, 0, 'none', cursor_);
+    EXIT WHEN result -> 'results' = '[]'::jsonb;
+    titles := titles || jsonb_build_array(result -> 'results' -> 0 -> 'Title');
+    cursor_ := result -> 'cursors' ->> 'last';
+  END LOOP;
+  RETURN titles;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_run_exploration_cursors_with_joined_keys() RETURNS SETOF TEXT AS $$
+DECLARE
+  author_id_col jsonb;
+  exploration jsonb;
+BEGIN
+  PERFORM __setup_run_exploration();
+  author_id_col := jsonb_build_object(
+    'alias', 'Author Id',
+    'attnum', 1,
+    'join_path', jsonb_build_array(jsonb_build_array(
+      jsonb_build_array('"Books"'::regclass::oid, 4),
+      jsonb_build_array('"Authors"'::regclass::oid, 1)
+    ))
+  );
+
+  -- The primary key of a joined table is repeated (Pratchett wrote two of the books) and NULL
+  -- (for the unattributed one), so it doesn't identify the records.
+  exploration := jsonb_build_object(
+    'base_table_oid', '"Books"'::regclass::oid::bigint,
+    'initial_columns', jsonb_build_array(
+      jsonb_build_object('alias', 'Title', 'attnum', 2),
+      author_id_col
+    ),
+    'transformations', $j$[
+      {"type": "order", "spec": [{"field": "Author Id", "direction": "asc"}]}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(
+    msar.build_exploration_query(exploration) -> 'keyset',
+    $j$[
+      {"name": "Author Id", "direction": "ASC", "not_null": false},
+      {"name": "Title", "direction": "ASC", "not_null": false}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(
+    __page_exploration_titles(exploration),
+    '["The Dispossessed", "Guards! Guards!", "Mort", "Unattributed"]'::jsonb
+  );
+
+  -- The primary key of the base table identifies the records, since the join is to a primary key.
+  exploration := jsonb_set(
+    exploration,
+    '{initial_columns}',
+    (exploration -> 'initial_columns') || jsonb_build_array(
+      jsonb_build_object('alias', 'Book Id', 'attnum', 1)
+    )
+  );
+  RETURN NEXT is(
+    msar.build_exploration_query(exploration) -> 'keyset',
+    $j$[
+      {"name": "Author Id", "direction": "ASC", "not_null": false},
+      {"name": "Book Id", "direction": "ASC", "not_null": true}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(
+    __page_exploration_titles(exploration),
+    '["The Dispossessed", "Mort", "Guards! Guards!", "Unattributed"]'::jsonb
+  );
+
+  -- Joining the books of each author repeats the authors, so their primary key doesn't identify the
+  -- records either.
+  exploration := jsonb_build_object(
+    'base_table_oid', '"Authors"'::regclass::oid::bigint,
+    'initial_columns', jsonb_build_array(
+      jsonb_build_object('alias', 'Id', 'attnum', 1),
+      jsonb_build_object(
+        'alias', 'Title',
+        'attnum', 2,
+        'join_path', jsonb_build_array(jsonb_build_array(
+          jsonb_build_array('"Authors"'::regclass::oid, 1),
+          jsonb_build_array('"Books"'::regclass::oid, 4)
+        ))
+      )
+    ),
+    'transformations', $j$[
+      {"type": "order", "spec": [{"field": "Id", "direction": "asc"}]}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(
+    msar.build_exploration_query(exploration) -> 'keyset',
+    $j$[
+      {"name": "Id", "direction": "ASC", "not_null": false},
+      {"name": "Title", "direction": "ASC", "not_null": false}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(
+    __page_exploration_titles(exploration),
+    '["The Dispossessed", "Guards! Guards!", "Mort"]'::jsonb
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- msar.get_tables_modification_token --------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION test_get_tables_modification_token() RETURNS SETOF TEXT AS $$
+DECLARE
+  token_1 text;
+  token_2 text;
+BEGIN
+  CREATE TABLE mod_token_a (id integer PRIMARY KEY, val text);
+  CREATE TABLE mod_token_b (id integer PRIMARY KEY);
+  token_1 := msar.get_tables_modification_token(
+    ARRAY['mod_token_a'::regclass::oid, 'mod_token_b'::regclass::oid]
+  );
+  RETURN NEXT isnt(token_1, null);
+  RETURN NEXT is(
+    msar.get_tables_modification_token(
+      ARRAY['mod_token_b'::regclass::oid, 'mod_token_a'::regclass::oid]
+    ),
+    token_1,
+    'The token does not depend on the order of the tables'
+  );
+  ALTER TABLE mod_token_b ADD COLUMN val text;
+  token_2 := msar.get_tables_modification_token(
+    ARRAY['mod_token_a'::regclass::oid, 'mod_token_b'::regclass::oid]
+  );
+  RETURN NEXT isnt(token_2, token_1, 'The token changes when a table is altered');
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- msar.materialize_exploration --------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION test_materialize_exploration() RETURNS SETOF TEXT AS $$
+DECLARE
+  exploration jsonb;
+  mv_id oid;
+  result jsonb;
+BEGIN
+  PERFORM __setup_run_exploration();
+  exploration := jsonb_build_object(
+    'base_table_oid', '"Books"'::regclass::oid::bigint,
+    'initial_columns', jsonb_build_array(
+      jsonb_build_object('alias', 'Title', 'attnum', 2),
+      jsonb_build_object('alias', 'Year', 'attnum', 3)
+    )
+  );
+  mv_id := msar.materialize_exploration(exploration, 'public'::regnamespace::oid, 'Books Explored');
+  RETURN NEXT is(mv_id, '"Books Explored"'::regclass::oid);
+
+  result := msar.run_materialized_exploration(exploration, mv_id, 2, 1);
+  RETURN NEXT is(result -> 'count', '4'::jsonb);
+  RETURN NEXT is(
+    result -> 'results',
+    $j$[
+      {"Title": "Mort", "Year": 1987},
+      {"Title": "The Dispossessed", "Year": 1974}
+    ]$j$::jsonb
+  );
+  RETURN NEXT is(result -> 'output_columns', '["Title", "Year"]'::jsonb);
+  RETURN NEXT is(
+    msar.build_materialized_exploration_query(mv_id, 1, 0),
+    $q$SELECT "Title", "Year" FROM "Books Explored" ORDER BY __mathesar_row_number LIMIT '1' OFFSET '0'$q$
+  );
+
+  -- The view only changes when refreshed.
+  INSERT INTO "Books" ("Title", "Year") VALUES ('Anathem', 2008);
+  result := msar.run_materialized_exploration(exploration, mv_id, 1, 0);
+  RETURN NEXT is(result -> 'count', '4'::jsonb);
+  PERFORM msar.refresh_materialized_exploration(mv_id);
+  result := msar.run_materialized_exploration(exploration, mv_id, 1, 0, 'none');
+  RETURN NEXT is(result -> 'count', 'null'::jsonb);
+  RETURN NEXT is(result -> 'results', '[{"Title": "Anathem", "Year": 2008}]'::jsonb);
+
+  PERFORM msar.drop_materialized_exploration(mv_id);
+  RETURN NEXT hasnt_materialized_view('Books Explored');
+  -- Dropping a view which no longer exists is a no-op.
+  RETURN NEXT lives_ok(format('SELECT msar.drop_materialized_exploration(%s)', mv_id));
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_replace_materialized_exploration() RETURNS SETOF TEXT AS $$
+DECLARE
+  exploration jsonb;
+  mv_id oid;
+  new_mv_id oid;
+BEGIN
+  PERFORM __setup_run_exploration();
+  exploration := jsonb_build_object(
+    'base_table_oid', '"Books"'::regclass::oid::bigint,
+    'initial_columns', jsonb_build_array(jsonb_build_object('alias', 'Title', 'attnum', 2))
+  );
+  mv_id := msar.materialize_exploration(exploration, 'public'::regnamespace::oid, 'Books Explored');
+  CREATE ROLE exploration_owner;
+  GRANT CREATE ON SCHEMA public TO exploration_owner;
+  GRANT exploration_owner TO current_user;
+  ALTER MATERIALIZED VIEW "Books Explored" OWNER TO exploration_owner;
+
+  exploration := jsonb_set(
+    exploration,
+    '{initial_columns}',
+    jsonb_build_array(jsonb_build_object('alias', 'Year', 'attnum', 3))
+  );
+  new_mv_id := msar.replace_materialized_exploration(
+    exploration, mv_id, 'public'::regnamespace::oid, 'Books Explored'
+  );
+  RETURN NEXT is(new_mv_id, '"Books Explored"'::regclass::oid);
+  RETURN NEXT isnt(new_mv_id, mv_id);
+  RETURN NEXT hasnt_materialized_view('Books Explored_new');
+  RETURN NEXT materialized_view_owner_is('Books Explored', 'exploration_owner');
+  RETURN NEXT is(
+    msar.run_materialized_exploration(exploration, new_mv_id, 1, 0) -> 'results',
+    '[{"Year": 1974}]'::jsonb
+  );
+
+  -- The old view is kept if the new one can't be built.
+  CREATE TABLE "Books Explored_new" (id integer);
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.replace_materialized_exploration(%L, %s, %s, %L)',
+      exploration,
+      new_mv_id,
+      'public'::regnamespace::oid,
+      'Books Explored'
+    ),
+    '42P07'
+  );
+  RETURN NEXT is('"Books Explored"'::regclass::oid, new_mv_id);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_can_read_materialized_exploration() RETURNS SETOF TEXT AS $$
+DECLARE
+  exploration jsonb;
+  mv_id oid;
+BEGIN
+  PERFORM __setup_run_exploration();
+  exploration := jsonb_build_object(
+    'base_table_oid', '"Books"'::regclass::oid::bigint,
+    'initial_columns', jsonb_build_array(
+      jsonb_build_object('alias', 'Title', 'attnum', 2),
+      jsonb_build_object(
+        'alias', 'Author Name',
+        'attnum', 2,
+        'join_path', jsonb_build_array(jsonb_build_array(
+          jsonb_build_array('"Books"'::regclass::oid, 4),
+          jsonb_build_array('"Authors"'::regclass::oid, 1)
+        ))
+      )
+    )
+  );
+  mv_id := msar.materialize_exploration(exploration, 'public'::regnamespace::oid, 'Books Explored');
+  RETURN NEXT ok(msar.can_read_materialized_exploration(exploration, mv_id));
+
+  CREATE ROLE exploration_reader;
+  GRANT USAGE ON SCHEMA msar, __msar TO exploration_reader;
+  GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA msar, __msar TO exploration_reader;
+  SET ROLE exploration_reader;
+  RETURN NEXT ok(
+    NOT msar.can_read_materialized_exploration(exploration, mv_id),
+    'The view may not be read without privileges on it'
+  );
+  SET ROLE NONE;
+  GRANT SELECT ON "Books Explored" TO exploration_reader;
+  GRANT SELECT ("Title", "Author") ON "Books" TO exploration_reader;
+  GRANT SELECT (id) ON "Authors" TO exploration_reader;
+  SET ROLE exploration_reader;
+  RETURN NEXT ok(
+    NOT msar.can_read_materialized_exploration(exploration, mv_id),
+    'The view may not be read without privileges on all the columns it uses'
+  );
+  SET ROLE NONE;
+  GRANT SELECT ("Name") ON "Authors" TO exploration_reader;
+  SET ROLE exploration_reader;
+  RETURN NEXT ok(msar.can_read_materialized_exploration(exploration, mv_id));
+  SET ROLE NONE;
+
+  PERFORM msar.drop_materialized_exploration(mv_id);
+  RETURN NEXT ok(NOT msar.can_read_materialized_exploration(exploration, mv_id));
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- msar.peak_time, msar.peak_month -----------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION test_peak_aggregates_parallel() RETURNS SETOF TEXT AS $$
+DECLARE
+  serial_peaks record;
+  parallel_peaks record;
+  plan_line text;
+  plan text;
+BEGIN
+  RETURN NEXT is(
+    (
+      SELECT array_agg(p.proparallel ORDER BY p.oid)
+      FROM pg_catalog.pg_proc AS p
+      WHERE p.oid IN ('msar.peak_time(time)'::regprocedure, 'msar.peak_month(date)'::regprocedure)
+    ),
+    ARRAY['s', 's']::"char"[]
+  );
+  RETURN NEXT is(
+    (
+      SELECT array_agg(a.aggcombinefn::regproc::text ORDER BY a.aggfnoid)
+      FROM pg_catalog.pg_aggregate AS a
+      WHERE a.aggfnoid IN (
+        'msar.peak_time(time)'::regprocedure, 'msar.peak_month(date)'::regprocedure
+      )
+    ),
+    ARRAY['msar.add_vectors', 'msar.add_vectors']
+  );
+
+  CREATE TABLE peak_fixture AS
+    SELECT
+      time '00:00' + (i % 96) * interval '10 minutes' + (i % 7) * interval '1 hour' AS t,
+      date '2023-01-01' + (i % 250) AS d
+    FROM generate_series(1, 20000) AS i;
+  ANALYZE peak_fixture;
+  SELECT msar.peak_time(t) AS pt, msar.peak_month(d) AS pm
+    INTO serial_peaks FROM peak_fixture;
+  -- Make the planner choose a parallel aggregate even for this small table.
+  SET LOCAL parallel_setup_cost = 0;
+  SET LOCAL parallel_tuple_cost = 0;
+  SET LOCAL min_parallel_table_scan_size = 0;
+  SET LOCAL max_parallel_workers_per_gather = 2;
+  FOR plan_line IN
+    EXECUTE 'EXPLAIN (COSTS OFF) SELECT msar.peak_time(t), msar.peak_month(d) FROM peak_fixture'
+  LOOP
+    plan := concat_ws(E'\n', plan, plan_line);
+  END LOOP;
+  RETURN NEXT matches(plan, 'Finalize Aggregate', 'The aggregates are finalized after a Gather');
+  RETURN NEXT matches(plan, 'Partial Aggregate', 'The aggregates are computed by parallel workers');
+  SELECT msar.peak_time(t) AS pt, msar.peak_month(d) AS pm
+    INTO parallel_peaks FROM peak_fixture;
+  RETURN NEXT is(
+    date_trunc('second', '2000-01-01'::date + parallel_peaks.pt),
+    date_trunc('second', '2000-01-01'::date + serial_peaks.pt)
+  );
+  RETURN NEXT is(parallel_peaks.pm, serial_peaks.pm);
+END;
+$$ LANGUAGE plpgsql;
@@ -1,4 +1,7 @@
 import json
+
+from psycopg import sql
+
 from db import connection as db_conn
 from db.columns import _transform_column_alter_dict
 
@@ -37,6 +40,23 @@ def list_joinable_tables(table_oid, conn, max_depth):
     return db_conn.exec_msar_func(conn, 'get_joinable_tables', max_depth, table_oid).fetchone()[0]
 
 
+def get_tables_modification_token(table_oids, conn):
+    """
+    Return a token which changes whenever any of the given tables is
+    modified.
+
+    The row counters in the token are maintained asynchronously by
+    Postgres, so data modifications may change it only after about a
+    second.
+
+    Args:
+        table_oids: The OIDs of the tables.
+    """
+    return db_conn.exec_msar_func(
+        conn, 'get_tables_modification_token', list(table_oids)
+    ).fetchone()[0]
+
+
 def get_preview(table_oid, column_list, conn, limit=20):
     """
     Preview an imported table. Returning the records from the specified columns of the table.
@@ -132,15 +152,42 @@ def create_and_import_from_rows(
               the same length, and should have the same length as
               `column_names`
     """
+    import_info = prepare_table_for_import(
+        table_name,
+        schema_oid,
+        column_names,
+        conn,
+        comment=comment,
+        import_into_temp_table=import_into_temp_table
+    )
+    import_rows_into_table(rows, import_info, conn)
+    return import_info
+
+
+def prepare_table_for_import(
+        table_name,
+        schema_oid,
+        column_names,
+        conn,
+        comment=None,
+        import_into_temp_table=False
+):
+    """
+    Create a Mathesar table as specified, with text columns, to be filled
+    using `import_rows_into_table` or `import_csv_into_table`.
+
+    Returns a dict describing the table, including the `copy_sql` and
+    `copy_columns` used to fill it.
+    """
     if import_into_temp_table:
-        import_info = db_conn.exec_msar_func(
+        return db_conn.exec_msar_func(
             conn,
             'prepare_temp_table_for_import',
             table_name,
             column_names
         ).fetchone()[0]
     else:
-        import_info = db_conn.exec_msar_func(
+        return db_conn.exec_msar_func(
             conn,
             'prepare_table_for_import',
             schema_oid,
@@ -149,12 +196,110 @@ def create_and_import_from_rows(
             comment
         ).fetchone()[0]
 
+
+def prepare_staging_tables_for_import(column_count, table_count, conn):
+    """
+    Create UNLOGGED tables of text columns, to be filled concurrently
+    through separate connections using `import_csv_into_table`.
+
+    The tables are created in an internal schema, which also gets rid of
+    the current role's tables left there by imports that didn't finish.
+
+    The tables need to be committed before they can be filled, and
+    dropped if they end up not being emptied by `insert_from_staging_tables`.
+
+    Returns a list with a dict per table, like those returned by
+    `prepare_table_for_import`.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'prepare_staging_tables_for_import',
+        column_count,
+        table_count
+    ).fetchone()[0]
+
+
+def prepare_columns_for_import(table_oid, column_attnums, conn):
+    """
+    Get what's needed to COPY straight into columns of an existing table,
+    using `import_rows_into_table` or `import_csv_into_table`.
+
+    Returns a dict like those returned by `prepare_table_for_import`, or
+    None if COPY would parse values differently from `insert_from_select`
+    (i.e., if any column isn't textual).
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'prepare_columns_for_import',
+        table_oid,
+        column_attnums
+    ).fetchone()[0]
+
+
+def import_rows_into_table(rows, import_info, conn):
+    """
+    Copy rows into a table created by `prepare_table_for_import`.
+
+    Args:
+        rows: An iterable of iterables, one per row, each with a value per
+              column of the table.
+        import_info: The dict returned by `prepare_table_for_import`.
+
+    Returns:
+        The number of rows copied.
+    """
     cursor = conn.cursor()
     with cursor.copy(import_info['copy_sql']) as copy:
         for row in rows:
             copy.write_row(row)
+    return cursor.rowcount
 
-    return import_info
+
+def import_csv_into_table(
+        blocks,
+        import_info,
+        conn,
+        delimiter=',',
+        quotechar='"',
+        header=False
+):
+    """
+    Copy UTF-8 CSV data into a table created by `prepare_table_for_import`.
+
+    The data is parsed by PostgreSQL itself. As with `import_rows_into_table`,
+    empty values (quoted or not) are imported as NULL.
+
+    Args:
+        blocks: An iterable of bytes objects, which concatenate to the CSV.
+        import_info: The dict returned by `prepare_table_for_import`.
+        delimiter: The character separating values.
+        quotechar: The character quoting values. Quotes are escaped by
+                   doubling them.
+        header: Whether to skip the first line of the CSV.
+
+    Returns:
+        The number of rows copied.
+    """
+    options = [
+        sql.SQL("FORMAT csv"),
+        sql.SQL("HEADER {}").format(sql.SQL("true" if header else "false")),
+        sql.SQL("DELIMITER {}").format(sql.Literal(delimiter)),
+        sql.SQL("QUOTE {}").format(sql.Literal(quotechar)),
+        sql.SQL("NULL ''"),
+        sql.SQL("ENCODING 'UTF8'"),
+    ]
+    if import_info['copy_columns']:
+        options.append(sql.SQL("FORCE_NULL ({})").format(
+            sql.SQL(', ').join(map(sql.Identifier, import_info['copy_columns']))
+        ))
+    copy_sql = sql.SQL("{} WITH ({})").format(
+        sql.SQL(import_info['copy_sql']), sql.SQL(', ').join(options)
+    )
+    cursor = conn.cursor()
+    with cursor.copy(copy_sql) as copy:
+        for block in blocks:
+            copy.write(block)
+    return cursor.rowcount
 
 
 def drop_table_from_database(table_oid, conn, cascade=False):
@@ -225,34 +370,35 @@ def split_table(
     }
 
 
-def fetch_table_in_chunks(
+def copy_table_as_csv(
     conn,
     table_oid,
     limit=None,
     offset=None,
     order=None,
     filter=None,
-    with_column_header=True,
-    batch_size=2000
 ):
-    with conn.transaction():
-        with db_conn.exec_msar_func_server_cursor(
-            conn,
-            'get_table_columns_and_records',
-            table_oid,
-            limit,
-            offset,
-            _json_or_none(order),
-            _json_or_none(filter),
-        ) as server_cursor:
-            if with_column_header:
-                columns = server_cursor.fetchone()[0]
-                yield columns
-            while True:
-                records = server_cursor.fetchmany(batch_size)
-                if not records:
-                    break
-                yield [record[0] for record in records]
+    """
+    Yield the records of a table as chunks of CSV bytes, with a header.
+
+    The CSV is produced by the database with `COPY ... TO STDOUT`, and
+    the chunks are passed on as they arrive.
+    """
+    export_query = db_conn.exec_msar_func(
+        conn,
+        'build_table_export_query',
+        table_oid,
+        limit,
+        offset,
+        _json_or_none(order),
+        _json_or_none(filter),
+    ).fetchone()[0]
+    cursor = conn.cursor()
+    with cursor.copy(
+        f"COPY ({export_query}) TO STDOUT WITH (FORMAT csv, HEADER)"
+    ) as copy:
+        for data in copy:
+            yield bytes(data)
 
 
 def set_primary_key_column_on_table(
@@ -270,3 +416,30 @@ def set_primary_key_column_on_table(
         default_type,
         drop_old_pkey_column
     )
+
+
+def set_record_summary_index(
+        conn, table_oid, enabled, table_record_summary_templates=None
+):
+    """
+    Create (or rebuild), or drop the record summary index of a table.
+
+    The index keeps the rendered record summaries of the table, so that
+    they can be searched and sorted without rendering them for every
+    record.
+
+    Args:
+        table_oid: The OID of the table whose summaries we'll index.
+        enabled: Whether the table should have a record summary index.
+        table_record_summary_templates: A dict of record summary
+            templates, per table.
+    """
+    if enabled:
+        db_conn.exec_msar_func(
+            conn,
+            'create_record_summary_index',
+            table_oid,
+            _json_or_none(table_record_summary_templates),
+        )
+    else:
+        db_conn.exec_msar_func(conn, 'drop_record_summary_index', table_oid)
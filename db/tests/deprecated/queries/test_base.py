@@ -1,5 +1,10 @@
-from sqlalchemy import inspect, text
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, inspect, select, text
 from db.deprecated.queries.base import DBQuery, InitialColumn, JoinParameter
+from db.deprecated.functions.base import Count, Sum
+from db.deprecated.tables import get_reflected_tables
 from db.deprecated.columns import get_column_attnum_from_name as get_attnum
 from db.deprecated.transforms import base as tbase
 from db.deprecated.metadata import get_empty_metadata
@@ -339,6 +344,31 @@ def test_DBQuery_all_sa_columns_map_overwriting(engine_with_library):
     assert actual_columns == expect_columns
 
 
+def test_DBQuery_get_records_and_count(engine_with_academics):
+    engine, schema = engine_with_academics
+    acad_oid = _get_oid_from_table("academics", schema, engine)
+    metadata = get_empty_metadata()
+    initial_columns = [
+        InitialColumn(
+            acad_oid,
+            get_attnum(acad_oid, 'id', engine, metadata=metadata),
+            alias='id',
+        ),
+        InitialColumn(
+            acad_oid,
+            get_attnum(acad_oid, 'name', engine, metadata=metadata),
+            alias='name',
+        ),
+    ]
+    dbq = DBQuery(acad_oid, initial_columns, engine)
+    records, count = dbq.get_records_and_count(limit=2, offset=1)
+    assert records == [r._asdict() for r in dbq.get_records(limit=2, offset=1)]
+    assert count == dbq.count
+    records, count = dbq.get_records_and_count(offset=count)
+    assert records == []
+    assert count == dbq.count
+
+
 def test_run_explorations(db, engine_with_library):
     # This test exists to make sure we're able to run explorations with both TCP & Unix socket connections to postgres.
     engine, schema = engine_with_library
@@ -394,3 +424,108 @@ def test_run_explorations(db, engine_with_library):
         ]
     }
     assert expected_results == actual_results['records']
+
+
+def test_DBQuery_approximate_summarize(engine_with_academics):
+    engine, schema = engine_with_academics
+    acad_oid = _get_oid_from_table("academics", schema, engine)
+    metadata = get_empty_metadata()
+    initial_columns = [
+        InitialColumn(
+            acad_oid,
+            get_attnum(acad_oid, 'id', engine, metadata=metadata),
+            alias='id',
+        ),
+        InitialColumn(
+            acad_oid,
+            get_attnum(acad_oid, 'name', engine, metadata=metadata),
+            alias='name',
+        ),
+    ]
+    summarize = tbase.Summarize({
+        'base_grouping_column': 'id',
+        'sample_percent': 100,
+        'grouping_expressions': [{'input_alias': 'id', 'output_alias': 'id'}],
+        'aggregation_expressions': [
+            {'input_alias': 'name', 'output_alias': 'name_count', 'function': 'count'},
+        ],
+    })
+    dbq = DBQuery(acad_oid, initial_columns, engine, transformations=[summarize])
+    assert dbq.sample_percent == 100
+    # Sampling all of the table gives the exact result.
+    records = dbq.get_records()
+    assert len(records) == DBQuery(acad_oid, initial_columns, engine).count
+    assert all(record.name_count == 1 for record in records)
+    dbq.transformations = [summarize, summarize]
+    with pytest.raises(ValueError):
+        dbq.sample_percent
+
+
+def test_DBQuery_approximate_summarize_scales_sample(engine_with_academics):
+    engine, schema = engine_with_academics
+    acad_oid = _get_oid_from_table("academics", schema, engine)
+    metadata = get_empty_metadata()
+    initial_columns = [
+        InitialColumn(
+            acad_oid,
+            get_attnum(acad_oid, col_name, engine, metadata=metadata),
+            alias=col_name,
+        )
+        for col_name in ['id', 'name', 'institution']
+    ]
+    summarize = tbase.Summarize({
+        'base_grouping_column': 'institution',
+        'sample_percent': 80,
+        'grouping_expressions': [
+            {'input_alias': 'institution', 'output_alias': 'institution'}
+        ],
+        'aggregation_expressions': [
+            {'input_alias': 'name', 'output_alias': 'name_count', 'function': 'count'},
+            {'input_alias': 'id', 'output_alias': 'id_sum', 'function': 'sum'},
+        ],
+    })
+    dbq = DBQuery(acad_oid, initial_columns, engine, transformations=[summarize])
+    # The table fits in one page, so the sample has either all of its rows
+    # or none of them. Scaled by 100 / 80, counts of 2 and 1 round to 3 and
+    # 1, and sums of 3 and 3 round to 4.
+    expected = {1: (3, Decimal(4)), 2: (1, Decimal(4))}
+    for record in dbq.get_records():
+        assert type(record.name_count) is int
+        assert isinstance(record.id_sum, Decimal)
+        assert (record.name_count, record.id_sum) == expected[record.institution]
+
+    # The scaling itself, applied to the whole table.
+    table = get_reflected_tables([acad_oid], engine)[acad_oid].table
+    scaled_count = tbase._scale_sampled_aggregation(
+        func.count(table.c.name), Count.id, table.c.name, 80
+    )
+    scaled_sum = tbase._scale_sampled_aggregation(
+        func.sum(table.c.id), Sum.id, table.c.id, 80
+    )
+    with engine.connect() as conn:
+        row = conn.execute(select(scaled_count, scaled_sum)).one()
+    # 3 * 1.25 and 6 * 1.25 are rounded.
+    assert type(row[0]) is int and row[0] == 4
+    assert row[1] == Decimal(8)
+
+
+def test_DBQuery_approximate_summarize_rejects_views(engine_with_academics):
+    engine, schema = engine_with_academics
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE VIEW "{schema}".academics_view AS SELECT * FROM "{schema}".academics'))
+    view_oid = _get_oid_from_table("academics_view", schema, engine)
+    initial_columns = [
+        InitialColumn(view_oid, 1, alias='id'),
+        InitialColumn(view_oid, 2, alias='name'),
+    ]
+    summarize = tbase.Summarize({
+        'base_grouping_column': 'id',
+        'sample_percent': 50,
+        'grouping_expressions': [{'input_alias': 'id', 'output_alias': 'id'}],
+        'aggregation_expressions': [
+            {'input_alias': 'name', 'output_alias': 'name_count', 'function': 'count'},
+        ],
+    })
+    dbq = DBQuery(view_oid, initial_columns, engine, transformations=[summarize])
+    with pytest.raises(ValueError):
+        dbq.get_records()
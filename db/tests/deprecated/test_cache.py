@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+
+from db.deprecated import engine as engine_module
+from db.deprecated.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    evicted = []
+    cache = LRUCache(2, on_evict=evicted.append)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert evicted == [2]
+    assert cache.get('b') is None
+    assert len(cache) == 2
+    cache.put('a', 4)
+    assert evicted == [2, 1]
+    cache.clear()
+    assert sorted(evicted) == [1, 2, 3, 4]
+
+
+def test_cached_engine_replaced_on_password_change(monkeypatch):
+    monkeypatch.setattr(engine_module, '_engines', LRUCache(2, on_evict=lambda e: e[1].dispose()))
+    monkeypatch.setattr(
+        engine_module,
+        'create_future_engine_with_custom_types',
+        lambda *args, **kwargs: MagicMock(),
+    )
+    args = ('alice', 'old', 'localhost', 'mathesar', 5432)
+    engine_1 = engine_module.get_cached_engine_with_custom_types(*args)
+    assert engine_module.get_cached_engine_with_custom_types(*args) is engine_1
+    engine_2 = engine_module.get_cached_engine_with_custom_types(
+        'alice', 'new', 'localhost', 'mathesar', 5432
+    )
+    assert engine_2 is not engine_1
+    engine_1.dispose.assert_called_once()
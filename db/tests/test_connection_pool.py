@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from psycopg.pq import TransactionStatus
+
+from db import connection_pool
+
+
+def _mock_conn():
+    conn = MagicMock()
+    conn.closed = False
+    conn.broken = False
+    conn.info.transaction_status = TransactionStatus.IDLE
+    return conn
+
+
+@pytest.fixture
+def mocked_mathesar_connection():
+    with patch.object(
+        connection_pool, 'mathesar_connection', side_effect=lambda **kw: _mock_conn()
+    ) as mock:
+        yield mock
+
+
+def test_pool_reuses_connections(mocked_mathesar_connection):
+    pool = connection_pool.ConnectionPool({'dbname': 'mathesar'})
+    with pool.connection() as conn_1:
+        pass
+    with pool.connection() as conn_2:
+        pass
+    assert conn_1 is conn_2
+    mocked_mathesar_connection.assert_called_once_with(dbname='mathesar')
+    conn_1.commit.assert_called()
+    stats = pool.get_stats()
+    assert stats['connections_num'] == 1
+    assert stats['requests_num'] == 2
+    assert stats['pool_available'] == 1
+
+
+def test_pool_rolls_back_and_discards_bad_connections(mocked_mathesar_connection):
+    pool = connection_pool.ConnectionPool({'dbname': 'mathesar'})
+    with pytest.raises(ValueError):
+        with pool.connection() as conn_1:
+            conn_1.broken = True
+            raise ValueError
+    conn_1.rollback.assert_called_once()
+    conn_1.close.assert_called_once()
+    with pool.connection() as conn_2:
+        pass
+    assert conn_1 is not conn_2
+    assert pool.get_stats()['returns_bad'] == 1
+
+
+def test_pool_times_out_when_full(mocked_mathesar_connection):
+    pool = connection_pool.ConnectionPool({}, max_size=1, timeout=0.01)
+    conn = pool.getconn()
+    with pytest.raises(connection_pool.PoolTimeout):
+        pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+
+
+def test_pool_reaps_idle_connections(mocked_mathesar_connection):
+    pool = connection_pool.ConnectionPool({}, max_idle=-1)
+    conn_1 = pool.getconn()
+    pool.putconn(conn_1)
+    conn_2 = pool.getconn()
+    assert conn_1 is not conn_2
+    conn_1.close.assert_called_once()
+    assert pool.get_stats()['connections_reaped'] == 1
+
+
+def test_pool_health_check_replaces_dead_connection(mocked_mathesar_connection):
+    pool = connection_pool.ConnectionPool({}, check_interval=-1)
+    conn_1 = pool.getconn()
+    pool.putconn(conn_1)
+    conn_1.execute.side_effect = connection_pool.psycopg.OperationalError
+    conn_2 = pool.getconn()
+    assert conn_1 is not conn_2
+    assert pool.get_stats()['connections_lost'] == 1
+
+
+def test_get_pool_replaces_pool_on_conninfo_change(mocked_mathesar_connection):
+    key = ('test_get_pool', 1, 1)
+    pool_1 = connection_pool.get_pool(key, {'password': 'old'})
+    assert connection_pool.get_pool(key, {'password': 'old'}) is pool_1
+    pool_2 = connection_pool.get_pool(key, {'password': 'new'})
+    assert pool_2 is not pool_1
+    assert pool_1.closed
+    connection_pool.close_pools(lambda k: k == key)
+    assert pool_2.closed
+    assert key not in connection_pool.get_pool_stats()
+
+
+def test_get_pool_reaps_other_pools(mocked_mathesar_connection, monkeypatch):
+    idle_key = ('test_get_pool_reaps', 1, 1)
+    idle_pool = connection_pool.get_pool(idle_key, {}, max_idle=-1)
+    conn = idle_pool.getconn()
+    idle_pool.putconn(conn)
+    monkeypatch.setattr(connection_pool, '_last_reaped', 0)
+    monkeypatch.setattr(connection_pool, 'REAP_INTERVAL', 0)
+    connection_pool.get_pool(('test_get_pool_reaps', 1, 2), {})
+    conn.close.assert_called_once()
+    assert idle_pool.get_stats()['connections_reaped'] == 1
+    connection_pool.close_pools(lambda k: k[0] == 'test_get_pool_reaps')
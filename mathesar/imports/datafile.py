@@ -1,12 +1,33 @@
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+import codecs
+import io
+import os
+import threading
+
 import clevercsv as csv
+from django.conf import settings
+import psycopg
 
 from db.constants import COLUMN_NAME_TEMPLATE
 from db.identifiers import truncate_if_necessary
-from db.tables import create_and_import_from_rows
-from db.records import insert_from_select
+from db.tables import (
+    drop_table_from_database,
+    import_csv_into_table,
+    import_rows_into_table,
+    prepare_columns_for_import,
+    prepare_staging_tables_for_import,
+    prepare_table_for_import,
+)
+from db.records import insert_from_select, insert_from_staging_tables
 
 from mathesar.models.base import DataFile
 
+# Files that PostgreSQL can parse directly are streamed to it in blocks of
+# this many bytes.
+COPY_BLOCK_SIZE = 4194304
+# Progress of files copied in parallel is reported every this many seconds.
+PARALLEL_PROGRESS_INTERVAL = 1
+
 
 def copy_datafile_to_table(
     user,
@@ -16,8 +37,22 @@ def copy_datafile_to_table(
     conn,
     comment=None,
     import_into_temp_table=False,
-    header_to_validate=[]
+    header_to_validate=[],
+    progress=None,
+    connect=None,
 ):
+    """
+    Copy the rows of a DataFile into a new table.
+
+    If given, `progress` is called periodically with the number of bytes
+    read from the file and the number of rows copied so far. It may
+    raise an exception to abort the import.
+
+    If given, `connect` is called to get more connections (to be used in
+    `with` blocks) to the database of `conn`, with which large files are
+    copied in parallel; see `_copy_datafile_in_parallel`. In that case,
+    the new table is committed independently of `conn`.
+    """
     data_file = DataFile.objects.get(id=data_file_id, user=user)
     file_path = data_file.file.path
     header = data_file.header
@@ -28,21 +63,35 @@ def copy_datafile_to_table(
     )
     table_name = table_name or data_file.base_name
 
-    with open(file_path, "r", newline="") as f:
+    if connect is not None and not import_into_temp_table:
+        def finish(staging_conn, staging_table_oids, first_row):
+            import_info = prepare_table_for_import(
+                table_name,
+                schema_oid,
+                _get_column_names(first_row, header),
+                staging_conn,
+                comment=comment,
+            )
+            insert_from_staging_tables(
+                staging_conn, staging_table_oids, import_info['table_oid']
+            )
+            return import_info
+
+        import_info = _copy_datafile_in_parallel(data_file, connect, finish, progress=progress)
+        if import_info is not None:
+            return _get_import_result(import_info)
+
+    with open(file_path, "rb") as raw_f, io.TextIOWrapper(raw_f, encoding=data_file.encoding, newline="") as f:
         reader = csv.reader(f, dialect)
+        first_row = next(reader)
         if header:
-            raw_col_names = next(reader)
+            raw_col_names = first_row
             if import_into_temp_table:
                 assert list(enumerate(raw_col_names)) == header_to_validate, "Parsing mismatch"
-            column_names = _process_column_names(raw_col_names)
         else:
-            column_names = [
-                f"{COLUMN_NAME_TEMPLATE}{i}" for i in range(len(next(reader)))
-            ]
-            f.seek(0)
-        processed_rows = ([None if val == '' else val for val in row] for row in reader)
-        import_info = create_and_import_from_rows(
-            processed_rows,
+            raw_col_names = []
+        column_names = _get_column_names(first_row, header)
+        import_info = prepare_table_for_import(
             table_name,
             schema_oid,
             column_names,
@@ -50,7 +99,284 @@ def copy_datafile_to_table(
             comment=comment,
             import_into_temp_table=import_into_temp_table
         )
+        if _can_import_csv_directly(data_file, raw_col_names):
+            try:
+                # A savepoint, so that we can fall back to parsing the
+                # file ourselves if PostgreSQL rejects it.
+                with conn.transaction():
+                    raw_f.seek(0)
+                    rows_copied = import_csv_into_table(
+                        _read_blocks(raw_f, progress, header),
+                        import_info,
+                        conn,
+                        delimiter=data_file.delimiter,
+                        quotechar=data_file.quotechar,
+                        header=header,
+                    )
+            except psycopg.errors.DataError:
+                pass
+            else:
+                if progress is not None:
+                    progress(raw_f.tell(), rows_copied)
+                return _get_import_result(import_info)
+
+        f.seek(0)
+        reader = csv.reader(f, dialect)
+        if header:
+            next(reader)
+        processed_rows = ([None if val == '' else val for val in row] for row in reader)
+        if progress is not None:
+            processed_rows = _report_progress(processed_rows, raw_f, progress)
+        import_rows_into_table(processed_rows, import_info, conn)
+
+    return _get_import_result(import_info)
+
+
+def _copy_datafile_to_columns(data_file, import_info, csv_indices, conn, header_to_validate=None):
+    """
+    Copy some columns of a DataFile into an existing table.
+
+    `import_info` is from `prepare_columns_for_import`, and `csv_indices`
+    are the (0-based) indices of the columns of the file to copy, in the
+    order of its `copy_columns`. If they're all of the columns, in order,
+    the file is streamed to COPY as is, when possible.
+
+    Returns the number of rows copied.
+    """
+    header = data_file.header
+    dialect = csv.dialect.SimpleDialect(
+        data_file.delimiter,
+        data_file.quotechar,
+        data_file.escapechar
+    )
+    with open(data_file.file.path, "rb") as raw_f, io.TextIOWrapper(raw_f, encoding=data_file.encoding, newline="") as f:
+        reader = csv.reader(f, dialect)
+        first_row = next(reader)
+        if header and header_to_validate is not None:
+            assert list(enumerate(first_row)) == header_to_validate, "Parsing mismatch"
+        if (
+            csv_indices == list(range(len(first_row)))
+            and _can_import_csv_directly(data_file, first_row if header else [])
+        ):
+            try:
+                with conn.transaction():
+                    raw_f.seek(0)
+                    return import_csv_into_table(
+                        _read_blocks(raw_f, None, header),
+                        import_info,
+                        conn,
+                        delimiter=data_file.delimiter,
+                        quotechar=data_file.quotechar,
+                        header=header,
+                    )
+            except psycopg.errors.DataError:
+                pass
 
+        f.seek(0)
+        reader = csv.reader(f, dialect)
+        if header:
+            next(reader)
+        projected_rows = (
+            [None if row[i] == '' else row[i] for i in csv_indices] for row in reader
+        )
+        return import_rows_into_table(projected_rows, import_info, conn)
+
+
+def _copy_datafile_in_parallel(
+    data_file, connect, finish, header_to_validate=None, progress=None
+):
+    """
+    Copy a large DataFile through several connections at once.
+
+    The file is split at record boundaries into a chunk per worker (see
+    the MATHESAR_IMPORT_PARALLEL_* settings). Each chunk is streamed by
+    its own connection into an UNLOGGED staging table, using COPY. Then,
+    `finish(conn, staging_table_oids, first_row)` is called in a single
+    transaction to move the records where they belong, and drop the
+    staging tables (see `insert_from_staging_tables`).
+
+    If given, `progress` is called from this thread as by
+    `copy_datafile_to_table`, with the totals of all chunks. If it raises
+    an exception, the copies are stopped and the exception is propagated.
+
+    Returns the result of `finish`, or None if the file is too small or
+    can't be copied this way, in which case nothing has been changed.
+    """
+    file_path = data_file.file.path
+    workers = settings.MATHESAR_IMPORT_PARALLEL_WORKERS
+    pool_size = settings.MATHESAR_CONNECTION_POOL['max_size']
+    if pool_size > 0:
+        # Leave a connection for the caller.
+        workers = min(workers, pool_size - 1)
+    if workers < 2 or os.path.getsize(file_path) < settings.MATHESAR_IMPORT_PARALLEL_MIN_SIZE:
+        return None
+
+    header = data_file.header
+    dialect = csv.dialect.SimpleDialect(
+        data_file.delimiter,
+        data_file.quotechar,
+        data_file.escapechar
+    )
+    with open(file_path, "rb") as raw_f:
+        with io.TextIOWrapper(raw_f, encoding=data_file.encoding, newline="") as f:
+            first_row = next(csv.reader(f, dialect))
+            if header and header_to_validate is not None:
+                assert list(enumerate(first_row)) == header_to_validate, "Parsing mismatch"
+            if (
+                not _can_import_csv_directly(data_file, first_row if header else [])
+                or not data_file.quotechar.isascii()
+            ):
+                return None
+            chunks = _split_csv(raw_f, workers, data_file.quotechar.encode(), header)
+    if len(chunks) < 2:
+        return None
+
+    try:
+        with connect() as conn:
+            staging_tables = prepare_staging_tables_for_import(
+                len(first_row), len(chunks), conn
+            )
+    except psycopg.errors.InsufficientPrivilege:
+        return None
+    staging_table_oids = [t['table_oid'] for t in staging_tables]
+    finished = False
+    try:
+        # Connections are got here, since that may need the Django ORM.
+        connections = [connect() for _ in chunks]
+        # The header is read before any chunk.
+        chunk_progress = _ChunkProgress(chunks[0][0])
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = [
+                executor.submit(
+                    _copy_chunk, data_file, file_path, chunk, staging_table, conn, chunk_progress
+                )
+                for chunk, staging_table, conn in zip(chunks, staging_tables, connections)
+            ]
+            try:
+                pending = futures
+                while pending:
+                    done, pending = wait(pending, PARALLEL_PROGRESS_INTERVAL, FIRST_EXCEPTION)
+                    for future in done:
+                        future.result()
+                    if progress is not None:
+                        progress(*chunk_progress.get_totals())
+            except BaseException:
+                # Don't wait for the other chunks to be copied.
+                chunk_progress.stop()
+                raise
+        with connect() as conn:
+            result = finish(conn, staging_table_oids, first_row)
+        finished = True
+        return result
+    except psycopg.errors.DataError:
+        # PostgreSQL couldn't parse the file, so let the caller do it.
+        return None
+    finally:
+        if not finished:
+            with connect() as conn:
+                for oid in staging_table_oids:
+                    drop_table_from_database(oid, conn)
+
+
+def _copy_chunk(data_file, file_path, chunk, staging_table, connection, chunk_progress):
+    start, end = chunk
+    with open(file_path, "rb") as raw_f, connection as conn:
+        raw_f.seek(start)
+        return import_csv_into_table(
+            _read_range(raw_f, end - start, chunk_progress),
+            staging_table,
+            conn,
+            delimiter=data_file.delimiter,
+            quotechar=data_file.quotechar,
+        )
+
+
+def _split_csv(raw_f, num_chunks, quotechar, header):
+    """
+    Split a CSV file (excluding its header) into at most `num_chunks`
+    (start, end) byte ranges of similar size, at record boundaries.
+
+    Quotes must only be escaped by doubling them (see
+    `_can_import_csv_directly`), so that a line break ends a record iff
+    an even number of quote characters precede it.
+    """
+    size = raw_f.seek(0, 2)
+    raw_f.seek(0)
+    data_start = len(raw_f.readline()) if header else 0
+    targets = [
+        data_start + (size - data_start) * i // num_chunks for i in range(1, num_chunks)
+    ]
+    boundaries = [data_start]
+    quotes = 0
+    offset = 0
+    raw_f.seek(0)
+    while targets and (block := raw_f.read(COPY_BLOCK_SIZE)):
+        # `quotes` counts the quote characters before offset + pos.
+        pos = 0
+        while targets:
+            newline = block.find(b'\n', max(targets[0] - offset, pos))
+            if newline == -1:
+                break
+            quotes += block.count(quotechar, pos, newline)
+            pos = newline + 1
+            if quotes % 2 == 0:
+                boundaries.append(offset + pos)
+                targets = [t for t in targets if t >= offset + pos]
+        quotes += block.count(quotechar, pos)
+        offset += len(block)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def _read_range(raw_f, length, chunk_progress):
+    while length > 0 and (block := raw_f.read(min(COPY_BLOCK_SIZE, length))):
+        length -= len(block)
+        yield block
+        chunk_progress.add(block)
+
+
+class _CopyStopped(Exception):
+    pass
+
+
+class _ChunkProgress:
+    """
+    Count the bytes and rows copied by the threads of a parallel copy,
+    and stop them when asked to.
+
+    The number of rows is estimated by counting line breaks, as for
+    `_read_blocks`. Each chunk ends at a record boundary.
+    """
+
+    def __init__(self, bytes_read):
+        self.bytes_read = bytes_read
+        self.rows_copied = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def add(self, block):
+        """Count a block copied, raising `_CopyStopped` if stopped."""
+        if self.stopped.is_set():
+            raise _CopyStopped
+        with self.lock:
+            self.bytes_read += len(block)
+            self.rows_copied += block.count(b'\n')
+
+    def get_totals(self):
+        with self.lock:
+            return self.bytes_read, self.rows_copied
+
+    def stop(self):
+        self.stopped.set()
+
+
+def _get_column_names(first_row, header):
+    if header:
+        return _process_column_names(first_row)
+    return [f"{COLUMN_NAME_TEMPLATE}{i}" for i in range(len(first_row))]
+
+
+def _get_import_result(import_info):
     return {
         "oid": import_info['table_oid'],
         "name": import_info.get('table_name'),
@@ -59,6 +385,46 @@ def copy_datafile_to_table(
     }
 
 
+def _can_import_csv_directly(data_file, raw_col_names):
+    """
+    Whether PostgreSQL's CSV parser will read the file as clevercsv does.
+
+    That needs UTF-8, quotes escaped only by doubling them, and a header
+    (which COPY skips as a single line) without line breaks in it.
+    """
+    encoding = codecs.lookup(data_file.encoding).name
+    return (
+        (encoding in ('utf-8', 'ascii') or (encoding == 'utf-8-sig' and data_file.header))
+        and data_file.quotechar != ''
+        and data_file.escapechar == ''
+        and not any('\n' in name or '\r' in name for name in raw_col_names)
+    )
+
+
+def _read_blocks(raw_f, progress, header):
+    """
+    Read a file in COPY_BLOCK_SIZE blocks, reporting progress after each.
+
+    The number of rows reported is estimated by counting line breaks.
+    """
+    rows_copied = -1 if header else 0
+    while block := raw_f.read(COPY_BLOCK_SIZE):
+        yield block
+        if progress is not None:
+            rows_copied += block.count(b'\n')
+            progress(raw_f.tell(), max(rows_copied, 0))
+
+
+def _report_progress(rows, raw_f, progress, interval=10000):
+    rows_copied = 0
+    for row in rows:
+        yield row
+        rows_copied += 1
+        if rows_copied % interval == 0:
+            progress(raw_f.tell(), rows_copied)
+    progress(raw_f.tell(), rows_copied)
+
+
 def _process_column_names(column_names):
     column_names = (
         column_name.strip()
@@ -78,12 +444,59 @@ def _process_column_names(column_names):
     return list(column_names)
 
 
-def insert_into_existing_table(user, data_file_id, target_table_oid, mappings, conn):
+def insert_into_existing_table(user, data_file_id, target_table_oid, mappings, conn, connect=None):
+    """
+    Insert the rows of a DataFile into an existing table.
+
+    If only textual columns are mapped, the rows are copied straight into
+    them. Otherwise, they're copied into a temp table, then cast as they
+    are inserted from there.
+
+    If given, `connect` is used as by `copy_datafile_to_table`. In that
+    case, the rows of large files needing casts are committed
+    independently of `conn`.
+    """
     header_to_validate = sorted([
         (
             i["csv_column"]["index"], i["csv_column"].get("name")
         ) for i in mappings
     ], key=lambda x: x[0])  # sometimes we don't have "name" when there is no header.
+    validated_mappings = [
+        {
+            'src_table_attnum': int(i["csv_column"]["index"]) + 1,  # The src/temp table attnums are indexed starting from 1
+            # but, the indicies we receive from the frontend start from 0, hence the +1.
+            'dst_table_attnum': i["table_column"]
+        } for i in mappings if i["table_column"] is not None
+    ]
+    # Textual columns can be filled straight from the file, without a temp table.
+    direct_mappings = sorted(validated_mappings, key=lambda m: m['src_table_attnum'])
+    if (
+        direct_mappings
+        and len({m['dst_table_attnum'] for m in direct_mappings}) == len(direct_mappings)
+        and len({m['src_table_attnum'] for m in direct_mappings}) == len(direct_mappings)
+    ):
+        import_info = prepare_columns_for_import(
+            target_table_oid, [m['dst_table_attnum'] for m in direct_mappings], conn
+        )
+        if import_info is not None:
+            return _copy_datafile_to_columns(
+                DataFile.objects.get(id=data_file_id, user=user),
+                import_info,
+                [m['src_table_attnum'] - 1 for m in direct_mappings],
+                conn,
+                header_to_validate=header_to_validate,
+            )
+    if connect is not None:
+        inserted_rows = _copy_datafile_in_parallel(
+            DataFile.objects.get(id=data_file_id, user=user),
+            connect,
+            lambda staging_conn, staging_table_oids, first_row: insert_from_staging_tables(
+                staging_conn, staging_table_oids, target_table_oid, validated_mappings
+            ),
+            header_to_validate=header_to_validate,
+        )
+        if inserted_rows is not None:
+            return inserted_rows
     temp_table = copy_datafile_to_table(
         user,
         data_file_id,
@@ -94,12 +507,5 @@ def insert_into_existing_table(user, data_file_id, target_table_oid, mappings, c
         import_into_temp_table=True,
         header_to_validate=header_to_validate
     )
-    validated_mappings = [
-        {
-            'src_table_attnum': int(i["csv_column"]["index"]) + 1,  # The src/temp table attnums are indexed starting from 1
-            # but, the indicies we receive from the frontend start from 0, hence the +1.
-            'dst_table_attnum': i["table_column"]
-        } for i in mappings if i["table_column"] is not None
-    ]
     inserted_rows = insert_from_select(conn, temp_table["oid"], target_table_oid, validated_mappings)
     return inserted_rows
@@ -0,0 +1,223 @@
+"""
+Run imports of data files into new tables in the background.
+
+Each import is recorded as an `ImportJob`, which is handed to a small
+pool of worker threads. While the rows are copied, the job is updated
+with the progress of the import, so that clients can poll it. A job can
+be cancelled while it's pending or running; a running import is rolled
+back the next time it reports progress.
+
+Jobs live in the memory of the process which started them. That process
+records a heartbeat for each of its pending and running jobs, so that a
+job left behind when its process exits can be marked as failed (see
+`fail_lost_import_jobs`).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+
+from mathesar.imports.datafile import copy_datafile_to_table
+from mathesar.models.base import ImportJob, UserDatabaseRoleMap
+from mathesar.utils.tables import set_table_meta_data
+
+PROGRESS_INTERVAL = 1  # seconds between progress updates of a job
+HEARTBEAT_INTERVAL = 10  # seconds between heartbeats of the jobs of a process
+HEARTBEAT_TIMEOUT = 60  # seconds without a heartbeat after which a job is lost
+
+_executor = None
+_executor_lock = threading.Lock()
+# The ids of the jobs queued or running in this process.
+_active_job_ids = set()
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+def start_import_job(
+        user, database_id, data_file_id, schema_oid, table_name=None, comment=None
+):
+    """Record an import job, and queue it to be run in the background."""
+    job = ImportJob.objects.create(
+        user=user,
+        database_id=database_id,
+        data_file_id=data_file_id,
+        schema_oid=schema_oid,
+        table_name=table_name,
+        comment=comment,
+        heartbeat_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: _submit(job.id))
+    return job
+
+
+def cancel_import_job(job):
+    """
+    Request cancellation of an import job.
+
+    A pending job is cancelled immediately. A running job is cancelled
+    (and its import rolled back) when it next reports progress.
+    """
+    ImportJob.objects.filter(id=job.id).update(cancel_requested=True)
+    ImportJob.objects.filter(id=job.id, status="PENDING").update(
+        status="CANCELLED", finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
+
+
+def fail_lost_import_jobs(**filters):
+    """
+    Mark pending or running jobs whose process has stopped recording
+    heartbeats (e.g., because it was restarted) as failed.
+
+    `filters` restrict the jobs checked, as for `ImportJob.objects.filter`.
+
+    Returns the number of jobs marked as failed.
+    """
+    now = timezone.now()
+    return ImportJob.objects.filter(
+        status__in=["PENDING", "RUNNING"],
+        heartbeat_at__lt=now - timedelta(seconds=HEARTBEAT_TIMEOUT),
+        **filters,
+    ).update(
+        status="FAILED",
+        error="The import was interrupted. Please try again.",
+        finished_at=now,
+    )
+
+
+def run_import_job(job_id):
+    """Run an import job, recording its progress and outcome."""
+    try:
+        job = ImportJob.objects.select_related('data_file', 'user').get(id=job_id)
+        started = ImportJob.objects.filter(
+            id=job_id, status="PENDING", cancel_requested=False
+        ).update(
+            status="RUNNING",
+            started_at=timezone.now(),
+            bytes_total=_get_file_size(job.data_file),
+        )
+        if started:
+            _run_import(job)
+    finally:
+        with _executor_lock:
+            _active_job_ids.discard(job_id)
+        close_old_connections()
+
+
+def _run_import(job):
+    recorder = _ProgressRecorder(job.id)
+    try:
+        role_map = UserDatabaseRoleMap.objects.select_related(
+            'server', 'database', 'configured_role'
+        ).get(user=job.user, database_id=job.database_id)
+        # A dedicated connection, so that a long import doesn't hold one
+        # of the pooled connections used to serve requests.
+        with role_map.connection as conn:
+            import_result = copy_datafile_to_table(
+                job.user,
+                job.data_file_id,
+                job.table_name,
+                job.schema_oid,
+                conn,
+                comment=job.comment,
+                progress=recorder,
+                connect=lambda: role_map.connection,
+            )
+        set_table_meta_data(
+            import_result['oid'],
+            {'mathesar_added_pkey_attnum': import_result['pkey_column_attnum']},
+            job.database_id,
+        )
+    except ImportCancelled:
+        _finish(job.id, status="CANCELLED")
+    except Exception as e:
+        _finish(job.id, status="FAILED", error=str(e))
+    else:
+        _finish(
+            job.id,
+            status="COMPLETE",
+            bytes_read=recorder.bytes_read,
+            rows_copied=recorder.rows_copied,
+            result={
+                "oid": import_result["oid"],
+                "name": import_result["name"],
+                "renamed_columns": import_result["renamed_columns"],
+            },
+        )
+
+
+def _finish(job_id, **fields):
+    ImportJob.objects.filter(id=job_id).update(finished_at=timezone.now(), **fields)
+
+
+def _get_file_size(data_file):
+    try:
+        return os.path.getsize(data_file.file.path)
+    except OSError:
+        return None
+
+
+def _submit(job_id):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.MATHESAR_IMPORT_WORKERS,
+                thread_name_prefix='mathesar-import',
+            )
+            threading.Thread(
+                target=_record_heartbeats, name='mathesar-import-heartbeat', daemon=True
+            ).start()
+        _active_job_ids.add(job_id)
+        _executor.submit(run_import_job, job_id)
+
+
+def _record_heartbeats():
+    while True:
+        time.sleep(HEARTBEAT_INTERVAL)
+        with _executor_lock:
+            job_ids = list(_active_job_ids)
+        if not job_ids:
+            continue
+        try:
+            ImportJob.objects.filter(id__in=job_ids).update(heartbeat_at=timezone.now())
+        except DatabaseError:
+            # Try again at the next heartbeat.
+            pass
+        finally:
+            close_old_connections()
+
+
+class _ProgressRecorder:
+    """
+    Record the progress of an import job, at most once per interval.
+
+    Raises `ImportCancelled` when cancellation of the job was requested.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.last_recorded = 0
+        self.bytes_read = 0
+        self.rows_copied = 0
+
+    def __call__(self, bytes_read, rows_copied):
+        self.bytes_read = bytes_read
+        self.rows_copied = rows_copied
+        now = time.monotonic()
+        if now - self.last_recorded < PROGRESS_INTERVAL:
+            return
+        self.last_recorded = now
+        ImportJob.objects.filter(id=self.job_id).update(
+            bytes_read=bytes_read, rows_copied=rows_copied
+        )
+        if ImportJob.objects.filter(id=self.job_id, cancel_requested=True).exists():
+            raise ImportCancelled
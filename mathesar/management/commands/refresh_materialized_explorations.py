@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from mathesar.utils.explorations import refresh_due_materialized_explorations
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the materialized explorations which are due to be refreshed."
+        " Run this periodically, e.g., every minute from cron."
+    )
+
+    def handle(self, *args, **options):
+        failures = refresh_due_materialized_explorations()
+        for exp_model, error in failures:
+            self.stderr.write(
+                f"Couldn't refresh exploration {exp_model.id} ({exp_model.name}): {error}"
+            )
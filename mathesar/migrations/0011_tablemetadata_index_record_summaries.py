@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0010_server_sslmode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablemetadata',
+            name='index_record_summaries',
+            field=models.BooleanField(null=True),
+        ),
+    ]
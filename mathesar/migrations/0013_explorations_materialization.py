@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0012_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='explorations',
+            name='materialized_view_oid',
+            field=models.PositiveBigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='explorations',
+            name='materialized_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='explorations',
+            name='refresh_interval',
+            field=models.DurationField(null=True),
+        ),
+        migrations.AddField(
+            model_name='explorations',
+            name='last_refreshed_at',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
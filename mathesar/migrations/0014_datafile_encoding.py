@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0013_explorations_materialization'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datafile',
+            name='encoding',
+            field=models.CharField(default='utf-8', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='datafile',
+            name='encoding_confidence',
+            field=models.FloatField(null=True),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0014_datafile_encoding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datafile',
+            name='dialect_detection',
+            field=models.JSONField(null=True),
+        ),
+    ]
@@ -8,6 +8,7 @@ from encrypted_fields.fields import EncryptedCharField, EncryptedJSONField
 from db.sql.install import uninstall, install
 from db.analytics import get_object_counts
 from db.connection import mathesar_connection
+from db.connection_pool import get_pool, close_pools
 from mathesar import __version__
 from mathesar.models import exceptions
 
@@ -58,6 +59,18 @@ class Server(BaseModel):
             ),
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.close_connection_pools()
+
+    def delete(self, *args, **kwargs):
+        self.close_connection_pools()
+        return super().delete(*args, **kwargs)
+
+    def close_connection_pools(self):
+        """Close pooled connections to any database on this server."""
+        close_pools(lambda key: key[0] == self.id)
+
 
 class Database(BaseModel):
     name = models.CharField(max_length=128)
@@ -88,6 +101,10 @@ class Database(BaseModel):
         else:
             raise exceptions.NoConnectionAvailable
 
+    def delete(self, *args, **kwargs):
+        close_pools(lambda key: key[1] == self.id)
+        return super().delete(*args, **kwargs)
+
     @property
     def needs_upgrade_attention(self):
         return self.last_confirmed_sql_version != __version__
@@ -122,12 +139,19 @@ class Database(BaseModel):
                 )
 
     def connect_user(self, user):
-        """Return the given user's connection to the database."""
+        """
+        Return the given user's connection to the database.
+
+        The connection is borrowed from a pool (unless pooling is disabled
+        via settings), so it should be used in a `with` block.
+        """
         try:
-            role_map = UserDatabaseRoleMap.objects.get(user=user, database=self)
+            role_map = UserDatabaseRoleMap.objects.select_related(
+                'server', 'database', 'configured_role'
+            ).get(user=user, database=self)
         except UserDatabaseRoleMap.DoesNotExist:
             raise exceptions.NoConnectionAvailable
-        return role_map.connection
+        return role_map.pooled_connection
 
     def connect_manually(self, role, password):
         """Return a connection to the Database using the role and password."""
@@ -192,6 +216,14 @@ class ConfiguredRole(BaseModel):
             )
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        close_pools(lambda key: key[2] == self.id)
+
+    def delete(self, *args, **kwargs):
+        close_pools(lambda key: key[2] == self.id)
+        return super().delete(*args, **kwargs)
+
 
 class UserDatabaseRoleMap(BaseModel):
     user = models.ForeignKey('User', on_delete=models.CASCADE)
@@ -209,13 +241,41 @@ class UserDatabaseRoleMap(BaseModel):
     @property
     def connection(self):
         return mathesar_connection(
+            **self._conninfo,
+            application_name='mathesar.models.base.UserDatabaseRoleMap.connection',
+        )
+
+    @property
+    def pooled_connection(self):
+        """
+        Return a context manager yielding a connection from the pool for
+        this (server, database, role) combination.
+
+        The transaction is committed (or rolled back on error) when the
+        context exits, and the connection is returned to the pool.
+        """
+        pool_settings = settings.MATHESAR_CONNECTION_POOL
+        if pool_settings['max_size'] <= 0:
+            return self.connection
+        pool = get_pool(
+            (self.server_id, self.database_id, self.configured_role_id),
+            {
+                **self._conninfo,
+                'application_name': 'mathesar.models.base.UserDatabaseRoleMap.pooled_connection',
+            },
+            **pool_settings,
+        )
+        return pool.connection()
+
+    @property
+    def _conninfo(self):
+        return dict(
             host=self.server.host,
             port=self.server.port,
             dbname=self.database.name,
             user=self.configured_role.name,
             password=self.configured_role.password,
             sslmode=self.server.sslmode,
-            application_name='mathesar.models.base.UserDatabaseRoleMap.connection',
         )
 
 
@@ -276,6 +336,7 @@ class TableMetaData(BaseModel):
     column_order = models.JSONField(null=True)
     record_summary_template = models.JSONField(null=True)
     mathesar_added_pkey_attnum = models.PositiveIntegerField(null=True)
+    index_record_summaries = models.BooleanField(null=True)
 
     class Meta:
         constraints = [
@@ -296,6 +357,14 @@ class Explorations(BaseModel):
     display_options = models.JSONField(null=True)
     display_names = models.JSONField(null=True)
     description = models.CharField(null=True)
+    # The materialized view serving the exploration's records, if any,
+    # and the user whose role owns (and hence refreshes) it.
+    materialized_view_oid = models.PositiveBigIntegerField(null=True)
+    materialized_by = models.ForeignKey(
+        'User', on_delete=models.SET_NULL, null=True, related_name='+'
+    )
+    refresh_interval = models.DurationField(null=True)
+    last_refreshed_at = models.DateTimeField(null=True)
 
 
 class Form(BaseModel):
@@ -402,6 +471,9 @@ class DataFile(BaseModel):
     delimiter = models.CharField(max_length=1, default=',', blank=True)
     escapechar = models.CharField(max_length=1, blank=True)
     quotechar = models.CharField(max_length=1, default='"', blank=True)
+    encoding = models.CharField(max_length=64, default='utf-8')
+    encoding_confidence = models.FloatField(null=True)
+    dialect_detection = models.JSONField(null=True)
 
 
 class DownloadLink(BaseModel):
@@ -410,3 +482,33 @@ class DownloadLink(BaseModel):
     uri = models.CharField()  # should not contain sensitive info
     thumbnail = models.JSONField(blank=True, default=dict)
     fsspec_kwargs = EncryptedJSONField(blank=True, default=dict)
+
+
+class ImportJob(BaseModel):
+    """
+    An import of a DataFile into a new table, run in the background.
+
+    See `mathesar.imports.jobs`.
+    """
+    status_choices = models.TextChoices(
+        "status", "PENDING RUNNING COMPLETE FAILED CANCELLED"
+    )
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    database = models.ForeignKey('Database', on_delete=models.CASCADE)
+    data_file = models.ForeignKey('DataFile', on_delete=models.CASCADE)
+    schema_oid = models.PositiveBigIntegerField()
+    table_name = models.CharField(null=True)
+    comment = models.TextField(null=True)
+    status = models.CharField(
+        max_length=16, choices=status_choices.choices, default="PENDING"
+    )
+    cancel_requested = models.BooleanField(default=False)
+    bytes_total = models.BigIntegerField(null=True)
+    bytes_read = models.BigIntegerField(default=0)
+    rows_copied = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+    heartbeat_at = models.DateTimeField(null=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(null=True)
@@ -63,6 +63,8 @@ def delete(*, database_oid: int, database_id: int, **kwargs) -> None:
         database_id: The Django id of the database to connect to.
     """
     user = kwargs.get(REQUEST_KEY).user
+    # Idle pooled connections to the target database would block the drop.
+    Database.objects.get(id=database_id).server.close_connection_pools()
     with connect(database_id, user) as conn:
         drop_database(database_oid, conn)
 
@@ -1,7 +1,8 @@
 """
 Classes and functions exposed to the RPC endpoint for managing explorations.
 """
-from typing import Optional, TypedDict
+from datetime import timedelta
+from typing import Literal, Optional, TypedDict
 
 from modernrpc.core import REQUEST_KEY
 
@@ -15,7 +16,10 @@ from mathesar.utils.explorations import (
     run_exploration,
     run_saved_exploration,
     replace_exploration,
-    create_exploration
+    create_exploration,
+    materialize_exploration,
+    dematerialize_exploration,
+    refresh_materialized_exploration,
 )
 
 
@@ -94,9 +98,14 @@ class ExplorationResult(TypedDict):
 
     Attributes:
         query: A dict describing the exploration that ran.
-        records: A dict describing the total count of records along with the contents of those records.
+        records: A dict describing the total count of records (null if not
+            counted) along with the contents of those records, and the
+            `cursors` of the first and last records (null if the records
+            can't be paged with cursors).
         output_columns: A tuple describing the names of the columns included in the exploration.
-        column_metadata: A dict describing the metadata applied to included columns.
+        column_metadata: A dict describing the metadata applied to included
+            columns. Aggregations computed by a sampled `summarize` are
+            marked `approximate`.
         limit: Specifies the max number of rows returned.(default 100)
         offset: Specifies the number of rows skipped.(default 0)
     """
@@ -119,6 +128,40 @@ class ExplorationResult(TypedDict):
         )
 
 
+class MaterializationInfo(TypedDict):
+    """
+    Information about the materialization of a saved exploration.
+
+    Attributes:
+        exploration_id: The Django id of the exploration.
+        materialized: Whether the exploration's records are served from a
+            materialized view.
+        refresh_interval: The number of seconds between scheduled
+            refreshes of the view, if it's refreshed on a schedule.
+        last_refreshed_at: When the view was last refreshed, in ISO 8601
+            format.
+    """
+    exploration_id: int
+    materialized: bool
+    refresh_interval: Optional[int]
+    last_refreshed_at: Optional[str]
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(
+            exploration_id=model.id,
+            materialized=model.materialized_view_oid is not None,
+            refresh_interval=(
+                int(model.refresh_interval.total_seconds())
+                if model.refresh_interval is not None else None
+            ),
+            last_refreshed_at=(
+                model.last_refreshed_at.isoformat()
+                if model.last_refreshed_at is not None else None
+            ),
+        )
+
+
 @mathesar_rpc_method(name="explorations.list", auth="login")
 def list_(*, database_id: int, schema_oid: int = None, **kwargs) -> list[ExplorationInfo]:
     """
@@ -153,42 +196,89 @@ def get(*, exploration_id: int, **kwargs) -> ExplorationInfo:
 @mathesar_rpc_method(name="explorations.delete", auth="login")
 def delete(*, exploration_id: int, **kwargs) -> None:
     """
-    Delete an exploration.
+    Delete an exploration, along with its materialized view, if any.
 
     Args:
         exploration_id: The Django id of the exploration to delete.
     """
+    exp_model = get_exploration(exploration_id)
+    if exp_model.materialized_view_oid is not None:
+        user = kwargs.get(REQUEST_KEY).user
+        with connect(exp_model.database_id, user) as conn:
+            dematerialize_exploration(exp_model, conn)
     delete_exploration(exploration_id)
 
 
 @mathesar_rpc_method(name="explorations.run", auth="login")
-def run(*, exploration_def: ExplorationDef, limit: int = 100, offset: int = 0, **kwargs) -> ExplorationResult:
+def run(
+        *,
+        exploration_def: ExplorationDef,
+        limit: int = 100,
+        offset: int = 0,
+        count_mode: Literal["exact", "none"] = "exact",
+        after: str = None,
+        before: str = None,
+        **kwargs
+) -> ExplorationResult:
     """
     Run an exploration.
 
+    While an exploration is being edited, use the `"none"` count mode to
+    skip counting its records.
+
+    Paging deep into an exploration with `offset` is slow, since all
+    preceding records must be computed. Instead, pass the `cursors` of
+    the current page as `after` or `before` to get the next or previous
+    page. A cursor is only valid for the same exploration definition.
+    Explorations ordered with NULLs first (for ascending order) or last
+    (for descending order), or by columns which are then hidden, can't
+    be paged with cursors.
+
     Args:
         exploration_def: A dict describing an exploration to run.
         limit: The max number of rows to return.(default 100)
         offset: The number of rows to skip.(default 0)
+        count_mode: How to compute the `count` of the records. `"exact"`
+            counts all records, and `"none"` skips counting.
+        after: A cursor; only records after the one it identifies are
+            returned.
+        before: A cursor; only records before the one it identifies are
+            returned.
 
     Returns:
         The result of the exploration run.
     """
     user = kwargs.get(REQUEST_KEY).user
     with connect(exploration_def["database_id"], user) as conn:
-        exploration_result = run_exploration(exploration_def, conn, limit, offset)
+        exploration_result = run_exploration(
+            exploration_def, conn, limit, offset, count_mode, after=after, before=before
+        )
     return ExplorationResult.from_dict(exploration_result)
 
 
 @mathesar_rpc_method(name="explorations.run_saved", auth="login")
-def run_saved(*, exploration_id: int, limit: int = 100, offset: int = 0, **kwargs) -> ExplorationResult:
+def run_saved(
+        *,
+        exploration_id: int,
+        limit: int = 100,
+        offset: int = 0,
+        count_mode: Literal["exact", "none"] = "exact",
+        refresh: bool = False,
+        **kwargs
+) -> ExplorationResult:
     """
     Run a saved exploration.
 
+    Results are cached for a while, and reused until any table used by
+    the exploration is modified. Data modifications may take about a
+    second to invalidate a cached result; pass `refresh` to bypass it.
+
     Args:
         exploration_id: The Django id of the exploration to run.
         limit: The max number of rows to return.(default 100)
         offset: The number of rows to skip.(default 0)
+        count_mode: How to compute the `count` of the records. `"exact"`
+            counts all records, and `"none"` skips counting.
 
     Returns:
         The result of the exploration run.
@@ -196,22 +286,34 @@ def run_saved(*, exploration_id: int, limit: int = 100, offset: int = 0, **kwarg
     user = kwargs.get(REQUEST_KEY).user
     exp_model = Explorations.objects.get(id=exploration_id)
     with connect(exp_model.database.id, user) as conn:
-        exploration_result = run_saved_exploration(exp_model, limit, offset, conn)
+        exploration_result = run_saved_exploration(
+            exp_model, limit, offset, conn, count_mode=count_mode, refresh=refresh
+        )
     return ExplorationResult.from_dict(exploration_result)
 
 
 @mathesar_rpc_method(name="explorations.replace", auth="login")
-def replace(*, new_exploration: ExplorationInfo) -> ExplorationInfo:
+def replace(*, new_exploration: ExplorationInfo, **kwargs) -> ExplorationInfo:
     """
     Replace a saved exploration.
 
+    The materialized view of a materialized exploration is rebuilt from
+    the new definition, and swapped in for the old one, before the new
+    definition is saved. It keeps its owner and refresh schedule.
+
     Args:
         new_exploration: A dict describing the exploration to replace, including the updated fields.
 
     Returns:
         The exploration details for the replaced exploration.
     """
-    replaced_exp_model = replace_exploration(new_exploration)
+    exp_model = get_exploration(new_exploration["id"])
+    if exp_model.materialized_view_oid is None:
+        replaced_exp_model = replace_exploration(new_exploration)
+    else:
+        user = kwargs.get(REQUEST_KEY).user
+        with connect(exp_model.database_id, user) as conn:
+            replaced_exp_model = replace_exploration(new_exploration, conn)
     return ExplorationInfo.from_model(replaced_exp_model)
 
 
@@ -228,3 +330,102 @@ def add(*, exploration_def: ExplorationDef) -> ExplorationInfo:
     """
     exp_model = create_exploration(exploration_def)
     return ExplorationInfo.from_model(exp_model)
+
+
+@mathesar_rpc_method(name="explorations.materialize", auth="login")
+def materialize(
+        *, exploration_id: int, refresh_interval: int = None, **kwargs
+) -> MaterializationInfo:
+    """
+    Materialize a saved exploration.
+
+    This stores the exploration's records in a materialized view, in the
+    schema of the exploration, owned by the user's role. The records are
+    then served from it by `explorations.run_saved` and by exports, until
+    the exploration is dematerialized. They're only served from it to
+    users whose roles may select from the view, and from all the columns
+    the exploration uses; the exploration is run against its tables for
+    others. Materializing an already materialized exploration re-creates
+    its view.
+
+    Only explorations whose transformations are fully specified can be
+    materialized.
+
+    Args:
+        exploration_id: The Django id of the exploration to materialize.
+        refresh_interval: The number of seconds between refreshes of the
+            view. Scheduled refreshes are made by the
+            `refresh_materialized_explorations` management command. If
+            not given, the view is only refreshed on demand.
+
+    Returns:
+        The materialization details of the exploration.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    exp_model = get_exploration(exploration_id)
+    with connect(exp_model.database_id, user) as conn:
+        exp_model = materialize_exploration(
+            exp_model,
+            conn,
+            user,
+            refresh_interval=(
+                timedelta(seconds=refresh_interval)
+                if refresh_interval is not None else None
+            ),
+        )
+    return MaterializationInfo.from_model(exp_model)
+
+
+@mathesar_rpc_method(name="explorations.dematerialize", auth="login")
+def dematerialize(*, exploration_id: int, **kwargs) -> MaterializationInfo:
+    """
+    Drop the materialized view of a saved exploration.
+
+    Its records are then computed whenever it's run.
+
+    Args:
+        exploration_id: The Django id of the exploration.
+
+    Returns:
+        The materialization details of the exploration.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    exp_model = get_exploration(exploration_id)
+    with connect(exp_model.database_id, user) as conn:
+        exp_model = dematerialize_exploration(exp_model, conn)
+    return MaterializationInfo.from_model(exp_model)
+
+
+@mathesar_rpc_method(name="explorations.refresh", auth="login")
+def refresh(*, exploration_id: int, **kwargs) -> MaterializationInfo:
+    """
+    Refresh the materialized view of a saved exploration.
+
+    The view is refreshed concurrently, so the exploration can still be
+    run meanwhile.
+
+    Args:
+        exploration_id: The Django id of the exploration.
+
+    Returns:
+        The materialization details of the exploration.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    exp_model = get_exploration(exploration_id)
+    with connect(exp_model.database_id, user) as conn:
+        exp_model = refresh_materialized_exploration(exp_model, conn)
+    return MaterializationInfo.from_model(exp_model)
+
+
+@mathesar_rpc_method(name="explorations.get_materialization", auth="login")
+def get_materialization(*, exploration_id: int, **kwargs) -> MaterializationInfo:
+    """
+    Get the materialization details of a saved exploration.
+
+    Args:
+        exploration_id: The Django id of the exploration.
+
+    Returns:
+        The materialization details of the exploration.
+    """
+    return MaterializationInfo.from_model(get_exploration(exploration_id))
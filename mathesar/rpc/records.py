@@ -7,11 +7,14 @@ from modernrpc.core import REQUEST_KEY
 
 from db.records import (
     list_records_from_table,
+    count_records_from_table,
     get_record_from_table,
     search_records_from_table,
     delete_records_from_table,
     add_record_to_table,
+    add_records_to_table,
     patch_record_in_table,
+    patch_records_in_table,
     list_by_record_summaries,
 )
 from mathesar.rpc.decorators import mathesar_rpc_method
@@ -164,6 +167,22 @@ class LinkedRecordPath(TypedDict):
     join_path: list[list[list[int]]]
 
 
+class RecordCursors(TypedDict):
+    """
+    Cursors identifying the first and last records of a page.
+
+    Pass `last` as the `after` argument to get the next page, or `first`
+    as the `before` argument to get the previous page. A cursor is only
+    valid for the same ordering of records.
+
+    Attributes:
+        first: The cursor of the first record returned.
+        last: The cursor of the last record returned.
+    """
+    first: Optional[str]
+    last: Optional[str]
+
+
 class RecordList(TypedDict):
     """
     Records from a table, along with some meta data
@@ -174,7 +193,9 @@ class RecordList(TypedDict):
     given row, for the given column.
 
     Attributes:
-        count: The total number of records in the table.
+        count: The total number of records in the table. This is an
+            estimate if the records were listed with the `"estimated"`
+            count mode, and null with the `"none"` count mode.
         results: An array of record objects.
         grouping: Information for displaying grouped records.
         linked_record_smmaries: Information for previewing foreign key
@@ -182,14 +203,16 @@ class RecordList(TypedDict):
         record_summaries: Information for previewing returned records.
         download_links: Information for viewing or downloading file
             attachments.
+        cursors: Cursors for fetching the neighboring pages of records.
     """
-    count: int
+    count: Optional[int]
     results: list[dict]
     grouping: GroupingResponse
     linked_record_summaries: dict[str, dict[str, str]]
     record_summaries: dict[str, str]
     joined_record_summaries: dict
     download_links: Optional[dict]
+    cursors: Optional[RecordCursors]
 
     @classmethod
     def from_dict(cls, d):
@@ -200,7 +223,8 @@ class RecordList(TypedDict):
             linked_record_summaries=d.get("linked_record_summaries"),
             record_summaries=d.get("record_summaries"),
             joined_record_summaries=d.get("joined_record_summaries"),
-            download_links=d.get("download_links") or None
+            download_links=d.get("download_links") or None,
+            cursors=d.get("cursors"),
         )
 
 
@@ -232,6 +256,95 @@ class RecordAdded(TypedDict):
         )
 
 
+class RecordAddError(TypedDict):
+    """
+    An error preventing a record from being added.
+
+    Attributes:
+        index: The position of the record in the submitted list.
+        message: A description of the error.
+        code: The PostgreSQL error code (SQLSTATE) of the error.
+    """
+    index: int
+    message: str
+    code: str
+
+
+class RecordsAdded(TypedDict):
+    """
+    The result of adding many records to a table.
+
+    If any record couldn't be added, none are, `keys` is null, and
+    `errors` describes the records causing problems. Otherwise, `errors`
+    is null.
+
+    Attributes:
+        keys: The primary key values of the added records, in the order
+            they were submitted.
+        results: The added records, if requested.
+        linked_record_summaries: Information for previewing foreign key
+            values, provides a map of foreign key to a text summary.
+        record_summaries: Information for previewing the added records,
+            if requested.
+        errors: The errors preventing records from being added.
+    """
+    keys: Optional[list[Any]]
+    results: Optional[list[dict]]
+    linked_record_summaries: Optional[dict[str, dict[str, str]]]
+    record_summaries: Optional[dict[str, str]]
+    errors: Optional[list[RecordAddError]]
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            keys=d["keys"],
+            results=d.get("results"),
+            linked_record_summaries=d.get("linked_record_summaries"),
+            record_summaries=d.get("record_summaries"),
+            errors=d.get("errors"),
+        )
+
+
+class RecordPatch(TypedDict):
+    """
+    A modification of a single record.
+
+    Attributes:
+        record_id: The primary key value of the record to modify.
+        record_def: An object representing the modification, as for
+            `records.patch`.
+    """
+    record_id: Any
+    record_def: dict
+
+
+class RecordsPatched(TypedDict):
+    """
+    The result of modifying many records in a table.
+
+    Attributes:
+        keys: The primary key values of the modified records.
+        results: The modified records, if requested.
+        linked_record_summaries: Information for previewing foreign key
+            values, provides a map of foreign key to a text summary.
+        record_summaries: Information for previewing the modified
+            records, if requested.
+    """
+    keys: list[Any]
+    results: Optional[list[dict]]
+    linked_record_summaries: Optional[dict[str, dict[str, str]]]
+    record_summaries: Optional[dict[str, str]]
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            keys=d["keys"],
+            results=d.get("results"),
+            linked_record_summaries=d.get("linked_record_summaries"),
+            record_summaries=d.get("record_summaries"),
+        )
+
+
 class SummarizedRecordReference(TypedDict):
     """
     A summarized reference to a record, typically used in foreign key fields.
@@ -293,11 +406,23 @@ def list_(
         grouping: Grouping = None,
         joined_columns: list[dict] = None,
         return_record_summaries: bool = False,
+        count_mode: Literal["exact", "estimated", "none"] = "exact",
+        after: str = None,
+        before: str = None,
         **kwargs
 ) -> RecordList:
     """
     List records from a table, and its row count. Exposed as `list`.
 
+    Counting all matching records can be expensive on large tables. In
+    that case, use the `"estimated"` or `"none"` count mode, and get the
+    exact count separately via `records.count` if needed.
+
+    Paging through records with `offset` gets slower the deeper the page,
+    since all preceding records must be read. Instead, pass the `cursors`
+    of the current page as `after` or `before` to get the next or
+    previous page. These may be combined with `offset` to skip pages.
+
     Args:
         table_oid: Identity of the table in the user's database.
         database_id: The Django id of the database containing the table.
@@ -311,6 +436,13 @@ def list_(
             "join_path" represents linkages via a simple many-to-many mapping to a column in another table.
         return_record_summaries: Whether to return summaries of retrieved
             records.
+        count_mode: How to compute the `count` of the result. `"exact"`
+            counts all matching records, `"estimated"` uses the query
+            planner's estimate, and `"none"` skips counting.
+        after: A cursor; only records after the one it identifies are
+            returned.
+        before: A cursor; only records before the one it identifies are
+            returned.
 
     Returns:
         The requested records, along with some metadata.
@@ -328,6 +460,10 @@ def list_(
             joined_columns=joined_columns,
             return_record_summaries=return_record_summaries,
             table_record_summary_templates=get_table_record_summary_templates(database_id),
+            count_mode=count_mode,
+            after=after,
+            before=before,
+            return_cursors=True,
         )
     download_link_columns = get_download_link_columns(table_oid, database_id)
     record_info["download_links"] = get_download_links(
@@ -339,6 +475,33 @@ def list_(
     return RecordList.from_dict(record_info)
 
 
+@mathesar_rpc_method(name="records.count", auth="login")
+def count(
+        *,
+        table_oid: int,
+        database_id: int,
+        filter: Filter = None,
+        **kwargs
+) -> int:
+    """
+    Count the records of a table, optionally restricted by a filter.
+
+    This is useful along with `records.list` called with a count mode
+    other than `"exact"`, to get the exact count lazily.
+
+    Args:
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        filter: A filter definition object.
+
+    Returns:
+        The number of (matching) records in the table.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        return count_records_from_table(conn, table_oid, filter=filter)
+
+
 @mathesar_rpc_method(name="records.get", auth="login")
 def get(
         *,
@@ -434,6 +597,50 @@ def add(
     return RecordAdded.from_dict(record_info)
 
 
+@mathesar_rpc_method(name="records.add_many", auth="login")
+def add_many(
+        *,
+        record_defs: list[dict],
+        table_oid: int,
+        database_id: int,
+        return_records: bool = False,
+        return_record_summaries: bool = False,
+        **kwargs
+) -> RecordsAdded:
+    """
+    Add many records to a table at once.
+
+    Each element of `record_defs` has the same form as the `record_def`
+    of `records.add`. The records are added in a single transaction; if
+    any of them can't be added, none are, and the errors are returned
+    for the offending records.
+
+    Args:
+        record_defs: A list of objects representing the records to add.
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        return_records: Whether to return the added records.
+        return_record_summaries: Whether to return summaries of the added
+            records.
+
+    Returns:
+        The primary keys of the created records, along with the records
+        themselves if requested, or the errors preventing them from being
+        created.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        records_info = add_records_to_table(
+            conn,
+            record_defs,
+            table_oid,
+            return_records=return_records,
+            return_record_summaries=return_record_summaries,
+            table_record_summary_templates=get_table_record_summary_templates(database_id),
+        )
+    return RecordsAdded.from_dict(records_info)
+
+
 @mathesar_rpc_method(name="records.patch", auth="login")
 def patch(
         *,
@@ -477,6 +684,65 @@ def patch(
     return RecordAdded.from_dict(record_info)
 
 
+@mathesar_rpc_method(name="records.patch_many", auth="login")
+def patch_many(
+        *,
+        table_oid: int,
+        database_id: int,
+        record_patches: Optional[list[RecordPatch]] = None,
+        record_def: Optional[dict] = None,
+        record_ids: Optional[list[Any]] = None,
+        return_records: bool = False,
+        return_record_summaries: bool = False,
+        **kwargs
+) -> RecordsPatched:
+    """
+    Modify many records in a table at once.
+
+    Either pass `record_patches` to modify each record differently, or
+    pass a single `record_def` along with the `record_ids` of the
+    records to modify in the same way. The records are modified in a
+    single transaction, with one `UPDATE` statement for each distinct
+    set of modified columns. Records which don't exist are skipped.
+
+    Args:
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        record_patches: A list of record modifications.
+        record_def: An object representing the modification of every
+            record given by `record_ids`, as for `records.patch`.
+        record_ids: The primary key values of the records to modify
+            according to `record_def`.
+        return_records: Whether to return the modified records.
+        return_record_summaries: Whether to return summaries of the
+            modified records.
+
+    Returns:
+        The primary keys of the modified records, along with the records
+        themselves if requested.
+    """
+    if (record_def is None) != (record_ids is None) or (record_patches is None) == (record_def is None):
+        raise ValueError(
+            "Pass either record_patches, or both record_def and record_ids."
+        )
+    if record_patches is None:
+        record_patches = [
+            {"record_id": record_id, "record_def": record_def}
+            for record_id in record_ids
+        ]
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        records_info = patch_records_in_table(
+            conn,
+            record_patches,
+            table_oid,
+            return_records=return_records,
+            return_record_summaries=return_record_summaries,
+            table_record_summary_templates=get_table_record_summary_templates(database_id),
+        )
+    return RecordsPatched.from_dict(records_info)
+
+
 @mathesar_rpc_method(name="records.delete", auth="login")
 def delete(
         *,
@@ -515,6 +781,8 @@ def search(
         limit: int = 10,
         offset: int = 0,
         return_record_summaries: bool = False,
+        after: str = None,
+        before: str = None,
         **kwargs
 ) -> RecordList:
     """
@@ -537,6 +805,10 @@ def search(
             following rows.
         return_record_summaries: Whether to return summaries of retrieved
             records.
+        after: A cursor; only records after the one it identifies are
+            returned.
+        before: A cursor; only records before the one it identifies are
+            returned.
 
     Returns:
         The requested records, along with some metadata.
@@ -551,6 +823,9 @@ def search(
             offset=offset,
             return_record_summaries=return_record_summaries,
             table_record_summary_templates=get_table_record_summary_templates(database_id),
+            after=after,
+            before=before,
+            return_cursors=True,
         )
     download_link_columns = get_download_link_columns(table_oid, database_id)
     record_info["download_links"] = get_download_links(
@@ -1,5 +1,6 @@
 from typing import TypedDict, Optional
 
+from db.connection_pool import get_pool_stats
 from mathesar.models.base import Server
 from mathesar.rpc.decorators import mathesar_rpc_method
 
@@ -43,6 +44,56 @@ class ConfiguredServerPatch(TypedDict):
     sslmode: Optional[str]
 
 
+class ConnectionPoolStats(TypedDict):
+    """
+    Statistics about a pool of connections to a database.
+
+    Attributes:
+        server_id: The Django id of the server.
+        database_id: The Django id of the database.
+        configured_role_id: The Django id of the role used to connect.
+        requests_num: Number of connections requested from the pool.
+        requests_waiting: Number of requests which had to wait.
+        requests_errors: Number of requests which timed out or failed.
+        connections_num: Number of connections opened.
+        connections_errors: Number of failed connection attempts.
+        connections_lost: Number of connections found dead on checkout.
+        connections_reaped: Number of idle connections closed.
+        returns_bad: Number of connections discarded on return.
+        pool_min: The minimum number of connections kept open.
+        pool_max: The maximum number of connections.
+        pool_size: Number of connections currently open.
+        pool_available: Number of idle connections.
+        pool_in_use: Number of connections currently checked out.
+    """
+    server_id: int
+    database_id: int
+    configured_role_id: int
+    requests_num: int
+    requests_waiting: int
+    requests_errors: int
+    connections_num: int
+    connections_errors: int
+    connections_lost: int
+    connections_reaped: int
+    returns_bad: int
+    pool_min: int
+    pool_max: int
+    pool_size: int
+    pool_available: int
+    pool_in_use: int
+
+    @classmethod
+    def from_dict(cls, key, stats):
+        server_id, database_id, configured_role_id = key
+        return cls(
+            server_id=server_id,
+            database_id=database_id,
+            configured_role_id=configured_role_id,
+            **stats
+        )
+
+
 @mathesar_rpc_method(name="servers.configured.list", auth="login")
 def list_() -> list[ConfiguredServerInfo]:
     """
@@ -77,3 +128,20 @@ def patch(*, server_id: int, patch: ConfiguredServerPatch, **kwargs) -> Configur
         server.sslmode = patch.get("sslmode")
     server.save()
     return ConfiguredServerInfo.from_model(server)
+
+
+@mathesar_rpc_method(name="servers.configured.get_connection_pool_stats")
+def get_connection_pool_stats(**kwargs) -> list[ConnectionPoolStats]:
+    """
+    List statistics about the connection pools of this Mathesar process.
+
+    Each worker process serving Mathesar keeps its own pools, so the
+    statistics only describe the process handling this request.
+
+    Returns:
+        A list of statistics, one for each connection pool.
+    """
+    return [
+        ConnectionPoolStats.from_dict(key, stats)
+        for key, stats in get_pool_stats().items()
+    ]
@@ -14,7 +14,6 @@ from db.tables import (
     get_table_info,
     list_joinable_tables,
 )
-from mathesar.imports.datafile import copy_datafile_to_table
 from mathesar.rpc.columns import (
     CreatablePkColumnInfo,
     CreatableColumnInfo,
@@ -298,49 +297,6 @@ def patch(
         return alter_table_on_database(table_oid, table_data_dict, conn)
 
 
-@mathesar_rpc_method(name="tables.import", auth="login")
-def import_(
-    *,
-    data_file_id: int,
-    schema_oid: int,
-    database_id: int,
-    table_name: Optional[str] = None,
-    comment: Optional[str] = None,
-    **kwargs
-) -> AddedTableInfo:
-    """
-    Import a CSV/TSV into a table.
-
-    Args:
-        data_file_id: The Django id of the DataFile containing desired CSV/TSV.
-        schema_oid: Identity of the schema in the user's database.
-        database_id: The Django id of the database containing the table.
-        table_name: Name of the table to be imported.
-        comment: The comment for the new table.
-
-    Returns:
-        The `oid`, `name`, and `renamed_columns` of the created table.
-    """
-    user = kwargs.get(REQUEST_KEY).user
-    with connect(database_id, user) as conn:
-        import_result = copy_datafile_to_table(
-            user,
-            data_file_id,
-            table_name,
-            schema_oid,
-            conn,
-            comment=comment,
-        )
-
-    set_table_meta_data(
-        import_result['oid'],
-        {'mathesar_added_pkey_attnum': import_result['pkey_column_attnum']},
-        database_id,
-    )
-
-    return AddedTableInfo.from_dict(import_result)
-
-
 @mathesar_rpc_method(name="tables.get_import_preview", auth="login")
 def get_import_preview(
     *,
@@ -0,0 +1,153 @@
+"""
+Classes and functions exposed to the RPC endpoint for importing tables in the background.
+"""
+from typing import Literal, Optional, TypedDict
+
+from django.utils import timezone
+from modernrpc.core import REQUEST_KEY
+
+from mathesar.imports.jobs import (
+    cancel_import_job, fail_lost_import_jobs, start_import_job
+)
+from mathesar.models.base import ImportJob
+from mathesar.rpc.decorators import mathesar_rpc_method
+from mathesar.rpc.tables.base import AddedTableInfo
+
+
+class ImportJobInfo(TypedDict):
+    """
+    Information about a background import of a data file into a table.
+
+    Attributes:
+        id: The Django id of the import job.
+        database_id: The Django id of the database the table is created in.
+        data_file_id: The Django id of the DataFile being imported.
+        status: The state of the job.
+        bytes_total: The size of the file being imported.
+        bytes_read: The number of bytes of the file read so far.
+        rows_copied: The number of rows copied into the table so far.
+        eta_seconds: An estimate of the seconds until the import finishes,
+            based on its progress so far.
+        result: The created table, once the import is complete.
+        error: A description of the error which made the import fail.
+    """
+    id: int
+    database_id: int
+    data_file_id: int
+    status: Literal["PENDING", "RUNNING", "COMPLETE", "FAILED", "CANCELLED"]
+    bytes_total: Optional[int]
+    bytes_read: int
+    rows_copied: int
+    eta_seconds: Optional[float]
+    result: Optional[AddedTableInfo]
+    error: Optional[str]
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(
+            id=model.id,
+            database_id=model.database_id,
+            data_file_id=model.data_file_id,
+            status=model.status,
+            bytes_total=model.bytes_total,
+            bytes_read=model.bytes_read,
+            rows_copied=model.rows_copied,
+            eta_seconds=_get_eta_seconds(model),
+            result=AddedTableInfo.from_dict(model.result) if model.result else None,
+            error=model.error,
+        )
+
+
+def _get_eta_seconds(model):
+    if (
+            model.status != "RUNNING"
+            or not model.bytes_read
+            or not model.bytes_total
+            or model.started_at is None
+    ):
+        return None
+    elapsed = (timezone.now() - model.started_at).total_seconds()
+    remaining = max(model.bytes_total - model.bytes_read, 0)
+    return elapsed * remaining / model.bytes_read
+
+
+@mathesar_rpc_method(name="tables.import", auth="login")
+def import_(
+    *,
+    data_file_id: int,
+    schema_oid: int,
+    database_id: int,
+    table_name: Optional[str] = None,
+    comment: Optional[str] = None,
+    **kwargs
+) -> ImportJobInfo:
+    """
+    Start importing a CSV/TSV into a table in the background.
+
+    This returns immediately. Poll the job with `tables.import_jobs.get`
+    to follow its progress, and to get the created table once it's
+    complete. Large files are copied through several connections at once
+    (see the `MATHESAR_IMPORT_PARALLEL_WORKERS` setting).
+
+    Args:
+        data_file_id: The Django id of the DataFile containing desired CSV/TSV.
+        schema_oid: Identity of the schema in the user's database.
+        database_id: The Django id of the database containing the table.
+        table_name: Name of the table to be imported.
+        comment: The comment for the new table.
+
+    Returns:
+        The newly started import job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    job = start_import_job(
+        user,
+        database_id,
+        data_file_id,
+        schema_oid,
+        table_name=table_name,
+        comment=comment,
+    )
+    return ImportJobInfo.from_model(job)
+
+
+@mathesar_rpc_method(name="tables.import_jobs.get", auth="login")
+def get(*, import_job_id: int, **kwargs) -> ImportJobInfo:
+    """
+    Get the progress of an import job started by the current user.
+
+    A job left pending or running when Mathesar was restarted is marked
+    as failed.
+
+    Args:
+        import_job_id: The Django id of the import job.
+
+    Returns:
+        The import job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    job = ImportJob.objects.get(id=import_job_id, user=user)
+    if fail_lost_import_jobs(id=job.id):
+        job.refresh_from_db()
+    return ImportJobInfo.from_model(job)
+
+
+@mathesar_rpc_method(name="tables.import_jobs.cancel", auth="login")
+def cancel(*, import_job_id: int, **kwargs) -> ImportJobInfo:
+    """
+    Cancel an import job started by the current user.
+
+    A running import is rolled back shortly after this call, so the
+    returned job may still be running.
+
+    Args:
+        import_job_id: The Django id of the import job.
+
+    Returns:
+        The import job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    job = ImportJob.objects.get(id=import_job_id, user=user)
+    if fail_lost_import_jobs(id=job.id):
+        job.refresh_from_db()
+    return ImportJobInfo.from_model(cancel_import_job(job))
@@ -3,8 +3,14 @@ Classes and functions exposed to the RPC endpoint for managing table metadata.
 """
 from typing import Optional, TypedDict, Union
 
+from modernrpc.core import REQUEST_KEY
+
+from db.tables import set_record_summary_index
 from mathesar.rpc.decorators import mathesar_rpc_method
-from mathesar.utils.tables import list_tables_meta_data, set_table_meta_data
+from mathesar.rpc.utils import connect
+from mathesar.utils.tables import (
+    get_table_meta_data, list_tables_meta_data, set_table_meta_data
+)
 
 
 class TableMetaDataRecord(TypedDict):
@@ -22,6 +28,7 @@ class TableMetaDataRecord(TypedDict):
         column_order: The order in which columns of a table are displayed.
         record_summary_template: The record summary template.
         mathesar_added_pkey_attnum: The attnum of the most recently-set pkey column.
+        index_record_summaries: Whether record summaries of the table are indexed.
     """
     id: int
     database_id: int
@@ -31,6 +38,7 @@ class TableMetaDataRecord(TypedDict):
     column_order: Optional[list[int]]
     record_summary_template: Optional[dict[str, Union[str, list[int]]]]
     mathesar_added_pkey_attnum: Optional[int]
+    index_record_summaries: Optional[bool]
 
     @classmethod
     def from_model(cls, model):
@@ -43,6 +51,7 @@ class TableMetaDataRecord(TypedDict):
             column_order=model.column_order,
             record_summary_template=model.record_summary_template,
             mathesar_added_pkey_attnum=model.mathesar_added_pkey_attnum,
+            index_record_summaries=model.index_record_summaries,
         )
 
 
@@ -56,12 +65,18 @@ class TableMetaDataBlob(TypedDict):
         column_order: The order in which columns of a table are displayed.
         record_summary_template: The record summary template
         mathesar_added_pkey_attnum: The attnum of the most recently-set pkey column.
+        index_record_summaries: Whether to maintain an index of the record
+            summaries of the table. This speeds up searching and listing
+            record summaries (e.g., in the row seeker) for large tables, at
+            the cost of slower writes. Only templates referring to columns
+            of the table itself (rather than linked tables) can be indexed.
     """
     data_file_id: Optional[int]
     import_verified: Optional[bool]
     column_order: Optional[list[int]]
     record_summary_template: Optional[dict[str, Union[str, list[int]]]]
     mathesar_added_pkey_attnum: Optional[int]
+    index_record_summaries: Optional[bool]
 
     @classmethod
     def from_model(cls, model):
@@ -71,6 +86,7 @@ class TableMetaDataBlob(TypedDict):
             column_order=model.column_order,
             record_summary_template=model.record_summary_template,
             mathesar_added_pkey_attnum=model.mathesar_added_pkey_attnum,
+            index_record_summaries=model.index_record_summaries,
         )
 
 
@@ -98,9 +114,35 @@ def set_(
     """
     Set metadata for a table.
 
+    If `index_record_summaries` is set, or the record summary template of
+    an indexed table changes, the record summary index of the table is
+    created, rebuilt, or dropped accordingly.
+
     Args:
         table_oid: The PostgreSQL OID of the table.
         metadata: A TableMetaDataBlob object describing desired table metadata to set.
         database_id: The Django id of the database containing the table.
     """
+    current_meta_data = get_table_meta_data(table_oid, database_id)
+    index_record_summaries = metadata.get(
+        "index_record_summaries", current_meta_data.index_record_summaries
+    )
+    record_summary_template = metadata.get(
+        "record_summary_template", current_meta_data.record_summary_template
+    )
+    if (
+            "index_record_summaries" in metadata
+            or "record_summary_template" in metadata
+            and index_record_summaries
+    ):
+        # The index is built before the metadata is saved, so that a failed
+        # build doesn't leave the table marked as indexed.
+        user = kwargs.get(REQUEST_KEY).user
+        with connect(database_id, user) as conn:
+            set_record_summary_index(
+                conn,
+                table_oid,
+                bool(index_record_summaries),
+                {table_oid: record_summary_template},
+            )
     set_table_meta_data(table_oid, metadata, database_id)
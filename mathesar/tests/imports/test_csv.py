@@ -1,7 +1,19 @@
+import codecs
+import io
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import psycopg
 import pytest
 
 from mathesar.errors import InvalidTableError
-from mathesar.utils.csv import get_sv_dialect
+from mathesar.imports import datafile
+from mathesar.imports.datafile import (
+    _can_import_csv_directly, _ChunkProgress, _copy_datafile_to_columns, _CopyStopped,
+    _read_range, _split_csv, insert_into_existing_table
+)
+from mathesar.models.base import DataFile
+from mathesar.utils.csv import detect_sv_dialect, get_file_encoding, get_sv_dialect
 
 
 get_dialect_test_list = [
@@ -22,6 +34,24 @@ def test_sv_get_dialect(exp_delim, exp_quote, exp_escape, file):
     assert dialect.escapechar == exp_escape
 
 
+detect_dialect_method_test_list = [
+    ("sniffer", "mathesar/tests/data/patents.csv"),
+    ("sniffer", "mathesar/tests/data/csv_parsing/mixed_quote.csv"),
+    # The standard library sniffer can't detect escape characters.
+    ("clevercsv", "mathesar/tests/data/csv_parsing/escaped_quote.csv"),
+]
+
+
+@pytest.mark.parametrize("exp_method,file", detect_dialect_method_test_list)
+def test_sv_detect_dialect_method(exp_method, file):
+    with open(file, "r") as sv_file:
+        dialect, detection = detect_sv_dialect(sv_file)
+        assert sv_file.tell() == 0
+    assert detection["method"] == exp_method
+    assert detection["sample_size"] > 0
+    assert detection["duration"] >= 0
+
+
 get_dialect_exceptions_test_list = [
     "mathesar/tests/data/csv_parsing/patents_invalid.csv",
     "mathesar/tests/data/csv_parsing/extra_quote_invalid.csv",
@@ -34,3 +64,192 @@ def test_sv_get_dialect_exceptions(file):
     with pytest.raises(InvalidTableError):
         with open(file, "r") as sv_file:
             get_sv_dialect(sv_file)
+
+
+def test_get_file_encoding_checks_whole_file_for_utf8():
+    # The only non-UTF-8 byte is far past the head sample.
+    data = ("id,name\n" + "1,abc\n" * 300000).encode() + "2,café\n".encode("latin-1")
+    encoding, confidence = get_file_encoding(io.BytesIO(data))
+    assert encoding not in ("ascii", "utf-8")
+    data.decode(encoding)
+
+
+get_file_encoding_test_list = [
+    ("utf-8", 1.0, ("id,name\n" + "1,日本語\n" * 100000).encode()),
+    ("utf-8-sig", 1.0, codecs.BOM_UTF8 + b"id,name\n1,abc\n"),
+    ("utf_16_le", 1.0, "mathesar/tests/data/non_unicode_files/utf_16_le.csv"),
+]
+
+
+@pytest.mark.parametrize("exp_encoding,exp_confidence,data", get_file_encoding_test_list)
+def test_get_file_encoding(exp_encoding, exp_confidence, data):
+    if isinstance(data, str):
+        with open(data, "rb") as f:
+            data = f.read()
+    file = io.BytesIO(data)
+    assert get_file_encoding(file) == (exp_encoding, exp_confidence)
+    assert file.tell() == 0
+
+
+can_import_csv_directly_test_list = [
+    (True, {}, ["a", "b"]),
+    (True, {"encoding": "ascii"}, ["a", "b"]),
+    (True, {"encoding": "utf-8-sig"}, ["a", "b"]),
+    (False, {"encoding": "utf-8-sig", "header": False}, []),
+    (False, {"encoding": "utf_16_le"}, ["a", "b"]),
+    (False, {"escapechar": "\\"}, ["a", "b"]),
+    (False, {"quotechar": ""}, ["a", "b"]),
+    (False, {}, ["a", "multi\nline"]),
+]
+
+
+@pytest.mark.parametrize("expect,fields,raw_col_names", can_import_csv_directly_test_list)
+def test_can_import_csv_directly(expect, fields, raw_col_names):
+    data_file = DataFile(**{"encoding": "utf-8", "header": True, "escapechar": "", **fields})
+    assert _can_import_csv_directly(data_file, raw_col_names) == expect
+
+
+def test_split_csv_at_record_boundaries():
+    data = b'a,b\n1,"x\ny"\n2,"""\n"""\n3,z\n4,w\n'
+    chunks = _split_csv(io.BytesIO(data), 3, b'"', True)
+    assert chunks[0][0] == len(b'a,b\n')
+    assert chunks[-1][1] == len(data)
+    assert all(prev[1] == next_[0] for prev, next_ in zip(chunks, chunks[1:]))
+    # Line breaks within quoted values are never used as boundaries.
+    assert {start for start, _ in chunks} <= {4, 12, 22, 26}
+    assert len(chunks) > 1
+
+
+def test_read_range_counts_chunk_progress():
+    data = b'a,b\n1,x\n2,y\n3,z\n'
+    chunk_progress = _ChunkProgress(len(b'a,b\n'))
+    raw_f = io.BytesIO(data)
+    raw_f.seek(len(b'a,b\n'))
+    assert b''.join(_read_range(raw_f, len(b'1,x\n2,y\n'), chunk_progress)) == b'1,x\n2,y\n'
+    assert chunk_progress.get_totals() == (len(b'a,b\n1,x\n2,y\n'), 2)
+
+
+def test_read_range_stops_when_chunk_progress_stopped():
+    chunk_progress = _ChunkProgress(0)
+    blocks = _read_range(io.BytesIO(b'1,x\n'), 4, chunk_progress)
+    next(blocks)
+    chunk_progress.stop()
+    with pytest.raises(_CopyStopped):
+        next(blocks)
+
+
+def _csv_data_file(tmp_path, data, header=True):
+    path = tmp_path / "data.csv"
+    path.write_bytes(data)
+    return SimpleNamespace(
+        file=SimpleNamespace(path=str(path)),
+        header=header,
+        encoding="utf-8",
+        delimiter=",",
+        quotechar='"',
+        escapechar="",
+    )
+
+
+def _mock_conn():
+    conn = MagicMock()
+    # Let exceptions out of `conn.transaction()`, as psycopg does.
+    conn.transaction.return_value.__exit__.return_value = False
+    return conn
+
+
+@pytest.fixture
+def mocked_imports(monkeypatch):
+    """Record what `_copy_datafile_to_columns` passes to COPY."""
+    copied = {}
+
+    def import_csv_into_table(blocks, import_info, conn, **kwargs):
+        copied["csv"] = b"".join(blocks)
+        copied["csv_kwargs"] = kwargs
+        return 2
+
+    def import_rows_into_table(rows, import_info, conn):
+        copied["rows"] = list(rows)
+        return len(copied["rows"])
+
+    monkeypatch.setattr(datafile, "import_csv_into_table", import_csv_into_table)
+    monkeypatch.setattr(datafile, "import_rows_into_table", import_rows_into_table)
+    return copied
+
+
+def test_copy_datafile_to_columns_streams_raw_csv(tmp_path, mocked_imports):
+    data = b'a,b\n1,"x,y"\n2,\n'
+    data_file = _csv_data_file(tmp_path, data)
+    assert _copy_datafile_to_columns(data_file, {}, [0, 1], _mock_conn()) == 2
+    assert mocked_imports["csv"] == data
+    assert mocked_imports["csv_kwargs"] == {"delimiter": ",", "quotechar": '"', "header": True}
+    assert "rows" not in mocked_imports
+
+
+def test_copy_datafile_to_columns_projects_columns(tmp_path, mocked_imports):
+    data_file = _csv_data_file(tmp_path, b'a,b,c\n1,x,\n2,,z\n')
+    assert _copy_datafile_to_columns(data_file, {}, [2, 0], _mock_conn()) == 2
+    assert mocked_imports["rows"] == [[None, "1"], ["z", "2"]]
+    assert "csv" not in mocked_imports
+
+
+def test_copy_datafile_to_columns_falls_back_on_data_error(
+    tmp_path, mocked_imports, monkeypatch
+):
+    def import_csv_into_table(blocks, import_info, conn, **kwargs):
+        raise psycopg.errors.DataError
+    monkeypatch.setattr(datafile, "import_csv_into_table", import_csv_into_table)
+    conn = _mock_conn()
+    data_file = _csv_data_file(tmp_path, b'a,b\n1,x\n2,\n')
+    assert _copy_datafile_to_columns(data_file, {}, [0, 1], conn) == 2
+    # The failed COPY is rolled back to a savepoint, then the rows are
+    # copied as parsed by clevercsv.
+    conn.transaction.assert_called_once()
+    assert mocked_imports["rows"] == [["1", "x"], ["2", None]]
+
+
+def test_insert_into_existing_table_copies_textual_columns(tmp_path, monkeypatch):
+    data_file = _csv_data_file(tmp_path, b'a,b,c\n1,x,y\n')
+    monkeypatch.setattr(
+        DataFile.objects, "get", lambda **kwargs: data_file
+    )
+    prepare_columns_for_import = MagicMock(return_value={"table_oid": 5})
+    copy_datafile_to_columns = MagicMock(return_value=1)
+    monkeypatch.setattr(datafile, "prepare_columns_for_import", prepare_columns_for_import)
+    monkeypatch.setattr(datafile, "_copy_datafile_to_columns", copy_datafile_to_columns)
+    mappings = [
+        {"csv_column": {"index": 2, "name": "c"}, "table_column": 3},
+        {"csv_column": {"index": 0, "name": "a"}, "table_column": 2},
+        {"csv_column": {"index": 1, "name": "b"}, "table_column": None},
+    ]
+    conn = _mock_conn()
+    assert insert_into_existing_table(None, 1, 5, mappings, conn) == 1
+    # The columns of the file are copied in the order they appear in it.
+    prepare_columns_for_import.assert_called_once_with(5, [2, 3], conn)
+    copy_datafile_to_columns.assert_called_once_with(
+        data_file,
+        {"table_oid": 5},
+        [0, 2],
+        conn,
+        header_to_validate=[(0, "a"), (1, "b"), (2, "c")],
+    )
+
+
+def test_insert_into_existing_table_uses_temp_table_for_casts(monkeypatch):
+    monkeypatch.setattr(
+        datafile, "prepare_columns_for_import", MagicMock(return_value=None)
+    )
+    copy_datafile_to_columns = MagicMock()
+    copy_datafile_to_table = MagicMock(return_value={"oid": 7})
+    insert_from_select = MagicMock(return_value=1)
+    monkeypatch.setattr(datafile, "_copy_datafile_to_columns", copy_datafile_to_columns)
+    monkeypatch.setattr(datafile, "copy_datafile_to_table", copy_datafile_to_table)
+    monkeypatch.setattr(datafile, "insert_from_select", insert_from_select)
+    mappings = [{"csv_column": {"index": 0, "name": "a"}, "table_column": 2}]
+    conn = _mock_conn()
+    assert insert_into_existing_table(None, 1, 5, mappings, conn) == 1
+    copy_datafile_to_columns.assert_not_called()
+    assert copy_datafile_to_table.call_args.kwargs["import_into_temp_table"] is True
+    insert_from_select.assert_called_once_with(
+        conn, 7, 5, [{"src_table_attnum": 1, "dst_table_attnum": 2}]
+    )
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from mathesar.imports.jobs import HEARTBEAT_TIMEOUT, fail_lost_import_jobs
+from mathesar.models.base import Database, DataFile, ImportJob, Server
+
+
+def test_fail_lost_import_jobs(user_alice):
+    server = Server.objects.create(host='example.com', port=5432)
+    database = Database.objects.create(name='db1', server=server)
+    data_file = DataFile.objects.create(
+        file='alice/patents.csv', user=user_alice, created_from='FILE', type='CSV',
+        base_name='patents',
+    )
+    now = timezone.now()
+    lost_at = now - timedelta(seconds=HEARTBEAT_TIMEOUT + 1)
+
+    def create_job(status, heartbeat_at):
+        return ImportJob.objects.create(
+            user=user_alice, database=database, data_file=data_file, schema_oid=2200,
+            status=status, heartbeat_at=heartbeat_at,
+        )
+
+    lost_pending = create_job("PENDING", lost_at)
+    lost_running = create_job("RUNNING", lost_at)
+    live_running = create_job("RUNNING", now)
+    complete = create_job("COMPLETE", lost_at)
+
+    fail_lost_import_jobs()
+
+    def get_status(job):
+        job.refresh_from_db()
+        return job.status
+
+    assert get_status(lost_pending) == "FAILED"
+    assert get_status(lost_running) == "FAILED"
+    assert lost_running.error is not None
+    assert get_status(live_running) == "RUNNING"
+    assert get_status(complete) == "COMPLETE"
@@ -187,51 +187,6 @@ def test_tables_patch(rf, monkeypatch, mocked_exec_msar_func):
     assert call_args[3] == json.dumps(table_data_dict)
 
 
-def test_tables_import(rf, monkeypatch):
-    request = rf.post('/api/rpc/v0', data={})
-    request.user = User(username='alice', password='pass1234')
-    schema_oid = 2200
-    data_file_id = 10
-    database_id = 11
-
-    @contextmanager
-    def mock_connect(_database_id, user):
-        if _database_id == database_id and user.username == 'alice':
-            try:
-                yield True
-            finally:
-                pass
-        else:
-            raise AssertionError('incorrect parameters passed')
-
-    def mock_set_meta_data(table_oid, metadata, _database_id):
-        assert table_oid == 1964474
-        assert metadata == {"mathesar_added_pkey_attnum": 1}
-        assert _database_id == 11
-
-    def mock_table_import(_user, _data_file_id, table_name, _schema_oid, conn, comment):
-        if (
-            _user != request.user
-            and _schema_oid != schema_oid
-            and _data_file_id != data_file_id
-        ):
-            raise AssertionError('incorrect parameters passed')
-        return {"oid": 1964474, "name": "imported_table", "pkey_column_attnum": 1}
-    monkeypatch.setattr(tables.base, 'connect', mock_connect)
-    monkeypatch.setattr(tables.base, 'set_table_meta_data', mock_set_meta_data)
-    monkeypatch.setattr(tables.base, 'copy_datafile_to_table', mock_table_import)
-    imported_table_info = tables.import_(
-        data_file_id=10,
-        table_name='imported_table',
-        schema_oid=2200,
-        database_id=11,
-        request=request
-    )
-    assert imported_table_info == {
-        "oid": 1964474, "name": "imported_table", "renamed_columns": None
-    }
-
-
 def test_tables_preview(rf, monkeypatch, mocked_exec_msar_func):
     request = rf.post('/api/rpc/v0', data={})
     request.user = User(username='alice', password='pass1234')
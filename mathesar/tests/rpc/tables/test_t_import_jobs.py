@@ -0,0 +1,104 @@
+"""
+This file tests the table import job RPC functions.
+
+Fixtures:
+    rf(pytest-django): Provides mocked `Request` objects.
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+    user_alice, user_bob(mathesar/tests/conftest.py): Users in the Django database.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+import pytest
+
+from mathesar.imports.jobs import HEARTBEAT_TIMEOUT
+from mathesar.models.base import Database, DataFile, ImportJob, Server
+from mathesar.models.users import User
+from mathesar.rpc.tables import import_jobs
+
+
+def test_tables_import(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+
+    def mock_start_import_job(
+            user, database_id, data_file_id, schema_oid, table_name=None, comment=None
+    ):
+        if (
+                user != request.user
+                or database_id != 11
+                or data_file_id != 10
+                or schema_oid != 2200
+                or table_name != 'imported_stuff'
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return ImportJob(
+            id=5,
+            database_id=database_id,
+            data_file_id=data_file_id,
+            schema_oid=schema_oid,
+            table_name=table_name,
+        )
+
+    monkeypatch.setattr(import_jobs, 'start_import_job', mock_start_import_job)
+    expect_job_info = {
+        'id': 5,
+        'database_id': 11,
+        'data_file_id': 10,
+        'status': 'PENDING',
+        'bytes_total': None,
+        'bytes_read': 0,
+        'rows_copied': 0,
+        'eta_seconds': None,
+        'result': None,
+        'error': None,
+    }
+    actual_job_info = import_jobs.import_(
+        data_file_id=10,
+        schema_oid=2200,
+        database_id=11,
+        table_name='imported_stuff',
+        request=request,
+    )
+    assert actual_job_info == expect_job_info
+
+
+def test_import_job_info_eta():
+    job = ImportJob(
+        id=5,
+        database_id=11,
+        data_file_id=10,
+        schema_oid=2200,
+        status='RUNNING',
+        bytes_total=1000,
+        bytes_read=250,
+        rows_copied=20,
+        started_at=timezone.now() - timedelta(seconds=30),
+    )
+    eta = import_jobs.ImportJobInfo.from_model(job)['eta_seconds']
+    assert 89 < eta < 92
+
+
+def test_import_jobs_get_fails_only_own_lost_jobs(rf, user_alice, user_bob):
+    server = Server.objects.create(host='example.com', port=5432)
+    database = Database.objects.create(name='db1', server=server)
+    data_file = DataFile.objects.create(
+        file='alice/patents.csv', user=user_alice, created_from='FILE', type='CSV',
+        base_name='patents',
+    )
+    job = ImportJob.objects.create(
+        user=user_alice, database=database, data_file=data_file, schema_oid=2200,
+        status='RUNNING',
+        heartbeat_at=timezone.now() - timedelta(seconds=HEARTBEAT_TIMEOUT + 1),
+    )
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = user_bob
+    with pytest.raises(ImportJob.DoesNotExist):
+        import_jobs.get(import_job_id=job.id, request=request)
+    with pytest.raises(ImportJob.DoesNotExist):
+        import_jobs.cancel(import_job_id=job.id, request=request)
+    # Another user's lost job is left as it is.
+    job.refresh_from_db()
+    assert job.status == 'RUNNING'
+    request.user = user_alice
+    assert import_jobs.get(import_job_id=job.id, request=request)['status'] == 'FAILED'
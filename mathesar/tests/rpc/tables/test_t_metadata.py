@@ -47,6 +47,7 @@ def test_tables_meta_data_list(monkeypatch):
             column_order=[8, 9, 10],
             record_summary_template=None,
             mathesar_added_pkey_attnum=None,
+            index_record_summaries=None,
         ),
         metadata.TableMetaDataRecord(
             id=2,
@@ -57,6 +58,7 @@ def test_tables_meta_data_list(monkeypatch):
             column_order=[],
             record_summary_template=None,
             mathesar_added_pkey_attnum=None,
+            index_record_summaries=None,
         ),
     ]
     actual_metadata_list = metadata.list_(database_id=database_id)
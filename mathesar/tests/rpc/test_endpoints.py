@@ -233,16 +233,36 @@ METHODS = [
         "explorations.delete",
         [user_is_authenticated]
     ),
+    (
+        explorations.dematerialize,
+        "explorations.dematerialize",
+        [user_is_authenticated]
+    ),
     (
         explorations.get,
         "explorations.get",
         [user_is_authenticated]
     ),
+    (
+        explorations.get_materialization,
+        "explorations.get_materialization",
+        [user_is_authenticated]
+    ),
     (
         explorations.list_,
         "explorations.list",
         [user_is_authenticated]
     ),
+    (
+        explorations.materialize,
+        "explorations.materialize",
+        [user_is_authenticated]
+    ),
+    (
+        explorations.refresh,
+        "explorations.refresh",
+        [user_is_authenticated]
+    ),
     (
         explorations.replace,
         "explorations.replace",
@@ -314,6 +334,16 @@ METHODS = [
         "records.add",
         [user_is_authenticated]
     ),
+    (
+        records.add_many,
+        "records.add_many",
+        [user_is_authenticated]
+    ),
+    (
+        records.count,
+        "records.count",
+        [user_is_authenticated]
+    ),
     (
         records.delete,
         "records.delete",
@@ -334,6 +364,11 @@ METHODS = [
         "records.patch",
         [user_is_authenticated]
     ),
+    (
+        records.patch_many,
+        "records.patch_many",
+        [user_is_authenticated]
+    ),
     (
         records.search,
         "records.search",
@@ -443,6 +478,11 @@ METHODS = [
         "servers.configured.patch",
         [user_is_superuser]
     ),
+    (
+        servers.configured.get_connection_pool_stats,
+        "servers.configured.get_connection_pool_stats",
+        [user_is_superuser]
+    ),
 
     (
         tables.add,
@@ -465,7 +505,7 @@ METHODS = [
         [user_is_authenticated]
     ),
     (
-        tables.import_,
+        tables.import_jobs.import_,
         "tables.import",
         [user_is_authenticated]
     ),
@@ -511,6 +551,17 @@ METHODS = [
         [user_is_authenticated]
     ),
 
+    (
+        tables.import_jobs.cancel,
+        "tables.import_jobs.cancel",
+        [user_is_authenticated]
+    ),
+    (
+        tables.import_jobs.get,
+        "tables.import_jobs.get",
+        [user_is_authenticated]
+    ),
+
     (
         tables.metadata.list_,
         "tables.metadata.list",
@@ -5,6 +5,8 @@ Fixtures:
     rf(pytest-django): Provides mocked `Request` objects.
     monkeypatch(pytest): Lets you monkeypatch an object for testing.
 """
+from datetime import datetime, timedelta, timezone
+
 from mathesar.rpc import explorations
 from mathesar.models.users import User
 from mathesar.models.base import Database, Explorations
@@ -136,3 +138,155 @@ def test_explorations_list(rf, monkeypatch):
     ]
     actual_explorations_list = explorations.list_(database_id=11)
     assert actual_explorations_list == expect_explorations_list
+
+
+def test_explorations_materialize(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    exp_model = Explorations(id=3, database=Database(id=11), schema_oid=2200)
+
+    class MockConn:
+        def __enter__(self):
+            return 'conn'
+
+        def __exit__(self, *args):
+            pass
+
+    def mock_connect(database_id, user):
+        if database_id != 11 or user != request.user:
+            raise AssertionError('incorrect parameters passed')
+        return MockConn()
+
+    def mock_materialize(_exp_model, conn, user, refresh_interval=None):
+        if (
+                _exp_model is not exp_model
+                or conn != 'conn'
+                or user != request.user
+                or refresh_interval != timedelta(hours=1)
+        ):
+            raise AssertionError('incorrect parameters passed')
+        _exp_model.materialized_view_oid = 123456
+        _exp_model.refresh_interval = refresh_interval
+        _exp_model.last_refreshed_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        return _exp_model
+
+    monkeypatch.setattr(explorations, 'get_exploration', lambda _id: exp_model)
+    monkeypatch.setattr(explorations, 'connect', mock_connect)
+    monkeypatch.setattr(explorations, 'materialize_exploration', mock_materialize)
+    actual_info = explorations.materialize(
+        exploration_id=3, refresh_interval=3600, request=request
+    )
+    assert actual_info == {
+        'exploration_id': 3,
+        'materialized': True,
+        'refresh_interval': 3600,
+        'last_refreshed_at': '2024-01-02T03:04:05+00:00',
+    }
+
+
+def test_explorations_replace(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    new_exploration = {
+        'id': 3,
+        'database_id': 11,
+        'name': 'books',
+        'base_table_oid': 12345,
+        'schema_oid': 2200,
+        'initial_columns': [{'alias': 'Title', 'attnum': 2}],
+    }
+    exp_model = Explorations(
+        id=3,
+        database=Database(id=11),
+        name='books',
+        base_table_oid=12345,
+        schema_oid=2200,
+        initial_columns=[{'alias': 'Title', 'attnum': 2}],
+    )
+    connections = []
+
+    class MockConn:
+        def __enter__(self):
+            connections.append('conn')
+            return 'conn'
+
+        def __exit__(self, *args):
+            pass
+
+    def mock_connect(database_id, user):
+        if database_id != 11 or user != request.user:
+            raise AssertionError('incorrect parameters passed')
+        return MockConn()
+
+    replacements = []
+
+    def mock_replace_exploration(_new_exploration, conn=None):
+        if _new_exploration != new_exploration:
+            raise AssertionError('incorrect parameters passed')
+        replacements.append(conn)
+        return exp_model
+
+    monkeypatch.setattr(explorations, 'get_exploration', lambda _id: exp_model)
+    monkeypatch.setattr(explorations, 'connect', mock_connect)
+    monkeypatch.setattr(explorations, 'replace_exploration', mock_replace_exploration)
+    explorations.replace(new_exploration=new_exploration, request=request)
+    # The exploration isn't materialized; no connection is needed.
+    assert replacements == [None]
+    assert connections == []
+    exp_model.materialized_view_oid = 123456
+    actual_info = explorations.replace(new_exploration=new_exploration, request=request)
+    assert replacements == [None, 'conn']
+    assert actual_info['id'] == 3
+
+
+def test_explorations_run_with_cursor(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    exploration_def = {'database_id': 11, 'base_table_oid': 12345, 'initial_columns': []}
+
+    class MockConn:
+        def __enter__(self):
+            return 'conn'
+
+        def __exit__(self, *args):
+            pass
+
+    def mock_connect(database_id, user):
+        if database_id != 11 or user != request.user:
+            raise AssertionError('incorrect parameters passed')
+        return MockConn()
+
+    def mock_run_exploration(
+            _exploration_def, conn, limit, offset, count_mode, after=None, before=None
+    ):
+        if (
+                _exploration_def != exploration_def
+                or conn != 'conn'
+                or (limit, offset, count_mode) != (50, 0, 'none')
+                or after != 'WyIxIl0='
+                or before is not None
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return {
+            'query': _exploration_def,
+            'records': {
+                'count': None,
+                'results': [{'id': 2}],
+                'cursors': {'first': 'WyIyIl0=', 'last': 'WyIyIl0='},
+            },
+            'output_columns': ('id',),
+            'column_metadata': {},
+            'limit': limit,
+            'offset': offset,
+        }
+
+    monkeypatch.setattr(explorations, 'connect', mock_connect)
+    monkeypatch.setattr(explorations, 'run_exploration', mock_run_exploration)
+    actual_result = explorations.run(
+        exploration_def=exploration_def,
+        limit=50,
+        count_mode='none',
+        after='WyIxIl0=',
+        request=request,
+    )
+    assert actual_result['records']['cursors'] == {'first': 'WyIyIl0=', 'last': 'WyIyIl0='}
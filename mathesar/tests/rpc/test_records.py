@@ -9,6 +9,8 @@ Fixtures:
 import json
 from contextlib import contextmanager
 
+import pytest
+
 from mathesar.rpc import records
 from mathesar.models.users import User
 
@@ -44,6 +46,7 @@ def test_records_list(rf, monkeypatch, mocked_exec_msar_func):
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "joined_record_summaries": None,
         "record_summaries": {"3": "abcde"},
+        "cursors": {"first": "WyIxIl0=", "last": "WyIyIl0="},
     }
     mocked_exec_msar_func.fetchone.return_value = [expect_records_list]
     actual_records_list = records.list_(
@@ -63,6 +66,47 @@ def test_records_list(rf, monkeypatch, mocked_exec_msar_func):
     assert call_args[8] is None  # joined_columns
     assert call_args[9] is True  # return_record_summaries
     assert call_args[10] == json.dumps({})  # summary template
+    assert call_args[11] == 'exact'  # count_mode
+    assert call_args[12] is None  # after
+    assert call_args[13] is None  # before
+    assert call_args[14] is True  # return_cursors
+
+
+def test_records_count(rf, monkeypatch, mocked_exec_msar_func):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = 2
+    filter_ = {
+        "type": "lesser",
+        "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}]
+    }
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    mocked_exec_msar_func.fetchone.return_value = [50123]
+    actual_count = records.count(
+        table_oid=table_oid,
+        database_id=database_id,
+        filter=filter_,
+        request=request
+    )
+    call_args = mocked_exec_msar_func.call_args_list[0][0]
+    assert actual_count == 50123
+    assert call_args[1] == 'count_records_from_table'
+    assert call_args[2] == table_oid
+    assert call_args[3] == json.dumps(filter_)
 
 
 def test_records_get(rf, monkeypatch, mocked_exec_msar_func):
@@ -92,6 +136,7 @@ def test_records_get(rf, monkeypatch, mocked_exec_msar_func):
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "joined_record_summaries": None,
         "record_summaries": {"3": "abcde"},
+        "cursors": None,
     }
     mocked_exec_msar_func.fetchone.return_value = [expect_record]
     actual_record = records.get(
@@ -151,6 +196,50 @@ def test_records_add(rf, monkeypatch, mocked_exec_msar_func):
     assert call_args[5] == json.dumps({})  # table_record_summary_templates
 
 
+def test_records_add_many(rf, monkeypatch, mocked_exec_msar_func):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = 2
+    record_defs = [{"2": "arecord"}, {"2": "brecord"}]
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    expect_records = {
+        "keys": [3, 4],
+        "results": None,
+        "linked_record_summaries": None,
+        "record_summaries": {"3": "arecord", "4": "brecord"},
+        "errors": None,
+    }
+    mocked_exec_msar_func.fetchone.return_value = [expect_records]
+    actual_records = records.add_many(
+        record_defs=record_defs,
+        table_oid=table_oid,
+        database_id=database_id,
+        return_record_summaries=True,
+        request=request
+    )
+    call_args = mocked_exec_msar_func.call_args_list[0][0]
+    assert actual_records == expect_records
+    assert call_args[2] == table_oid
+    assert call_args[3] == json.dumps(record_defs)
+    assert call_args[4] is False  # return_records
+    assert call_args[5] is True  # return_record_summaries
+    assert call_args[6] == json.dumps({})  # table_record_summary_templates
+
+
 def test_records_patch(rf, monkeypatch, mocked_exec_msar_func):
     username = 'alice'
     password = 'pass1234'
@@ -196,6 +285,66 @@ def test_records_patch(rf, monkeypatch, mocked_exec_msar_func):
     assert call_args[6] == json.dumps({})  # table_record_summary_templates
 
 
+def test_records_patch_many(rf, monkeypatch, mocked_exec_msar_func):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = 2
+    record_def = {"2": "arecord"}
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    expect_records = {
+        "keys": [3, 4],
+        "results": None,
+        "linked_record_summaries": None,
+        "record_summaries": None,
+    }
+    mocked_exec_msar_func.fetchone.return_value = [expect_records]
+    actual_records = records.patch_many(
+        record_def=record_def,
+        record_ids=[3, 4],
+        table_oid=table_oid,
+        database_id=database_id,
+        request=request
+    )
+    call_args = mocked_exec_msar_func.call_args_list[0][0]
+    assert actual_records == expect_records
+    assert call_args[2] == table_oid
+    assert call_args[3] == json.dumps([
+        {"record_id": 3, "record_def": record_def},
+        {"record_id": 4, "record_def": record_def},
+    ])
+    assert call_args[4] is False  # return_records
+    assert call_args[5] is False  # return_record_summaries
+    with pytest.raises(ValueError):
+        records.patch_many(
+            record_def=record_def,
+            table_oid=table_oid,
+            database_id=database_id,
+            request=request
+        )
+    with pytest.raises(ValueError):
+        records.patch_many(
+            record_patches=[{"record_id": 3, "record_def": record_def}],
+            record_def=record_def,
+            table_oid=table_oid,
+            database_id=database_id,
+            request=request
+        )
+
+
 def test_records_delete(rf, monkeypatch, mocked_exec_msar_func):
     username = 'alice'
     password = 'pass1234'
@@ -253,12 +402,14 @@ def test_records_search(rf, monkeypatch, mocked_exec_msar_func):
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "joined_record_summaries": None,
         "record_summaries": {"3": "abcde"},
+        "cursors": {"first": "WyIzIiwgIjEiXQ==", "last": "WyIyIiwgIjQiXQ=="},
     }
     mocked_exec_msar_func.fetchone.return_value = [expect_records_list]
     actual_records_list = records.search(
         table_oid=table_oid,
         database_id=database_id,
         return_record_summaries=True,
+        after="WyIzIiwgIjEiXQ==",
         request=request
     )
     call_args = mocked_exec_msar_func.call_args_list[0][0]
@@ -269,3 +420,6 @@ def test_records_search(rf, monkeypatch, mocked_exec_msar_func):
     assert call_args[5] == 0   # offset
     assert call_args[6] is True  # return_record_summaries
     assert call_args[7] == json.dumps({})  # table_record_summary_templates
+    assert call_args[8] == "WyIzIiwgIjEiXQ=="  # after
+    assert call_args[9] is None  # before
+    assert call_args[10] is True  # return_cursors
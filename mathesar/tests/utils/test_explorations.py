@@ -0,0 +1,184 @@
+"""
+Test running saved explorations.
+"""
+from unittest.mock import MagicMock
+
+from django.core.cache import cache
+
+from mathesar.models.base import Explorations
+from mathesar.utils import explorations
+
+
+def test_run_saved_exploration_caches_results(monkeypatch, settings):
+    settings.MATHESAR_EXPLORATION_CACHE_TIMEOUT = 60
+    cache.clear()
+    exp_model = Explorations(
+        id=3,
+        base_table_oid=1234,
+        initial_columns=[
+            {'alias': 'id', 'attnum': 1},
+            {'alias': 'name', 'attnum': 2, 'join_path': [[[1234, 3], [5678, 1]]]},
+        ],
+        display_names={},
+        transformations=[],
+    )
+    exp_model.database_id = 7
+    conn = MagicMock()
+    conn.info.user = 'alice'
+    tokens = iter(['a', 'a', 'b', 'b'])
+    table_oids_seen = []
+
+    def mock_get_tables_modification_token(table_oids, _conn):
+        table_oids_seen.append(table_oids)
+        return next(tokens)
+
+    runs = []
+
+    def mock_run_exploration(exploration_def, _conn, limit, offset, count_mode):
+        runs.append((limit, offset, count_mode))
+        return {
+            'run': len(runs),
+            'column_metadata': {
+                'id': {'alias': 'id', 'metadata': None},
+                'name': {'alias': 'name', 'metadata': None},
+            },
+        }
+
+    metadata_columns_seen = []
+
+    def mock_get_column_metadata_records(database_id, columns):
+        metadata_columns_seen.append((database_id, sorted(columns)))
+        return {(5678, 1): {'display_width': len(metadata_columns_seen)}}
+
+    monkeypatch.setattr(
+        explorations, 'get_tables_modification_token', mock_get_tables_modification_token
+    )
+    monkeypatch.setattr(explorations, 'run_exploration', mock_run_exploration)
+    monkeypatch.setattr(
+        explorations, '_get_column_metadata_records', mock_get_column_metadata_records
+    )
+    monkeypatch.setattr(
+        explorations,
+        '_get_saved_exploration_def',
+        lambda m: {
+            'database_id': m.database_id,
+            'base_table_oid': m.base_table_oid,
+            'initial_columns': m.initial_columns,
+            'display_names': m.display_names,
+            'transformations': m.transformations,
+        },
+    )
+
+    def run(**kwargs):
+        result = explorations.run_saved_exploration(exp_model, 10, 0, conn, **kwargs)
+        return result['run'], result['column_metadata']['name']['metadata']
+
+    assert run() == (1, None)
+    # Unmodified tables; the cached result is used, with the current
+    # column metadata.
+    assert run() == (1, {'display_width': 1})
+    # Modified tables; the exploration is run again.
+    assert run() == (2, None)
+    # A refresh is requested.
+    assert run(refresh=True) == (3, None)
+    assert table_oids_seen == [[1234, 5678]] * 4
+    assert runs == [(10, 0, 'exact')] * 3
+    assert metadata_columns_seen == [(7, [(1234, 1), (5678, 1)])]
+
+
+def test_run_saved_exploration_reads_materialized_view_if_allowed(monkeypatch, settings):
+    settings.MATHESAR_EXPLORATION_CACHE_TIMEOUT = 0
+    exp_model = Explorations(
+        id=3,
+        base_table_oid=1234,
+        initial_columns=[{'alias': 'id', 'attnum': 1}],
+        display_names={},
+        transformations=[],
+        materialized_view_oid=4321,
+    )
+    exp_model.database_id = 7
+    conn = MagicMock()
+    readable = []
+
+    def mock_db_can_read_materialized_exploration(_conn, exploration, view_oid):
+        assert exploration['base_table_oid'] == 1234 and view_oid == 4321
+        return readable.pop()
+
+    monkeypatch.setattr(
+        explorations,
+        'db_can_read_materialized_exploration',
+        mock_db_can_read_materialized_exploration,
+    )
+    monkeypatch.setattr(
+        explorations,
+        '_run_exploration_on_db',
+        lambda *args, materialized_view_oid=None: {'view': materialized_view_oid},
+    )
+    monkeypatch.setattr(
+        explorations, 'run_exploration', lambda *args: {'view': None}
+    )
+    monkeypatch.setattr(
+        explorations,
+        '_get_saved_exploration_def',
+        lambda m: {
+            'database_id': m.database_id,
+            'base_table_oid': m.base_table_oid,
+            'initial_columns': m.initial_columns,
+            'display_names': m.display_names,
+            'transformations': m.transformations,
+        },
+    )
+
+    readable.append(True)
+    assert explorations.run_saved_exploration(exp_model, 10, 0, conn) == {'view': 4321}
+    # The user may not read the view; the exploration is run against its tables.
+    readable.append(False)
+    assert explorations.run_saved_exploration(exp_model, 10, 0, conn) == {'view': None}
+
+
+def test_exploration_chunker_streams_records_from_db(monkeypatch):
+    exp_model = Explorations(
+        id=3,
+        base_table_oid=1234,
+        initial_columns=[{'alias': 'id', 'attnum': 1}],
+        display_names={},
+        transformations=[],
+    )
+    exp_model.database_id = 7
+    conn = MagicMock()
+    streamed = []
+
+    def mock_db_stream_exploration_records(_conn, query, batch_size, limit, offset):
+        streamed.append((query, batch_size, limit, offset))
+        yield [{'id': 1}, {'id': 2}]
+        yield [{'id': 3}]
+
+    monkeypatch.setattr(explorations, 'get_exploration', lambda exploration_id: exp_model)
+    monkeypatch.setattr(
+        explorations,
+        '_get_saved_exploration_def',
+        lambda m: {
+            'database_id': m.database_id,
+            'base_table_oid': m.base_table_oid,
+            'initial_columns': m.initial_columns,
+            'display_names': m.display_names,
+            'transformations': m.transformations,
+        },
+    )
+    monkeypatch.setattr(
+        explorations,
+        'db_get_exploration_records_query',
+        lambda _conn, exploration: {'output_columns': ['id'], 'query': 'SELECT 1'},
+    )
+    monkeypatch.setattr(
+        explorations, 'db_stream_exploration_records', mock_db_stream_exploration_records
+    )
+    monkeypatch.setattr(
+        explorations,
+        '_get_engine_and_metadata',
+        MagicMock(side_effect=AssertionError('SQLAlchemy should not be used')),
+    )
+
+    chunks = list(explorations.exploration_chunker(conn, 3, limit=10, offset=5, batch_size=2))
+    assert chunks == [('id',), [{'id': 1}, {'id': 2}], [{'id': 3}]]
+    assert streamed == [('SELECT 1', 2, 10, 5)]
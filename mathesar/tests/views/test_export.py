@@ -0,0 +1,33 @@
+"""
+Test exporting tables as CSV.
+"""
+from sqlalchemy import inspect, text
+
+from db.deprecated.utils import engine_to_psycopg_conn
+from mathesar.views import export
+
+
+def test_export_table_csv_in_chunks(engine_with_schema, monkeypatch):
+    engine, schema = engine_with_schema
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE "{schema}".export_test (
+              id integer PRIMARY KEY, "Done" boolean, tags text[], doc jsonb
+            );
+            INSERT INTO "{schema}".export_test VALUES
+              (2, NULL, NULL, NULL),
+              (1, true, '{{a,"b c"}}', '{{"k": [1, "x"]}}');
+        """))
+    table_oid = inspect(engine).get_table_oid('export_test', schema=schema)
+    monkeypatch.setattr(
+        export, 'connect', lambda database_id, user: engine_to_psycopg_conn(engine)
+    )
+    chunks = export.export_table_csv_in_chunks(
+        None, 1, table_oid, order=[{'attnum': 1, 'direction': 'asc'}]
+    )
+    # Values are rendered as Postgres renders them as text.
+    assert b''.join(chunks).decode() == (
+        'id,Done,tags,doc\n'
+        '1,true,"{a,""b c""}","{""k"": [1, ""x""]}"\n'
+        '2,,,\n'
+    )
@@ -1,3 +1,8 @@
+import codecs
+import csv as std_csv
+import io
+import time
+
 import clevercsv as csv
 
 from mathesar.errors import InvalidTableError
@@ -6,6 +11,24 @@ from mathesar.errors import InvalidTableError
 ALLOWED_DELIMITERS = ",\t:|;"
 SAMPLE_SIZE = 1000000
 CHECK_ROWS = 10
+# Lines sniffed before falling back to the much slower clevercsv, and the
+# sample size clevercsv starts from (growing 4x at a time up to SAMPLE_SIZE).
+FAST_SNIFF_LINES = 200
+CLEVERCSV_INITIAL_SAMPLE_SIZE = 65536
+# Encoding detection reads at most these many bytes into memory at once.
+ENCODING_HEAD_SAMPLE_SIZE = 65536
+ENCODING_STRIDE_SAMPLE_SIZE = 16384
+ENCODING_STRIDE_SAMPLES = 4
+ENCODING_CHUNK_SIZE = 1048576
+# Below this confidence, detected encodings are double checked as UTF-8.
+ENCODING_MIN_CONFIDENCE = 0.5
+_ENCODING_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
 
 
 def is_valid_csv(data):
@@ -18,44 +41,224 @@ def is_valid_csv(data):
 
 def get_file_encoding(file):
     """
-    Given a file, uses charset_normalizer if installed or chardet which is
-    installed as part of clevercsv module to detect the file encoding. Returns a
-    default value of utf-8-sig if encoding could not be detected or detection
-    libraries are missing.
+    Given a binary file, detect its encoding using a bounded amount of memory.
+
+    Byte order marks are trusted outright. Otherwise, charset_normalizer is
+    run over the head of the file plus a few samples taken at even strides
+    through it. Since sampling can miss a stray byte, a verdict of UTF-8
+    (or ASCII), or no confident verdict at all, is checked by streaming the
+    whole file through a UTF-8 decoder. If that finds an invalid byte, the
+    bytes around it are sampled to find the actual encoding.
+
+    Returns:
+        A tuple of the encoding name and the confidence (0 to 1) in it.
     """
     from charset_normalizer import detect
-    # Sample Size reduces the accuracy
-    encoding = detect(file.read()).get('encoding', None)
+    head = file.read(ENCODING_HEAD_SAMPLE_SIZE)
+    for bom, encoding in _ENCODING_BOMS:
+        if head.startswith(bom):
+            file.seek(0)
+            return encoding, 1.0
+
+    sample = head
+    remaining = file.seek(0, 2) - len(head)
+    if remaining <= ENCODING_STRIDE_SAMPLES * ENCODING_STRIDE_SAMPLE_SIZE:
+        file.seek(len(head))
+        sample += file.read()
+    else:
+        # Keep offsets 4-byte aligned so UTF-16/32 samples stay aligned.
+        stride = (remaining // ENCODING_STRIDE_SAMPLES) & ~3
+        for i in range(1, ENCODING_STRIDE_SAMPLES + 1):
+            file.seek(len(head) + i * stride - ENCODING_STRIDE_SAMPLE_SIZE)
+            sample += b'\n' + _trim_to_utf8_boundaries(
+                file.read(ENCODING_STRIDE_SAMPLE_SIZE)
+            )
+    result = detect(sample)
+    encoding, confidence = result['encoding'], result['confidence'] or 0.0
+
+    if (
+        encoding is None
+        or confidence < ENCODING_MIN_CONFIDENCE
+        or encoding.replace('_', '-') in ('ascii', 'utf-8')
+    ):
+        file.seek(0)
+        invalid_offset = _find_invalid_utf8(file)
+        if invalid_offset is None:
+            encoding, confidence = 'utf-8', 1.0
+        elif encoding is None or encoding.replace('_', '-') in ('ascii', 'utf-8'):
+            # The samples missed the non-UTF-8 bytes, so look at them.
+            file.seek(max(invalid_offset - ENCODING_STRIDE_SAMPLE_SIZE // 2, 0))
+            window = _trim_to_utf8_boundaries(file.read(ENCODING_STRIDE_SAMPLE_SIZE))
+            result = detect(head + b'\n' + window)
+            encoding, confidence = result['encoding'], result['confidence'] or 0.0
+            if encoding is None or encoding.replace('_', '-') in ('ascii', 'utf-8'):
+                # Every byte decodes as latin-1, so at least the import works.
+                encoding, confidence = 'latin-1', 0.0
     file.seek(0)
-    if encoding is not None:
-        return encoding
-    return "utf-8"
+    return encoding, confidence
+
+
+def _trim_to_utf8_boundaries(data):
+    """
+    Drop partial UTF-8 characters from the ends of a slice of a file.
+
+    Slices taken at arbitrary offsets would otherwise look like invalid
+    UTF-8 to the detector.
+    """
+    start = 0
+    while start < min(3, len(data)) and 0x80 <= data[start] < 0xC0:
+        start += 1
+    end = len(data)
+    for i in range(1, min(4, len(data) - start) + 1):
+        byte = data[-i]
+        if byte < 0x80:
+            break
+        if byte >= 0xC0:
+            # A lead byte; keep the character only if it is complete.
+            needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            if needed > i:
+                end = len(data) - i
+            break
+    return data[start:end]
+
+
+def _find_invalid_utf8(file):
+    """
+    Stream a binary file through a UTF-8 decoder, a chunk at a time.
+
+    Returns the offset of the chunk containing the first invalid byte, or
+    None if the whole file is valid UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    offset = 0
+    while chunk := file.read(ENCODING_CHUNK_SIZE):
+        try:
+            decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            return offset + e.start
+        offset += len(chunk)
+    try:
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return offset
+    return None
 
 
 def get_sv_dialect(file):
     """
     Given a *sv file, generate a dialect to parse it.
 
+    See `detect_sv_dialect`.
+    """
+    return detect_sv_dialect(file)[0]
+
+
+def detect_sv_dialect(file):
+    """
+    Given a *sv file, generate a dialect to parse it.
+
+    The first FAST_SNIFF_LINES lines are sniffed with the standard library
+    first. Only if that is ambiguous is clevercsv's much slower consistency
+    scoring used, on a sample that grows until the dialect it finds stops
+    changing.
+
     Args:
         file: _io.TextIOWrapper object, an already opened file
 
     Returns:
         dialect: csv.Dialect object, the dialect to parse the file
+        detection: dict describing how the dialect was found; the `method`
+            ("sniffer" or "clevercsv"), the `sample_size` in characters, and
+            the `duration` in seconds
 
     Raises:
         InvalidTableError: If the generated dialect was unable to parse the file
     """
-    dialect = csv.detect.Detector().detect(file.read(SAMPLE_SIZE),
-                                           delimiters=ALLOWED_DELIMITERS)
+    start = time.perf_counter()
+    sample = _read_lines(file, FAST_SNIFF_LINES)
+    dialect = _sniff_sv_dialect(sample)
+    if dialect is not None:
+        method, sample_size = 'sniffer', len(sample)
+    else:
+        method = 'clevercsv'
+        dialect, sample_size = _score_sv_dialect(file)
     if dialect is None:
         raise InvalidTableError
 
     file.seek(0)
-    if _check_dialect(file, dialect):
-        file.seek(0)
-        return dialect
-    else:
+    if not _check_dialect(file, dialect):
         raise InvalidTableError
+    file.seek(0)
+    detection = {
+        'method': method,
+        'sample_size': sample_size,
+        'duration': time.perf_counter() - start,
+    }
+    return dialect, detection
+
+
+def _read_lines(file, num_lines):
+    lines = []
+    for _ in range(num_lines):
+        line = file.readline()
+        if not line:
+            break
+        lines.append(line)
+    return ''.join(lines)
+
+
+def _sniff_sv_dialect(sample):
+    """
+    Cheaply detect the dialect of a sample, or return None if unsure.
+
+    The sniffed dialect must parse every row of the sample into the same
+    number (>1) of columns, and no other allowed delimiter may appear the
+    same number of times on every line. Escaped quotes are left to
+    clevercsv, since the standard library sniffer doesn't detect them.
+    """
+    lines = [line for line in sample.splitlines() if line]
+    if len(lines) < 2:
+        return None
+    try:
+        sniffed = std_csv.Sniffer().sniff(sample, delimiters=ALLOWED_DELIMITERS)
+    except std_csv.Error:
+        return None
+    if '\\' + sniffed.quotechar in sample:
+        return None
+
+    num_columns = {len(row) for row in std_csv.reader(io.StringIO(sample), sniffed) if row}
+    if len(num_columns) != 1 or num_columns.pop() < 2:
+        return None
+    for delimiter in ALLOWED_DELIMITERS:
+        if delimiter == sniffed.delimiter:
+            continue
+        counts = {line.count(delimiter) for line in lines}
+        if len(counts) == 1 and counts.pop() > 0:
+            return None
+    return csv.dialect.SimpleDialect(sniffed.delimiter, sniffed.quotechar, '')
+
+
+def _score_sv_dialect(file):
+    """
+    Detect the dialect of a file with clevercsv, on as small a sample as
+    gives a stable answer.
+
+    Returns the dialect (or None) and the size of the sample it came from.
+    """
+    sample_size = CLEVERCSV_INITIAL_SAMPLE_SIZE
+    prev_dialect = None
+    while True:
+        file.seek(0)
+        sample = file.read(sample_size)
+        dialect = csv.detect.Detector().detect(sample, delimiters=ALLOWED_DELIMITERS)
+        if (
+            len(sample) < sample_size
+            or sample_size >= SAMPLE_SIZE
+            or (dialect is not None and dialect == prev_dialect)
+        ):
+            return dialect, len(sample)
+        prev_dialect = dialect
+        sample_size = min(sample_size * 4, SAMPLE_SIZE)
 
 
 def _check_dialect(file, dialect):
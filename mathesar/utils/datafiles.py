@@ -6,7 +6,7 @@ import requests
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
 
-from mathesar.utils.csv import is_valid_csv, get_file_encoding, get_sv_dialect
+from mathesar.utils.csv import is_valid_csv, get_file_encoding, detect_sv_dialect
 from mathesar.errors import URLDownloadError, UnsupportedFileFormat
 from mathesar.models.base import DataFile
 
@@ -56,10 +56,10 @@ def create_datafile(data, user=None):
         base_name, _ = os.path.splitext(os.path.basename(raw_file.name))
         base_name = base_name[:max_length]
 
-    encoding = get_file_encoding(raw_file.file)
+    encoding, encoding_confidence = get_file_encoding(raw_file.file)
     text_file = TextIOWrapper(raw_file.file, encoding=encoding)
     if type == 'csv' or type == 'tsv':
-        dialect = get_sv_dialect(text_file)
+        dialect, dialect_detection = detect_sv_dialect(text_file)
         datafile = DataFile(
             file=raw_file,
             base_name=base_name,
@@ -69,6 +69,9 @@ def create_datafile(data, user=None):
             delimiter=dialect.delimiter,
             escapechar=dialect.escapechar,
             quotechar=dialect.quotechar,
+            encoding=encoding,
+            encoding_confidence=encoding_confidence,
+            dialect_detection=dialect_detection,
             user=user,
         )
         datafile.save()
@@ -1,8 +1,27 @@
-from db.deprecated.engine import create_future_engine_with_custom_types
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+import psycopg
+
+from db.deprecated.engine import get_cached_engine_with_custom_types
 from db.deprecated.metadata import get_empty_metadata
 from db.deprecated.queries.base import DBQuery, InitialColumn, JoinParameter
 from db.deprecated.queries.operations.process import get_transforms_with_summarizes_speced
-from db.tables import get_table
+from db.explorations import (
+    can_read_materialized_exploration as db_can_read_materialized_exploration,
+    drop_materialized_exploration as db_drop_materialized_exploration,
+    get_exploration_records_query as db_get_exploration_records_query,
+    materialize_exploration as db_materialize_exploration,
+    refresh_materialized_exploration as db_refresh_materialized_exploration,
+    replace_materialized_exploration as db_replace_materialized_exploration,
+    run_exploration as db_run_exploration,
+    run_materialized_exploration as db_run_materialized_exploration,
+    stream_exploration_records as db_stream_exploration_records,
+)
+from db.tables import get_tables_modification_token
 from db.deprecated.transforms.base import Summarize
 from db.deprecated.transforms.operations.deserialize import deserialize_transformation
 from db.deprecated.functions.base import (
@@ -22,6 +41,11 @@ from db.deprecated.functions.packed import DistinctArrayAgg
 from mathesar.models.base import Explorations, ColumnMetaData, Database
 from mathesar.rpc.columns.metadata import ColumnMetaDataRecord
 
+MATERIALIZED_VIEW_NAME = '__mathesar_exploration_{}'
+_MATERIALIZATION_FIELDS = [
+    'materialized_view_oid', 'materialized_by', 'refresh_interval', 'last_refreshed_at'
+]
+
 
 def list_explorations(database_id, schema_oid=None):
     if schema_oid is not None:
@@ -37,19 +61,47 @@ def delete_exploration(exploration_id):
     Explorations.objects.get(id=exploration_id).delete()
 
 
-def replace_exploration(new_exploration):
-    Explorations.objects.filter(id=new_exploration["id"]).update(
-        database=Database.objects.get(id=new_exploration["database_id"]),
-        name=new_exploration["name"],
-        base_table_oid=new_exploration["base_table_oid"],
-        schema_oid=new_exploration["schema_oid"],
-        initial_columns=new_exploration["initial_columns"],
-        transformations=new_exploration.get("transformations"),
-        display_options=new_exploration.get("display_options"),
-        display_names=new_exploration.get("display_names", {}),
-        description=new_exploration.get("description")
-    )
-    return get_exploration(new_exploration["id"])
+def replace_exploration(new_exploration, conn=None):
+    """
+    Replace a saved exploration.
+
+    The materialized view of a materialized exploration is replaced
+    through `conn` by one built from the new definition, before the new
+    definition is saved. The new view keeps the owner of the old one, so
+    the exploration is still refreshed as the user who materialized it.
+
+    Raises psycopg.errors.FeatureNotSupported if the exploration is
+    materialized, and the new definition can't be compiled on the
+    database. The exploration is then left as it was.
+    """
+    exp_model = get_exploration(new_exploration["id"])
+    exp_model.database = Database.objects.get(id=new_exploration["database_id"])
+    exp_model.name = new_exploration["name"]
+    exp_model.base_table_oid = new_exploration["base_table_oid"]
+    exp_model.schema_oid = new_exploration["schema_oid"]
+    exp_model.initial_columns = new_exploration["initial_columns"]
+    exp_model.transformations = new_exploration.get("transformations")
+    exp_model.display_options = new_exploration.get("display_options")
+    exp_model.display_names = new_exploration.get("display_names", {})
+    exp_model.description = new_exploration.get("description")
+    update_fields = [
+        'database', 'name', 'base_table_oid', 'schema_oid', 'initial_columns',
+        'transformations', 'display_options', 'display_names', 'description',
+    ]
+    if exp_model.materialized_view_oid is not None:
+        exploration_def = _get_saved_exploration_def(exp_model)
+        with conn.transaction():
+            exp_model.materialized_view_oid = db_replace_materialized_exploration(
+                conn,
+                _get_db_exploration(exploration_def),
+                exp_model.materialized_view_oid,
+                exp_model.schema_oid,
+                MATERIALIZED_VIEW_NAME.format(exp_model.id),
+            )
+        exp_model.last_refreshed_at = timezone.now()
+        update_fields += ['materialized_view_oid', 'last_refreshed_at']
+    exp_model.save(update_fields=update_fields)
+    return exp_model
 
 
 def create_exploration(exploration_def):
@@ -66,15 +118,24 @@ def create_exploration(exploration_def):
     )
 
 
-def run_exploration(exploration_def, conn, limit=100, offset=0):
-    engine = create_future_engine_with_custom_types(
+def _get_engine_and_metadata(conn):
+    engine = get_cached_engine_with_custom_types(
         conn.info.user,
         conn.info.password,
         conn.info.host,
         conn.info.dbname,
         conn.info.port
     )
-    metadata = get_empty_metadata()
+    return engine, get_empty_metadata()
+
+
+def _get_db_query(exploration_def, engine, metadata):
+    """
+    Build the DBQuery for an exploration definition.
+
+    Note that this fills in the specs of any Summarize transformations
+    (and their default display names) in the `exploration_def`.
+    """
     base_table_oid = exploration_def["base_table_oid"]
     initial_columns = exploration_def['initial_columns']
     processed_initial_columns = []
@@ -120,21 +181,157 @@ def run_exploration(exploration_def, conn, limit=100, offset=0):
         transformations,
         exploration_def.get("display_names", {})
     )
-    query_results = db_query.get_records(limit=limit, offset=offset)
+    return db_query, processed_initial_columns
+
+
+def run_exploration(
+        exploration_def,
+        conn,
+        limit=100,
+        offset=0,
+        count_mode='exact',
+        after=None,
+        before=None,
+):
+    """
+    Run an exploration.
+
+    Args:
+        after: A cursor; only records after the one it identifies are returned.
+        before: A cursor; only records before the one it identifies are returned.
+    """
+    if count_mode not in ('exact', 'none'):
+        raise ValueError(
+            f"Invalid count mode: {count_mode}. It must be one of exact or none."
+        )
+    try:
+        with conn.transaction():
+            return _run_exploration_on_db(
+                exploration_def, conn, limit, offset, count_mode, after=after, before=before
+            )
+    except psycopg.errors.FeatureNotSupported:
+        # The exploration can't be compiled on the database, e.g., since
+        # a summarization isn't fully specified yet.
+        if after is not None or before is not None:
+            raise ValueError(
+                "The records of this exploration can't be paged with cursors."
+            )
+        return _run_exploration_with_sqlalchemy(
+            exploration_def, conn, limit, offset, count_mode
+        )
+
+
+def _run_exploration_on_db(
+        exploration_def,
+        conn,
+        limit,
+        offset,
+        count_mode,
+        materialized_view_oid=None,
+        after=None,
+        before=None,
+):
+    transformations = tuple(
+        deserialize_transformation(i)
+        for i in exploration_def.get("transformations") or []
+    )
+    exploration_def["display_names"] = _get_default_display_names_for_summarize_transforms(
+        transformations,
+        exploration_def.get("display_names", {})
+    )
+    if materialized_view_oid is None:
+        result = db_run_exploration(
+            conn,
+            _get_db_exploration(exploration_def),
+            limit,
+            offset,
+            count_mode,
+            after=after,
+            before=before,
+        )
+    else:
+        result = db_run_materialized_exploration(
+            conn,
+            _get_db_exploration(exploration_def),
+            materialized_view_oid,
+            limit,
+            offset,
+            count_mode,
+        )
+    map_of_output_alias_to_input_alias = {}
+    for transformation in transformations:
+        map_of_output_alias_to_input_alias |= transformation.map_of_output_alias_to_input_alias
+    display_names = exploration_def.get("display_names", None)
+    metadata_records = _get_column_metadata_records(
+        exploration_def["database_id"],
+        [
+            (col["input_table_oid"], col["input_column_attnum"])
+            for col in result["columns"]
+            if col["input_table_oid"] is not None
+        ],
+    )
+    column_metadata = {}
+    for col in result["columns"]:
+        alias = col["alias"]
+        is_initial_column = col["input_table_oid"] is not None
+        column_metadata[alias] = {
+            "alias": alias,
+            "display_name": display_names.get(alias) if display_names is not None else None,
+            "type": col["type"],
+            "primary_key": col["primary_key"],
+            "type_options": col["type_options"],
+            "metadata": metadata_records.get(
+                (col["input_table_oid"], col["input_column_attnum"])
+            ),
+            "is_initial_column": is_initial_column,
+            "input_column_name": col["input_column_name"],
+            "input_table_name": col["input_table_name"],
+            "input_table_id": col["input_table_oid"],
+            "input_alias": map_of_output_alias_to_input_alias.get(alias),
+            "approximate": col.get("approximate", False),
+        }
+    return {
+        "query": exploration_def,
+        "records": {
+            "count": result["count"],
+            "results": result["results"],
+            "cursors": result.get("cursors"),
+        },
+        "output_columns": tuple(result["output_columns"]),
+        "column_metadata": column_metadata,
+        "limit": limit,
+        "offset": offset
+    }
+
+
+def _get_db_exploration(exploration_def):
+    return {
+        "base_table_oid": exploration_def["base_table_oid"],
+        "initial_columns": exploration_def["initial_columns"],
+        "transformations": exploration_def.get("transformations"),
+    }
+
+
+def _run_exploration_with_sqlalchemy(exploration_def, conn, limit, offset, count_mode):
+    engine, metadata = _get_engine_and_metadata(conn)
+    db_query, processed_initial_columns = _get_db_query(exploration_def, engine, metadata)
+    if count_mode == 'none':
+        records = [r._asdict() for r in db_query.get_records(limit=limit, offset=offset)]
+        records_count = None
+    else:
+        records, records_count = db_query.get_records_and_count(limit=limit, offset=offset)
 
     column_metadata = _get_exploration_column_metadata(
         exploration_def,
         processed_initial_columns,
         db_query,
-        conn,
-        engine,
-        metadata
     )
     return {
         "query": exploration_def,
         "records": {
-            "count": db_query.count,
-            "results": [r._asdict() for r in query_results],
+            "count": records_count,
+            "results": records,
+            "cursors": None,
         },
         "output_columns": tuple(sa_col.name for sa_col in db_query.sa_output_columns),
         "column_metadata": column_metadata,
@@ -143,15 +340,204 @@ def run_exploration(exploration_def, conn, limit=100, offset=0):
     }
 
 
-def run_saved_exploration(exp_model, limit, offset, conn):
-    exploration_def = {
+def run_saved_exploration(exp_model, limit, offset, conn, count_mode='exact', refresh=False):
+    """
+    Run a saved exploration, reusing a cached result where possible.
+
+    The records of a materialized exploration are read from its view,
+    if the user may read them from it (see
+    `can_read_materialized_exploration`).
+
+    Results are cached per exploration definition, page, count mode, and
+    database role. A cached result is used only while none of the tables
+    joined by the exploration have been modified, and for at most
+    `MATHESAR_EXPLORATION_CACHE_TIMEOUT` seconds. The metadata of the
+    columns is stored by Mathesar rather than the tables, so it's
+    attached to a cached result afresh.
+
+    Args:
+        refresh: Whether to run the exploration even if a result is cached.
+    """
+    exploration_def = _get_saved_exploration_def(exp_model)
+    if can_read_materialized_exploration(exp_model, conn):
+        # The records are read from the materialized view, which is
+        # cheap enough not to be worth caching.
+        return _run_exploration_on_db(
+            exploration_def,
+            conn,
+            limit,
+            offset,
+            count_mode,
+            materialized_view_oid=exp_model.materialized_view_oid,
+        )
+    timeout = settings.MATHESAR_EXPLORATION_CACHE_TIMEOUT
+    if not timeout:
+        return run_exploration(exploration_def, conn, limit, offset, count_mode)
+    cache_key = _get_result_cache_key(
+        exp_model.id, exploration_def, limit, offset, count_mode, conn.info.user
+    )
+    # The token is taken before running the exploration, so that a
+    # modification made while it runs invalidates the result.
+    modification_token = get_tables_modification_token(
+        _get_exploration_table_oids(exploration_def), conn
+    )
+    if not refresh:
+        cached = cache.get(cache_key)
+        if cached is not None and cached['modification_token'] == modification_token:
+            return _attach_current_column_metadata(cached['result'], exploration_def)
+    result = run_exploration(exploration_def, conn, limit, offset, count_mode)
+    cache.set(
+        cache_key,
+        {'modification_token': modification_token, 'result': result},
+        timeout,
+    )
+    return result
+
+
+def _get_result_cache_key(exploration_id, exploration_def, limit, offset, count_mode, role):
+    key_data = json.dumps(
+        [exploration_id, exploration_def, limit, offset, count_mode, role],
+        sort_keys=True,
+    )
+    return 'exploration_result:' + hashlib.sha256(key_data.encode()).hexdigest()
+
+
+def _attach_current_column_metadata(result, exploration_def):
+    initial_column_ids = {}
+    for column in exploration_def['initial_columns']:
+        join_path = column.get('join_path')
+        reloid = join_path[-1][-1][0] if join_path else exploration_def['base_table_oid']
+        initial_column_ids[column['alias']] = (reloid, column['attnum'])
+    metadata_records = _get_column_metadata_records(
+        exploration_def['database_id'], initial_column_ids.values()
+    )
+    for alias, column_metadata in result['column_metadata'].items():
+        column_metadata['metadata'] = metadata_records.get(initial_column_ids.get(alias))
+    return result
+
+
+def _get_exploration_table_oids(exploration_def):
+    """Get the oids of the base table and all tables joined to it."""
+    table_oids = {exploration_def['base_table_oid']}
+    for column in exploration_def['initial_columns']:
+        for left, right in column.get('join_path') or []:
+            table_oids.update((left[0], right[0]))
+    return sorted(table_oids)
+
+
+def can_read_materialized_exploration(exp_model, conn):
+    """
+    Return whether the records of a saved exploration should be read
+    from its materialized view through `conn`.
+
+    The view is owned by the role of the user who materialized the
+    exploration. It's only read by roles which may select from it, and
+    from all the columns used by the exploration; for others, the
+    exploration is run against its tables, as if it weren't
+    materialized.
+    """
+    if exp_model.materialized_view_oid is None:
+        return False
+    return db_can_read_materialized_exploration(
+        conn,
+        _get_db_exploration(_get_saved_exploration_def(exp_model)),
+        exp_model.materialized_view_oid,
+    )
+
+
+def materialize_exploration(exp_model, conn, user, refresh_interval=None):
+    """
+    Create a materialized view holding the records of a saved exploration,
+    from which they're then served.
+
+    An existing view of the exploration is replaced, e.g., to reflect a
+    changed definition. The view is owned by the role of `user`, which is
+    used for scheduled refreshes.
+
+    Raises psycopg.errors.FeatureNotSupported if the exploration can't
+    be compiled on the database.
+
+    Args:
+        refresh_interval: A timedelta giving how often the view should be
+            refreshed by `refresh_due_materialized_explorations`. If None,
+            the view is only refreshed on demand.
+    """
+    exploration_def = _get_saved_exploration_def(exp_model)
+    if exp_model.materialized_view_oid is not None:
+        db_drop_materialized_exploration(conn, exp_model.materialized_view_oid)
+    exp_model.materialized_view_oid = db_materialize_exploration(
+        conn,
+        _get_db_exploration(exploration_def),
+        exp_model.schema_oid,
+        MATERIALIZED_VIEW_NAME.format(exp_model.id),
+    )
+    exp_model.materialized_by = user
+    exp_model.refresh_interval = refresh_interval
+    exp_model.last_refreshed_at = timezone.now()
+    exp_model.save(update_fields=_MATERIALIZATION_FIELDS)
+    return exp_model
+
+
+def dematerialize_exploration(exp_model, conn):
+    """Drop the materialized view of a saved exploration, if any."""
+    if exp_model.materialized_view_oid is not None:
+        db_drop_materialized_exploration(conn, exp_model.materialized_view_oid)
+    exp_model.materialized_view_oid = None
+    exp_model.materialized_by = None
+    exp_model.refresh_interval = None
+    exp_model.last_refreshed_at = None
+    exp_model.save(update_fields=_MATERIALIZATION_FIELDS)
+    return exp_model
+
+
+def refresh_materialized_exploration(exp_model, conn):
+    """
+    Refresh the materialized view of a saved exploration.
+
+    The view is refreshed concurrently, so it can be read meanwhile.
+    """
+    db_refresh_materialized_exploration(conn, exp_model.materialized_view_oid)
+    exp_model.last_refreshed_at = timezone.now()
+    exp_model.save(update_fields=['last_refreshed_at'])
+    return exp_model
+
+
+def refresh_due_materialized_explorations():
+    """
+    Refresh the materialized explorations whose refresh interval has
+    elapsed since they were last refreshed.
+
+    Returns a list of (exploration, error) pairs for the explorations
+    which couldn't be refreshed.
+    """
+    now = timezone.now()
+    failures = []
+    due_explorations = Explorations.objects.select_related(
+        'database', 'materialized_by'
+    ).filter(
+        materialized_view_oid__isnull=False,
+        refresh_interval__isnull=False,
+        materialized_by__isnull=False,
+    )
+    for exp_model in due_explorations:
+        if exp_model.last_refreshed_at + exp_model.refresh_interval > now:
+            continue
+        try:
+            with exp_model.database.connect_user(exp_model.materialized_by) as conn:
+                refresh_materialized_exploration(exp_model, conn)
+        except Exception as e:
+            failures.append((exp_model, e))
+    return failures
+
+
+def _get_saved_exploration_def(exp_model):
+    return {
         "database_id": exp_model.database.id,
         "base_table_oid": exp_model.base_table_oid,
         "initial_columns": exp_model.initial_columns,
         "display_names": exp_model.display_names,
         "transformations": exp_model.transformations,
     }
-    return run_exploration(exploration_def, conn, limit, offset)
 
 
 def exploration_chunker(
@@ -161,54 +547,113 @@ def exploration_chunker(
     offset=None,
     batch_size=2000
 ):
-    limit = min(limit or 50000, 50000)  # We cap limit at 50000
-    # so that we can avoid loading explorations > 50000 rows into memory.
+    """
+    Yield the output column names of a saved exploration, followed by
+    its records in batches of at most `batch_size`.
+
+    The records are fetched through a server-side cursor, so the whole
+    result set is never held in memory. They're formatted as by
+    `run_exploration`, unless the exploration can't be compiled on the
+    database, in which case they're fetched with SQLAlchemy instead.
+    """
     exp_model = get_exploration(exploration_id)
-    exp_results = run_saved_exploration(exp_model, limit, offset, conn)
-    yield exp_results["output_columns"]
-    records = exp_results["records"]
-    for i in range(0, records["count"], batch_size):
-        yield records["results"][i:i + batch_size]
+    exploration_def = _get_saved_exploration_def(exp_model)
+    try:
+        with conn.transaction():
+            records_query = db_get_exploration_records_query(
+                conn, _get_db_exploration(exploration_def)
+            )
+    except psycopg.errors.FeatureNotSupported:
+        pass
+    else:
+        yield tuple(records_query["output_columns"])
+        yield from db_stream_exploration_records(
+            conn, records_query["query"], batch_size, limit=limit, offset=offset
+        )
+        return
+    engine, metadata = _get_engine_and_metadata(conn)
+    db_query, _ = _get_db_query(exploration_def, engine, metadata)
+    yield tuple(sa_col.name for sa_col in db_query.sa_output_columns)
+    for records in db_query.stream_records(batch_size, limit=limit, offset=offset):
+        yield [r._asdict() for r in records]
 
 
 def _get_exploration_column_metadata(
     exploration_def,
     processed_initial_columns,
     db_query,
-    conn,
-    engine,
-    metadata
 ):
+    """
+    Describe every column appearing at any step of the exploration.
+
+    The relation is built once, the tables and their column names come
+    from the reflection cache of the query, and the column metadata is
+    fetched in a single query.
+    """
+    initial_columns = {col.alias: col for col in processed_initial_columns}
+    all_sa_columns_map = db_query.all_sa_columns_map
+    metadata_records = _get_column_metadata_records(
+        exploration_def["database_id"],
+        [
+            (initial_columns[alias].reloid, initial_columns[alias].attnum)
+            for alias in all_sa_columns_map
+            if alias in initial_columns
+        ],
+    )
+    display_names = exploration_def.get("display_names", None)
+    # Aggregations of a sample of the base table are approximate.
+    approximate_aliases = set()
+    if db_query.sample_percent is not None:
+        for transform in db_query.transformations:
+            if isinstance(transform, Summarize):
+                approximate_aliases.update(transform.aggregation_output_aliases)
     exploration_column_metadata = {}
-    for alias, sa_col in db_query.all_sa_columns_map.items():
-        initial_column = None
-        for col in processed_initial_columns:
-            if alias == col.alias:
-                initial_column = col
-        column_metadata = ColumnMetaData.objects.filter(
-            database__id=exploration_def["database_id"],
-            table_oid=initial_column.reloid,
-            attnum=sa_col.column_attnum
-        ).first() if initial_column else None
-        input_table_name = get_table(initial_column.reloid, conn)["name"] if initial_column else None
-        input_column_name = initial_column.get_name(engine, metadata) if initial_column else None
-        display_names = exploration_def.get("display_names", None)
+    for alias, sa_col in all_sa_columns_map.items():
+        initial_column = initial_columns.get(alias)
+        if initial_column is not None:
+            reloid, attnum = initial_column.reloid, initial_column.attnum
+            input_table_name = db_query.get_table_name(reloid)
+            input_column_name = db_query.get_column_name(reloid, attnum)
+        else:
+            reloid = attnum = input_table_name = input_column_name = None
         exploration_column_metadata[alias] = {
             "alias": alias,
             "display_name": display_names.get(alias) if display_names is not None else None,
             "type": sa_col.db_type.id,
             "primary_key": sa_col.primary_key,
             "type_options": sa_col.type_options,
-            "metadata": ColumnMetaDataRecord.from_model(column_metadata) if column_metadata else None,
-            "is_initial_column": True if initial_column else False,
+            "metadata": metadata_records.get((reloid, attnum)),
+            "is_initial_column": initial_column is not None,
             "input_column_name": input_column_name,
             "input_table_name": input_table_name,
-            "input_table_id": initial_column.reloid if initial_column else None,
-            "input_alias": db_query.get_input_alias_for_output_alias(alias)
+            "input_table_id": reloid,
+            "input_alias": db_query.get_input_alias_for_output_alias(alias),
+            "approximate": alias in approximate_aliases,
         }
     return exploration_column_metadata
 
 
+def _get_column_metadata_records(database_id, columns):
+    """
+    Get the metadata of the given (table oid, attnum) pairs in one query.
+
+    Returns a dict mapping each pair having metadata to its record.
+    """
+    columns = set(columns)
+    if not columns:
+        return {}
+    column_metadata = ColumnMetaData.objects.filter(
+        database__id=database_id,
+        table_oid__in={oid for oid, _ in columns},
+        attnum__in={attnum for _, attnum in columns},
+    )
+    return {
+        (cm.table_oid, cm.attnum): ColumnMetaDataRecord.from_model(cm)
+        for cm in column_metadata
+        if (cm.table_oid, cm.attnum) in columns
+    }
+
+
 def _get_default_display_names_for_summarize_transforms(transformations, current_display_names=dict()):
     default_display_names = dict()
     if not current_display_names:
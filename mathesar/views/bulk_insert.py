@@ -33,7 +33,14 @@ def bulk_insert(request):
         try:
             datafile = create_datafile(data, user)
             with connect(database_id, user) as conn:
-                inserted_rows = insert_into_existing_table(user, datafile.id, target_table_oid, mappings, conn)
+                inserted_rows = insert_into_existing_table(
+                    user,
+                    datafile.id,
+                    target_table_oid,
+                    mappings,
+                    conn,
+                    connect=lambda: connect(database_id, user),
+                )
                 return JsonResponse({"inserted_rows": inserted_rows})
         except Exception as e:
             return JsonResponse({"errors": "Unable to import data into existing table. " + force_str(e)}, status=400)
@@ -97,6 +97,9 @@ def list_or_create_data_file(request):
             "delimiter": df.delimiter,
             "escapechar": df.escapechar,
             "quotechar": df.quotechar,
+            "encoding": df.encoding,
+            "encoding_confidence": df.encoding_confidence,
+            "dialect_detection": df.dialect_detection,
             "created_from": df.created_from,
             # TODO: remove?
             "max_level": df.max_level,
@@ -172,6 +175,9 @@ def get_or_patch_data_file(request, data_file_id):
             "delimiter": df.delimiter,
             "escapechar": df.escapechar,
             "quotechar": df.quotechar,
+            "encoding": df.encoding,
+            "encoding_confidence": df.encoding_confidence,
+            "dialect_detection": df.dialect_detection,
             "created_from": df.created_from,
             # TODO: remove?
             "max_level": df.max_level,
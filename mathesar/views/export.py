@@ -5,11 +5,14 @@ from django.contrib.auth.decorators import login_required
 from django import forms
 from django.http import StreamingHttpResponse, JsonResponse
 
-from mathesar.utils.explorations import exploration_chunker
+from mathesar.utils.explorations import (
+    can_read_materialized_exploration, exploration_chunker, get_exploration
+)
 from mathesar.rpc.utils import connect
 from mathesar.rpc.records import Filter, OrderBy
 
-from db.tables import fetch_table_in_chunks
+from db.explorations import copy_materialized_exploration_as_csv
+from db.tables import copy_table_as_csv
 
 
 class ExportExplorationQueryForm(forms.Form):
@@ -32,7 +35,13 @@ def export_exploration_csv_in_chunks(
     exploration_id: int,
     **kwargs
 ):
+    exp_model = get_exploration(exploration_id)
     with connect(database_id, user) as conn:
+        if can_read_materialized_exploration(exp_model, conn):
+            yield from copy_materialized_exploration_as_csv(
+                conn, exp_model.materialized_view_oid, **kwargs
+            )
+            return
         csv_buffer = StringIO()
         exploration_chunk_gen = exploration_chunker(conn, exploration_id, **kwargs)
         columns = next(exploration_chunk_gen)
@@ -97,24 +106,7 @@ def export_table_csv_in_chunks(
     **kwargs
 ):
     with connect(database_id, user) as conn:
-        csv_buffer = StringIO()
-
-        table_fetch_gen = fetch_table_in_chunks(conn, table_oid, **kwargs)
-        columns = next(table_fetch_gen)
-        csv_writer = csv.DictWriter(csv_buffer, fieldnames=columns.keys())
-
-        csv_writer.writerow(columns)
-        value = csv_buffer.getvalue()
-        yield value
-        csv_buffer.seek(0)
-        csv_buffer.truncate(0)
-
-        for records in table_fetch_gen:
-            csv_writer.writerows(records)
-            value = csv_buffer.getvalue()
-            yield value
-            csv_buffer.seek(0)
-            csv_buffer.truncate(0)
+        yield from copy_table_as_csv(conn, table_oid, **kwargs)
 
 
 def stream_table_as_csv(
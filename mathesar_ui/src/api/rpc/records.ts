@@ -89,6 +89,11 @@ export interface RecordsListParams {
   filter?: SqlExpr;
   return_record_summaries?: boolean;
   joined_columns?: { alias: string; join_path: JoinPath }[];
+  count_mode?: 'exact' | 'estimated' | 'none';
+  /** A cursor from `RecordsResponse['cursors']` */
+  after?: string;
+  /** A cursor from `RecordsResponse['cursors']` */
+  before?: string;
 }
 
 export interface RecordsSearchParams {
@@ -97,6 +102,8 @@ export interface RecordsSearchParams {
   search_params: { attnum: number; literal: unknown }[];
   limit?: number;
   return_record_summaries?: boolean;
+  after?: string;
+  before?: string;
 }
 
 /** keys are stringified column ids */
@@ -127,6 +134,18 @@ export interface RecordsResponse {
   /** Keys are attnums. */
   download_links: Record<string, FileManifestColumnData>;
   joined_record_summaries: Record<string, RecordSummaryColumnData> | null;
+  cursors: { first: string | null; last: string | null } | null;
+}
+
+export interface RecordsAddedResponse {
+  /** Null if any record couldn't be added */
+  keys: ResultValue[] | null;
+  results: Result[] | null;
+  /** Keys are attnums. */
+  linked_record_summaries: Record<string, RecordSummaryColumnData> | null;
+  record_summaries: Record<string, string> | null;
+  /** `index` is the position of the record in `record_defs` */
+  errors: { index: number; message: string; code: string }[] | null;
 }
 
 export const records = {
@@ -141,6 +160,18 @@ export const records = {
     RecordsResponse
   >(),
 
+  add_many: rpcMethodTypeContainer<
+    {
+      database_id: number;
+      table_oid: number;
+      /** Keys are stringified attnums */
+      record_defs: Record<string, unknown>[];
+      return_records?: boolean;
+      return_record_summaries?: boolean;
+    },
+    RecordsAddedResponse
+  >(),
+
   patch: rpcMethodTypeContainer<
     {
       database_id: number;
@@ -153,6 +184,25 @@ export const records = {
     RecordsResponse
   >(),
 
+  patch_many: rpcMethodTypeContainer<
+    {
+      database_id: number;
+      table_oid: number;
+      /** Either `record_patches`, or both `record_def` and `record_ids` */
+      record_patches?: {
+        record_id: ResultValue;
+        /** Keys are stringified attnums */
+        record_def: Record<string, unknown>;
+      }[];
+      /** Keys are stringified attnums */
+      record_def?: Record<string, unknown>;
+      record_ids?: ResultValue[];
+      return_records?: boolean;
+      return_record_summaries?: boolean;
+    },
+    Omit<RecordsAddedResponse, 'keys' | 'errors'> & { keys: ResultValue[] }
+  >(),
+
   get: rpcMethodTypeContainer<
     {
       database_id: number;
@@ -176,6 +226,15 @@ export const records = {
 
   list: rpcMethodTypeContainer<RecordsListParams, RecordsResponse>(),
 
+  count: rpcMethodTypeContainer<
+    {
+      database_id: number;
+      table_oid: number;
+      filter?: SqlExpr;
+    },
+    number
+  >(),
+
   search: rpcMethodTypeContainer<RecordsSearchParams, RecordsResponse>(),
 
   delete: rpcMethodTypeContainer<
@@ -60,12 +60,37 @@ interface TableMetadata {
   record_summary_template: RecordSummaryTemplate | null;
   /** The attnum of the most recently-set pkey column (used during import) */
   mathesar_added_pkey_attnum: number | null;
+  index_record_summaries: boolean | null;
 }
 
 export interface RawTableWithMetadata extends RawTable {
   metadata: TableMetadata | null;
 }
 
+export type ImportJobStatus =
+  | 'PENDING'
+  | 'RUNNING'
+  | 'COMPLETE'
+  | 'FAILED'
+  | 'CANCELLED';
+
+export interface RawImportJob {
+  id: number;
+  database_id: number;
+  data_file_id: number;
+  status: ImportJobStatus;
+  bytes_total: number | null;
+  bytes_read: number;
+  rows_copied: number;
+  eta_seconds: number | null;
+  result: {
+    oid: number;
+    name: string;
+    renamed_columns: Record<string, string>;
+  } | null;
+  error: string | null;
+}
+
 /** [table oid, column attnum][] */
 export type JoinPath = [number, number][][];
 
@@ -231,7 +256,10 @@ export const tables = {
     }
   >(),
 
-  /** Returns the oid of the table created */
+  /**
+   * Starts importing the data file in the background. Poll the returned job
+   * with `import_jobs.get` to find the table created.
+   */
   import: rpcMethodTypeContainer<
     {
       database_id: number;
@@ -240,11 +268,7 @@ export const tables = {
       comment?: string;
       data_file_id: number;
     },
-    {
-      oid: number;
-      name: string;
-      renamed_columns: Record<string, string>;
-    }
+    RawImportJob
   >(),
 
   patch: rpcMethodTypeContainer<
@@ -301,6 +325,12 @@ export const tables = {
     >(),
   },
 
+  import_jobs: {
+    get: rpcMethodTypeContainer<{ import_job_id: number }, RawImportJob>(),
+
+    cancel: rpcMethodTypeContainer<{ import_job_id: number }, RawImportJob>(),
+  },
+
   privileges: {
     list_direct: rpcMethodTypeContainer<
       {
@@ -19,6 +19,7 @@ import { api } from '@mathesar/api/rpc';
 import type { ColumnPatchSpec } from '@mathesar/api/rpc/columns';
 import type {
   NewPkColumnType,
+  RawImportJob,
   RawTableWithMetadata,
 } from '@mathesar/api/rpc/tables';
 import { invalidIf } from '@mathesar/components/form';
@@ -45,6 +46,7 @@ import { currentSchema } from './schemas';
 
 const commonData = preloadCommonData();
 const isInAuthenticatedContext = commonData.routing_context !== 'anonymous';
+const IMPORT_JOB_POLL_INTERVAL_MS = 1000;
 
 type TablesMap = Map<Table['oid'], Table>;
 
@@ -331,6 +333,23 @@ export async function createTable({
   return putTableInStore({ schema, rawTableWithMetadata });
 }
 
+async function waitForImportJob(
+  job: RawImportJob,
+): Promise<NonNullable<RawImportJob['result']>> {
+  if (job.status === 'PENDING' || job.status === 'RUNNING') {
+    await new Promise((resolve) => {
+      setTimeout(resolve, IMPORT_JOB_POLL_INTERVAL_MS);
+    });
+    return waitForImportJob(
+      await api.tables.import_jobs.get({ import_job_id: job.id }).run(),
+    );
+  }
+  if (job.status !== 'COMPLETE' || !job.result) {
+    throw new Error(job.error ?? 'The import was cancelled.');
+  }
+  return job.result;
+}
+
 export async function createTableFromDataFile(props: {
   schema: Schema;
   dataFile: Pick<DataFile, 'id'>;
@@ -341,7 +360,7 @@ export async function createTableFromDataFile(props: {
 }> {
   const { schema } = props;
 
-  const created = await api.tables
+  const job = await api.tables
     .import({
       database_id: schema.database.id,
       schema_oid: schema.oid,
@@ -349,6 +368,7 @@ export async function createTableFromDataFile(props: {
       data_file_id: props.dataFile.id,
     })
     .run();
+  const created = await waitForImportJob(job);
 
   schema.setTableCount(get(schema.tableCount) + 1);
   const fullTable = await updateTable({